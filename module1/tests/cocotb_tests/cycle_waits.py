@@ -0,0 +1,122 @@
+"""
+Module 1: Cycle Waits
+Clock-cycle waiting helpers for the cocotb tests.
+
+Awaiting RisingEdge in a loop wakes Python on every clock cycle, even when
+nothing is checked until the end. For a clock whose period is known
+(started with start_clock or registered with register_clock, and still
+running),
+wait_cycles() synchronises to one edge, sleeps with a single Timer to the
+middle of the cycle before the target edge, then awaits that edge: three
+wake-ups for any number of cycles. Clocks of unknown period fall back to
+counting edges.
+
+The Timer shortcut assumes the clock runs freely for the whole wait; do
+not use it across a clock stop or gate.
+"""
+
+from cocotb.clock import Clock
+from cocotb.triggers import (ClockCycles, First, RisingEdge, SimTimeoutError,
+                             Timer, ValueChange, with_timeout)
+from cocotb.utils import get_sim_steps
+
+
+# Clock signal handle -> (period in simulator steps, task driving the clock).
+# cocotb cancels a test's tasks when the test ends, so an entry only counts
+# while its task runs: the next test, or a stopped clock, falls back to edges.
+_clocks = {}
+
+
+def register_clock(clock, task):
+    """
+    Record the period of a running cocotb Clock so waits on its signal can
+    use timers. task is the Task returned by clock.start().
+    """
+    _clocks[clock.signal] = (get_sim_steps(clock.period, clock.unit), task)
+
+
+def start_clock(signal, period_ns=10, impl="gpi"):
+    """
+    Start a free-running clock and register its period.
+
+    impl="gpi" toggles the signal from the simulator without entering
+    Python.
+    """
+    clock = Clock(signal, period_ns, unit="ns", impl=impl)
+    register_clock(clock, clock.start())
+    return clock
+
+
+def clock_period(clk):
+    """Period of clk in simulator steps, or None if no registered clock drives it."""
+    entry = _clocks.get(clk)
+    if entry is None:
+        return None
+    period, task = entry
+    if task.done():
+        del _clocks[clk]
+        return None
+    return period
+
+
+async def wait_cycles(clk, n):
+    """
+    Wait for the n-th rising edge of clk.
+
+    Returns at the same simulation time as n awaits of RisingEdge(clk).
+    """
+    if n < 0:
+        raise ValueError(f"Cycle count must be non-negative, got {n}")
+    period = clock_period(clk)
+    if period is None or n <= 3:
+        if n:
+            await ClockCycles(clk, n)
+        return
+    edge = RisingEdge(clk)
+    await edge
+    # Land half a period before edge n, so the Timer never shares a
+    # timestep with a clock edge
+    await Timer((n - 1) * period - period // 2, unit="step")
+    await edge
+
+
+async def _until(signal, value):
+    change = ValueChange(signal)
+    while signal.value != value:
+        await change
+
+
+async def wait_until(signal, value, clk=None, timeout_cycles=None):
+    """
+    Wait until signal equals value.
+
+    Wakes only when signal changes, not on every clock. With
+    timeout_cycles, raises SimTimeoutError if the value has not appeared
+    within that many cycles of clk; the deadline is a single Timer when
+    the period of clk is registered, otherwise edges of clk are counted.
+    """
+    if signal.value == value:
+        return
+    if timeout_cycles is None:
+        await _until(signal, value)
+        return
+    if clk is None:
+        raise ValueError("timeout_cycles needs the clock to count cycles on")
+
+    period = clock_period(clk)
+    if period is not None:
+        await with_timeout(_until(signal, value), timeout_cycles * period, "step")
+        return
+
+    change = ValueChange(signal)
+    edge = RisingEdge(clk)
+    cycles = 0
+    while True:
+        fired = await First(change, edge)
+        if signal.value == value:
+            return
+        if fired is edge:
+            cycles += 1
+            if cycles >= timeout_cycles:
+                raise SimTimeoutError(
+                    f"{signal._name} did not reach {value} within {timeout_cycles} cycles")
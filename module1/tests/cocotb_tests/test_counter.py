@@ -3,33 +3,44 @@ Module 1: Counter Testbench
 cocotb testbench for counter module.
 
 Demonstrates:
-- Clock generation
+- Clock generation (simulator-driven vs Python-toggled)
 - Reset sequence
 - Enable control
 - Counter verification
+- Waiting many cycles without a Python wake-up per cycle
 """
 
+import time
+
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import Timer, RisingEdge, FallingEdge
+from cocotb.triggers import Timer, RisingEdge, FallingEdge, ClockCycles, SimTimeoutError
+from cocotb.utils import get_sim_time
+
+from cycle_waits import start_clock, wait_cycles, wait_until
 
 
 async def generate_clock(dut, period_ns=10):
-    """Generate clock signal."""
+    """
+    Generate clock signal from Python.
+
+    Wakes Python on every edge; kept as the baseline for
+    test_counter_clock_benchmark.
+    """
     while True:
         dut.clk.value = 1
-        await Timer(period_ns // 2, units="ns")
+        await Timer(period_ns // 2, unit="ns")
         dut.clk.value = 0
-        await Timer(period_ns // 2, units="ns")
+        await Timer(period_ns // 2, unit="ns")
 
 
 async def reset_dut(dut, duration_ns=20):
     """Reset the DUT."""
     dut.rst_n.value = 0
     dut.enable.value = 0
-    await Timer(duration_ns, units="ns")
+    await Timer(duration_ns, unit="ns")
     dut.rst_n.value = 1
-    await Timer(10, units="ns")
+    await Timer(10, unit="ns")
 
 
 @cocotb.test()
@@ -38,7 +49,7 @@ async def test_counter_reset(dut):
     Test counter reset functionality.
     """
     # Start clock
-    cocotb.start_soon(generate_clock(dut, period_ns=10))
+    start_clock(dut.clk, period_ns=10)
     
     # Reset
     await reset_dut(dut)
@@ -53,7 +64,7 @@ async def test_counter_increment(dut):
     Test counter increment functionality.
     """
     # Start clock
-    cocotb.start_soon(generate_clock(dut, period_ns=10))
+    start_clock(dut.clk, period_ns=10)
     
     # Reset
     await reset_dut(dut)
@@ -64,7 +75,7 @@ async def test_counter_increment(dut):
     # Count for several cycles
     for expected_count in range(1, 11):
         await RisingEdge(dut.clk)
-        await Timer(1, units="ns")  # Wait for combinational logic
+        await Timer(1, unit="ns")  # Wait for combinational logic
         actual_count = int(dut.count.value)
         assert actual_count == expected_count, \
             f"Expected count {expected_count}, got {actual_count}"
@@ -76,7 +87,7 @@ async def test_counter_enable(dut):
     Test counter enable control.
     """
     # Start clock
-    cocotb.start_soon(generate_clock(dut, period_ns=10))
+    start_clock(dut.clk, period_ns=10)
     
     # Reset
     await reset_dut(dut)
@@ -84,21 +95,21 @@ async def test_counter_enable(dut):
     # Enable and count
     dut.enable.value = 1
     await RisingEdge(dut.clk)
-    await Timer(1, units="ns")
+    await Timer(1, unit="ns")
     assert dut.count.value == 1, "Counter should increment when enabled"
     
     # Disable and check counter doesn't increment
     dut.enable.value = 0
     count_before = int(dut.count.value)
     await RisingEdge(dut.clk)
-    await Timer(1, units="ns")
+    await Timer(1, unit="ns")
     count_after = int(dut.count.value)
     assert count_after == count_before, "Counter should not increment when disabled"
     
     # Re-enable and verify it continues
     dut.enable.value = 1
     await RisingEdge(dut.clk)
-    await Timer(1, units="ns")
+    await Timer(1, unit="ns")
     assert dut.count.value == count_before + 1, "Counter should resume incrementing when re-enabled"
 
 
@@ -108,7 +119,7 @@ async def test_counter_overflow(dut):
     Test counter overflow behavior.
     """
     # Start clock
-    cocotb.start_soon(generate_clock(dut, period_ns=10))
+    start_clock(dut.clk, period_ns=10)
     
     # Reset
     await reset_dut(dut)
@@ -122,9 +133,9 @@ async def test_counter_overflow(dut):
     MAX_COUNT = 255  # Maximum value for 8-bit counter
     COUNT_TO_OVERFLOW = MAX_COUNT - 1  # 254
     
-    for _ in range(COUNT_TO_OVERFLOW):
-        await RisingEdge(dut.clk)
-        await Timer(1, units="ns")
+    # One Timer instead of a wake-up per cycle (see test_counter_overflow_benchmark)
+    await wait_cycles(dut.clk, COUNT_TO_OVERFLOW)
+    await Timer(1, unit="ns")
     
     # Check we're at the expected pre-overflow value
     assert dut.count.value == COUNT_TO_OVERFLOW, \
@@ -133,7 +144,7 @@ async def test_counter_overflow(dut):
     # Next increment should wrap to 0 (or continue to 255, depending on implementation)
     # This tests the counter's overflow behavior
     await RisingEdge(dut.clk)
-    await Timer(1, units="ns")
+    await Timer(1, unit="ns")
     # Note: Counter behavior depends on implementation:
     # - Wrapping counter: 254 -> 255 -> 0 (wraps on next increment)
     # - Saturating counter: 254 -> 255 -> 255 (saturates at max)
@@ -142,3 +153,113 @@ async def test_counter_overflow(dut):
     assert final_count in [0, MAX_COUNT], \
         f"Counter should wrap to 0 or saturate at {MAX_COUNT}, got {final_count}"
 
+
+
+@cocotb.test()
+async def test_counter_wait_until(dut):
+    """
+    Test waiting for a counter value with a cycle timeout.
+    """
+    start_clock(dut.clk, period_ns=10)
+    await reset_dut(dut)
+    
+    # Counter reaches 100 well within the timeout
+    dut.enable.value = 1
+    start = get_sim_time("ns")
+    await wait_until(dut.count, 100, dut.clk, timeout_cycles=200)
+    elapsed = get_sim_time("ns") - start
+    assert int(dut.count.value) == 100, f"Expected count 100, got {int(dut.count.value)}"
+    assert elapsed <= 101 * 10, f"Count 100 took {elapsed} ns"
+    
+    # Disabled counter never reaches 200: the wait must time out
+    dut.enable.value = 0
+    try:
+        await wait_until(dut.count, 200, dut.clk, timeout_cycles=20)
+    except SimTimeoutError:
+        pass
+    else:
+        assert False, "wait_until should time out when the counter is disabled"
+
+
+@cocotb.test()
+async def test_counter_overflow_benchmark(dut):
+    """
+    Time the overflow count (254 cycles) with a per-cycle RisingEdge
+    loop, cocotb's ClockCycles and wait_cycles.
+    """
+    REPEATS = 50
+    COUNT_TO_OVERFLOW = 254
+    start_clock(dut.clk, period_ns=10)
+    
+    async def per_cycle():
+        for _ in range(COUNT_TO_OVERFLOW):
+            await RisingEdge(dut.clk)
+            await Timer(1, unit="ns")
+    
+    async def clock_cycles():
+        await ClockCycles(dut.clk, COUNT_TO_OVERFLOW)
+        await Timer(1, unit="ns")
+    
+    async def timed():
+        await wait_cycles(dut.clk, COUNT_TO_OVERFLOW)
+        await Timer(1, unit="ns")
+    
+    results = {}
+    for name, wait in (("per-cycle", per_cycle), ("ClockCycles", clock_cycles),
+                       ("wait_cycles", timed)):
+        elapsed = 0.0
+        for _ in range(REPEATS):
+            await reset_dut(dut)
+            dut.enable.value = 1
+            sim_start = get_sim_time("ns")
+            start = time.perf_counter()
+            await wait()
+            elapsed += time.perf_counter() - start
+            sim_ns = get_sim_time("ns") - sim_start
+            count = int(dut.count.value)
+            assert count == COUNT_TO_OVERFLOW, f"{name}: expected {COUNT_TO_OVERFLOW}, got {count}"
+        results[name] = (sim_ns, elapsed / REPEATS)
+    
+    sim_times = {sim_ns for sim_ns, _ in results.values()}
+    assert len(sim_times) == 1, f"Waits ended at different times: {results}"
+    baseline = results["per-cycle"][1]
+    for name, (sim_ns, wall) in results.items():
+        print(f"{name:>12}: {sim_ns} ns simulated, {wall * 1e6:8.1f} us wall "
+              f"({baseline / wall:.1f}x)")
+
+
+@cocotb.test()
+async def test_counter_clock_benchmark(dut):
+    """
+    Compare simulated cycles per wall second for the counter with a
+    Python-toggled clock, cocotb's Python Clock and the GPI Clock.
+    """
+    CYCLES = 20000
+    PERIOD_NS = 10
+    rates = {}
+    for name in ("python", "py", "gpi"):
+        if name == "python":
+            task = cocotb.start_soon(generate_clock(dut, period_ns=PERIOD_NS))
+            stop = task.cancel
+        else:
+            clock = Clock(dut.clk, PERIOD_NS, unit="ns", impl=name)
+            clock.start()
+            stop = clock.stop
+        await reset_dut(dut)
+
+        # Enable mid-cycle so exactly CYCLES rising edges fall in the window
+        await FallingEdge(dut.clk)
+        dut.enable.value = 1
+        start = time.perf_counter()
+        await Timer(CYCLES * PERIOD_NS, unit="ns")
+        elapsed = time.perf_counter() - start
+        dut.enable.value = 0
+        stop()
+
+        count = int(dut.count.value)
+        assert count == CYCLES % 256, \
+            f"{name}: expected count {CYCLES % 256} after {CYCLES} cycles, got {count}"
+        rates[name] = CYCLES / elapsed
+
+    for name, rate in rates.items():
+        print(f"{name:>6} clock: {rate:12,.0f} cycles/s ({rate / rates['python']:.1f}x)")
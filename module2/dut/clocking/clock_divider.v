@@ -0,0 +1,40 @@
+/**
+ * Module 2: Clock Divider
+ * 
+ * Divides clk by an even ratio with a toggle counter. The output is low
+ * while rst_n is asserted.
+ * 
+ * Parameters:
+ *   DIVIDE: Division ratio (even, >= 2)
+ * 
+ * Ports:
+ *   clk:     Input clock
+ *   rst_n:   Active-low reset
+ *   clk_out: clk / DIVIDE
+ */
+
+module clock_divider #(
+    parameter DIVIDE = 2
+) (
+    input  wire clk,
+    input  wire rst_n,
+    output reg  clk_out
+);
+
+    localparam HALF = DIVIDE / 2;
+
+    reg [15:0] count;
+
+    always @(posedge clk or negedge rst_n) begin
+        if (!rst_n) begin
+            count   <= 16'd0;
+            clk_out <= 1'b0;
+        end else if (count == HALF - 1) begin
+            count   <= 16'd0;
+            clk_out <= ~clk_out;
+        end else begin
+            count <= count + 16'd1;
+        end
+    end
+
+endmodule
@@ -0,0 +1,30 @@
+/**
+ * Module 2: Clock Gate
+ * 
+ * Glitch-free clock gate. The enable is sampled on the falling edge, so
+ * gclk only starts or stops while clk is low and never produces a
+ * shortened pulse.
+ * 
+ * Ports:
+ *   clk:  Input clock
+ *   en:   Gate enable
+ *   gclk: Gated clock
+ */
+
+module clock_gate (
+    input  wire clk,
+    input  wire en,
+    output wire gclk
+);
+
+    reg en_q;
+
+    initial en_q = 1'b0;
+
+    always @(negedge clk) begin
+        en_q <= en;
+    end
+
+    assign gclk = clk & en_q;
+
+endmodule
@@ -0,0 +1,25 @@
+/**
+ * Module 2: Clock Generator
+ * 
+ * Free-running 50% duty clock generated inside the simulator, so no
+ * Python code runs on its edges. Needs a simulator with timing support
+ * (Verilator --timing, Icarus).
+ * 
+ * Parameters:
+ *   PERIOD: Clock period in simulator time units (even)
+ * 
+ * Ports:
+ *   clk: Generated clock
+ */
+
+module clock_gen #(
+    parameter PERIOD = 10
+) (
+    output reg clk
+);
+
+    initial clk = 1'b0;
+
+    always #(PERIOD / 2) clk = ~clk;
+
+endmodule
@@ -0,0 +1,88 @@
+/**
+ * Module 2: Clocked Register
+ * 
+ * simple_register wrapped with the clocking shims. The core clock comes
+ * either from the clk port (driven by cocotb) or from clock_gen, chosen
+ * by USE_CLOCK_GEN; divided and gated clocks are derived in HDL. Edge
+ * counters let a test check clock activity without waking on each edge.
+ * 
+ * Parameters:
+ *   USE_CLOCK_GEN: 1 = core clock from clock_gen, 0 = from clk
+ *   PERIOD:        clock_gen period in simulator time units
+ *   DIVIDE:        clock_divider ratio
+ * 
+ * Ports:
+ *   clk:          External clock (unused when USE_CLOCK_GEN = 1)
+ *   rst_n:        Active-low reset
+ *   enable:       Register enable
+ *   d:            Data input
+ *   q:            Data output
+ *   clk_en:       Gated clock enable
+ *   core_clk:     Clock driving the register
+ *   div_clk:      core_clk / DIVIDE
+ *   gated_clk:    core_clk gated by clk_en
+ *   core_cycles:  Rising edges of core_clk
+ *   div_cycles:   Rising edges of div_clk
+ *   gated_cycles: Rising edges of gated_clk
+ */
+
+module clocked_register #(
+    parameter USE_CLOCK_GEN = 0,
+    parameter PERIOD = 10,
+    parameter DIVIDE = 4
+) (
+    input  wire        clk,
+    input  wire        rst_n,
+    input  wire        enable,
+    input  wire [7:0]  d,
+    output wire [7:0]  q,
+    input  wire        clk_en,
+    output wire        core_clk,
+    output wire        div_clk,
+    output wire        gated_clk,
+    output reg  [31:0] core_cycles,
+    output reg  [31:0] div_cycles,
+    output reg  [31:0] gated_cycles
+);
+
+    generate
+        if (USE_CLOCK_GEN) begin : gen_clk
+            clock_gen #(.PERIOD(PERIOD)) u_clock_gen (
+                .clk(core_clk)
+            );
+        end else begin : ext_clk
+            assign core_clk = clk;
+        end
+    endgenerate
+
+    clock_divider #(.DIVIDE(DIVIDE)) u_clock_divider (
+        .clk(core_clk),
+        .rst_n(rst_n),
+        .clk_out(div_clk)
+    );
+
+    clock_gate u_clock_gate (
+        .clk(core_clk),
+        .en(clk_en),
+        .gclk(gated_clk)
+    );
+
+    simple_register u_register (
+        .clk(core_clk),
+        .rst_n(rst_n),
+        .enable(enable),
+        .d(d),
+        .q(q)
+    );
+
+    initial begin
+        core_cycles  = 32'd0;
+        div_cycles   = 32'd0;
+        gated_cycles = 32'd0;
+    end
+
+    always @(posedge core_clk)  core_cycles  <= core_cycles + 32'd1;
+    always @(posedge div_clk)   div_cycles   <= div_cycles + 32'd1;
+    always @(posedge gated_clk) gated_cycles <= gated_cycles + 32'd1;
+
+endmodule
@@ -1,44 +1,69 @@
 """
 Module 2 Example 2.2: Clock Generation and Management
 Demonstrates clock generation patterns in cocotb.
+
+Free-running clocks come from cocotb's C-level GPI Clock or, when built
+with CLOCK_SOURCE=verilog, from clock_gen inside the toplevel. Divided
+and gated clocks are Verilog shims (dut/clocking/) around
+simple_register; Python only drives their enables and reads their edge
+counters. A Python clock is used only for an irregular waveform.
 """
 
+import time
+
 import cocotb
 from cocotb.clock import Clock
 from cocotb.triggers import Timer, RisingEdge, FallingEdge
 
+from clocking import (ClockDriver, apply_reset, clock_period_ns, clock_source,
+                      irregular_clock, measure_period)
+
+
+SOURCE = clock_source()
+PERIOD_NS = clock_period_ns()
+DIVIDE = 4  # clocked_register DIVIDE parameter
+BENCH_CYCLES = 20000
+
+# Tests that drive dut.clk from Python cannot run when clock_gen owns the clock
+VERILOG_CLOCK = SOURCE == "verilog"
+
 
-async def generate_clock_simple(dut, period_ns=10):
+async def align(dut):
     """
-    Simple clock generation function.
+    Move to a quarter period after a falling edge of the core clock, so
+    later reads and writes never share a timestep with a clock edge.
     """
-    while True:
-        dut.clk.value = 1
-        await Timer(period_ns // 2, units="ns")
-        dut.clk.value = 0
-        await Timer(period_ns // 2, units="ns")
+    await FallingEdge(dut.core_clk)
+    await Timer(PERIOD_NS // 4, unit="ns")
 
 
-@cocotb.test()
+async def count_edges(dut, counter, cycles):
+    """Run for a number of core clock periods and return how far counter advanced."""
+    before = int(counter.value)
+    await Timer(cycles * PERIOD_NS, unit="ns")
+    return int(counter.value) - before
+
+
+@cocotb.test(skip=VERILOG_CLOCK)
 async def test_clock_class(dut):
     """
     Demonstrates using Clock class.
     """
-    # Create clock with 10ns period
-    clock = Clock(dut.clk, 10, units="ns")
-    
+    # Create clock with 10ns period; impl="gpi" toggles it in C
+    clock = Clock(dut.clk, 10, unit="ns", impl="gpi")
+
     # Start clock
-    cocotb.start_soon(clock.start())
-    
+    clock.start()
+
     # Wait for a few clock cycles
     for i in range(5):
         await RisingEdge(dut.clk)
         print(f"Clock cycle {i+1}")
-    
+
     # Clock continues running in background
 
 
-@cocotb.test()
+@cocotb.test(skip=VERILOG_CLOCK)
 async def test_multiple_clocks(dut):
     """
     Demonstrates multiple clock domains.
@@ -46,12 +71,12 @@ async def test_multiple_clocks(dut):
     In practice, you'd have multiple clock signals.
     """
     # Create clocks with different periods
-    clock_fast = Clock(dut.clk, 5, units="ns")
-    clock_slow = Clock(dut.clk, 20, units="ns")
-    
+    clock_fast = Clock(dut.clk, 5, unit="ns")
+    clock_slow = Clock(dut.clk, 20, unit="ns")
+
     # Start fast clock
-    cocotb.start_soon(clock_fast.start())
-    
+    clock_fast.start()
+
     # Count fast clock cycles
     for i in range(10):
         await RisingEdge(dut.clk)
@@ -62,93 +87,131 @@ async def test_multiple_clocks(dut):
 @cocotb.test()
 async def test_clock_gating(dut):
     """
-    Demonstrates clock gating pattern.
-    """
-    clock = Clock(dut.clk, 10, units="ns")
-    cocotb.start_soon(clock.start())
-    
-    clock_enable = True
-    
-    # Simulate clock gating
-    async def gated_clock():
-        while True:
-            await RisingEdge(dut.clk)
-            if not clock_enable:
-                print("Clock gated")
-                await Timer(50, units="ns")  # Hold for gated period
-    
-    cocotb.start_soon(gated_clock())
-    
-    # Enable/disable clock
-    await RisingEdge(dut.clk)
-    clock_enable = False
-    await Timer(30, units="ns")
-    clock_enable = True
-    await RisingEdge(dut.clk)
+    Demonstrates clock gating with the clock_gate shim.
 
+    The gate samples clk_en on the falling edge, so gated_clk only
+    pulses on core clock periods where clk_en was high.
+    """
+    clock = ClockDriver(dut.clk, PERIOD_NS, SOURCE).start()
+    dut.clk_en.value = 1
+    await align(dut)
 
-@cocotb.test()
+    # Enable/disable clock; clk_en takes effect after the next falling edge
+    enabled = await count_edges(dut, dut.gated_cycles, 10)
+    dut.clk_en.value = 0
+    await Timer(PERIOD_NS, unit="ns")
+    gated = await count_edges(dut, dut.gated_cycles, 5)
+    dut.clk_en.value = 1
+    await Timer(PERIOD_NS, unit="ns")
+    resumed = await count_edges(dut, dut.gated_cycles, 10)
+    print(f"Gated clock edges: enabled {enabled}, gated {gated}, resumed {resumed}")
+    assert enabled == 10, f"Gated clock should follow core clock, got {enabled} edges"
+    assert gated == 0, f"Gated clock should stop when clk_en is low, got {gated} edges"
+    assert resumed == 10, f"Gated clock should resume, got {resumed} edges"
+    clock.stop()
+
+
+@cocotb.test(skip=VERILOG_CLOCK)
 async def test_clock_stopping(dut):
     """
     Demonstrates stopping a clock.
-    
-    In cocotb, Clock objects run as coroutines. To stop a clock, you can:
-    1. Use a flag-based approach with a custom clock generator
-    2. Use the coroutine handle's kill() method (if supported)
-    3. Let the test complete naturally (clock stops when test ends)
-    
-    This example demonstrates the pattern for controlled clock stopping.
-    """
-    clock = Clock(dut.clk, 10, units="ns")
-    clock_handle = cocotb.start_soon(clock.start())
-    
+
+    Clock.stop() halts the driver; the signal keeps its last value and
+    the core edge counter stops advancing.
+    """
+    clock = Clock(dut.clk, 10, unit="ns", impl="gpi")
+    clock.start()
+
     # Run for a few cycles
     for i in range(5):
         await RisingEdge(dut.clk)
         print(f"Clock cycle {i+1}")
-    
-    # Note: In cocotb, Clock objects run until the test completes.
-    # For explicit clock control, use a custom clock generator with a stop flag:
-    # 
-    # stop_clock = False
-    # async def controlled_clock():
-    #     while not stop_clock:
-    #         dut.clk.value = 1
-    #         await Timer(period_ns // 2, units="ns")
-    #         dut.clk.value = 0
-    #         await Timer(period_ns // 2, units="ns")
-    # 
-    # Then set stop_clock = True when you want to stop
-    
-    print("Clock continues running until test completes")
+
+    clock.stop()
+    await Timer(10, unit="ns")
+    stopped_at = int(dut.core_cycles.value)
+    await Timer(100, unit="ns")
+    assert int(dut.core_cycles.value) == stopped_at, "Clock should not toggle after stop()"
+    print(f"Clock stopped after {stopped_at} core cycles")
 
 
 @cocotb.test()
 async def test_clock_division(dut):
     """
-    Demonstrates clock division pattern.
-    """
-    clock = Clock(dut.clk, 10, units="ns")
-    cocotb.start_soon(clock.start())
-    
-    divided_clock = 0
-    divide_by = 2
-    
-    # Create divided clock
-    async def clock_divider():
-        nonlocal divided_clock
-        count = 0
-        while True:
-            await RisingEdge(dut.clk)
-            count += 1
-            if count >= divide_by:
-                divided_clock = 1 - divided_clock
-                count = 0
-                print(f"Divided clock: {divided_clock}")
-    
-    cocotb.start_soon(clock_divider())
-    
-    # Run for several cycles
-    for i in range(10):
-        await RisingEdge(dut.clk)
+    Demonstrates clock division with the clock_divider shim.
+    """
+    clock = ClockDriver(dut.clk, PERIOD_NS, SOURCE).start()
+    await apply_reset(dut.rst_n, cycles=2, period_ns=PERIOD_NS)
+    await align(dut)
+
+    # Run for several divided periods
+    core = int(dut.core_cycles.value)
+    divided = await count_edges(dut, dut.div_cycles, 8 * DIVIDE)
+    core = int(dut.core_cycles.value) - core
+    print(f"Divided clock: {divided} edges in {core} core cycles (/{DIVIDE})")
+    assert divided == core // DIVIDE, \
+        f"Expected {core // DIVIDE} divided edges, got {divided}"
+    clock.stop()
+
+
+@cocotb.test(skip=VERILOG_CLOCK)
+async def test_irregular_clock(dut):
+    """
+    Demonstrates a Python clock for an irregular waveform.
+
+    A burst of fast cycles followed by a long pause cannot be expressed
+    with Clock, so it stays in Python.
+    """
+    pattern = [(2, 2)] * 4 + [(5, 45)]
+    dut.clk.value = 0
+    await Timer(PERIOD_NS, unit="ns")
+    before = int(dut.core_cycles.value)
+    await irregular_clock(dut.clk, pattern, repeat=False)
+    edges = int(dut.core_cycles.value) - before
+    print(f"Irregular clock: {edges} edges in {sum(h + l for h, l in pattern)} ns")
+    assert edges == len(pattern), f"Expected {len(pattern)} edges, got {edges}"
+
 
+async def run_benchmark(dut, source):
+    """Simulated core cycles per wall-clock second for one clock source."""
+    clock = ClockDriver(dut.clk, PERIOD_NS, source).start()
+    await align(dut)
+    start = time.perf_counter()
+    cycles = await count_edges(dut, dut.core_cycles, BENCH_CYCLES)
+    elapsed = time.perf_counter() - start
+    clock.stop()
+    assert cycles == BENCH_CYCLES, f"{source}: expected {BENCH_CYCLES} cycles, got {cycles}"
+    return cycles / elapsed
+
+
+@cocotb.test(skip=VERILOG_CLOCK)
+async def test_clock_benchmark(dut):
+    """
+    Compares simulated cycles per wall second for Python-side clocks.
+
+    Build with CLOCK_SOURCE=verilog for the clock_gen figure.
+    """
+    dut.clk_en.value = 1
+    await apply_reset(dut.rst_n, cycles=2, period_ns=PERIOD_NS)
+    rates = {}
+    for source in ("python", "py", "gpi"):
+        rates[source] = await run_benchmark(dut, source)
+    for source, rate in rates.items():
+        print(f"{source:>8}: {rate:12,.0f} cycles/s ({rate / rates['python']:.1f}x)")
+
+
+@cocotb.test(skip=not VERILOG_CLOCK)
+async def test_verilog_clock(dut):
+    """
+    Demonstrates a clock generated by clock_gen inside the toplevel.
+
+    No Python runs on clock edges; the test only measures the period
+    and the cycle rate.
+    """
+    period = await measure_period(dut.core_clk)
+    print(f"clock_gen period: {period} ns")
+    assert period == PERIOD_NS, f"Expected {PERIOD_NS} ns period, got {period}"
+    dut.clk_en.value = 1
+    await apply_reset(dut.rst_n, cycles=2, period_ns=PERIOD_NS)
+    rate = await run_benchmark(dut, "verilog")
+    print(f" verilog: {rate:12,.0f} cycles/s")
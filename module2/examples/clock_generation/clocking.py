@@ -0,0 +1,143 @@
+"""
+Module 2: Clocking Helpers
+Clock and reset helpers that keep free-running clocks out of Python.
+
+A coroutine that writes dut.clk and awaits two Timers per period crosses
+from the simulator into Python on every edge. ClockDriver prefers clocks
+that toggle without Python: cocotb's C-level GPI Clock, or a Verilog
+clock_gen inside the toplevel (CLOCK_SOURCE=verilog in the Makefile).
+Divided and gated clocks come from the clock_divider and clock_gate
+shims in dut/clocking/. Python-side clocks are kept for irregular
+waveforms only (irregular_clock).
+"""
+
+import os
+
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import Timer, RisingEdge
+from cocotb.utils import get_sim_time
+
+
+CLOCK_SOURCES = ("gpi", "py", "python", "verilog")
+
+
+def clock_source(default="gpi"):
+    """Clock source selected by the CLOCK_SOURCE make variable."""
+    source = os.environ.get("CLOCK_SOURCE", default)
+    if source not in CLOCK_SOURCES:
+        raise ValueError(f"CLOCK_SOURCE must be one of {', '.join(CLOCK_SOURCES)}, got {source!r}")
+    return source
+
+
+def clock_period_ns(default=10):
+    """Clock period selected by the CLK_PERIOD_NS make variable."""
+    return int(os.environ.get("CLK_PERIOD_NS", default))
+
+
+async def toggle_clock(signal, period_ns=10):
+    """
+    Clock toggled from Python, two wake-ups per period.
+
+    Kept as the baseline for benchmarks; use ClockDriver for real clocks.
+    """
+    half = Timer(period_ns // 2, unit="ns")
+    while True:
+        signal.value = 1
+        await half
+        signal.value = 0
+        await half
+
+
+async def irregular_clock(signal, pattern, repeat=True):
+    """
+    Drive a clock with non-uniform high/low times from Python.
+
+    pattern is a sequence of (high_ns, low_ns) pairs, e.g. a burst of
+    fast cycles followed by a long pause. Timers are built once per
+    distinct duration. With repeat=False the pattern is played once and
+    the signal is left low.
+    """
+    timers = {}
+    steps = []
+    for high_ns, low_ns in pattern:
+        if high_ns <= 0 or low_ns <= 0:
+            raise ValueError(f"Clock phases must be positive, got ({high_ns}, {low_ns})")
+        for ns in (high_ns, low_ns):
+            if ns not in timers:
+                timers[ns] = Timer(ns, unit="ns")
+        steps.append((timers[high_ns], timers[low_ns]))
+    while True:
+        for high, low in steps:
+            signal.value = 1
+            await high
+            signal.value = 0
+            await low
+        if not repeat:
+            return
+
+
+class ClockDriver:
+    """
+    Free-running 50% duty clock from the selected source.
+
+    source:
+    - "gpi": cocotb Clock implemented in C; no Python per edge (default)
+    - "py": cocotb Clock implemented as a Python task
+    - "python": toggle_clock() task, the per-edge baseline
+    - "verilog": nothing to start; the toplevel's clock_gen drives the clock
+
+    start() and stop() may be called repeatedly.
+    """
+
+    def __init__(self, signal, period_ns=10, source="gpi"):
+        if source not in CLOCK_SOURCES:
+            raise ValueError(f"Unknown clock source {source!r}")
+        self.signal = signal
+        self.period_ns = period_ns
+        self.source = source
+        self._clock = None
+        self._task = None
+
+    @property
+    def running(self):
+        return self._clock is not None or self._task is not None
+
+    def start(self, start_high=True):
+        if self.running or self.source == "verilog":
+            return self
+        if self.source == "python":
+            self._task = cocotb.start_soon(toggle_clock(self.signal, self.period_ns))
+        else:
+            self._clock = Clock(self.signal, self.period_ns, unit="ns", impl=self.source)
+            self._clock.start(start_high=start_high)
+        return self
+
+    def stop(self):
+        if self._clock is not None:
+            self._clock.stop()
+            self._clock = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+async def measure_period(clk):
+    """Period of clk in ns, measured between two rising edges."""
+    edge = RisingEdge(clk)
+    await edge
+    start = get_sim_time("ns")
+    await edge
+    return get_sim_time("ns") - start
+
+
+async def apply_reset(rst_n, cycles=2, period_ns=10):
+    """
+    Hold active-low rst_n for a number of clock periods.
+
+    Waits with one Timer instead of counting edges, so it costs a single
+    wake-up regardless of length.
+    """
+    rst_n.value = 0
+    await Timer(cycles * period_ns, unit="ns")
+    rst_n.value = 1
@@ -0,0 +1,103 @@
+"""
+Module 2: Reset Checkpoints
+Capture the DUT state after reset/bring-up once and restore it for later seeds.
+
+A multi-seed run normally repeats the same reset and configuration
+sequence before every seed. Checkpoint.capture() records the value of
+every logic signal under the toplevel, together with the testbench
+configuration that produced it, and restore() deposits those values back
+so a later seed can go straight to its main stimulus. save()/load() keep
+the checkpoint in a JSON file, so separate simulator runs can share it.
+
+Restoring works on signal values through the normal handle interface:
+registers must be writable from Python (Verilator builds made by the
+cocotb makefiles are), and the restore should happen away from an active
+clock edge. Memories and non-logic objects are not captured.
+"""
+
+import fnmatch
+import json
+import os
+
+from cocotb.handle import HierarchyObject, LogicArrayObject, LogicObject
+from cocotb.triggers import Timer
+from cocotb.types import Logic, LogicArray
+from cocotb.utils import get_sim_time
+
+
+def _signals(root, exclude=()):
+    """{path: handle} for every logic signal under root not matching exclude."""
+    found = {}
+
+    def walk(scope):
+        for child in scope:
+            if isinstance(child, HierarchyObject):
+                walk(child)
+            elif isinstance(child, (LogicObject, LogicArrayObject)):
+                if not any(fnmatch.fnmatchcase(child._path, p) for p in exclude):
+                    found[child._path] = child
+
+    walk(root)
+    return found
+
+
+class Checkpoint:
+    """
+    DUT signal values plus testbench configuration at one point of a run.
+
+    config is any JSON-serialisable dict; compatible() compares it with
+    the configuration a new run wants, so a stale checkpoint is never
+    restored. cost_ns and cost_s record the simulated and wall-clock time
+    the checkpointed sequence took, i.e. what a restore saves.
+    """
+
+    def __init__(self, state, config, cost_ns=0, cost_s=0.0, exclude=()):
+        self.state = state
+        self.config = config
+        self.cost_ns = cost_ns
+        self.cost_s = cost_s
+        self.exclude = list(exclude)
+
+    @classmethod
+    def capture(cls, root, config=None, exclude=(), cost_ns=0, cost_s=0.0):
+        """Record the current value of every signal under root."""
+        state = {path: str(handle.value) for path, handle in _signals(root, exclude).items()}
+        return cls(state, dict(config or {}), cost_ns, cost_s, exclude)
+
+    def compatible(self, config):
+        return self.config == config
+
+    async def restore(self, root, settle_ns=1):
+        """
+        Deposit the captured values and let them settle for settle_ns.
+
+        Returns the simulated time the restore took.
+        """
+        start = get_sim_time("ns")
+        handles = _signals(root, self.exclude)
+        missing = set(self.state) - set(handles)
+        if missing:
+            raise ValueError(f"Checkpoint signals not in design: {sorted(missing)}")
+        for path, value in self.state.items():
+            handle = handles[path]
+            if isinstance(handle, LogicArrayObject):
+                handle.value = LogicArray(value)
+            else:
+                handle.value = Logic(value)
+        await Timer(settle_ns, unit="ns")
+        return get_sim_time("ns") - start
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump({"config": self.config, "state": self.state, "exclude": self.exclude,
+                       "cost_ns": self.cost_ns, "cost_s": self.cost_s}, f, indent=1)
+
+    @classmethod
+    def load(cls, path):
+        """Checkpoint saved at path, or None if there is no such file."""
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["state"], data["config"], data["cost_ns"], data["cost_s"],
+                   data["exclude"])
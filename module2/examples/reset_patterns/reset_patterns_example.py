@@ -1,11 +1,31 @@
 """
 Module 2 Example 2.5: Reset Patterns
 Demonstrates reset sequence implementation.
+
+test_checkpoint_seeds runs several seeds from one post-reset checkpoint
+(checkpoint.py): the reset/bring-up sequence runs once, its end state is
+captured, and later seeds restore it and start directly with their main
+stimulus.
 """
 
+import os
+import random
+import time
+
 import cocotb
 from cocotb.clock import Clock
-from cocotb.triggers import Timer, RisingEdge, FallingEdge
+from cocotb.triggers import ClockCycles, Timer, RisingEdge, FallingEdge
+from cocotb.utils import get_sim_time
+
+from checkpoint import Checkpoint
+
+
+CLK_PERIOD_NS = 10
+CONFIG_VALUE = 0x5A  # Loaded into the register by bring_up()
+SEEDS = [int(s) for s in os.environ.get("SEEDS", "1 2 3 4").split()]
+BRINGUP_CYCLES = int(os.environ.get("BRINGUP_CYCLES", "2000"))
+MAIN_CYCLES = int(os.environ.get("MAIN_CYCLES", "200"))
+CHECKPOINT = os.environ.get("CHECKPOINT", "")
 
 
 async def async_reset(dut, duration_ns=100, propagation_delay_ns=10):
@@ -178,3 +198,104 @@ async def test_reset_initialization(dut):
     assert dut.q.value.integer == 0x12, "Should accept data after reset"
     print("✓ Initialization after reset verified")
 
+
+async def bring_up(dut, cycles):
+    """
+    Reset and configure sequence checkpointed by test_checkpoint_seeds.
+
+    After the async reset the register is loaded with CONFIG_VALUE and
+    the design idles for `cycles` clocks, standing in for the long
+    post-reset initialisation (PLL lock, memory init, register
+    programming) of a larger design.
+    """
+    dut.enable.value = 0
+    dut.d.value = 0
+    await async_reset(dut, duration_ns=50)
+    await FallingEdge(dut.clk)
+    dut.d.value = CONFIG_VALUE
+    dut.enable.value = 1
+    await FallingEdge(dut.clk)
+    dut.enable.value = 0
+    await ClockCycles(dut.clk, cycles)
+
+
+async def main_stimulus(dut, seed, cycles):
+    """
+    Random register writes starting from the bring-up state.
+
+    Returns the number of cycles where q did not match the model.
+    """
+    rng = random.Random(seed)
+    expected = CONFIG_VALUE
+    errors = 0
+    for _ in range(cycles):
+        await FallingEdge(dut.clk)
+        if int(dut.q.value) != expected:
+            errors += 1
+        enable = rng.getrandbits(1)
+        d = rng.getrandbits(8)
+        dut.enable.value = enable
+        dut.d.value = d
+        if enable:
+            expected = d
+    return errors
+
+
+@cocotb.test()
+async def test_checkpoint_seeds(dut):
+    """
+    Runs several seeds from one post-reset checkpoint.
+
+    The first seed runs the full bring_up() and captures the DUT state
+    and configuration at its end; the remaining seeds restore that state
+    instead. With CHECKPOINT set, the checkpoint is also saved to that
+    file and later runs with the same configuration restore it for every
+    seed.
+    """
+    clock = Clock(dut.clk, CLK_PERIOD_NS, unit="ns", impl="gpi")
+    clock.start()
+    config = {"toplevel": dut._name, "clock_period_ns": CLK_PERIOD_NS,
+              "bringup_cycles": BRINGUP_CYCLES, "config_value": CONFIG_VALUE}
+
+    checkpoint = Checkpoint.load(CHECKPOINT) if CHECKPOINT else None
+    if checkpoint is not None and not checkpoint.compatible(config):
+        print(f"Ignoring {CHECKPOINT}: saved for {checkpoint.config}")
+        checkpoint = None
+
+    results = []
+    for seed in SEEDS:
+        await FallingEdge(dut.clk)
+        sim_start = get_sim_time("ns")
+        wall = time.perf_counter()
+        if checkpoint is None:
+            await bring_up(dut, BRINGUP_CYCLES)
+            await FallingEdge(dut.clk)
+            checkpoint = Checkpoint.capture(dut, config, exclude=[dut.clk._path],
+                                            cost_ns=get_sim_time("ns") - sim_start,
+                                            cost_s=time.perf_counter() - wall)
+            if CHECKPOINT:
+                checkpoint.save(CHECKPOINT)
+            source = "reset"
+        else:
+            await checkpoint.restore(dut)
+            source = "restored"
+        setup_ns = get_sim_time("ns") - sim_start
+        setup_s = time.perf_counter() - wall
+
+        errors = await main_stimulus(dut, seed, MAIN_CYCLES)
+        assert errors == 0, f"Seed {seed} ({source}): {errors} mismatches after setup"
+        results.append((seed, source, setup_ns, setup_s))
+
+    print(f"Checkpoint: {len(checkpoint.state)} signals, bring-up "
+          f"{checkpoint.cost_ns} ns sim / {checkpoint.cost_s * 1000:.1f} ms wall")
+    print(f"{'seed':>6} {'setup':>9} {'sim ns':>8} {'wall ms':>8} {'saved ns':>9} {'saved ms':>9}")
+    saved_ns = saved_s = 0
+    for seed, source, setup_ns, setup_s in results:
+        seed_ns = checkpoint.cost_ns - setup_ns if source == "restored" else 0
+        seed_s = checkpoint.cost_s - setup_s if source == "restored" else 0.0
+        saved_ns += seed_ns
+        saved_s += seed_s
+        print(f"{seed:>6} {source:>9} {setup_ns:>8} {setup_s * 1000:>8.1f} "
+              f"{seed_ns:>9} {seed_s * 1000:>9.1f}")
+    print(f"Saved {saved_ns} ns sim / {saved_s * 1000:.1f} ms wall over {len(results)} seeds")
+    clock.stop()
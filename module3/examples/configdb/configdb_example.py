@@ -1,12 +1,22 @@
 """
 Module 3 Example 3.4: UVM ConfigDB
 Demonstrates UVM configuration database usage.
+
+The scale tests build 2,000 components against ~1,000 config entries
+twice: with pyuvm's ConfigDB, which matches every stored path on each
+get(), and with indexed_configdb.IndexedConfigDB (segment trie plus
+per-(path, field) cache), and compare build times and results.
 """
 
+import math
+import time
+
 import cocotb
 from cocotb.triggers import Timer
 from pyuvm import *
 
+from indexed_configdb import install
+
 
 class AgentConfig(uvm_object):
     """
@@ -174,6 +184,139 @@ class ConfigDBHierarchyTest(uvm_test):
         self.drop_objection()
 
 
+# Wall time spent in ConfigDB().get() during a scale build
+lookup_s = 0.0
+
+
+def timed_get(context, inst_name, field_name, default):
+    global lookup_s
+    start = time.perf_counter()
+    value = ConfigDB().get(context, inst_name, field_name, default)
+    lookup_s += time.perf_counter() - start
+    return value
+
+
+class ScaleLeaf(uvm_component):
+    """Leaf doing the build-time lookups of a driver or monitor."""
+
+    def build_phase(self):
+        self.is_active = timed_get(self, "", "is_active", True)
+        self.data_width = timed_get(self, "", "data_width", 32)
+        self.mode = timed_get(self, "", "mode", "normal")
+        # Field name built at runtime, as CompleteAgent does for ".active"
+        self.vif = timed_get(None, "", f"{self.get_full_name()}.vif", None)
+
+
+class ScaleAgent(uvm_component):
+    """Agent with four leaves."""
+
+    LEAVES = ("driver", "monitor", "sequencer", "coverage")
+
+    def build_phase(self):
+        self.is_active = timed_get(self, "", "is_active", True)
+        self.leaves = [ScaleLeaf.create(name, self) for name in self.LEAVES]
+
+
+class ScaleEnv(uvm_env):
+    """Environment with num_agents (ConfigDB) agents."""
+
+    def build_phase(self):
+        agents = ConfigDB().get(self, "", "num_agents")
+        self.agents = [ScaleAgent.create(f"agent{i}", self) for i in range(agents)]
+
+
+# Lookup time and results per ConfigDB implementation
+SCALE_RESULTS = {}
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+class ConfigDBScaleTest(uvm_test):
+    """
+    Build-phase cost of ConfigDB lookups in a large environment.
+
+    AGENTS agents of five components each. Per agent the test stores a
+    glob entry (data_width), a literal monitor entry (mode), a runtime
+    vif key and, for every fourth agent, is_active=False.
+    """
+
+    AGENTS = 400
+    INDEXED = False
+
+    def build_phase(self):
+        global lookup_s
+        lookup_s = 0.0
+        self.start = time.perf_counter()
+        self.errors = 0
+        self.db = install() if self.INDEXED else ConfigDB()
+        cdb = ConfigDB()
+        cdb.set(self, "env", "num_agents", self.AGENTS)
+        cdb.set(self, "*", "is_active", True)
+        for i in range(self.AGENTS):
+            cdb.set(self, f"env.agent{i}.*", "data_width", 8 << (i % 4))
+            cdb.set(self, f"env.agent{i}.monitor", "mode", "passive" if i % 2 else "checking")
+            if i % 4 == 0:
+                cdb.set(self, f"env.agent{i}", "is_active", False)
+            cdb.set(None, "", f"uvm_test_top.env.agent{i}.driver.vif", f"bus{i}")
+        self.env = ScaleEnv.create("env", self)
+
+    def connect_phase(self):
+        # Connect is bottom-up, so every build_phase has run
+        self.build_s = time.perf_counter() - self.start
+        self.lookup_s = lookup_s
+        agents = self.env.agents
+        leaves = [leaf for agent in agents for leaf in agent.leaves]
+        self.summary = {
+            "active_agents": sum(agent.is_active for agent in agents),
+            "active_leaves": sum(leaf.is_active for leaf in leaves),
+            "data_width": sum(leaf.data_width for leaf in leaves),
+            "passive": sum(leaf.mode == "passive" for leaf in leaves),
+            "vifs": sum(leaf.vif is not None for leaf in leaves),
+        }
+        SCALE_RESULTS["indexed" if self.INDEXED else "plain"] = (self.lookup_s, self.summary)
+
+    def expect(self, what, got, expected):
+        if got != expected:
+            self.errors += 1
+            self.logger.error(f"{what}: got {got}, expected {expected}")
+
+    def check_phase(self):
+        n = self.AGENTS
+        leaves = n * len(ScaleAgent.LEAVES)
+        expected = {
+            "active_agents": n - math.ceil(n / 4),
+            "active_leaves": leaves,
+            "data_width": len(ScaleAgent.LEAVES) * sum(8 << (i % 4) for i in range(n)),
+            "passive": n // 2,
+            "vifs": n,
+        }
+        for key, value in expected.items():
+            self.expect(key, self.summary[key], value)
+        if "plain" in SCALE_RESULTS and self.INDEXED:
+            self.expect("indexed vs plain results", self.summary, SCALE_RESULTS["plain"][1])
+
+    def report_phase(self):
+        kind = "IndexedConfigDB" if self.INDEXED else "ConfigDB"
+        components = self.AGENTS * (1 + len(ScaleAgent.LEAVES))
+        self.logger.info("=" * 60)
+        self.logger.info(f"{kind}: {components} components built in {self.build_s:.3f} s, "
+                         f"{self.lookup_s:.3f} s of it in ConfigDB().get()")
+        if self.INDEXED:
+            self.logger.info(f"  {self.db.report()}")
+            if "plain" in SCALE_RESULTS:
+                plain_s = SCALE_RESULTS["plain"][0]
+                self.logger.info(f"  get() time: ConfigDB {plain_s:.3f} s -> IndexedConfigDB "
+                                 f"{self.lookup_s:.3f} s ({plain_s / self.lookup_s:.1f}x)")
+        if self.errors:
+            self.logger.error(f"ConfigDB scale test FAILED with {self.errors} errors")
+        self.logger.info("=" * 60)
+
+
+class IndexedConfigDBScaleTest(ConfigDBScaleTest):
+    """ConfigDBScaleTest with IndexedConfigDB installed."""
+
+    INDEXED = True
+
+
 # Cocotb test functions to run the pyuvm tests
 @cocotb.test()
 async def test_configdb(dut):
@@ -195,6 +338,22 @@ async def test_configdb_hierarchy(dut):
     # Use uvm_root to run the test properly (executes all phases in hierarchy)
     await uvm_root().run_test("ConfigDBHierarchyTest")
 
+@cocotb.test()
+async def test_configdb_scale(dut):
+    """Cocotb test wrapper for ConfigDBScaleTest."""
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["ConfigDBScaleTest"] = ConfigDBScaleTest
+    await uvm_root().run_test("ConfigDBScaleTest")
+
+@cocotb.test()
+async def test_configdb_scale_indexed(dut):
+    """Cocotb test wrapper for IndexedConfigDBScaleTest."""
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["IndexedConfigDBScaleTest"] = IndexedConfigDBScaleTest
+    await uvm_root().run_test("IndexedConfigDBScaleTest")
+
 if __name__ == "__main__":
     print("This is a pyuvm ConfigDB example.")
     print("To run with cocotb, use the Makefile in the test directory.")
@@ -0,0 +1,192 @@
+"""
+Module 3: Indexed ConfigDB
+A drop-in ConfigDB that does not scan every stored path on each get().
+
+pyuvm's ConfigDB.get() runs fnmatch against every path ever set, then
+insertion-sorts the matches by specificity. With thousands of components
+each doing a few gets against thousands of entries, the build phase is
+quadratic. IndexedConfigDB keeps the same storage and the same answers,
+and adds:
+
+- A trie keyed by path segment. Literal leading segments of a stored
+  path ("env.agent0" in "env.agent0.*") are trie edges; the rest of a
+  glob is compiled once and kept on the node where its literal prefix
+  ends. A get() walks the trie along its own path and only tests the
+  globs it passes, so the candidates are the matching paths, not all
+  paths.
+- A (path, field) result cache. Each field has a generation counter
+  bumped by set(), plus one counter for the set of stored paths; a
+  cached result is used only while both are unchanged.
+- Lookup statistics (stats(), report()).
+
+install() makes ConfigDB() return an IndexedConfigDB. run_test() clears
+pyuvm's singletons, so call it at the start of the test's build_phase.
+"""
+
+import fnmatch
+import re
+
+from pyuvm import ConfigDB, Singleton, UVMError
+
+
+_GLOB_CHARS = frozenset("*?[")
+_MISSING = object()
+
+
+class _Node:
+    """Trie node: literal child segments, a literal path ending here, globs rooted here."""
+
+    __slots__ = ("children", "exact", "globs")
+
+    def __init__(self):
+        self.children = {}
+        self.exact = None
+        self.globs = []  # (compiled match, stored path)
+
+
+class IndexedConfigDB(ConfigDB):
+    """
+    ConfigDB with a segment trie over stored paths and a per-(path, field)
+    result cache. Results, precedence and tracing match ConfigDB.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._reset_index()
+
+    def _reset_index(self):
+        self._root = _Node()
+        self._order = {}  # stored path -> insertion index (ConfigDB dict order)
+        self._paths_gen = 0
+        self._field_gen = {}
+        self._cache = {}
+        self.lookups = 0
+        self.hits = 0
+        self.resolves = 0
+        self.candidates = 0
+        self.sets = 0
+
+    def clear(self):
+        super().clear()
+        self._reset_index()
+
+    def _index(self, path):
+        """Add a newly stored path to the trie."""
+        self._order[path] = len(self._order)
+        self._paths_gen += 1
+        node = self._root
+        for segment in path.split("."):
+            if not _GLOB_CHARS.isdisjoint(segment):
+                node.globs.append((re.compile(fnmatch.translate(path)).match, path))
+                return
+            node = node.children.setdefault(segment, _Node())
+        node.exact = path
+
+    def _matching_paths(self, inst_name):
+        """Stored paths matching inst_name, in ConfigDB dict order."""
+        matches = []
+        node = self._root
+        for segment in inst_name.split("."):
+            matches.extend(path for match, path in node.globs if match(inst_name))
+            node = node.children.get(segment)
+            if node is None:
+                break
+        else:
+            matches.extend(path for match, path in node.globs if match(inst_name))
+            if node.exact is not None:
+                matches.append(node.exact)
+        matches.sort(key=self._order.__getitem__)
+        return matches
+
+    @staticmethod
+    def _most_specific_first(key_matches):
+        """ConfigDB.get()'s insertion sort: A.B.C before A.B.* before A.* before *."""
+        sorted_paths = [key_matches.pop()]
+        for path in key_matches:
+            for ii in range(len(sorted_paths)):
+                if fnmatch.fnmatch(path, sorted_paths[ii]):
+                    sorted_paths.insert(ii, path)
+                    break
+            else:
+                sorted_paths.append(path)
+        return sorted_paths
+
+    def _resolve(self, inst_name, field_name):
+        """(value or _MISSING, not-found message) for a full instance path."""
+        self.resolves += 1
+        matches = self._matching_paths(inst_name)
+        self.candidates += len(matches)
+        if not matches:
+            return _MISSING, f'"{inst_name}" is not in ConfigDB().'
+        for path in self._most_specific_first(matches):
+            fields = self._path_dict[path].get(field_name)
+            if fields:
+                return fields[max(fields)], None
+        return _MISSING, f'"Component {inst_name} has no key: {field_name}"'
+
+    def set(self, context, inst_name, field_name, value):
+        super().set(context, inst_name, field_name, value)
+        self.sets += 1
+        _, path = self._get_context_inst_name(context, inst_name)
+        if path not in self._order:
+            self._index(path)
+        self._field_gen[field_name] = self._field_gen.get(field_name, 0) + 1
+
+    def get(self, context, inst_name, field_name, default=ConfigDB.default_get):
+        if not set(inst_name).issubset(self.legal_chars):
+            raise UVMError(
+                f'"{inst_name}" is illegal: inst_name wildcards only allowed when storing.')
+        context, inst_name = self._get_context_inst_name(context, inst_name)
+        self.lookups += 1
+
+        key = (inst_name, field_name)
+        field_gen = self._field_gen.get(field_name, 0)
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] == self._paths_gen and entry[1] == field_gen:
+            self.hits += 1
+            value, message = entry[2], entry[3]
+        else:
+            value, message = self._resolve(inst_name, field_name)
+            self._cache[key] = (self._paths_gen, field_gen, value, message)
+
+        if value is _MISSING:
+            return self._not_found(message, default)
+        self.trace("GET", context, inst_name, field_name, value)
+        return value
+
+    def stats(self):
+        """Lookup counters since the last clear()."""
+        return {
+            "lookups": self.lookups,
+            "cache_hits": self.hits,
+            "resolves": self.resolves,
+            "avg_candidates": self.candidates / self.resolves if self.resolves else 0.0,
+            "sets": self.sets,
+            "paths": len(self._order),
+            "cached": len(self._cache),
+        }
+
+    def report(self):
+        s = self.stats()
+        hit_pct = 100 * s["cache_hits"] / s["lookups"] if s["lookups"] else 0.0
+        return (f"{s['lookups']} gets ({hit_pct:.1f}% cached), {s['resolves']} resolved "
+                f"with {s['avg_candidates']:.1f} candidate paths each, "
+                f"{s['sets']} sets on {s['paths']} paths")
+
+
+def install():
+    """
+    Make ConfigDB() return the IndexedConfigDB singleton.
+
+    Entries already stored in a plain ConfigDB are carried over.
+    """
+    db = IndexedConfigDB()
+    current = Singleton._instances.get(ConfigDB)
+    if current is not None and current is not db:
+        for path, fields in current._path_dict.items():
+            db._path_dict[path] = fields
+            db._index(path)
+        db.is_tracing = current.is_tracing
+    Singleton._instances[ConfigDB] = db
+    return db
+
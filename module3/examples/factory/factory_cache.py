@@ -0,0 +1,185 @@
+"""
+Module 3: Caching Factory
+A drop-in uvm_factory that memoizes override resolution.
+
+Every create() goes through uvm_factory(): it builds the instance path,
+then FactoryData.find_override() walks the override chain, testing each
+instance override with fnmatch. Nothing is remembered, so a sequence
+creating a million items resolves the same chain a million times.
+CachingFactory keeps pyuvm's override storage and results, and adds:
+
+- A fast path: while no override is registered, create returns
+  requested_type(name) directly.
+- A per-type cache for chains without instance overrides; the result
+  does not depend on the path, so items named txn_0, txn_1, ... share
+  one entry.
+- A per-(type, instance path) cache for chains that have instance
+  overrides.
+- Invalidation: every set_*_override and clear_* call drops both caches.
+
+install() makes uvm_factory() return a CachingFactory; run_test() keeps
+the factory singleton, so it stays installed until uninstall().
+"""
+
+from pyuvm import FactoryData, Singleton, UVMFactoryError, uvm_factory, uvm_void
+
+
+class CachingFactory(uvm_factory):
+    """uvm_factory with memoized override resolution and creation counters."""
+
+    def __init__(self):
+        super().__init__()
+        self._checked = set()
+        self.creates = 0
+        self.fast = 0
+        self.hits = 0
+        self.resolves = 0
+        self.invalidations = 0
+        self._invalidate()
+
+    def _invalidate(self):
+        self._type_cache = {}  # requested type -> final type (no inst overrides on chain)
+        self._path_cache = {}  # (requested type, inst path) -> final type
+        self.invalidations += 1
+
+    def clear_all(self):
+        super().clear_all()
+        self._invalidate()
+
+    def clear_overrides(self):
+        super().clear_overrides()
+        self._invalidate()
+
+    def set_inst_override_by_type(self, original_type, override_type, full_inst_path):
+        super().set_inst_override_by_type(original_type, override_type, full_inst_path)
+        self._invalidate()
+
+    def set_inst_override_by_name(self, original_type_name, override_type_name, full_inst_path):
+        super().set_inst_override_by_name(original_type_name, override_type_name, full_inst_path)
+        self._invalidate()
+
+    def set_type_override_by_type(self, original_type, override_type, replace=True):
+        super().set_type_override_by_type(original_type, override_type, replace)
+        self._invalidate()
+
+    def set_type_override_by_name(self, original_type_name, override_type_name, replace=True):
+        super().set_type_override_by_name(original_type_name, override_type_name, replace)
+        self._invalidate()
+
+    def _path_independent(self, requested_type):
+        """True if no type on requested_type's override chain has instance overrides."""
+        overrides = self.fd.overrides
+        seen = set()
+        current = requested_type
+        while current in overrides:
+            if current in seen:
+                return False  # Loop: let find_override report it every time
+            seen.add(current)
+            override = overrides[current]
+            if override.inst_overrides:
+                return False
+            if override.type_override is None:
+                return True
+            current = override.type_override
+        return True
+
+    @staticmethod
+    def _inst_path(parent_inst_path, name):
+        if parent_inst_path == "":
+            return name
+        if name != "":
+            return parent_inst_path + "." + name
+        return parent_inst_path
+
+    def _find_override(self, requested_type, inst_path):
+        self.resolves += 1
+        new_type = self.fd.find_override(requested_type, inst_path)
+        if isinstance(new_type, str):
+            self.logger.error('"%s" is not declared and is not an override string', new_type)
+            return None
+        return new_type
+
+    def resolve(self, requested_type, parent_inst_path="", name=""):
+        """Final type for requested_type at parent_inst_path.name, or None."""
+        if isinstance(requested_type, str):
+            # A name is not a type: it only resolves through an override,
+            # so it is looked up (and rejected) before the fast path
+            return self._find_override(requested_type, self._inst_path(parent_inst_path, name))
+        if requested_type not in self._checked:
+            assert issubclass(requested_type, uvm_void), (
+                f"You must create uvm_void descendants not {requested_type}")
+            self._checked.add(requested_type)
+        if not self.fd.overrides:
+            self.fast += 1
+            return requested_type
+        new_type = self._type_cache.get(requested_type)
+        if new_type is not None:
+            self.hits += 1
+            return new_type
+
+        inst_path = self._inst_path(parent_inst_path, name)
+        key = (requested_type, inst_path)
+        new_type = self._path_cache.get(key)
+        if new_type is not None:
+            self.hits += 1
+            return new_type
+
+        new_type = self._find_override(requested_type, inst_path)
+        if new_type is None:
+            return None
+        if self._path_independent(requested_type):
+            self._type_cache[requested_type] = new_type
+        else:
+            self._path_cache[key] = new_type
+        return new_type
+
+    def create_object_by_type(self, requested_type, parent_inst_path="", name=""):
+        self.creates += 1
+        new_type = self.resolve(requested_type, parent_inst_path, name)
+        if new_type is None:
+            raise UVMFactoryError(f"{requested_type} not in uvm_factory()")
+        return new_type(name)
+
+    def create_component_by_type(self, requested_type, parent_inst_path="", name="", parent=None):
+        if name is None:
+            raise UVMFactoryError("Parameter name must be specified in function call.")
+        self.creates += 1
+        new_type = self.resolve(requested_type, parent_inst_path, name)
+        if new_type is None:
+            raise UVMFactoryError(f"{requested_type} not in uvm_factory()")
+        return new_type(name, parent)
+
+    def find_override_by_type(self, requested_type, full_inst_path):
+        return self.resolve(requested_type, full_inst_path)
+
+    def report(self):
+        return (f"{self.creates} creates: {self.fast} without overrides, {self.hits} cached, "
+                f"{self.resolves} resolved; {self.invalidations} invalidations")
+
+
+_previous = []
+
+
+def install():
+    """Make uvm_factory() return a CachingFactory sharing the current overrides."""
+    current = Singleton._instances.get(uvm_factory)
+    if isinstance(current, CachingFactory):
+        return current
+    factory = CachingFactory()
+    factory._invalidate()  # Overrides may have changed since a previous install
+    if current is not None:
+        factory.debug_level = current.debug_level
+    _previous.append(current)
+    Singleton._instances[uvm_factory] = factory
+    return factory
+
+
+def uninstall():
+    """Put back the factory that install() replaced."""
+    if not _previous:
+        return
+    previous = _previous.pop()
+    if previous is None:
+        Singleton._instances.pop(uvm_factory, None)
+    else:
+        Singleton._instances[uvm_factory] = previous
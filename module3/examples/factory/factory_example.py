@@ -1,12 +1,21 @@
 """
 Module 3 Example: Factory Pattern
 Demonstrates UVM factory pattern for object creation and overrides.
+
+The benchmark tests measure creates per second for sequence items and a
+1,000-component tree, first with pyuvm's uvm_factory and then with
+factory_cache.CachingFactory, which memoizes override resolution.
 """
 
+import fnmatch
+import time
+
 import cocotb
 from cocotb.triggers import Timer
 from pyuvm import *
 
+from factory_cache import install, uninstall
+
 
 class BaseTransaction(uvm_sequence_item):
     """Base transaction class."""
@@ -141,6 +150,164 @@ class FactoryOverrideTest(uvm_test):
         self.drop_objection()
 
 
+class BenchItem(uvm_sequence_item):
+    """Sequence item created in the benchmark loops."""
+
+    def __init__(self, name="BenchItem"):
+        super().__init__(name)
+        self.data = 0
+
+
+class FastBenchItem(BenchItem):
+    """Type override for BenchItem."""
+
+
+class PlainBenchItem(uvm_sequence_item):
+    """Item type with no override registered."""
+
+
+class BenchDriver(uvm_component):
+    pass
+
+
+class FastBenchDriver(BenchDriver):
+    """Type override for BenchDriver."""
+
+
+class BenchMonitor(uvm_component):
+    pass
+
+
+class AltBenchMonitor(BenchMonitor):
+    """Instance override for monitors of agents agent1*."""
+
+
+class BenchAgent(uvm_component):
+    """Driver, monitor and six other leaves."""
+
+    LEAVES = ("sequencer", "coverage", "checker", "predictor", "adapter", "recorder")
+
+    def build_phase(self):
+        self.driver = BenchDriver.create("driver", self)
+        self.monitor = BenchMonitor.create("monitor", self)
+        self.leaves = [uvm_component.create(name, self) for name in self.LEAVES]
+
+
+class BenchEnv(uvm_env):
+    """Env of num_agents agents (nine components each)."""
+
+    def build_phase(self):
+        agents = ConfigDB().get(self, "", "num_agents")
+        self.agents = [BenchAgent.create(f"agent{i}", self) for i in range(agents)]
+
+
+# Rates per factory implementation
+FACTORY_RESULTS = {}
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+class FactoryBenchTest(uvm_test):
+    """
+    Creates per second through the factory.
+
+    1. Items before any override is registered
+    2. A 1,000-component tree (111 agents x 9 + env) with a type override
+       on the driver and an instance override on agent1* monitors
+    3. Override resolution alone for the tree's 1,000 (type, path) pairs
+    4. Items with a type override, and items of a type without one
+    """
+
+    AGENTS = 111
+    ITEMS = 100_000
+    RESOLVE_PASSES = 20
+    MONITOR_PATH = "uvm_test_top.env.agent1*.monitor"
+    CACHED = False
+
+    def build_phase(self):
+        self.errors = 0
+        self.factory = install() if self.CACHED else uvm_factory()
+        self.rates = {}
+        self.rates["items, no overrides"] = self.item_rate(BenchItem, BenchItem)
+
+        self.factory.set_type_override_by_type(BenchDriver, FastBenchDriver)
+        self.factory.set_inst_override_by_type(BenchMonitor, AltBenchMonitor, self.MONITOR_PATH)
+        self.factory.set_type_override_by_type(BenchItem, FastBenchItem)
+        ConfigDB().set(self, "env", "num_agents", self.AGENTS)
+        self.start = time.perf_counter()
+        self.env = BenchEnv.create("env", self)
+
+    def connect_phase(self):
+        # Connect is bottom-up, so the whole tree has been built
+        elapsed = time.perf_counter() - self.start
+        agents = self.env.agents
+        self.components = 1 + len(agents) * (3 + len(BenchAgent.LEAVES))
+        self.rates["component tree"] = self.components / elapsed
+        self.expect("FastBenchDriver drivers",
+                    sum(type(a.driver) is FastBenchDriver for a in agents), len(agents))
+        alt = sum(fnmatch.fnmatch(f"uvm_test_top.env.agent{i}.monitor", self.MONITOR_PATH)
+                  for i in range(len(agents)))
+        self.expect("AltBenchMonitor monitors",
+                    sum(type(a.monitor) is AltBenchMonitor for a in agents), alt)
+
+    def expect(self, what, got, expected):
+        if got != expected:
+            self.errors += 1
+            self.logger.error(f"{what}: got {got}, expected {expected}")
+
+    def item_rate(self, cls, expected_type):
+        start = time.perf_counter()
+        for _ in range(self.ITEMS):
+            item = cls.create("item")
+        rate = self.ITEMS / (time.perf_counter() - start)
+        self.expect(f"{cls.__name__}.create() type", type(item), expected_type)
+        return rate
+
+    def resolve_rate(self):
+        requests = []
+        for agent in self.env.agents:
+            path = agent.get_full_name()
+            requests.append((BenchAgent, path))
+            requests.append((BenchDriver, f"{path}.driver"))
+            requests.append((BenchMonitor, f"{path}.monitor"))
+            requests.extend((uvm_component, f"{path}.{leaf}") for leaf in BenchAgent.LEAVES)
+        find = self.factory.find_override_by_type
+        start = time.perf_counter()
+        for _ in range(self.RESOLVE_PASSES):
+            for requested_type, path in requests:
+                find(requested_type, path)
+        return len(requests) * self.RESOLVE_PASSES / (time.perf_counter() - start)
+
+    async def run_phase(self):
+        self.raise_objection()
+        self.rates["override resolution"] = self.resolve_rate()
+        self.rates["items, type override"] = self.item_rate(BenchItem, FastBenchItem)
+        self.rates["items, not overridden"] = self.item_rate(PlainBenchItem, PlainBenchItem)
+        FACTORY_RESULTS["cached" if self.CACHED else "plain"] = self.rates
+        await Timer(10, unit="ns")
+        self.drop_objection()
+
+    def report_phase(self):
+        kind = "CachingFactory" if self.CACHED else "uvm_factory"
+        plain = FACTORY_RESULTS.get("plain") if self.CACHED else None
+        self.logger.info("=" * 60)
+        self.logger.info(f"{kind}: creates per second ({self.components} components in the tree)")
+        for what, rate in self.rates.items():
+            speedup = f" ({rate / plain[what]:.1f}x)" if plain else ""
+            self.logger.info(f"  {what:<24}{rate:>12,.0f}/s{speedup}")
+        if self.CACHED:
+            self.logger.info(f"  {self.factory.report()}")
+            uninstall()
+        if self.errors:
+            self.logger.error(f"Factory benchmark FAILED with {self.errors} errors")
+        self.logger.info("=" * 60)
+
+
+class CachedFactoryBenchTest(FactoryBenchTest):
+    """FactoryBenchTest with CachingFactory installed."""
+
+    CACHED = True
+
+
 # Cocotb test functions to run the pyuvm tests
 @cocotb.test()
 async def test_factory(dut):
@@ -162,6 +329,22 @@ async def test_factory_override(dut):
     # Use uvm_root to run the test properly (executes all phases in hierarchy)
     await uvm_root().run_test("FactoryOverrideTest")
 
+@cocotb.test()
+async def test_factory_benchmark(dut):
+    """Cocotb test wrapper for FactoryBenchTest."""
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["FactoryBenchTest"] = FactoryBenchTest
+    await uvm_root().run_test("FactoryBenchTest")
+
+@cocotb.test()
+async def test_factory_benchmark_cached(dut):
+    """Cocotb test wrapper for CachedFactoryBenchTest."""
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["CachedFactoryBenchTest"] = CachedFactoryBenchTest
+    await uvm_root().run_test("CachedFactoryBenchTest")
+
 if __name__ == "__main__":
     print("This is a pyuvm factory example.")
     print("To run with cocotb, use the Makefile in the test directory.")
@@ -0,0 +1,483 @@
+"""
+Module 4 Example 4.8: Sequencer Throughput Mode
+Demonstrates batched item handoff between sequences, sequencer and driver.
+
+A regular sequence/driver pair pays for one start_item/finish_item and one
+get_next_item/item_done round trip per transaction. In throughput mode a
+sequence pushes a burst of pre-built items with a single call, and the
+driver pulls up to N items per get_next_items(n) and acknowledges them in
+bulk with items_done(). Arbitration between concurrent sequences and
+response routing back to the originating sequence behave as they do for
+single items.
+"""
+
+from pyuvm import *
+import cocotb
+from cocotb.triggers import Timer, Event
+from collections import Counter
+import time
+
+
+class DataTransaction(uvm_sequence_item):
+    """Transaction for sequencer throughput example."""
+
+    def __init__(self, name="DataTransaction"):
+        super().__init__(name)
+        self.data = 0
+        self.address = 0
+        self.seq_tag = ""
+
+    def __str__(self):
+        return f"data=0x{self.data:02X}, addr=0x{self.address:04X}"
+
+
+class _Burst:
+    """A sequence's pending burst: the items and how many are still unacknowledged."""
+
+    __slots__ = ("sequence", "items", "next_index", "pending", "responses", "done")
+
+    def __init__(self, sequence, items):
+        self.sequence = sequence
+        self.items = items
+        self.next_index = 0
+        self.pending = len(items)
+        self.responses = [None] * len(items)
+        self.done = Event()
+
+
+class BatchSequencer(uvm_sequencer):
+    """
+    Sequencer with a batched (throughput mode) item path.
+
+    Shows:
+    - Bursts of pre-built items queued with one call per burst
+    - FIFO arbitration applied per item across concurrent bursts
+    - Bulk grant to the driver with get_next_items(n)
+    - Bulk acknowledge with items_done(responses)
+    - Responses routed back to the burst that produced each item
+
+    Bursts wait in the request queue of the base seq_item_export, next to
+    items from sequences that use start_item/finish_item, so both kinds of
+    sequence can run on the same sequencer. Each pending burst behaves like
+    a sequence with one outstanding request: after one of its items is
+    granted it re-joins the back of the request queue. Two concurrent
+    sequences therefore interleave item by item exactly as they would with
+    start_item/finish_item. A driver on this sequencer must use the batched
+    port; get_next_item() would hand it a burst.
+    """
+
+    def __init__(self, name, parent):
+        super().__init__(name, parent)
+        self.outstanding = []  # (burst, index), or (item, None) for a start_item request
+        self.grant_calls = 0
+        self.items_granted = 0
+
+    async def execute_burst(self, sequence, items):
+        """
+        Queue a burst from a sequence and wait until every item is acknowledged.
+
+        Returns the list of responses (None where the driver gave none),
+        in the same order as items.
+        """
+        if not items:
+            return []
+        burst = _Burst(sequence, list(items))
+        await self.put_req(burst)
+        await burst.done.wait()
+        return burst.responses
+
+    async def get_next_items(self, max_items):
+        """
+        Return between 1 and max_items granted items.
+
+        Blocks until at least one item is available. Must be followed by
+        items_done() before the next call.
+        """
+        if max_items < 1:
+            raise ValueError(f"{self.get_full_name()}: get_next_items() needs "
+                             f"max_items >= 1, got {max_items}")
+        if self.outstanding:
+            raise RuntimeError(f"{self.get_full_name()}: get_next_items() called "
+                               f"with {len(self.outstanding)} items not yet done")
+        req_q = self.seq_item_export.req_q
+        granted = self.outstanding
+        entry = await req_q.get()
+        while True:
+            if isinstance(entry, _Burst):
+                start = entry.next_index
+                if req_q.empty():
+                    # Single requester: grant a contiguous slice of its burst
+                    stop = min(start + max_items - len(granted), len(entry.items))
+                else:
+                    stop = start + 1
+                granted.extend((entry, index) for index in range(start, stop))
+                entry.next_index = stop
+                if stop < len(entry.items):
+                    req_q.put_nowait(entry)
+            else:
+                # start_item/finish_item request: same handshake as get_next_item()
+                entry.start_condition.set()
+                entry.start_condition.clear()
+                await entry.item_ready.wait()
+                granted.append((entry, None))
+            if len(granted) >= max_items or req_q.empty():
+                break
+            entry = req_q.get_nowait()
+
+        self.grant_calls += 1
+        self.items_granted += len(granted)
+        return [entry if index is None else entry.items[index] for entry, index in granted]
+
+    def items_done(self, responses=None):
+        """
+        Acknowledge every item returned by the last get_next_items().
+
+        Args:
+            responses: Optional list aligned with the granted items. Each
+                non-None entry is routed to the originating burst, or to
+                the response queue for a start_item/finish_item sequence.
+        """
+        if not self.outstanding:
+            raise RuntimeError(f"{self.get_full_name()}: items_done() without outstanding items")
+        if responses is not None and len(responses) != len(self.outstanding):
+            raise RuntimeError(f"{self.get_full_name()}: {len(responses)} responses for "
+                               f"{len(self.outstanding)} items")
+        for position, (entry, index) in enumerate(self.outstanding):
+            rsp = responses[position] if responses is not None else None
+            if index is None:
+                entry.finish_condition.set()
+                entry.finish_condition.clear()
+                if rsp is not None:
+                    rsp.set_id_info(entry)
+                    self.seq_item_export.put_response(rsp)
+                continue
+            if rsp is not None:
+                if hasattr(rsp, "set_id_info"):
+                    rsp.set_id_info(entry.items[index])
+                entry.responses[index] = rsp
+            entry.pending -= 1
+            if entry.pending == 0:
+                entry.done.set()
+        self.outstanding = []
+
+
+class BatchSeqItemPort:
+    """
+    Driver-side port for the batched item path of a BatchSequencer.
+
+    Mirrors uvm_seq_item_port: connect() in connect_phase, then
+    get_next_items()/items_done() in run_phase.
+    """
+
+    def __init__(self, name, parent):
+        self.name = name
+        self.parent = parent
+        self.sequencer = None
+
+    def get_full_name(self):
+        return f"{self.parent.get_full_name()}.{self.name}"
+
+    def connect(self, sequencer):
+        self.sequencer = sequencer
+
+    async def get_next_items(self, max_items):
+        return await self.sequencer.get_next_items(max_items)
+
+    def items_done(self, responses=None):
+        self.sequencer.items_done(responses)
+
+
+class BurstSequence(uvm_sequence):
+    """
+    Base sequence with throughput-mode helpers.
+
+    Use send_burst() on a BatchSequencer instead of start_item/finish_item.
+    """
+
+    async def send_burst(self, items):
+        """Hand a list of pre-built items to the sequencer; returns their responses."""
+        return await self.sequencer.execute_burst(self, items)
+
+    async def send_item(self, item):
+        """Single-item convenience wrapper; returns the response or None."""
+        responses = await self.sequencer.execute_burst(self, [item])
+        return responses[0]
+
+
+class PrebuiltBurstSequence(BurstSequence):
+    """Builds all items up front and pushes them in bursts of burst_size."""
+
+    def __init__(self, name="PrebuiltBurstSequence", num_items=1000, burst_size=64):
+        super().__init__(name)
+        self.num_items = num_items
+        self.burst_size = burst_size
+        self.responses = []
+
+    def build_items(self):
+        items = []
+        for i in range(self.num_items):
+            txn = DataTransaction()
+            txn.data = i & 0xFF
+            txn.address = (i * 4) & 0xFFFF
+            txn.seq_tag = self.get_name()
+            items.append(txn)
+        return items
+
+    async def body(self):
+        items = self.build_items()
+        for start in range(0, len(items), self.burst_size):
+            self.responses.extend(await self.send_burst(items[start:start + self.burst_size]))
+
+
+class PerItemSequence(uvm_sequence):
+    """Baseline: one start_item/finish_item handshake per transaction."""
+
+    def __init__(self, name="PerItemSequence", num_items=1000):
+        super().__init__(name)
+        self.num_items = num_items
+
+    async def body(self):
+        for i in range(self.num_items):
+            txn = DataTransaction()
+            txn.data = i & 0xFF
+            txn.address = (i * 4) & 0xFFFF
+            await self.start_item(txn)
+            await self.finish_item(txn)
+
+
+class SequencerDriver(uvm_driver):
+    """Baseline driver: one get_next_item/item_done round trip per item."""
+
+    def build_phase(self):
+        self.driven = 0
+
+    async def run_phase(self):
+        while True:
+            await self.seq_item_port.get_next_item()
+            self.driven += 1
+            self.seq_item_port.item_done()
+
+
+class BatchDriver(uvm_driver):
+    """
+    Driver that pulls up to batch_size items per handshake.
+
+    When send_responses is set, returns one response per item (data + 1)
+    so response routing can be checked.
+    """
+
+    def build_phase(self):
+        self.batch_port = BatchSeqItemPort("batch_port", self)
+        self.batch_size = 64
+        self.send_responses = False
+        self.driven = 0
+        self.drive_order = []
+        self.record_order = False
+
+    async def run_phase(self):
+        while True:
+            items = await self.batch_port.get_next_items(self.batch_size)
+            self.driven += len(items)
+            if self.record_order:
+                self.drive_order.extend(item.seq_tag for item in items)
+            if self.send_responses:
+                responses = []
+                for item in items:
+                    rsp = DataTransaction()
+                    rsp.data = (item.data + 1) & 0xFF
+                    rsp.address = item.address
+                    rsp.seq_tag = item.seq_tag
+                    responses.append(rsp)
+                self.batch_port.items_done(responses)
+            else:
+                self.batch_port.items_done()
+
+
+class SequencerAgent(uvm_agent):
+    """Baseline agent: uvm_sequencer and per-item driver."""
+
+    def build_phase(self):
+        self.seqr = uvm_sequencer("sequencer", self)
+        self.driver = SequencerDriver.create("driver", self)
+
+    def connect_phase(self):
+        self.driver.seq_item_port.connect(self.seqr.seq_item_export)
+
+
+class BatchSequencerAgent(uvm_agent):
+    """Same topology as SequencerAgent with the batched item path."""
+
+    def build_phase(self):
+        self.seqr = BatchSequencer("sequencer", self)
+        self.driver = BatchDriver.create("driver", self)
+
+    def connect_phase(self):
+        self.driver.batch_port.connect(self.seqr)
+
+
+class ThroughputEnv(uvm_env):
+    """Environment holding a baseline and a batched agent."""
+
+    def build_phase(self):
+        self.baseline = SequencerAgent.create("baseline", self)
+        self.batched = BatchSequencerAgent.create("batched", self)
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+# Using cocotb test wrapper instead for compatibility with cocotb test discovery
+class SequencerThroughputTest(uvm_test):
+    """
+    Throughput benchmark and semantics check for batched item handoff.
+
+    Reports items per second of wall time for the per-item baseline and
+    for batch sizes 1, 8 and 64, then checks interleaving and response
+    routing with two concurrent burst sequences.
+    """
+
+    NUM_ITEMS = 5000
+    BATCH_SIZES = (1, 8, 64)
+
+    def build_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info("Sequencer Throughput Example Test")
+        self.logger.info("=" * 60)
+        self.env = ThroughputEnv.create("env", self)
+        self.results = []
+        self.errors = 0
+
+    async def run_phase(self):
+        self.raise_objection()
+
+        # Baseline: start_item/finish_item + get_next_item/item_done
+        seq = PerItemSequence.create("per_item_seq")
+        seq.num_items = self.NUM_ITEMS
+        start = time.perf_counter()
+        await seq.start(self.env.baseline.seqr)
+        elapsed = time.perf_counter() - start
+        self.results.append(("per-item handshake", self.NUM_ITEMS, elapsed))
+
+        # Throughput mode at several batch sizes
+        driver = self.env.batched.driver
+        for batch_size in self.BATCH_SIZES:
+            driver.batch_size = batch_size
+            seq = PrebuiltBurstSequence.create(f"burst_seq_{batch_size}")
+            seq.num_items = self.NUM_ITEMS
+            seq.burst_size = max(batch_size, 64)
+            start = time.perf_counter()
+            await seq.start(self.env.batched.seqr)
+            elapsed = time.perf_counter() - start
+            self.results.append((f"batched n={batch_size}", self.NUM_ITEMS, elapsed))
+
+        await self.check_arbitration_and_responses()
+        await self.check_mixed_requests()
+        await Timer(10, unit="ns")
+        self.drop_objection()
+
+    async def check_arbitration_and_responses(self):
+        """Two concurrent burst sequences must interleave and get their own responses."""
+        driver = self.env.batched.driver
+        driver.batch_size = 8
+        driver.send_responses = True
+        driver.record_order = True
+        driver.drive_order = []
+
+        seq_a = PrebuiltBurstSequence.create("seq_a")
+        seq_a.num_items, seq_a.burst_size = 16, 16
+        seq_b = PrebuiltBurstSequence.create("seq_b")
+        seq_b.num_items, seq_b.burst_size = 16, 16
+        task_a = cocotb.start_soon(seq_a.start(self.env.batched.seqr))
+        task_b = cocotb.start_soon(seq_b.start(self.env.batched.seqr))
+        await task_a
+        await task_b
+
+        if not self.is_interleaved(driver.drive_order):
+            self.errors += 1
+            self.logger.error(f"Arbitration order not interleaved: {driver.drive_order}")
+        for seq in (seq_a, seq_b):
+            for index, rsp in enumerate(seq.responses):
+                if rsp is None or rsp.seq_tag != seq.get_name() or rsp.data != (index + 1) & 0xFF:
+                    self.errors += 1
+                    self.logger.error(f"[{seq.get_name()}] Misrouted response at item {index}: {rsp}")
+                    break
+        driver.send_responses = False
+        driver.record_order = False
+
+    async def check_mixed_requests(self):
+        """Per-item and burst sequences share the request queue; max_items < 1 is rejected."""
+        driver = self.env.batched.driver
+        seqr = self.env.batched.seqr
+        driven = driver.driven
+        burst_seq = PrebuiltBurstSequence.create("seq_c")
+        burst_seq.num_items, burst_seq.burst_size = 16, 16
+        item_seq = PerItemSequence.create("per_item_mixed")
+        item_seq.num_items = 8
+        task_burst = cocotb.start_soon(burst_seq.start(seqr))
+        task_item = cocotb.start_soon(item_seq.start(seqr))
+        await task_burst
+        await task_item
+        if driver.driven - driven != 24:
+            self.errors += 1
+            self.logger.error(f"Mixed sequences drove {driver.driven - driven} items, expected 24")
+
+        try:
+            await seqr.get_next_items(0)
+        except ValueError:
+            pass
+        else:
+            self.errors += 1
+            self.logger.error("get_next_items(0) was not rejected")
+
+    @staticmethod
+    def is_interleaved(order):
+        """
+        Check FIFO per-item arbitration: once two sequences are both
+        requesting, neither is granted twice in a row while the other
+        still has items waiting.
+        """
+        remaining = Counter(order)
+        seen = set()
+        prev = None
+        for tag in order:
+            remaining[tag] -= 1
+            if tag == prev and any(remaining[other] > 0 for other in seen if other != tag):
+                return False
+            seen.add(tag)
+            prev = tag
+        return True
+
+    def report_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info("Sequencer throughput (items per second of wall time)")
+        self.logger.info("=" * 60)
+        baseline_rate = None
+        for label, count, elapsed in self.results:
+            rate = count / elapsed if elapsed > 0 else float("inf")
+            if baseline_rate is None:
+                baseline_rate = rate
+            self.logger.info(f"  {label:<22} {rate:>12,.0f} items/s  "
+                             f"({rate / baseline_rate:5.1f}x)")
+        seqr = self.env.batched.seqr
+        self.logger.info(f"Batched sequencer: {seqr.items_granted} items in "
+                         f"{seqr.grant_calls} grants")
+        if self.errors:
+            self.logger.error(f"Sequencer throughput test failed with {self.errors} error(s)")
+        else:
+            self.logger.info("Arbitration interleaving and response routing: PASSED")
+        self.logger.info("=" * 60)
+
+
+# Cocotb test function to run the pyuvm test
+@cocotb.test()
+async def test_sequencer_throughput(dut):
+    """Cocotb test wrapper for pyuvm test."""
+    # Register the test class with uvm_root so run_test can find it
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["SequencerThroughputTest"] = SequencerThroughputTest
+    # Use uvm_root to run the test properly (executes all phases in hierarchy)
+    await uvm_root().run_test("SequencerThroughputTest")
+
+
+if __name__ == "__main__":
+    print("This is a pyuvm sequencer throughput example.")
+    print("To run with cocotb, use the Makefile in the test directory.")
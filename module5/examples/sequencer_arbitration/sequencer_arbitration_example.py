@@ -0,0 +1,579 @@
+"""
+Module 5 Example 5.6: Sequencer Arbitration
+Demonstrates configurable arbitration between concurrent sequences.
+
+When several sequences run on the same sequencer (for example the child
+sequences a virtual sequence launches with cocotb.start_soon), the
+sequencer decides which one gets the driver next. This example adds an
+arbitration layer on top of uvm_sequencer with four modes, lock/grab
+support and per-sequence grant statistics. Every mode uses a deque, a
+heap or an O(1) swap-remove list, so each grant costs at most O(log n)
+with hundreds of waiting sequences.
+"""
+
+from pyuvm import *
+import cocotb
+from cocotb.triggers import Timer, Event
+from cocotb.utils import get_sim_time
+from collections import deque
+from enum import Enum
+import heapq
+import random
+import time
+
+
+class ArbMode(Enum):
+    """Arbitration modes (named after the UVM SEQ_ARB_* modes)."""
+    FIFO = "SEQ_ARB_FIFO"                # Request order, priority ignored
+    STRICT_FIFO = "SEQ_ARB_STRICT_FIFO"  # Highest priority first, FIFO among equals
+    WEIGHTED = "SEQ_ARB_WEIGHTED"        # Weighted fair queuing, priority is the weight
+    RANDOM = "SEQ_ARB_RANDOM"            # Uniform random among waiting requests
+
+
+class GrantRequest:
+    """A sequence waiting for the sequencer (an item grant or a lock)."""
+
+    __slots__ = ("sequence", "priority", "is_lock", "event", "seqno", "request_time")
+
+    def __init__(self, sequence, priority, seqno, is_lock=False):
+        self.sequence = sequence
+        self.priority = priority
+        self.is_lock = is_lock
+        self.event = Event()
+        self.seqno = seqno
+        self.request_time = 0
+
+
+class SequenceArbiter:
+    """
+    Pending-request container for one arbitration mode.
+
+    Shows:
+    - FIFO with a deque: O(1) push and pop
+    - Strict priority with a heap keyed (-priority, seqno): O(log n)
+    - Weighted fair queuing with a heap keyed by virtual finish time: O(log n)
+    - Random with swap-remove on a list: O(1)
+    """
+
+    def __init__(self, mode=ArbMode.FIFO, seed=0):
+        self.mode = mode
+        self.rng = random.Random(seed)
+        self.fifo = deque()
+        self.heap = []
+        self.pool = []
+        self.virtual_time = 0.0
+        self.last_finish = {}  # id(sequence) -> virtual finish time of its last request
+
+    def __len__(self):
+        return len(self.fifo) + len(self.heap) + len(self.pool)
+
+    def push(self, request):
+        mode = self.mode
+        if mode is ArbMode.FIFO:
+            self.fifo.append(request)
+        elif mode is ArbMode.STRICT_FIFO:
+            heapq.heappush(self.heap, (-request.priority, request.seqno, request))
+        elif mode is ArbMode.WEIGHTED:
+            key = id(request.sequence)
+            start = max(self.virtual_time, self.last_finish.get(key, 0.0))
+            finish = start + 1.0 / max(request.priority, 1)
+            self.last_finish[key] = finish
+            heapq.heappush(self.heap, (finish, request.seqno, start, request))
+        else:
+            self.pool.append(request)
+
+    def pop(self):
+        mode = self.mode
+        if mode is ArbMode.FIFO:
+            return self.fifo.popleft()
+        if mode is ArbMode.STRICT_FIFO:
+            return heapq.heappop(self.heap)[2]
+        if mode is ArbMode.WEIGHTED:
+            _, _, start, request = heapq.heappop(self.heap)
+            self.virtual_time = start
+            return request
+        pool = self.pool
+        index = self.rng.randrange(len(pool))
+        pool[index], pool[-1] = pool[-1], pool[index]
+        return pool.pop()
+
+    def forget(self, sequence):
+        """Drop the state kept for a sequence that has finished."""
+        self.last_finish.pop(id(sequence), None)
+
+    def drain(self):
+        """Remove and return all pending requests (used when switching modes)."""
+        requests = list(self.fifo) + [entry[-1] for entry in self.heap] + self.pool
+        self.fifo.clear()
+        self.heap.clear()
+        self.pool = []
+        requests.sort(key=lambda r: r.seqno)
+        return requests
+
+
+class GrantStats:
+    """Per-sequence grant statistics (wait times in sim ns)."""
+
+    __slots__ = ("requests", "grants", "total_wait", "max_wait")
+
+    def __init__(self):
+        self.requests = 0
+        self.grants = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def avg_wait(self):
+        return self.total_wait / self.grants if self.grants else 0.0
+
+
+class ArbitratingSequencer(uvm_sequencer):
+    """
+    Sequencer with configurable arbitration, lock/grab and grant statistics.
+
+    Shows:
+    - set_arbitration() selecting one of the ArbMode modes
+    - A single grant slot: a sequence holds it from start_item to finish_item
+    - lock(): waits its turn in arbitration, then only the owner is granted
+    - grab(): jumps ahead of all waiting requests
+    - Per-sequence request/grant counts and wait times
+
+    Items still travel through the regular uvm_sequencer/uvm_seq_item_port
+    path, so existing drivers work unchanged.
+    """
+
+    def __init__(self, name, parent):
+        super().__init__(name, parent)
+        self.arbiter = SequenceArbiter(ArbMode.FIFO)
+        self.grab_q = deque()
+        self.owner_q = deque()
+        self.lock_owner = None
+        self.granted = None
+        self.released = Event()
+        self.seqno = 0
+        self.stats = {}
+        self.arbitration_ns = 0
+        self.arbitrations = 0
+
+    def set_arbitration(self, mode, seed=0):
+        """Switch arbitration mode; pending requests keep their request order."""
+        pending = self.arbiter.drain()
+        self.arbiter = SequenceArbiter(mode, seed)
+        for request in pending:
+            self.arbiter.push(request)
+
+    def get_arbitration(self):
+        return self.arbiter.mode
+
+    async def run_phase(self):
+        cocotb.start_soon(self._dispatch_released())
+        await super().run_phase()
+
+    def _new_request(self, sequence, priority, is_lock=False):
+        self.seqno += 1
+        request = GrantRequest(sequence, priority, self.seqno, is_lock)
+        request.request_time = get_sim_time("ns")
+        stats = self.stats.get(sequence.get_name())
+        if stats is None:
+            stats = self.stats[sequence.get_name()] = GrantStats()
+        stats.requests += 1
+        return request
+
+    async def wait_for_grant(self, sequence, priority=100):
+        """Block until this sequence owns the grant slot."""
+        request = self._new_request(sequence, priority)
+        if self.lock_owner is sequence:
+            self.owner_q.append(request)
+        else:
+            self.arbiter.push(request)
+        self._dispatch()
+        await request.event.wait()
+
+    def release_grant(self, sequence):
+        """
+        Release the grant slot after the item was done.
+
+        Arbitration is deferred until the releasing sequence has had the
+        chance to request its next item, as a UVM sequencer arbitrates when
+        the driver asks for the next item rather than at item_done. If the
+        releasing sequence requests again right away, its own request runs
+        the arbitration; otherwise _dispatch_released() does.
+        """
+        if self.granted is not None and self.granted.sequence is sequence:
+            self.granted = None
+            self.released.set()
+
+    async def _dispatch_released(self):
+        """Arbitrate once after every release, woken by the released event."""
+        while True:
+            await self.released.wait()
+            self.released.clear()
+            self._dispatch()
+
+    def sequence_done(self, sequence):
+        """Forget a sequence whose body has returned."""
+        self.arbiter.forget(sequence)
+
+    async def lock(self, sequence, priority=100):
+        """Request exclusive access; granted in arbitration order."""
+        request = self._new_request(sequence, priority, is_lock=True)
+        self.arbiter.push(request)
+        self._dispatch()
+        await request.event.wait()
+
+    async def grab(self, sequence):
+        """Request exclusive access ahead of every waiting request."""
+        request = self._new_request(sequence, 0, is_lock=True)
+        self.grab_q.append(request)
+        self._dispatch()
+        await request.event.wait()
+
+    def unlock(self, sequence):
+        """Release a lock or grab held by sequence."""
+        if self.lock_owner is not sequence:
+            self.logger.warning(f"[{self.get_name()}] unlock() by {sequence.get_name()} "
+                                f"which does not hold the lock")
+            return
+        self.lock_owner = None
+        # Requests the owner queued while locked go back into normal arbitration
+        while self.owner_q:
+            self.arbiter.push(self.owner_q.popleft())
+        self._dispatch()
+
+    ungrab = unlock
+
+    def is_blocked(self, sequence):
+        return self.lock_owner is not None and self.lock_owner is not sequence
+
+    def _grant(self, request):
+        stats = self.stats[request.sequence.get_name()]
+        wait = get_sim_time("ns") - request.request_time
+        stats.grants += 1
+        stats.total_wait += wait
+        if wait > stats.max_wait:
+            stats.max_wait = wait
+        request.event.set()
+
+    def _dispatch(self):
+        """Grant locks and, if the slot is free, the next eligible item request."""
+        start = time.perf_counter_ns()
+        while True:
+            if self.lock_owner is None and self.grab_q:
+                request = self.grab_q.popleft()
+                self.lock_owner = request.sequence
+                self._grant(request)
+                continue
+            if self.granted is not None:
+                break
+            if self.lock_owner is not None:
+                if not self.owner_q:
+                    break
+                request = self.owner_q.popleft()
+            elif len(self.arbiter):
+                request = self.arbiter.pop()
+                if request.is_lock:
+                    self.lock_owner = request.sequence
+                    self._grant(request)
+                    continue
+            else:
+                break
+            self.granted = request
+            self._grant(request)
+            break
+        self.arbitration_ns += time.perf_counter_ns() - start
+        self.arbitrations += 1
+
+    def report_grant_stats(self, logger, top=10):
+        logger.info(f"{'sequence':<20} {'requests':>8} {'grants':>8} "
+                    f"{'avg wait ns':>12} {'max wait ns':>12}")
+        ranked = sorted(self.stats.items(), key=lambda kv: kv[1].grants, reverse=True)
+        for name, stats in ranked[:top]:
+            logger.info(f"{name:<20} {stats.requests:>8} {stats.grants:>8} "
+                        f"{stats.avg_wait:>12.1f} {stats.max_wait:>12.1f}")
+        if len(ranked) > top:
+            logger.info(f"... {len(ranked) - top} more sequences")
+
+
+class ArbitratedSequence(uvm_sequence):
+    """
+    Base sequence that arbitrates on an ArbitratingSequencer.
+
+    start_item() waits for the grant slot before the regular handshake;
+    finish_item() releases it once the driver called item_done().
+    """
+
+    def __init__(self, name="ArbitratedSequence", priority=100):
+        super().__init__(name)
+        self.priority = priority
+
+    def set_priority(self, priority):
+        self.priority = priority
+
+    async def start(self, seqr=None, call_pre_post=True):
+        try:
+            await super().start(seqr, call_pre_post)
+        finally:
+            if seqr is not None:
+                seqr.sequence_done(self)
+
+    async def start_item(self, item, priority=-1):
+        await self.sequencer.wait_for_grant(self, self.priority if priority < 0 else priority)
+        await super().start_item(item)
+
+    async def finish_item(self, item):
+        try:
+            await super().finish_item(item)
+        finally:
+            self.sequencer.release_grant(self)
+
+    async def lock(self):
+        await self.sequencer.lock(self, self.priority)
+
+    async def grab(self):
+        await self.sequencer.grab(self)
+
+    def unlock(self):
+        self.sequencer.unlock(self)
+
+    def ungrab(self):
+        self.sequencer.ungrab(self)
+
+
+class ArbTransaction(uvm_sequence_item):
+    """Transaction tagged with the sequence that produced it."""
+
+    def __init__(self, name="ArbTransaction"):
+        super().__init__(name)
+        self.data = 0
+        self.source = ""
+
+    def __str__(self):
+        return f"source={self.source}, data=0x{self.data:02X}"
+
+
+class StreamSequence(ArbitratedSequence):
+    """Sends num_items transactions tagged with its name."""
+
+    def __init__(self, name="StreamSequence", priority=100, num_items=5):
+        super().__init__(name, priority)
+        self.num_items = num_items
+
+    async def body(self):
+        for i in range(self.num_items):
+            txn = ArbTransaction()
+            txn.data = i & 0xFF
+            txn.source = self.get_name()
+            await self.start_item(txn)
+            await self.finish_item(txn)
+
+
+class LockingSequence(StreamSequence):
+    """Sends its items back-to-back under a lock (or a grab)."""
+
+    def __init__(self, name="LockingSequence", priority=100, num_items=5, use_grab=False):
+        super().__init__(name, priority, num_items)
+        self.use_grab = use_grab
+
+    async def body(self):
+        if self.use_grab:
+            await self.grab()
+        else:
+            await self.lock()
+        try:
+            await super().body()
+        finally:
+            self.unlock()
+
+
+class ArbDriver(uvm_driver):
+    """Driver recording the source of every item it receives."""
+
+    def build_phase(self):
+        self.order = []
+
+    async def run_phase(self):
+        while True:
+            item = await self.seq_item_port.get_next_item()
+            self.order.append(item.source)
+            await Timer(1, unit="ns")
+            self.seq_item_port.item_done()
+
+
+class ArbAgent(uvm_agent):
+    """Agent with an arbitrating sequencer."""
+
+    def build_phase(self):
+        self.seqr = ArbitratingSequencer("sequencer", self)
+        self.driver = ArbDriver.create("driver", self)
+
+    def connect_phase(self):
+        self.driver.seq_item_port.connect(self.seqr.seq_item_export)
+
+
+class ArbEnv(uvm_env):
+    def build_phase(self):
+        self.agent = ArbAgent.create("agent", self)
+
+
+def benchmark_arbiter(mode, pending, operations=20000, seed=1):
+    """
+    Measure push+pop cost with a steady number of pending requests.
+
+    Returns nanoseconds of wall time per grant.
+    """
+
+    class _Seq:
+        def __init__(self, name):
+            self.name = name
+
+    rng = random.Random(seed)
+    arbiter = SequenceArbiter(mode, seed)
+    sequences = [_Seq(f"s{i}") for i in range(pending)]
+    seqno = 0
+    for seq in sequences:
+        seqno += 1
+        arbiter.push(GrantRequest(seq, rng.randint(1, 10), seqno))
+    start = time.perf_counter_ns()
+    for _ in range(operations):
+        granted = arbiter.pop()
+        seqno += 1
+        granted.seqno = seqno
+        arbiter.push(granted)
+    return (time.perf_counter_ns() - start) / operations
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+# Using cocotb test wrapper instead for compatibility with cocotb test discovery
+class SequencerArbitrationTest(uvm_test):
+    """
+    Test demonstrating the arbitration modes, lock/grab and grant statistics.
+    """
+
+    NUM_CONCURRENT = 200
+
+    def build_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info("Sequencer Arbitration Example Test")
+        self.logger.info("=" * 60)
+        self.env = ArbEnv.create("env", self)
+        self.errors = 0
+
+    async def run_concurrent(self, sequences):
+        driver = self.env.agent.driver
+        driver.order = []
+        tasks = [cocotb.start_soon(seq.start(self.env.agent.seqr)) for seq in sequences]
+        for task in tasks:
+            await task
+        return driver.order
+
+    async def run_phase(self):
+        self.raise_objection()
+        seqr = self.env.agent.seqr
+
+        # Strict priority: the high-priority sequence drains first
+        seqr.set_arbitration(ArbMode.STRICT_FIFO)
+        order = await self.run_concurrent([
+            StreamSequence("low", priority=10, num_items=4),
+            StreamSequence("high", priority=500, num_items=4),
+        ])
+        self.logger.info(f"STRICT_FIFO order: {order}")
+        if order[1:5] != ["high"] * 4:
+            self.errors += 1
+            self.logger.error("STRICT_FIFO did not favour the high-priority sequence")
+
+        # Weighted fair queuing: grants proportional to weight while both wait
+        seqr.set_arbitration(ArbMode.WEIGHTED)
+        order = await self.run_concurrent([
+            StreamSequence("w1", priority=1, num_items=40),
+            StreamSequence("w3", priority=3, num_items=40),
+        ])
+        window = order[:40]
+        share = window.count("w3") / len(window)
+        self.logger.info(f"WEIGHTED share of w3 in first 40 grants: {share:.2f} (expect ~0.75)")
+        if not 0.6 <= share <= 0.9:
+            self.errors += 1
+            self.logger.error("WEIGHTED arbitration is not proportional to weight")
+
+        # Lock: once granted, the locking sequence's items are back-to-back
+        seqr.set_arbitration(ArbMode.FIFO)
+        order = await self.run_concurrent([
+            StreamSequence("bg0", num_items=6),
+            LockingSequence("locker", num_items=5),
+            StreamSequence("bg1", num_items=6),
+        ])
+        self.logger.info(f"FIFO + lock order: {order}")
+        first = order.index("locker")
+        if order[first:first + 5] != ["locker"] * 5:
+            self.errors += 1
+            self.logger.error("Locked sequence was interleaved with other sequences")
+
+        # Grab: jumps ahead of sequences already waiting
+        background = [StreamSequence(f"bg{i}", num_items=3) for i in range(4)]
+        tasks = [cocotb.start_soon(seq.start(seqr)) for seq in background]
+        await Timer(2, unit="ns")
+        self.env.agent.driver.order = []
+        grabber = LockingSequence("grabber", num_items=3, use_grab=True)
+        await grabber.start(seqr)
+        for task in tasks:
+            await task
+        order = self.env.agent.driver.order
+        self.logger.info(f"FIFO + grab order: {order}")
+        if order.count("grabber") != 3 or order.index("grabber") > 1:
+            self.errors += 1
+            self.logger.error("Grab did not take the sequencer ahead of waiting sequences")
+
+        # Hundreds of concurrent sequences in every mode
+        self.concurrency_results = []
+        for mode in ArbMode:
+            seqr.set_arbitration(mode, seed=7)
+            seqr.arbitration_ns = 0
+            seqr.arbitrations = 0
+            sequences = [StreamSequence(f"{mode.name.lower()}_{i}", priority=1 + i % 8, num_items=3)
+                         for i in range(self.NUM_CONCURRENT)]
+            order = await self.run_concurrent(sequences)
+            per_call = seqr.arbitration_ns / max(seqr.arbitrations, 1)
+            self.concurrency_results.append((mode, len(order), per_call))
+
+        await Timer(10, unit="ns")
+        self.drop_objection()
+
+    def report_phase(self):
+        seqr = self.env.agent.seqr
+        self.logger.info("=" * 60)
+        self.logger.info("Grant statistics (top sequences by grants)")
+        self.logger.info("=" * 60)
+        seqr.report_grant_stats(self.logger)
+
+        self.logger.info("=" * 60)
+        self.logger.info(f"{self.NUM_CONCURRENT} concurrent sequences per mode")
+        for mode, items, per_call in self.concurrency_results:
+            self.logger.info(f"  {mode.value:<22} {items:>6} items  {per_call:>8.0f} ns/arbitration")
+
+        self.logger.info("Arbiter micro-benchmark (ns per grant vs pending requests)")
+        for mode in ArbMode:
+            costs = [benchmark_arbiter(mode, pending) for pending in (10, 100, 1000)]
+            self.logger.info(f"  {mode.value:<22} " +
+                             "  ".join(f"n={n}: {c:6.0f}" for n, c in zip((10, 100, 1000), costs)))
+
+        if self.errors:
+            self.logger.error(f"Sequencer arbitration test failed with {self.errors} error(s)")
+        else:
+            self.logger.info("Arbitration mode, lock and grab checks: PASSED")
+        self.logger.info("=" * 60)
+
+
+# Cocotb test function to run the pyuvm test
+@cocotb.test()
+async def test_sequencer_arbitration(dut):
+    """Cocotb test wrapper for pyuvm test."""
+    # Register the test class with uvm_root so run_test can find it
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["SequencerArbitrationTest"] = SequencerArbitrationTest
+    # Use uvm_root to run the test properly (executes all phases in hierarchy)
+    await uvm_root().run_test("SequencerArbitrationTest")
+
+
+if __name__ == "__main__":
+    print("This is a pyuvm sequencer arbitration example.")
+    print("To run with cocotb, use the Makefile in the test directory.")
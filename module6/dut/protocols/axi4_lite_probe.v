@@ -0,0 +1,81 @@
+/**
+ * Module 6: AXI4-Lite Probe Wrapper
+ * 
+ * axi4_lite_slave with the same ports plus PROBE, a packed copy of every
+ * bus signal. A monitor reads PROBE once per clock instead of reading
+ * each signal separately; the field layout is AXI4_LITE_PROBE in
+ * signal_snapshot.py (listed LSB first).
+ * 
+ * Ports:
+ *   All axi4_lite_slave ports (passed through)
+ *   PROBE: {RRESP, RDATA, RREADY, RVALID,
+ *           ARPROT, ARADDR, ARREADY, ARVALID,
+ *           BRESP, BREADY, BVALID,
+ *           WSTRB, WDATA, WREADY, WVALID,
+ *           AWPROT, AWADDR, AWREADY, AWVALID,
+ *           ARESETn}
+ */
+
+module axi4_lite_probe (
+    input  wire         ACLK,
+    input  wire         ARESETn,
+
+    input  wire         AWVALID,
+    output wire         AWREADY,
+    input  wire [31:0]  AWADDR,
+    input  wire [2:0]   AWPROT,
+
+    input  wire         WVALID,
+    output wire         WREADY,
+    input  wire [31:0]  WDATA,
+    input  wire [3:0]   WSTRB,
+
+    output wire         BVALID,
+    input  wire         BREADY,
+    output wire [1:0]   BRESP,
+
+    input  wire         ARVALID,
+    output wire         ARREADY,
+    input  wire [31:0]  ARADDR,
+    input  wire [2:0]   ARPROT,
+
+    output wire         RVALID,
+    input  wire         RREADY,
+    output wire [31:0]  RDATA,
+    output wire [1:0]   RRESP,
+
+    output wire [152:0] PROBE
+);
+
+    axi4_lite_slave u_slave (
+        .ACLK(ACLK),
+        .ARESETn(ARESETn),
+        .AWVALID(AWVALID),
+        .AWREADY(AWREADY),
+        .AWADDR(AWADDR),
+        .AWPROT(AWPROT),
+        .WVALID(WVALID),
+        .WREADY(WREADY),
+        .WDATA(WDATA),
+        .WSTRB(WSTRB),
+        .BVALID(BVALID),
+        .BREADY(BREADY),
+        .BRESP(BRESP),
+        .ARVALID(ARVALID),
+        .ARREADY(ARREADY),
+        .ARADDR(ARADDR),
+        .ARPROT(ARPROT),
+        .RVALID(RVALID),
+        .RREADY(RREADY),
+        .RDATA(RDATA),
+        .RRESP(RRESP)
+    );
+
+    assign PROBE = {RRESP, RDATA, RREADY, RVALID,
+                    ARPROT, ARADDR, ARREADY, ARVALID,
+                    BRESP, BREADY, BVALID,
+                    WSTRB, WDATA, WREADY, WVALID,
+                    AWPROT, AWADDR, AWREADY, AWVALID,
+                    ARESETn};
+
+endmodule
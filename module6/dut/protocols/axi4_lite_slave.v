@@ -74,85 +74,100 @@ module axi4_lite_slave (
     // Simple memory for AXI4-Lite slave
     reg [31:0] memory [0:1023];
     
-    // Write state machine
-    reg write_state;
-    localparam WRITE_IDLE = 1'b0;
-    localparam WRITE_DATA = 1'b1;
+    // Single-entry holding registers: one write and one read in flight.
+    // READY is high whenever the holding register is free, so a master that
+    // keeps VALID asserted gets one transfer every two cycles per direction.
+    reg        aw_full;
+    reg [31:0] awaddr_q;
+    reg        w_full;
+    reg [31:0] wdata_q;
+    reg [3:0]  wstrb_q;
+    reg        ar_full;
+    reg [31:0] araddr_q;
     
-    // Read state machine
-    reg read_state;
-    localparam READ_IDLE = 1'b0;
-    localparam READ_DATA = 1'b1;
+    wire write_commit = aw_full && w_full && (!BVALID || BREADY);
+    wire read_commit  = ar_full && (!RVALID || RREADY);
     
-    // Write Address Channel
+    // Write Address, Write Data and Write Response Channels
     always @(posedge ACLK or negedge ARESETn) begin
         if (!ARESETn) begin
             AWREADY <= 1'b0;
-            write_state <= WRITE_IDLE;
-        end else begin
-            if (AWVALID && !AWREADY) begin
-                AWREADY <= 1'b1;
-                write_state <= WRITE_DATA;
-            end else begin
-                AWREADY <= 1'b0;
-            end
-        end
-    end
-    
-    // Write Data Channel
-    always @(posedge ACLK or negedge ARESETn) begin
-        if (!ARESETn) begin
             WREADY <= 1'b0;
             BVALID <= 1'b0;
             BRESP <= 2'b00;
+            aw_full <= 1'b0;
+            awaddr_q <= 32'h0;
+            w_full <= 1'b0;
+            wdata_q <= 32'h0;
+            wstrb_q <= 4'h0;
         end else begin
-            if (write_state == WRITE_DATA && WVALID && !WREADY) begin
-                WREADY <= 1'b1;
-                // Write to memory
-                memory[AWADDR[11:2]] <= WDATA;
-            end else begin
-                WREADY <= 1'b0;
+            // Write Response Channel
+            if (BVALID && BREADY) begin
+                BVALID <= 1'b0;
             end
             
-            if (WREADY && WVALID) begin
+            // Commit address+data to memory once both have been accepted
+            if (write_commit) begin
+                if (wstrb_q[0]) memory[awaddr_q[11:2]][7:0]   <= wdata_q[7:0];
+                if (wstrb_q[1]) memory[awaddr_q[11:2]][15:8]  <= wdata_q[15:8];
+                if (wstrb_q[2]) memory[awaddr_q[11:2]][23:16] <= wdata_q[23:16];
+                if (wstrb_q[3]) memory[awaddr_q[11:2]][31:24] <= wdata_q[31:24];
                 BVALID <= 1'b1;
                 BRESP <= 2'b00; // OKAY
-            end else if (BREADY && BVALID) begin
-                BVALID <= 1'b0;
-                write_state <= WRITE_IDLE;
+                aw_full <= 1'b0;
+                w_full <= 1'b0;
             end
-        end
-    end
-    
-    // Read Address Channel
-    always @(posedge ACLK or negedge ARESETn) begin
-        if (!ARESETn) begin
-            ARREADY <= 1'b0;
-            read_state <= READ_IDLE;
-        end else begin
-            if (ARVALID && !ARREADY) begin
-                ARREADY <= 1'b1;
-                read_state <= READ_DATA;
-            end else begin
-                ARREADY <= 1'b0;
+            
+            // Write Address Channel
+            if (AWVALID && AWREADY) begin
+                AWREADY <= 1'b0;
+                aw_full <= 1'b1;
+                awaddr_q <= AWADDR;
+            end else if (!aw_full || write_commit) begin
+                AWREADY <= 1'b1;
+            end
+            
+            // Write Data Channel
+            if (WVALID && WREADY) begin
+                WREADY <= 1'b0;
+                w_full <= 1'b1;
+                wdata_q <= WDATA;
+                wstrb_q <= WSTRB;
+            end else if (!w_full || write_commit) begin
+                WREADY <= 1'b1;
             end
         end
     end
     
-    // Read Data Channel
+    // Read Address and Read Data Channels
     always @(posedge ACLK or negedge ARESETn) begin
         if (!ARESETn) begin
+            ARREADY <= 1'b0;
             RVALID <= 1'b0;
             RDATA <= 32'h0;
             RRESP <= 2'b00;
+            ar_full <= 1'b0;
+            araddr_q <= 32'h0;
         end else begin
-            if (read_state == READ_DATA && !RVALID) begin
+            // Read Data Channel
+            if (RVALID && RREADY) begin
+                RVALID <= 1'b0;
+            end
+            
+            if (read_commit) begin
                 RVALID <= 1'b1;
-                RDATA <= memory[ARADDR[11:2]];
+                RDATA <= memory[araddr_q[11:2]];
                 RRESP <= 2'b00; // OKAY
-            end else if (RREADY && RVALID) begin
-                RVALID <= 1'b0;
-                read_state <= READ_IDLE;
+                ar_full <= 1'b0;
+            end
+            
+            // Read Address Channel
+            if (ARVALID && ARREADY) begin
+                ARREADY <= 1'b0;
+                ar_full <= 1'b1;
+                araddr_q <= ARADDR;
+            end else if (!ar_full || read_commit) begin
+                ARREADY <= 1'b1;
             end
         end
     end
@@ -0,0 +1,308 @@
+"""
+Module 6 Example 6.8: Temporal Assertions
+Demonstrates SVA-style temporal properties checked on sampled AXI4-Lite signals.
+
+Properties are written as strings (##[M:N], |->, |=>, $stable, $rose, ...)
+and compiled by temporal_assertions.TemporalEngine into step lists. One
+monitor samples every signal the properties use on each RisingEdge(ACLK)
+and advances all of them with a single engine.step() call: running
+attempts are rows in shared lists, not coroutines, so a cycle costs time
+in proportion to the attempts in flight.
+
+The test runs the handshake and reset properties against
+axi4_lite_slave.v, with traffic from the pipelined master in
+axi4_lite_master_example.py plus a deliberate AWADDR/AWVALID violation,
+then instantiates 1,000 properties on a synthetic trace to measure
+cycles per second.
+"""
+
+from pyuvm import *
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import Timer, RisingEdge
+import random
+import time
+
+from axi4_lite_master_example import AXI4LiteMaster, CLK_PERIOD_NS, make_mixed_ops
+from signal_snapshot import AXI4_LITE_PROBE, SignalSnapshot
+from temporal_assertions import TemporalEngine
+
+
+AXI_PROPERTIES = (
+    ("aw_valid_stable", "AWVALID && !AWREADY |=> AWVALID && $stable(AWADDR)"),
+    ("w_valid_stable", "WVALID && !WREADY |=> WVALID && $stable(WDATA) && $stable(WSTRB)"),
+    ("b_valid_stable", "BVALID && !BREADY |=> BVALID && $stable(BRESP)"),
+    ("ar_valid_stable", "ARVALID && !ARREADY |=> ARVALID && $stable(ARADDR)"),
+    ("r_valid_stable", "RVALID && !RREADY |=> RVALID && $stable(RDATA) && $stable(RRESP)"),
+    ("aw_accepted", "$rose(AWVALID) |-> ##[0:4] AWREADY"),
+    ("write_response", "WVALID && WREADY |-> ##[1:8] BVALID"),
+    ("read_response", "ARVALID && ARREADY |-> ##[1:8] RVALID"),
+    ("reset_idle", "!ARESETn |=> !AWREADY && !WREADY && !ARREADY && !BVALID && !RVALID"),
+)
+
+# One handshake channel, instantiated per channel with bind=
+CHANNEL_PROPERTIES = (
+    ("stable", "v && !r |=> v && $stable(d)"),
+    ("latency", "$rose(v) |-> ##[0:3] r"),
+)
+
+
+def _value(handle):
+    """Integer value of handle; X/Z resolve to 0."""
+    try:
+        return int(handle.value)
+    except ValueError:
+        return 0
+
+
+class AssertionMonitor(uvm_component):
+    """
+    Samples the signals used by the properties once per clock.
+
+    Properties come from ConfigDB "assertion_properties" as (name, text)
+    pairs (default AXI_PROPERTIES). Failures are logged up to LOG_LIMIT
+    and kept by the engine as compact records. When the toplevel has a
+    PROBE vector covering every used signal, each clock costs one read.
+    """
+
+    LOG_LIMIT = 10
+
+    def build_phase(self):
+        try:
+            properties = ConfigDB().get(self, "", "assertion_properties")
+        except UVMConfigItemNotFound:
+            properties = AXI_PROPERTIES
+        self.engine = TemporalEngine(max_failures=64, on_fail=self._on_fail)
+        for name, text in properties:
+            self.engine.add(name, text)
+        self.logged = 0
+
+    def _on_fail(self, prop, start, cycle):
+        if self.logged < self.LOG_LIMIT:
+            self.logged += 1
+            self.logger.error(f"[{self.get_name()}] Assertion {prop.name} failed: "
+                              f"started cycle {start}, failed cycle {cycle}")
+
+    async def run_phase(self):
+        dut = cocotb.top
+        names = self.engine.names
+        self.logger.info(f"[{self.get_name()}] {len(self.engine.properties)} properties "
+                         f"on {len(names)} signals")
+        for name in names:
+            self.engine.set_width(name, len(getattr(dut, name)))
+        edge = RisingEdge(dut.ACLK)
+        step = self.engine.step
+        probed = {name for name, _ in AXI4_LITE_PROBE}
+        if hasattr(dut, "PROBE") and probed.issuperset(names):
+            snap = SignalSnapshot.from_probe(dut.PROBE, AXI4_LITE_PROBE)
+            sample, unpack = snap.sample, snap.unpacker(names)
+            while True:
+                await edge
+                step(unpack(sample()))
+        handles = [getattr(dut, name) for name in names]
+        while True:
+            await edge
+            try:
+                values = [int(h.value) for h in handles]
+            except ValueError:
+                values = [_value(h) for h in handles]
+            step(values)
+
+
+class AssertionEnv(uvm_env):
+    """Environment with the assertion monitor."""
+
+    def build_phase(self):
+        self.logger.info("Building AssertionEnv")
+        self.monitor = AssertionMonitor.create("monitor", self)
+
+
+def channel_trace(engine, channels, cycles, inject_pct, seed=1):
+    """
+    Build a per-cycle value vector for engine.names from legal bursty
+    handshakes on every channel. With inject_pct percent probability per
+    stalled cycle, valid is dropped before ready. Returns (rows, injected).
+    """
+    rng = random.Random(seed)
+    index = [(engine.signal(f"v{i}"), engine.signal(f"r{i}"), engine.signal(f"d{i}"))
+             for i in range(channels)]
+    state = [[0, 0, 0] for _ in range(channels)]
+    rows = []
+    injected = 0
+    for _ in range(cycles):
+        row = [0] * len(engine.names)
+        for (vi, ri, di), ch in zip(index, state):
+            v, r, d = ch
+            if v and r:
+                v = 0
+            elif v and rng.randrange(1000) < inject_pct * 10:
+                v = 0
+                injected += 1
+            if not v and rng.random() < 0.05:
+                v, d = 1, rng.getrandbits(8)
+            r = 1 if v and rng.random() < 0.5 else 0
+            ch[:] = (v, r, d)
+            row[vi], row[ri], row[di] = v, r, d
+        rows.append(row)
+    return rows, injected
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+# Using cocotb test wrapper instead for compatibility with cocotb test discovery
+class AssertionTest(uvm_test):
+    """
+    Test demonstrating temporal assertions.
+
+    1. Reset: reset_idle holds on every reset cycle
+    2. Directed violation: AWADDR changes, then AWVALID drops, while
+       AWREADY is low (two aw_valid_stable failures)
+    3. Mixed pipelined traffic: no further failures
+    4. 1,000 property instances on a synthetic 500-channel trace
+    """
+
+    NUM_OPS = 200
+    CHANNELS = 500
+    CYCLES = 2000
+    EXPECTED_FAILURES = {"aw_valid_stable": 2}
+
+    def build_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info("Temporal Assertions Example Test")
+        self.logger.info("=" * 60)
+        self.env = AssertionEnv.create("env", self)
+        self.errors = 0
+        self.benchmark = None
+
+    def expect(self, what, got, expected):
+        if got != expected:
+            self.errors += 1
+            self.logger.error(f"{what}: got {got}, expected {expected}")
+
+    async def reset_dut(self):
+        dut = cocotb.top
+        cocotb.start_soon(Clock(dut.ACLK, CLK_PERIOD_NS, unit="ns").start())
+        for name in ("AWVALID", "WVALID", "BREADY", "ARVALID", "RREADY"):
+            getattr(dut, name).value = 0
+        dut.ARESETn.value = 0
+        for _ in range(5):
+            await RisingEdge(dut.ACLK)
+        dut.ARESETn.value = 1
+        await RisingEdge(dut.ACLK)
+
+    async def unstable_write(self):
+        """Write whose second address beat changes AWADDR and drops AWVALID while stalled."""
+        dut = cocotb.top
+        edge = RisingEdge(dut.ACLK)
+        dut.BREADY.value = 1
+        dut.AWADDR.value = 0x100
+        dut.AWPROT.value = 0
+        dut.AWVALID.value = 1
+        await edge
+        while dut.AWREADY.value != 1:
+            await edge
+        # First beat accepted; AWREADY stays low until the write data arrives
+        dut.AWADDR.value = 0x104
+        await edge  # Second beat stalled
+        dut.AWADDR.value = 0x108  # Violation: address changes while stalled
+        await edge
+        dut.AWVALID.value = 0  # Violation: valid drops before ready
+        dut.WDATA.value = 0xDEADBEEF
+        dut.WSTRB.value = 0xF
+        dut.WVALID.value = 1
+        await edge
+        while dut.WREADY.value != 1:
+            await edge
+        dut.WVALID.value = 0
+        await edge
+        while dut.BVALID.value != 1:
+            await edge
+        dut.BREADY.value = 0
+
+    def channel_benchmark(self):
+        engine = TemporalEngine(max_failures=64)
+        for i in range(self.CHANNELS):
+            bind = {"v": f"v{i}", "r": f"r{i}", "d": f"d{i}"}
+            for name, text in CHANNEL_PROPERTIES:
+                engine.add(f"{name}{i}", text, bind)
+        rows, injected = channel_trace(engine, self.CHANNELS, self.CYCLES, inject_pct=1)
+        step = engine.step
+        start = time.perf_counter()
+        for row in rows:
+            step(row)
+        elapsed = time.perf_counter() - start
+        stable_failures = sum(p.failures for p in engine.properties if p.name.startswith("stable"))
+        self.expect("synthetic stable failures", stable_failures, injected)
+        return engine, elapsed
+
+    async def run_phase(self):
+        self.raise_objection()
+        await self.reset_dut()
+        dut = cocotb.top
+        engine = self.env.monitor.engine
+
+        await self.unstable_write()
+        for _ in range(4):
+            await RisingEdge(dut.ACLK)
+
+        master = AXI4LiteMaster(dut, dut.ACLK, max_outstanding=4)
+        for is_write, addr, data in make_mixed_ops(self.NUM_OPS, 0x000, 64, 0x800):
+            if is_write:
+                await master.issue_write(addr, data)
+            else:
+                await master.issue_read(addr)
+        await master.wait_idle()
+        for _ in range(10):
+            await RisingEdge(dut.ACLK)
+        master.stop()
+
+        failures = {p.name: p.failures for p in engine.properties if p.failures}
+        self.expect("AXI assertion failures", failures, self.EXPECTED_FAILURES)
+        reset = next(p for p in engine.properties if p.name == "reset_idle")
+        if reset.passes < 4:
+            self.errors += 1
+            self.logger.error(f"reset_idle passed on {reset.passes} reset cycles, expected at least 4")
+
+        self.benchmark = self.channel_benchmark()
+        await Timer(100, unit="ns")
+        self.drop_objection()
+
+    def report_phase(self):
+        engine = self.env.monitor.engine
+        self.logger.info("=" * 60)
+        self.logger.info(f"AXI4-Lite assertions over {engine.cycle} cycles")
+        self.logger.info("=" * 60)
+        self.logger.info(f"{'property':<18}{'attempts':>9}{'passed':>8}{'failed':>8}")
+        for prop in engine.properties:
+            self.logger.info(f"{prop.name:<18}{prop.attempts:>9}{prop.passes:>8}{prop.failures:>8}")
+        for record in engine.failures:
+            self.logger.info(f"  {engine.describe(record)}")
+        if self.benchmark:
+            bench, elapsed = self.benchmark
+            self.logger.info(f"Synthetic: {len(bench.properties)} properties, {bench.cycle} cycles in "
+                             f"{elapsed:.2f} s ({bench.cycle / elapsed:,.0f} cycles/s), "
+                             f"{bench.thread_steps / bench.cycle:.1f} active attempts per cycle "
+                             f"(peak {bench.peak_threads}), "
+                             f"{sum(p.attempts for p in bench.properties)} obligations, "
+                             f"{sum(p.failures for p in bench.properties)} failures")
+        if self.errors:
+            self.logger.error(f"Temporal assertions test FAILED with {self.errors} errors")
+        else:
+            self.logger.info("Temporal assertions test completed")
+        self.logger.info("=" * 60)
+
+
+# Cocotb test function to run the pyuvm test
+@cocotb.test()
+async def test_axi4_lite_assertions(dut):
+    """Cocotb test wrapper for pyuvm test."""
+    # Register the test class with uvm_root so run_test can find it
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["AssertionTest"] = AssertionTest
+    # Use uvm_root to run the test properly (executes all phases in hierarchy)
+    await uvm_root().run_test("AssertionTest")
+
+
+if __name__ == "__main__":
+    print("This is a pyuvm temporal assertions example.")
+    print("To run with cocotb, use the Makefile in the test directory.")
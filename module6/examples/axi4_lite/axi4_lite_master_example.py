@@ -0,0 +1,572 @@
+"""
+Module 6 Example 6.6: Pipelined AXI4-Lite Master
+Demonstrates a signal-level AXI4-Lite master agent with outstanding transactions.
+
+The master runs one coroutine per channel (AW, W, B, AR, R) against
+axi4_lite_slave.v. Address and data of a write are queued to the AW and W
+channels independently so both can be accepted in the same cycle, VALID is
+held across back-to-back transfers, and up to max_outstanding writes and
+max_outstanding reads are in flight at once. AXI4-Lite has no transaction
+IDs, so responses are matched to requests in issue order.
+
+The test compares achieved bus utilization against a serialized master that
+walks address, data and response phases one transaction at a time, the way
+AXI4LiteDriver in examples/protocol does.
+"""
+
+from pyuvm import *
+import cocotb
+from cocotb.clock import Clock
+from cocotb.queue import Queue
+from cocotb.triggers import Timer, RisingEdge, Event
+from cocotb.utils import get_sim_time
+from collections import deque
+import random
+
+
+CLK_PERIOD_NS = 10
+RESP_NAMES = ("OKAY", "EXOKAY", "SLVERR", "DECERR")
+
+
+class AXI4LiteTransaction(uvm_sequence_item):
+    """AXI4-Lite transaction (one read or one write)."""
+
+    def __init__(self, name="AXI4LiteTransaction"):
+        super().__init__(name)
+        self.addr = 0
+        self.data = 0
+        self.is_write = True
+        self.prot = 0  # Protection type
+        self.strb = 0xF  # Write strobe
+        self.resp = 0  # Filled in when the response arrives
+
+    def __str__(self):
+        op = "WRITE" if self.is_write else "READ"
+        return (f"{op}: addr=0x{self.addr:08X}, data=0x{self.data:08X}, "
+                f"resp={RESP_NAMES[self.resp]}")
+
+
+class AXI4LiteRequest:
+    """One access tracked by the master from issue until its response."""
+
+    __slots__ = ("is_write", "addr", "data", "strb", "prot", "resp",
+                 "context", "issue_time", "done_time", "_event")
+
+    def __init__(self, is_write, addr, data=0, strb=0xF, prot=0, context=None):
+        self.is_write = is_write
+        self.addr = addr
+        self.data = data
+        self.strb = strb
+        self.prot = prot
+        self.resp = 0
+        self.context = context
+        self.issue_time = 0
+        self.done_time = None
+        self._event = None
+
+    @property
+    def done(self):
+        return self.done_time is not None
+
+    async def wait(self):
+        """Wait until the response for this request has been received."""
+        if self.done_time is None:
+            if self._event is None:
+                self._event = Event()
+            await self._event.wait()
+        return self
+
+    def complete(self, now):
+        self.done_time = now
+        if self._event is not None:
+            self._event.set()
+
+
+class AXI4LiteMaster:
+    """
+    Pipelined AXI4-Lite master bus functional model.
+
+    Shows:
+    - Independent coroutines for the AW, W, B, AR and R channels
+    - VALID held across back-to-back transfers (no idle cycle between items)
+    - Up to max_outstanding writes and max_outstanding reads in flight
+    - ID-less ordered response tracking with one deque per direction
+    - Per-channel handshake counters for bus utilization
+
+    Channel coroutines are started on first use and can be stopped with
+    stop() to hand the bus to another master.
+    """
+
+    CHANNELS = ("AW", "W", "B", "AR", "R")
+
+    def __init__(self, dut, clock, max_outstanding=4):
+        if max_outstanding < 1:
+            raise ValueError(f"max_outstanding must be >= 1, got {max_outstanding}")
+        self.dut = dut
+        self.max_outstanding = max_outstanding
+        self.on_complete = None
+        self.beats = dict.fromkeys(self.CHANNELS, 0)
+        self._edge = RisingEdge(clock)
+        self._aw_q = Queue()
+        self._w_q = Queue()
+        self._ar_q = Queue()
+        self._wr_pending = deque()
+        self._rd_pending = deque()
+        self._credit = Event()
+        self._tasks = []
+
+    @property
+    def running(self):
+        return bool(self._tasks)
+
+    @property
+    def outstanding(self):
+        return len(self._wr_pending) + len(self._rd_pending)
+
+    def start(self):
+        """Start the five channel coroutines."""
+        if self._tasks:
+            return
+        dut = self.dut
+        dut.AWVALID.value = 0
+        dut.WVALID.value = 0
+        dut.ARVALID.value = 0
+        self._tasks = [
+            cocotb.start_soon(self._source(self._aw_q, dut.AWVALID, dut.AWREADY, self._drive_aw, "AW")),
+            cocotb.start_soon(self._source(self._w_q, dut.WVALID, dut.WREADY, self._drive_w, "W")),
+            cocotb.start_soon(self._source(self._ar_q, dut.ARVALID, dut.ARREADY, self._drive_ar, "AR")),
+            cocotb.start_soon(self._sink(dut.BVALID, dut.BREADY, self._wr_pending, self._collect_b, "B")),
+            cocotb.start_soon(self._sink(dut.RVALID, dut.RREADY, self._rd_pending, self._collect_r, "R")),
+        ]
+
+    def stop(self):
+        """Stop the channel coroutines and release the bus (call when idle)."""
+        if self.outstanding:
+            raise RuntimeError(f"Cannot stop AXI4-Lite master with {self.outstanding} requests in flight")
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        dut = self.dut
+        dut.AWVALID.value = 0
+        dut.WVALID.value = 0
+        dut.ARVALID.value = 0
+        dut.BREADY.value = 0
+        dut.RREADY.value = 0
+
+    async def issue_write(self, addr, data, strb=0xF, prot=0, context=None):
+        """Queue a write, waiting only for a free outstanding slot."""
+        await self._acquire(self._wr_pending)
+        req = AXI4LiteRequest(True, addr, data, strb, prot, context)
+        req.issue_time = get_sim_time("ns")
+        self._wr_pending.append(req)
+        self._aw_q.put_nowait(req)
+        self._w_q.put_nowait(req)
+        return req
+
+    async def issue_read(self, addr, prot=0, context=None):
+        """Queue a read, waiting only for a free outstanding slot."""
+        await self._acquire(self._rd_pending)
+        req = AXI4LiteRequest(False, addr, prot=prot, context=context)
+        req.issue_time = get_sim_time("ns")
+        self._rd_pending.append(req)
+        self._ar_q.put_nowait(req)
+        return req
+
+    async def write(self, addr, data, strb=0xF, prot=0):
+        """Write and wait for the response; returns BRESP."""
+        req = await self.issue_write(addr, data, strb, prot)
+        await req.wait()
+        return req.resp
+
+    async def read(self, addr, prot=0):
+        """Read and wait for the data; returns (RDATA, RRESP)."""
+        req = await self.issue_read(addr, prot)
+        await req.wait()
+        return req.data, req.resp
+
+    async def wait_idle(self):
+        """Wait until every issued request has received its response."""
+        while self._wr_pending or self._rd_pending:
+            self._credit.clear()
+            await self._credit.wait()
+
+    async def _acquire(self, pending):
+        if not self._tasks:
+            self.start()
+        while len(pending) >= self.max_outstanding:
+            self._credit.clear()
+            await self._credit.wait()
+
+    def _drive_aw(self, req):
+        self.dut.AWADDR.value = req.addr
+        self.dut.AWPROT.value = req.prot
+
+    def _drive_w(self, req):
+        self.dut.WDATA.value = req.data
+        self.dut.WSTRB.value = req.strb
+
+    def _drive_ar(self, req):
+        self.dut.ARADDR.value = req.addr
+        self.dut.ARPROT.value = req.prot
+
+    def _collect_b(self, req):
+        req.resp = int(self.dut.BRESP.value)
+
+    def _collect_r(self, req):
+        req.data = int(self.dut.RDATA.value)
+        req.resp = int(self.dut.RRESP.value)
+
+    async def _source(self, queue, valid, ready, drive, channel):
+        """Drive one request channel, keeping VALID high while work is queued."""
+        edge = self._edge
+        beats = self.beats
+        while True:
+            req = await queue.get()
+            drive(req)
+            valid.value = 1
+            while True:
+                await edge
+                if ready.value:
+                    beats[channel] += 1
+                    if queue.empty():
+                        valid.value = 0
+                        break
+                    drive(queue.get_nowait())
+
+    async def _sink(self, valid, ready, pending, collect, channel):
+        """Accept one response channel; responses complete requests in issue order."""
+        edge = self._edge
+        beats = self.beats
+        ready.value = 1
+        while True:
+            await edge
+            if valid.value:
+                if not pending:
+                    raise RuntimeError(f"{channel} response with no outstanding request")
+                req = pending.popleft()
+                collect(req)
+                beats[channel] += 1
+                req.complete(get_sim_time("ns"))
+                self._credit.set()
+                if self.on_complete is not None:
+                    self.on_complete(req)
+
+
+class AXI4LiteSerialMaster:
+    """
+    Serialized AXI4-Lite master used as the benchmark baseline.
+
+    Each access walks its phases in order (address, then data, then
+    response) and the next access starts only after the previous response,
+    like AXI4LiteDriver in examples/protocol.
+    """
+
+    def __init__(self, dut, clock):
+        self.dut = dut
+        self._edge = RisingEdge(clock)
+
+    async def _handshake(self, signal):
+        while True:
+            await self._edge
+            if signal.value:
+                return
+
+    async def write(self, addr, data, strb=0xF, prot=0):
+        dut = self.dut
+        dut.AWADDR.value = addr
+        dut.AWPROT.value = prot
+        dut.AWVALID.value = 1
+        await self._handshake(dut.AWREADY)
+        dut.AWVALID.value = 0
+        dut.WDATA.value = data
+        dut.WSTRB.value = strb
+        dut.WVALID.value = 1
+        await self._handshake(dut.WREADY)
+        dut.WVALID.value = 0
+        dut.BREADY.value = 1
+        await self._handshake(dut.BVALID)
+        dut.BREADY.value = 0
+        return int(dut.BRESP.value)
+
+    async def read(self, addr, prot=0):
+        dut = self.dut
+        dut.ARADDR.value = addr
+        dut.ARPROT.value = prot
+        dut.ARVALID.value = 1
+        await self._handshake(dut.ARREADY)
+        dut.ARVALID.value = 0
+        dut.RREADY.value = 1
+        await self._handshake(dut.RVALID)
+        dut.RREADY.value = 0
+        return int(dut.RDATA.value), int(dut.RRESP.value)
+
+
+class AXI4LiteMasterDriver(uvm_driver):
+    """
+    AXI4-Lite driver built on the pipelined master.
+
+    Shows:
+    - item_done() as soon as the request is queued, so the sequence can
+      issue the next item while earlier ones are still on the bus
+    - Back-pressure from max_outstanding through issue_write/issue_read
+    - Completed transactions (with read data and response) on an
+      analysis port
+    """
+
+    def build_phase(self):
+        self.logger.info(f"[{self.get_name()}] Building pipelined AXI4-Lite driver")
+        self.ap = uvm_analysis_port("ap", self)
+        try:
+            max_outstanding = ConfigDB().get(self, "", "max_outstanding")
+        except UVMConfigItemNotFound:
+            max_outstanding = 4
+        dut = cocotb.top
+        self.bfm = AXI4LiteMaster(dut, dut.ACLK, max_outstanding)
+        self.bfm.on_complete = self.complete
+
+    def complete(self, req):
+        txn = req.context
+        txn.data = req.data
+        txn.resp = req.resp
+        self.ap.write(txn)
+
+    async def run_phase(self):
+        self.logger.info(f"[{self.get_name()}] Starting pipelined AXI4-Lite driver "
+                         f"(max_outstanding={self.bfm.max_outstanding})")
+        bfm = self.bfm
+        while True:
+            item = await self.seq_item_port.get_next_item()
+            if item.is_write:
+                await bfm.issue_write(item.addr, item.data, item.strb, item.prot, item)
+            else:
+                await bfm.issue_read(item.addr, item.prot, item)
+            self.seq_item_port.item_done()
+
+
+class AXI4LiteMemoryScoreboard(uvm_subscriber):
+    """Checks completed reads against a model updated by completed writes."""
+
+    def build_phase(self):
+        self.model = {}
+        self.writes = 0
+        self.reads = 0
+        self.checked = 0
+        self.errors = 0
+
+    def write(self, txn):
+        if txn.resp != 0:
+            self.errors += 1
+            self.logger.error(f"[{self.get_name()}] Error response: {txn}")
+        if txn.is_write:
+            self.writes += 1
+            self.model[txn.addr & ~0x3] = txn.data
+            return
+        self.reads += 1
+        expected = self.model.get(txn.addr & ~0x3)
+        if expected is None:
+            return
+        self.checked += 1
+        if txn.data != expected:
+            self.errors += 1
+            self.logger.error(f"[{self.get_name()}] Read mismatch: {txn}, expected 0x{expected:08X}")
+
+    def report_phase(self):
+        self.logger.info(f"[{self.get_name()}] writes={self.writes}, reads={self.reads}, "
+                         f"checked={self.checked}, errors={self.errors}")
+
+
+class AXI4LiteMasterAgent(uvm_agent):
+    """Active AXI4-Lite master agent."""
+
+    def build_phase(self):
+        self.logger.info("Building AXI4-Lite master agent")
+        self.seqr = uvm_sequencer("sequencer", self)
+        self.driver = AXI4LiteMasterDriver.create("driver", self)
+
+    def connect_phase(self):
+        self.driver.seq_item_port.connect(self.seqr.seq_item_export)
+
+
+class AXI4LiteWriteSequence(uvm_sequence):
+    """Writes a pattern to consecutive words starting at base."""
+
+    def __init__(self, name="AXI4LiteWriteSequence", base=0x000, count=64):
+        super().__init__(name)
+        self.base = base
+        self.count = count
+
+    async def body(self):
+        for i in range(self.count):
+            txn = AXI4LiteTransaction()
+            txn.addr = self.base + i * 4
+            txn.data = (0xA5000000 | (i << 8) | i) & 0xFFFFFFFF
+            txn.is_write = True
+            await self.start_item(txn)
+            await self.finish_item(txn)
+
+
+class AXI4LiteMixedSequence(uvm_sequence):
+    """Replays a list of (is_write, addr, data) operations through the agent."""
+
+    def __init__(self, name="AXI4LiteMixedSequence", ops=None):
+        super().__init__(name)
+        self.ops = ops or []
+
+    async def body(self):
+        for is_write, addr, data in self.ops:
+            txn = AXI4LiteTransaction()
+            txn.addr = addr
+            txn.data = data
+            txn.is_write = is_write
+            await self.start_item(txn)
+            await self.finish_item(txn)
+
+
+def make_mixed_ops(count, read_base, read_words, write_base, seed=6):
+    """
+    Build a reproducible random mix of (is_write, addr, data) operations.
+
+    Reads target [read_base, read_base + read_words*4) and writes target a
+    separate region, so read data never depends on write/read ordering.
+    """
+    rng = random.Random(seed)
+    ops = []
+    for _ in range(count):
+        if rng.random() < 0.5:
+            ops.append((True, write_base + rng.randrange(256) * 4, rng.getrandbits(32)))
+        else:
+            ops.append((False, read_base + rng.randrange(read_words) * 4, 0))
+    return ops
+
+
+class AXI4LiteMasterEnv(uvm_env):
+    """Environment with a pipelined AXI4-Lite master and a memory scoreboard."""
+
+    def build_phase(self):
+        self.agent = AXI4LiteMasterAgent.create("agent", self)
+        self.scoreboard = AXI4LiteMemoryScoreboard.create("scoreboard", self)
+
+    def connect_phase(self):
+        self.agent.driver.ap.connect(self.scoreboard.analysis_export)
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+# Using cocotb test wrapper instead for compatibility with cocotb test discovery
+class AXI4LiteMasterTest(uvm_test):
+    """
+    Functional check plus bus utilization benchmark.
+
+    1. Write a 64-word pattern and read it back through the agent
+    2. Run a mixed read/write stream through the serialized master
+    3. Run the same stream through the agent with max_outstanding 1, 2, 4
+    """
+
+    NUM_OPS = 400
+    READ_BASE = 0x000
+    READ_WORDS = 64
+    WRITE_BASE = 0x800
+
+    def build_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info("Pipelined AXI4-Lite Master Example Test")
+        self.logger.info("=" * 60)
+        ConfigDB().set(None, "*", "max_outstanding", 4)
+        self.env = AXI4LiteMasterEnv.create("env", self)
+        self.results = []
+
+    async def reset_dut(self):
+        dut = cocotb.top
+        cocotb.start_soon(Clock(dut.ACLK, CLK_PERIOD_NS, unit="ns").start())
+        for name in ("AWVALID", "WVALID", "BREADY", "ARVALID", "RREADY"):
+            getattr(dut, name).value = 0
+        dut.ARESETn.value = 0
+        for _ in range(5):
+            await RisingEdge(dut.ACLK)
+        dut.ARESETn.value = 1
+        await RisingEdge(dut.ACLK)
+
+    async def run_phase(self):
+        self.raise_objection()
+        await self.reset_dut()
+        bfm = self.env.agent.driver.bfm
+        seqr = self.env.agent.seqr
+
+        # 1. Functional: write a pattern, then read it back
+        await AXI4LiteWriteSequence("write_pattern", self.READ_BASE, self.READ_WORDS).start(seqr)
+        readback = [(False, self.READ_BASE + i * 4, 0) for i in range(self.READ_WORDS)]
+        await AXI4LiteMixedSequence("readback", readback).start(seqr)
+        await bfm.wait_idle()
+        bfm.stop()
+
+        ops = make_mixed_ops(self.NUM_OPS, self.READ_BASE, self.READ_WORDS, self.WRITE_BASE)
+
+        # 2. Baseline: serialized master, one access at a time
+        serial = AXI4LiteSerialMaster(cocotb.top, cocotb.top.ACLK)
+        model = self.env.scoreboard.model
+        start = get_sim_time("ns")
+        for is_write, addr, data in ops:
+            if is_write:
+                await serial.write(addr, data)
+            else:
+                rdata, _ = await serial.read(addr)
+                if rdata != model[addr]:
+                    self.logger.error(f"Serial read mismatch at 0x{addr:08X}: 0x{rdata:08X}")
+                    self.env.scoreboard.errors += 1
+        self.record("serialized", 1, ops, get_sim_time("ns") - start)
+
+        # 3. Pipelined agent with increasing outstanding depth
+        for depth in (1, 2, 4):
+            bfm.max_outstanding = depth
+            beats_before = dict(bfm.beats)
+            start = get_sim_time("ns")
+            await AXI4LiteMixedSequence(f"mixed_{depth}", ops).start(seqr)
+            await bfm.wait_idle()
+            elapsed = get_sim_time("ns") - start
+            moved = sum(bfm.beats[ch] - beats_before[ch] for ch in ("W", "R"))
+            if moved != len(ops):
+                self.logger.error(f"Expected {len(ops)} data beats, saw {moved}")
+                self.env.scoreboard.errors += 1
+            self.record("pipelined", depth, ops, elapsed)
+
+        await Timer(100, unit="ns")
+        self.drop_objection()
+
+    def record(self, mode, depth, ops, elapsed_ns):
+        cycles = max(1, int(elapsed_ns // CLK_PERIOD_NS))
+        # Two data channels (W and R); utilization is the fraction of
+        # data-channel cycles that carried a beat.
+        utilization = len(ops) / (2 * cycles)
+        self.results.append((mode, depth, cycles, len(ops) / cycles, utilization))
+
+    def report_phase(self):
+        sb = self.env.scoreboard
+        self.logger.info("=" * 60)
+        self.logger.info("AXI4-Lite master bus utilization")
+        self.logger.info("=" * 60)
+        self.logger.info(f"{'mode':<12}{'outst':>6}{'cycles':>9}{'txn/cyc':>10}{'util':>8}")
+        baseline = self.results[0][2] if self.results else 0
+        for mode, depth, cycles, per_cycle, util in self.results:
+            self.logger.info(f"{mode:<12}{depth:>6}{cycles:>9}{per_cycle:>10.3f}{util:>7.1%}"
+                             f"  ({baseline / cycles:.2f}x)")
+        if sb.errors:
+            self.logger.error(f"AXI4-Lite master test FAILED with {sb.errors} errors")
+        else:
+            self.logger.info(f"AXI4-Lite master test PASSED ({sb.checked} reads checked)")
+        self.logger.info("=" * 60)
+
+
+# Cocotb test function to run the pyuvm test
+@cocotb.test()
+async def test_axi4_lite_master(dut):
+    """Cocotb test wrapper for pyuvm test."""
+    # Register the test class with uvm_root so run_test can find it
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["AXI4LiteMasterTest"] = AXI4LiteMasterTest
+    # Use uvm_root to run the test properly (executes all phases in hierarchy)
+    await uvm_root().run_test("AXI4LiteMasterTest")
+
+
+if __name__ == "__main__":
+    print("This is a pyuvm pipelined AXI4-Lite master example.")
+    print("To run with cocotb, use the Makefile in the test directory.")
@@ -0,0 +1,437 @@
+"""
+Module 6 Example 6.7: Signal-Driven AXI4-Lite Monitor
+Demonstrates a passive AXI4-Lite monitor that reassembles transactions from bus signals.
+
+The monitor samples all five channels of axi4_lite_slave.v in one pass per
+RisingEdge(ACLK) from a single coroutine. Handshakes on AW, W and AR are
+pushed into small per-channel FIFOs; each B handshake pops one write address
+and one write data entry, and each R handshake pops one read address, to
+build complete transactions. Payload signals are only read on a handshake,
+so an idle cycle costs five VALID reads.
+
+With the axi4_lite_probe.v toplevel the monitor can instead sample every bus
+signal with one read of the packed PROBE vector (signal_snapshot.py): a
+cycle costs one simulator read whatever the number of signals, and
+handshakes are detected with masks on the packed integer. The last
+HISTORY samples are kept for error reports.
+
+Traffic comes from the pipelined master in axi4_lite_master_example.py.
+The test measures the wall-clock cost per cycle of this monitor, with
+per-signal reads and with snapshots, against a monitor that runs one
+coroutine per channel, and checks every observed transaction against what
+the master completed.
+"""
+
+from pyuvm import *
+import cocotb
+from cocotb.clock import Clock
+from cocotb.triggers import Timer, RisingEdge
+from cocotb.utils import get_sim_time
+from collections import deque
+import time
+
+from axi4_lite_master_example import (
+    AXI4LiteMaster,
+    AXI4LiteTransaction,
+    CLK_PERIOD_NS,
+    make_mixed_ops,
+)
+from signal_snapshot import AXI4_LITE_PROBE, SignalSnapshot
+
+
+class AXI4LiteBusMonitor(uvm_monitor):
+    """
+    Passive AXI4-Lite monitor driven by the bus signals.
+
+    Shows:
+    - One sampling coroutine for all five channels
+    - Payload read only when VALID and READY are both high
+    - Per-channel FIFOs (AW, W, AR) for reassembly
+    - Complete write (address + data + response) and read (address + data)
+      transactions on the analysis port
+    - Reassembly errors counted when a response has nothing to pair with
+    - ConfigDB "monitor_sampling": "snapshot" (default; one PROBE read per
+      clock, falls back to "handles" without a probe) or "handles"
+    """
+
+    HISTORY = 16
+
+    def build_phase(self):
+        self.logger.info(f"[{self.get_name()}] Building AXI4-Lite bus monitor")
+        self.ap = uvm_analysis_port("ap", self)
+        try:
+            self.sampling = ConfigDB().get(self, "", "monitor_sampling")
+        except UVMConfigItemNotFound:
+            self.sampling = "snapshot"
+        self.snapshot = None
+        self.cycles = 0
+        self.writes = 0
+        self.reads = 0
+        self.errors = 0
+        self._aw_q = deque()
+        self._w_q = deque()
+        self._ar_q = deque()
+        self._task = None
+
+    async def run_phase(self):
+        self.logger.info(f"[{self.get_name()}] Waiting for reset release")
+        await RisingEdge(cocotb.top.ARESETn)
+        self.start()
+
+    def start(self):
+        """Start sampling (no-op if already running)."""
+        if self._task is None:
+            if self.sampling == "snapshot" and not hasattr(cocotb.top, "PROBE"):
+                self.logger.warning(f"[{self.get_name()}] No PROBE on toplevel, sampling handles")
+                self.sampling = "handles"
+            loop = self.snapshot_loop() if self.sampling == "snapshot" else self.sample_loop()
+            self._task = cocotb.start_soon(loop)
+
+    def stop(self):
+        """Stop sampling and drop partially reassembled transfers."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._aw_q.clear()
+        self._w_q.clear()
+        self._ar_q.clear()
+
+    async def sample_loop(self):
+        dut = cocotb.top
+        edge = RisingEdge(dut.ACLK)
+        awvalid, awready, awaddr, awprot = dut.AWVALID, dut.AWREADY, dut.AWADDR, dut.AWPROT
+        wvalid, wready, wdata, wstrb = dut.WVALID, dut.WREADY, dut.WDATA, dut.WSTRB
+        bvalid, bready, bresp = dut.BVALID, dut.BREADY, dut.BRESP
+        arvalid, arready, araddr, arprot = dut.ARVALID, dut.ARREADY, dut.ARADDR, dut.ARPROT
+        rvalid, rready, rdata, rresp = dut.RVALID, dut.RREADY, dut.RDATA, dut.RRESP
+        aw_q, w_q, ar_q = self._aw_q, self._w_q, self._ar_q
+        cycles = self.cycles
+        while True:
+            await edge
+            cycles += 1
+            self.cycles = cycles
+            if awvalid.value and awready.value:
+                aw_q.append((int(awaddr.value), int(awprot.value)))
+            if wvalid.value and wready.value:
+                w_q.append((int(wdata.value), int(wstrb.value)))
+            if bvalid.value and bready.value:
+                self.complete_write(int(bresp.value))
+            if arvalid.value and arready.value:
+                ar_q.append((int(araddr.value), int(arprot.value)))
+            if rvalid.value and rready.value:
+                self.complete_read(int(rdata.value), int(rresp.value))
+
+    async def snapshot_loop(self):
+        dut = cocotb.top
+        edge = RisingEdge(dut.ACLK)
+        snap = self.snapshot = SignalSnapshot.from_probe(dut.PROBE, AXI4_LITE_PROBE,
+                                                         depth=self.HISTORY)
+        sample = snap.sample
+        aw_hs = snap.mask("AWVALID", "AWREADY")
+        w_hs = snap.mask("WVALID", "WREADY")
+        b_hs = snap.mask("BVALID", "BREADY")
+        ar_hs = snap.mask("ARVALID", "ARREADY")
+        r_hs = snap.mask("RVALID", "RREADY")
+        any_hs = aw_hs | w_hs | b_hs | ar_hs | r_hs
+        awaddr_s, awaddr_m = snap.field("AWADDR")
+        awprot_s, awprot_m = snap.field("AWPROT")
+        wdata_s, wdata_m = snap.field("WDATA")
+        wstrb_s, wstrb_m = snap.field("WSTRB")
+        bresp_s, bresp_m = snap.field("BRESP")
+        araddr_s, araddr_m = snap.field("ARADDR")
+        arprot_s, arprot_m = snap.field("ARPROT")
+        rdata_s, rdata_m = snap.field("RDATA")
+        rresp_s, rresp_m = snap.field("RRESP")
+        aw_q, w_q, ar_q = self._aw_q, self._w_q, self._ar_q
+        cycles = self.cycles
+        while True:
+            await edge
+            raw = sample()
+            cycles += 1
+            self.cycles = cycles
+            if not raw & any_hs:
+                continue
+            if (raw & aw_hs) == aw_hs:
+                aw_q.append(((raw >> awaddr_s) & awaddr_m, (raw >> awprot_s) & awprot_m))
+            if (raw & w_hs) == w_hs:
+                w_q.append(((raw >> wdata_s) & wdata_m, (raw >> wstrb_s) & wstrb_m))
+            if (raw & b_hs) == b_hs:
+                self.complete_write((raw >> bresp_s) & bresp_m)
+            if (raw & ar_hs) == ar_hs:
+                ar_q.append(((raw >> araddr_s) & araddr_m, (raw >> arprot_s) & arprot_m))
+            if (raw & r_hs) == r_hs:
+                self.complete_read((raw >> rdata_s) & rdata_m, (raw >> rresp_s) & rresp_m)
+
+    def log_history(self):
+        """Log the last few bus samples (snapshot sampling only)."""
+        if self.snapshot is not None:
+            for record in self.snapshot.history(4):
+                self.logger.error(f"[{self.get_name()}]   {record}")
+
+    def complete_write(self, resp):
+        if not self._aw_q or not self._w_q:
+            self.errors += 1
+            self.logger.error(f"[{self.get_name()}] B handshake without matching AW/W "
+                              f"(aw={len(self._aw_q)}, w={len(self._w_q)})")
+            self.log_history()
+            return
+        addr, prot = self._aw_q.popleft()
+        data, strb = self._w_q.popleft()
+        txn = AXI4LiteTransaction()
+        txn.is_write = True
+        txn.addr = addr
+        txn.prot = prot
+        txn.data = data
+        txn.strb = strb
+        txn.resp = resp
+        self.writes += 1
+        self.ap.write(txn)
+
+    def complete_read(self, data, resp):
+        if not self._ar_q:
+            self.errors += 1
+            self.logger.error(f"[{self.get_name()}] R handshake without matching AR")
+            self.log_history()
+            return
+        addr, prot = self._ar_q.popleft()
+        txn = AXI4LiteTransaction()
+        txn.is_write = False
+        txn.addr = addr
+        txn.prot = prot
+        txn.data = data
+        txn.resp = resp
+        self.reads += 1
+        self.ap.write(txn)
+
+
+class PerChannelAXI4LiteMonitor:
+    """
+    Benchmark baseline: one coroutine per channel.
+
+    Each channel waits for its own RisingEdge(ACLK) and reads its own
+    VALID/READY pair, so every clock wakes five coroutines instead of one.
+    Reassembly is the same as AXI4LiteBusMonitor.
+    """
+
+    def __init__(self, dut):
+        self.dut = dut
+        self.transactions = 0
+        self._aw_q = deque()
+        self._w_q = deque()
+        self._ar_q = deque()
+        self._tasks = []
+
+    def start(self):
+        dut = self.dut
+        self._tasks = [
+            cocotb.start_soon(self._channel(dut.AWVALID, dut.AWREADY, (dut.AWADDR, dut.AWPROT), self._aw_q.append)),
+            cocotb.start_soon(self._channel(dut.WVALID, dut.WREADY, (dut.WDATA, dut.WSTRB), self._w_q.append)),
+            cocotb.start_soon(self._channel(dut.BVALID, dut.BREADY, (dut.BRESP,), self._on_b)),
+            cocotb.start_soon(self._channel(dut.ARVALID, dut.ARREADY, (dut.ARADDR, dut.ARPROT), self._ar_q.append)),
+            cocotb.start_soon(self._channel(dut.RVALID, dut.RREADY, (dut.RDATA, dut.RRESP), self._on_r)),
+        ]
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    async def _channel(self, valid, ready, payload, sink):
+        edge = RisingEdge(self.dut.ACLK)
+        while True:
+            await edge
+            if valid.value and ready.value:
+                sink(tuple(int(sig.value) for sig in payload))
+
+    def _on_b(self, beat):
+        if self._aw_q and self._w_q:
+            self._aw_q.popleft()
+            self._w_q.popleft()
+            self.transactions += 1
+
+    def _on_r(self, beat):
+        if self._ar_q:
+            self._ar_q.popleft()
+            self.transactions += 1
+
+
+class AXI4LiteMonitorChecker(uvm_subscriber):
+    """Compares monitored transactions with the master's completed requests, per direction."""
+
+    def build_phase(self):
+        self.observed = {True: [], False: []}
+        self.expected = {True: [], False: []}
+        self.enabled = False
+
+    def expect(self, req):
+        if self.enabled:
+            self.expected[req.is_write].append((req.addr, req.data, req.resp))
+
+    def write(self, txn):
+        if self.enabled:
+            self.observed[txn.is_write].append((txn.addr, txn.data, txn.resp))
+
+    def mismatches(self):
+        count = 0
+        for direction in (True, False):
+            exp, obs = self.expected[direction], self.observed[direction]
+            count += abs(len(exp) - len(obs))
+            count += sum(1 for e, o in zip(exp, obs) if e != o)
+        return count
+
+
+class AXI4LiteMonitorEnv(uvm_env):
+    """Passive environment: bus monitor feeding a checker."""
+
+    def build_phase(self):
+        self.monitor = AXI4LiteBusMonitor.create("monitor", self)
+        self.checker = AXI4LiteMonitorChecker.create("checker", self)
+
+    def connect_phase(self):
+        self.monitor.ap.connect(self.checker.analysis_export)
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+# Using cocotb test wrapper instead for compatibility with cocotb test discovery
+class AXI4LiteMonitorTest(uvm_test):
+    """
+    Monitor correctness and per-cycle cost benchmark.
+
+    The same mixed read/write stream is driven four times by the pipelined
+    master: with no monitor, with the per-channel baseline, and with
+    AXI4LiteBusMonitor reading each signal ("combined") and reading one
+    packed snapshot per clock ("snapshot"). The extra wall-clock time
+    divided by the number of clock cycles is the monitor's cost per cycle.
+    """
+
+    NUM_OPS = 2000
+    READ_WORDS = 64
+
+    def build_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info("Signal-Driven AXI4-Lite Monitor Example Test")
+        self.logger.info("=" * 60)
+        self.env = AXI4LiteMonitorEnv.create("env", self)
+        self.results = []
+
+    async def reset_dut(self):
+        dut = cocotb.top
+        cocotb.start_soon(Clock(dut.ACLK, CLK_PERIOD_NS, unit="ns").start())
+        for name in ("AWVALID", "WVALID", "BREADY", "ARVALID", "RREADY"):
+            getattr(dut, name).value = 0
+        dut.ARESETn.value = 0
+        for _ in range(5):
+            await RisingEdge(dut.ACLK)
+        dut.ARESETn.value = 1
+        await RisingEdge(dut.ACLK)
+
+    async def drive(self, master, ops):
+        """Drive ops through the master; returns (clock cycles, wall seconds)."""
+        start = get_sim_time("ns")
+        wall = time.perf_counter()
+        for is_write, addr, data in ops:
+            if is_write:
+                await master.issue_write(addr, data)
+            else:
+                await master.issue_read(addr)
+        await master.wait_idle()
+        wall = time.perf_counter() - wall
+        cycles = max(1, int((get_sim_time("ns") - start) // CLK_PERIOD_NS))
+        return cycles, wall
+
+    async def monitored_run(self, master, ops, mode, sampling):
+        """Drive ops with the bus monitor sampling in the given way, checking every transaction."""
+        monitor = self.env.monitor
+        checker = self.env.checker
+        monitor.stop()
+        monitor.sampling = sampling
+        monitor.start()
+        checker.enabled = True
+        seen_before = monitor.writes + monitor.reads
+        cycles, wall = await self.drive(master, ops)
+        await RisingEdge(cocotb.top.ACLK)
+        checker.enabled = False
+        return (mode, cycles, wall, monitor.writes + monitor.reads - seen_before)
+
+    async def run_phase(self):
+        self.raise_objection()
+        await self.reset_dut()
+        dut = cocotb.top
+        monitor = self.env.monitor
+        checker = self.env.checker
+
+        master = AXI4LiteMaster(dut, dut.ACLK, max_outstanding=4)
+        master.on_complete = checker.expect
+        # Preload the read region so every read returns known data
+        for i in range(self.READ_WORDS):
+            await master.issue_write(i * 4, 0x5A000000 | i)
+        await master.wait_idle()
+
+        ops = make_mixed_ops(self.NUM_OPS, 0x000, self.READ_WORDS, 0x800)
+
+        # 1. No monitor
+        monitor.stop()
+        cycles, wall = await self.drive(master, ops)
+        self.results.append(("none", cycles, wall, None))
+
+        # 2. One coroutine per channel
+        baseline = PerChannelAXI4LiteMonitor(dut)
+        baseline.start()
+        cycles, wall = await self.drive(master, ops)
+        baseline.stop()
+        self.results.append(("per-channel", cycles, wall, baseline.transactions))
+
+        # 3. Single sampling coroutine, with correctness check
+        self.results.append(await self.monitored_run(master, ops, "combined", "handles"))
+
+        # 4. Single sampling coroutine reading one PROBE snapshot per clock
+        if hasattr(dut, "PROBE"):
+            self.results.append(await self.monitored_run(master, ops, "snapshot", "snapshot"))
+
+        await Timer(100, unit="ns")
+        self.drop_objection()
+
+    def report_phase(self):
+        monitor = self.env.monitor
+        checker = self.env.checker
+        self.logger.info("=" * 60)
+        self.logger.info("AXI4-Lite monitor cost per cycle")
+        self.logger.info("=" * 60)
+        _, _, base_wall, _ = self.results[0]
+        self.logger.info(f"{'monitor':<13}{'cycles':>8}{'txns':>7}{'txn/cyc':>9}"
+                         f"{'wall ms':>9}{'us/cycle':>10}")
+        for mode, cycles, wall, txns in self.results:
+            overhead = "-" if txns is None else f"{(wall - base_wall) / cycles * 1e6:.2f}"
+            seen = "-" if txns is None else str(txns)
+            per_cycle = "-" if txns is None else f"{txns / cycles:.3f}"
+            self.logger.info(f"{mode:<13}{cycles:>8}{seen:>7}{per_cycle:>9}"
+                             f"{wall * 1e3:>9.1f}{overhead:>10}")
+        errors = monitor.errors + checker.mismatches()
+        for mode, _, _, txns in self.results[2:]:
+            if txns != self.NUM_OPS:
+                errors += 1
+                self.logger.error(f"{mode} monitor saw {txns} transactions, "
+                                  f"expected {self.NUM_OPS}")
+        if errors:
+            self.logger.error(f"AXI4-Lite monitor test FAILED with {errors} errors")
+        else:
+            self.logger.info(f"AXI4-Lite monitor test PASSED ({monitor.writes} writes, "
+                             f"{monitor.reads} reads reassembled)")
+        self.logger.info("=" * 60)
+
+
+# Cocotb test function to run the pyuvm test
+@cocotb.test()
+async def test_axi4_lite_monitor(dut):
+    """Cocotb test wrapper for pyuvm test."""
+    # Register the test class with uvm_root so run_test can find it
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["AXI4LiteMonitorTest"] = AXI4LiteMonitorTest
+    # Use uvm_root to run the test properly (executes all phases in hierarchy)
+    await uvm_root().run_test("AXI4LiteMonitorTest")
+
+
+if __name__ == "__main__":
+    print("This is a pyuvm signal-driven AXI4-Lite monitor example.")
+    print("To run with cocotb, use the Makefile in the test directory.")
@@ -0,0 +1,184 @@
+"""
+Bulk signal sampling for monitors.
+
+Every handle.value read crosses from Python into the simulator, so a
+monitor that reads twenty signals per clock pays twenty crossings.
+SignalSnapshot registers a set of fields once and samples all of them
+with one call per sample point:
+
+- from_probe(): the fields are packed into one vector in HDL (PROBE on
+  axi4_lite_probe.v), so a sample is a single simulator read.
+- from_handles(): one handle per field. A sample still reads every
+  handle, but the result has the same packed form, for DUTs without a
+  probe.
+
+sample() returns the packed integer. Fields are decoded on demand through
+the preallocated record (snap.record.AWADDR), with shift/mask pairs from
+field(), or into a NumPy row when NumPy is installed. The last `depth`
+samples are kept in a ring buffer for checkers.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# (name, width) pairs, LSB first, matching PROBE in axi4_lite_probe.v
+AXI4_LITE_PROBE = (
+    ("ARESETn", 1),
+    ("AWVALID", 1), ("AWREADY", 1), ("AWADDR", 32), ("AWPROT", 3),
+    ("WVALID", 1), ("WREADY", 1), ("WDATA", 32), ("WSTRB", 4),
+    ("BVALID", 1), ("BREADY", 1), ("BRESP", 2),
+    ("ARVALID", 1), ("ARREADY", 1), ("ARADDR", 32), ("ARPROT", 3),
+    ("RVALID", 1), ("RREADY", 1), ("RDATA", 32), ("RRESP", 2),
+)
+
+# Unresolved logic values read as 0 (H as 1)
+_XZ = str.maketrans("XZUWLH-xzuwlh", "0000010000001")
+
+
+def resolve(value):
+    """Integer value of a LogicArray, with X/Z/U/W/- bits read as 0."""
+    try:
+        return int(value)
+    except ValueError:
+        return int(str(value).translate(_XZ), 2)
+
+
+def _record_class(fields):
+    """Slot class with one read-only property per field, decoded from .raw."""
+    attrs = {"__slots__": ("raw",), "_fields": tuple(name for name, _, _ in fields)}
+    for name, shift, mask in fields:
+        attrs[name] = property(lambda self, s=shift, m=mask: (self.raw >> s) & m)
+
+    def __init__(self, raw=0):
+        self.raw = raw
+
+    def __repr__(self):
+        return " ".join(f"{name}={getattr(self, name):x}" for name in self._fields)
+
+    attrs["__init__"] = __init__
+    attrs["__repr__"] = __repr__
+    return type("SnapshotRecord", (), attrs)
+
+
+class SignalSnapshot:
+    """
+    One-call sampler for a fixed set of signals.
+
+    fields is a sequence of (name, width) pairs, LSB first. Pass either
+    probe, a single handle holding the packed fields, or handles, one per
+    field in the same order. depth > 0 keeps that many past samples.
+    """
+
+    def __init__(self, fields, probe=None, handles=None, depth=0):
+        if (probe is None) == (handles is None):
+            raise ValueError("SignalSnapshot needs either probe or handles")
+        self.names = [name for name, _ in fields]
+        if len(set(self.names)) != len(self.names):
+            raise ValueError("Duplicate field names in snapshot layout")
+        self._fields = {}
+        shift = 0
+        for name, width in fields:
+            self._fields[name] = (shift, (1 << width) - 1)
+            shift += width
+        self.width = shift
+        self.Record = _record_class([(n, s, m) for n, (s, m) in self._fields.items()])
+        self.record = self.Record()
+        self.depth = depth
+        self.count = 0
+        self._ring = [0] * depth
+        self._head = 0
+        self._row = np.zeros(len(self.names), dtype=np.uint64) if np is not None else None
+        if probe is not None:
+            self._probe = probe
+            self.sample = self._sample_probe
+        else:
+            if len(handles) != len(self.names):
+                raise ValueError(f"Expected {len(self.names)} handles, got {len(handles)}")
+            self._handles = [(h, self._fields[n][0]) for h, n in zip(handles, self.names)]
+            self.sample = self._sample_handles
+
+    @classmethod
+    def from_probe(cls, probe, fields, depth=0):
+        """Snapshot over a packed probe vector (one simulator read per sample)."""
+        return cls(fields, probe=probe, depth=depth)
+
+    @classmethod
+    def from_handles(cls, parent, fields, depth=0):
+        """Snapshot over parent.<name> handles (one read per field per sample)."""
+        return cls(fields, handles=[getattr(parent, name) for name, _ in fields], depth=depth)
+
+    def _store(self, raw):
+        self.record.raw = raw
+        if self.depth:
+            self._ring[self._head] = raw
+            self._head = (self._head + 1) % self.depth
+        self.count += 1
+        return raw
+
+    def _sample_probe(self):
+        value = self._probe.value
+        try:
+            raw = int(value)
+        except ValueError:
+            raw = resolve(value)
+        return self._store(raw)
+
+    def _sample_handles(self):
+        raw = 0
+        for handle, shift in self._handles:
+            raw |= resolve(handle.value) << shift
+        return self._store(raw)
+
+    def field(self, name):
+        """(shift, mask) of a field, for inline decoding: (raw >> shift) & mask."""
+        return self._fields[name]
+
+    def decode(self, raw, name):
+        shift, mask = self._fields[name]
+        return (raw >> shift) & mask
+
+    def mask(self, *names):
+        """Bit mask covering the given fields, e.g. a VALID/READY pair."""
+        bits = 0
+        for name in names:
+            shift, mask = self._fields[name]
+            bits |= mask << shift
+        return bits
+
+    def unpacker(self, names=None):
+        """Function raw -> list of field values in names order (default all fields)."""
+        pairs = [self._fields[name] for name in (names or self.names)]
+        return lambda raw: [(raw >> s) & m for s, m in pairs]
+
+    def row(self, raw=None):
+        """Fields of raw (default: last sample) as a reused NumPy uint64 row."""
+        if self._row is None:
+            raise RuntimeError("NumPy is not installed; use record or unpacker() instead")
+        raw = self.record.raw if raw is None else raw
+        row = self._row
+        for i, name in enumerate(self.names):
+            shift, mask = self._fields[name]
+            row[i] = (raw >> shift) & mask
+        return row
+
+    def history_raw(self, count=None):
+        """Up to count most recent packed samples, oldest first."""
+        held = min(self.count, self.depth)
+        count = held if count is None else min(count, held)
+        start = (self._head - count) % self.depth if self.depth else 0
+        return [self._ring[(start + i) % self.depth] for i in range(count)]
+
+    def history(self, count=None):
+        """Up to count most recent samples as records, oldest first."""
+        return [self.Record(raw) for raw in self.history_raw(count)]
+
+    def history_array(self, count=None):
+        """Up to count most recent samples as a (count, fields) NumPy array."""
+        if np is None:
+            raise RuntimeError("NumPy is not installed; use history() instead")
+        unpack = self.unpacker()
+        return np.array([unpack(raw) for raw in self.history_raw(count)],
+                        dtype=np.uint64).reshape(-1, len(self.names))
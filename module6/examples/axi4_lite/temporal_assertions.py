@@ -0,0 +1,465 @@
+"""
+Temporal assertions for sampled signals.
+
+A small SVA-like property language evaluated once per sampled clock:
+
+    AWVALID && !AWREADY |=> AWVALID && $stable(AWADDR)
+    $rose(ARVALID) |-> ##[0:4] ARREADY
+    WVALID && WREADY |-> ##[1:8] BVALID
+    !ARESETn |=> !BVALID && !RVALID
+
+Supported: boolean expressions over signals (!, &&, ||, ==, !=, <, <=,
+>, >=, ~, &, |, ^, parentheses, integer literals), $rose, $fell, $stable,
+$changed and $past on a signal, cycle delays ##N and ##[M:N], and the
+implications |-> (same cycle) and |=> (next cycle). A property without
+an implication must match starting on every cycle.
+
+Operators bind as in SystemVerilog, tightest first: ! ~, then < <= > >=,
+== !=, &, ^, |, &&, ||. So !a == b is (!a) == b and a & b == c is
+a & (b == c). ~ inverts within the width of its operand: signals are 1
+bit unless declared with TemporalEngine.signal(name, width) or
+set_width(), so ~VALID is 0 or 1 and ~ADDR needs ADDR's width.
+
+TemporalEngine compiles every property into a list of steps (delay
+window plus a guard compiled to a Python function) and keeps the running
+attempts of all properties in shared parallel lists. step() advances
+each live thread once, so its cost follows the number of active
+attempts, not the number of properties: the first guard of a property
+is only evaluated when one of its signals changed, or while it is known
+to hold (for example a level that stays high).
+"""
+
+import re
+from collections import deque
+
+
+class PropertySyntaxError(ValueError):
+    """Raised when a property string cannot be parsed."""
+
+
+_TOKEN = re.compile(r"""\s*(?:
+    (?P<range>\#\#\s*\[\s*\d+\s*:\s*\d+\s*\]) |
+    (?P<delay>\#\#\s*\d+) |
+    (?P<impl>\|->|\|=>) |
+    (?P<func>\$[a-z]+) |
+    (?P<num>0x[0-9a-fA-F]+|\d+) |
+    (?P<name>[A-Za-z_][\w.]*) |
+    (?P<op>&&|\|\||==|!=|<=|>=|[!()<>~&|^])
+)""", re.VERBOSE)
+
+_FUNCS = {
+    "$rose": "(c[{0}] & 1 and not p[{0}] & 1)",
+    "$fell": "(p[{0}] & 1 and not c[{0}] & 1)",
+    "$stable": "(c[{0}] == p[{0}])",
+    "$changed": "(c[{0}] != p[{0}])",
+    "$past": "p[{0}]",
+}
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if not match or match.end() == pos:
+            raise PropertySyntaxError(f"Unexpected input at {pos}: {text[pos:]!r}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        pos = match.end()
+    tokens.append(("end", ""))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser producing steps of (lo, hi, source, signals)."""
+
+    def __init__(self, text, resolve):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.pos = 0
+        self.resolve = resolve  # Signal name -> index
+        self.signals = set()
+
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def take(self, kind=None, value=None):
+        token = self.tokens[self.pos]
+        if (kind and token[0] != kind) or (value and token[1] != value):
+            raise PropertySyntaxError(f"Expected {value or kind} in {self.text!r}, got {token[1]!r}")
+        self.pos += 1
+        return token
+
+    def delay(self):
+        kind, text = self.peek()
+        if kind == "delay":
+            self.take()
+            n = int(text[2:])
+            return n, n
+        if kind == "range":
+            self.take()
+            lo, hi = (int(v) for v in text[2:].strip(" []").split(":"))
+            if lo > hi:
+                raise PropertySyntaxError(f"Empty delay range {text} in {self.text!r}")
+            return lo, hi
+        return None
+
+    def sequence(self):
+        steps = []
+        window = self.delay() or (0, 0)
+        while True:
+            self.signals = set()
+            source = self.expr()[0]
+            steps.append((window[0], window[1], source, frozenset(self.signals)))
+            window = self.delay()
+            if window is None:
+                return steps
+
+    # Each expression level returns (source, mask, logical): mask is the
+    # Python source of the all-ones mask of the value's width (the widest
+    # operand, as in SystemVerilog), and logical marks "and"/"or" results,
+    # which Python leaves as an operand value rather than 0/1.
+
+    @staticmethod
+    def _operand(node):
+        source, _, logical = node
+        return f"bool{source}" if logical else source
+
+    def _logical(self, op, python, operand):
+        node = operand()
+        while self.peek() == ("op", op):
+            self.take()
+            right = operand()
+            node = (f"({node[0]} {python} {right[0]})", "1", True)
+        return node
+
+    def _binary(self, ops, operand, width):
+        node = operand()
+        while self.peek()[0] == "op" and self.peek()[1] in ops:
+            op = self.take()[1]
+            right = operand()
+            source = f"({self._operand(node)} {op} {self._operand(right)})"
+            node = (source, f"({node[1]} | {right[1]})" if width else "1", False)
+        return node
+
+    def expr(self):
+        return self._logical("||", "or", self.conjunction)
+
+    def conjunction(self):
+        return self._logical("&&", "and", self.bit_or)
+
+    def bit_or(self):
+        return self._binary(("|",), self.bit_xor, width=True)
+
+    def bit_xor(self):
+        return self._binary(("^",), self.bit_and, width=True)
+
+    def bit_and(self):
+        return self._binary(("&",), self.equality, width=True)
+
+    def equality(self):
+        return self._binary(("==", "!="), self.relational, width=False)
+
+    def relational(self):
+        return self._binary(("<", "<=", ">", ">="), self.unary, width=False)
+
+    def unary(self):
+        if self.peek() == ("op", "!"):
+            self.take()
+            return f"(not {self.unary()[0]})", "1", False
+        if self.peek() == ("op", "~"):
+            self.take()
+            node = self.unary()
+            return f"(~{self._operand(node)} & {node[1]})", node[1], False
+        return self.primary()
+
+    def primary(self):
+        kind, text = self.take()
+        if kind == "num":
+            value = int(text, 0)
+            return str(value), str((1 << max(value.bit_length(), 1)) - 1), False
+        if kind == "name":
+            index = self.resolve(text)
+            self.signals.add(index)
+            return f"c[{index}]", f"m[{index}]", False
+        if kind == "func":
+            if text not in _FUNCS:
+                raise PropertySyntaxError(f"Unknown function {text} in {self.text!r}")
+            self.take("op", "(")
+            name = self.take("name")[1]
+            self.take("op", ")")
+            index = self.resolve(name)
+            self.signals.add(index)
+            mask = f"m[{index}]" if text == "$past" else "1"
+            return _FUNCS[text].format(index), mask, text in ("$rose", "$fell")
+        if (kind, text) == ("op", "("):
+            node = self.expr()
+            self.take("op", ")")
+            return node
+        raise PropertySyntaxError(f"Unexpected {text!r} in {self.text!r}")
+
+    def property(self):
+        antecedent = self.sequence()
+        kind, text = self.peek()
+        if kind != "impl":
+            self.take("end")
+            return [], antecedent
+        self.take()
+        consequent = self.sequence()
+        self.take("end")
+        if text == "|=>":
+            lo, hi, source, signals = consequent[0]
+            consequent[0] = (lo + 1, hi + 1, source, signals)
+        if antecedent[0][:2] != (0, 0):
+            raise PropertySyntaxError(f"Antecedent cannot start with a delay: {self.text!r}")
+        return antecedent, consequent
+
+
+class TemporalProperty:
+    """A compiled property: steps[i] is (lo, hi, guard), the first n_ante are the antecedent."""
+
+    def __init__(self, name, text, steps, n_ante, trigger):
+        self.name = name
+        self.text = text
+        self.steps = steps
+        self.n_ante = n_ante
+        self.trigger = trigger  # Signals of the first guard
+        self.attempts = 0
+        self.passes = 0
+        self.failures = 0
+
+    def __str__(self):
+        return f"{self.name}: {self.text}"
+
+
+class TemporalEngine:
+    """
+    Evaluates many temporal properties over one sampled signal vector.
+
+    Register properties with add() before the first step(); call step()
+    once per sampled clock with the values of self.names, in order.
+
+    A thread is one attempt waiting in the delay window of one step. All
+    threads live in five parallel lists (property, step, cycles waited,
+    start cycle, obligation). Antecedent threads are anonymous: when their
+    window closes the attempt is simply vacuous. Once an antecedent has
+    matched, an obligation is opened and counted; it passes when any of
+    its consequent threads reaches the end and fails when its last thread
+    dies. Failures are counted per property and the last max_failures are
+    kept as (property index, start cycle, fail cycle) tuples.
+    """
+
+    def __init__(self, max_failures=64, on_fail=None):
+        self.names = []
+        self._index = {}
+        self._masks = []  # All-ones mask of each signal's width, read by ~
+        self.properties = []
+        self.failures = deque(maxlen=max_failures)
+        self.on_fail = on_fail  # Called with (property, start cycle, fail cycle)
+        self.cycle = 0
+        self.thread_steps = 0  # Thread advances over the whole run
+        self.peak_threads = 0
+        self._guards = {}  # Python source -> compiled guard
+        # Threads
+        self._t_prop = []
+        self._t_step = []
+        self._t_wait = []
+        self._t_start = []
+        self._t_ob = []
+        # Obligations
+        self._ob_prop = []
+        self._ob_start = []
+        self._ob_live = []
+        self._ob_done = []
+        self._ob_free = []
+        # First-guard scheduling
+        self._fanout = {}  # Signal index -> implication properties triggered by it
+        self._armed = set()  # Implications whose first guard holds while nothing changes
+        self._always = []  # Plain properties: an attempt every cycle
+        self._prev = None
+        self._c = None
+        self._p = None
+
+    def signal(self, name, width=None):
+        """Index of name in the sampled vector, registering it if needed."""
+        index = self._index.get(name)
+        if index is None:
+            if self._prev is not None:
+                raise RuntimeError(f"Cannot add signal {name} after sampling has started")
+            index = self._index[name] = len(self.names)
+            self.names.append(name)
+            self._masks.append(1)
+        if width is not None:
+            self.set_width(name, width)
+        return index
+
+    def set_width(self, name, width):
+        """Declare the width of a signal (1 bit until declared); only ~ uses it."""
+        self._masks[self._index[name]] = (1 << width) - 1
+
+    def _guard(self, source):
+        guard = self._guards.get(source)
+        if guard is None:
+            guard = self._guards[source] = eval(f"lambda c, p: {source}", {"m": self._masks})
+        return guard
+
+    def add(self, name, text, bind=None):
+        """
+        Compile text into a property and return its index. bind maps
+        names used in text to signal names, so one property text can be
+        instantiated on many channels.
+        """
+        bind = bind or {}
+        parser = _Parser(text, lambda sig: self.signal(bind.get(sig, sig)))
+        antecedent, consequent = parser.property()
+        steps = [(lo, hi, self._guard(source)) for lo, hi, source, _ in antecedent + consequent]
+        trigger = (antecedent or consequent)[0][3]
+        prop = TemporalProperty(name, text, steps, len(antecedent), trigger)
+        pid = len(self.properties)
+        self.properties.append(prop)
+        if antecedent:
+            for index in trigger:
+                self._fanout.setdefault(index, []).append(pid)
+        else:
+            self._always.append(pid)
+        return pid
+
+    @property
+    def active_threads(self):
+        return len(self._t_prop)
+
+    def abort(self):
+        """Drop every running attempt (for example on reset) and restart sampling."""
+        for lst in (self._t_prop, self._t_step, self._t_wait, self._t_start, self._t_ob):
+            lst.clear()
+        for lst in (self._ob_prop, self._ob_start, self._ob_live, self._ob_done, self._ob_free):
+            lst.clear()
+        self._armed.clear()
+        self._prev = None
+
+    def _open(self, pid, start):
+        if self._ob_free:
+            ob = self._ob_free.pop()
+            self._ob_prop[ob] = pid
+            self._ob_start[ob] = start
+            self._ob_live[ob] = 0
+            self._ob_done[ob] = False
+        else:
+            ob = len(self._ob_prop)
+            self._ob_prop.append(pid)
+            self._ob_start.append(start)
+            self._ob_live.append(0)
+            self._ob_done.append(False)
+        self.properties[pid].attempts += 1
+        return ob
+
+    def _close(self, ob):
+        """The obligation has no threads left: it failed unless it already passed."""
+        if not self._ob_done[ob]:
+            prop = self.properties[self._ob_prop[ob]]
+            prop.failures += 1
+            record = (self._ob_prop[ob], self._ob_start[ob], self.cycle)
+            self.failures.append(record)
+            if self.on_fail is not None:
+                self.on_fail(prop, record[1], record[2])
+        self._ob_free.append(ob)
+
+    def _release(self, ob):
+        live = self._ob_live[ob] - 1
+        self._ob_live[ob] = live
+        if live == 0:
+            self._close(ob)
+
+    def _enter(self, pid, s, start, ob):
+        """Step s-1 of pid just matched: wait for step s (evaluating it now if lo is 0)."""
+        steps = self.properties[pid].steps
+        if s == len(steps):
+            if not self._ob_done[ob]:
+                self._ob_done[ob] = True
+                self.properties[pid].passes += 1
+            return
+        opened = s == self.properties[pid].n_ante
+        if opened:
+            ob = self._open(pid, start)
+        lo, hi, guard = steps[s]
+        if lo == 0 and guard(self._c, self._p):
+            self._enter(pid, s + 1, start, ob)
+        if hi > 0 and not (ob >= 0 and self._ob_done[ob]):
+            self._t_prop.append(pid)
+            self._t_step.append(s)
+            self._t_wait.append(0)
+            self._t_start.append(start)
+            self._t_ob.append(ob)
+            if ob >= 0:
+                self._ob_live[ob] += 1
+        if opened and self._ob_live[ob] == 0:
+            self._close(ob)
+
+    def step(self, values):
+        """Advance every property by one sampled clock."""
+        c = values
+        p = self._prev if self._prev is not None else values
+        self._c, self._p = c, p
+        cycle = self.cycle
+        t_prop, t_step, t_wait, t_start, t_ob = (
+            self._t_prop, self._t_step, self._t_wait, self._t_start, self._t_ob)
+        ob_done = self._ob_done
+        properties = self.properties
+
+        # Advance the threads started on earlier cycles, compacting in place;
+        # threads spawned meanwhile are appended after index n
+        n = len(t_prop)
+        w = 0
+        for k in range(n):
+            pid, s, ob = t_prop[k], t_step[k], t_ob[k]
+            if ob >= 0 and ob_done[ob]:
+                self._release(ob)
+                continue
+            waited = t_wait[k] + 1
+            lo, hi, guard = properties[pid].steps[s]
+            if waited >= lo and guard(c, p):
+                self._enter(pid, s + 1, t_start[k], ob)
+            if waited < hi and not (ob >= 0 and ob_done[ob]):
+                t_prop[w] = pid
+                t_step[w] = s
+                t_wait[w] = waited
+                t_start[w] = t_start[k]
+                t_ob[w] = ob
+                w += 1
+            elif ob >= 0:
+                self._release(ob)
+        for lst in (t_prop, t_step, t_wait, t_start, t_ob):
+            del lst[w:n]
+        self.thread_steps += n
+
+        # Start new attempts
+        for pid in self._always:
+            self._enter(pid, 0, cycle, -1)
+        if self._prev is None:
+            touched = {pid for pids in self._fanout.values() for pid in pids}
+        else:
+            touched = set()
+            for index, pids in self._fanout.items():
+                if c[index] != p[index]:
+                    touched.update(pids)
+        armed = self._armed
+        for pid in touched:
+            guard = properties[pid].steps[0][2]
+            if guard(c, p):
+                self._enter(pid, 1, cycle, -1)
+            if guard(c, c):
+                armed.add(pid)
+            else:
+                armed.discard(pid)
+        for pid in armed:
+            if pid not in touched:
+                self._enter(pid, 1, cycle, -1)
+
+        if len(t_prop) > self.peak_threads:
+            self.peak_threads = len(t_prop)
+        self._prev = list(c)
+        self.cycle = cycle + 1
+
+    def describe(self, record):
+        pid, start, cycle = record
+        return f"{self.properties[pid]} failed: started cycle {start}, failed cycle {cycle}"
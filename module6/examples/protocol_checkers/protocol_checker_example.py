@@ -1,8 +1,20 @@
 """
 Module 6 Example 6.3: Protocol Checker
 Demonstrates protocol compliance checking.
+
+Valid/ready handshake properties are declared once as HandshakeRule
+entries and compiled by HandshakeRuleSet into an 8-entry transition
+table. HandshakeMachine evaluates one clock per sample() call with a
+table lookup and integer state (stalled flag, wait counter, held data),
+counts violations per rule and keeps only the last few as compact
+(timestamp, rule, data) records, so it can run on every clock of a
+long simulation.
 """
 
+import random
+import time
+from collections import deque
+
 from pyuvm import *
 # Explicitly import uvm_seq_item_pull_port - it may not be exported by from pyuvm import *
 # Try multiple possible import paths
@@ -47,16 +59,184 @@ import cocotb
 from cocotb.triggers import Timer
 
 
+
+
+# Handshake rule kinds
+VALID_STABLE = "valid stable until ready"
+DATA_STABLE = "data stable while valid && !ready"
+MAX_LATENCY = "max valid-to-ready latency"
+
+# Transition table entry layout: action flags, then one violation bit per rule
+NEXT_STALLED = 1  # valid && !ready this cycle
+COMPARE_DATA = 2  # Stalled last cycle and valid now: data must match
+COUNT_WAIT = 4  # Stalled this cycle: increment the wait counter
+HANDSHAKE = 8  # valid && ready this cycle
+RULE_SHIFT = 4
+
+
+class HandshakeRule:
+    """
+    One declared handshake property.
+
+    kind is VALID_STABLE, DATA_STABLE or MAX_LATENCY. For MAX_LATENCY,
+    limit is the number of cycles valid may wait for ready; the rule fires
+    once per transfer, on the first cycle past the limit. severity is
+    "error" or "warning".
+    """
+
+    def __init__(self, name, kind, limit=0, severity="error"):
+        if kind not in (VALID_STABLE, DATA_STABLE, MAX_LATENCY):
+            raise ValueError(f"Unknown handshake rule kind: {kind!r}")
+        self.name = name
+        self.kind = kind
+        self.limit = limit
+        self.severity = severity
+
+    def __str__(self):
+        text = f"{self.name}: {self.kind}"
+        return f"{text} {self.limit} cycles" if self.kind == MAX_LATENCY else text
+
+
+DEFAULT_RULES = (
+    HandshakeRule("valid_stable", VALID_STABLE),
+    HandshakeRule("data_stable", DATA_STABLE),
+    HandshakeRule("slow_ready", MAX_LATENCY, limit=1, severity="warning"),
+    HandshakeRule("max_latency", MAX_LATENCY, limit=3),
+)
+
+# Soak rules: the legal source's ready is random, so long waits are legal
+# there and the latency rules only count them (as warnings)
+SOAK_RULES = (
+    HandshakeRule("valid_stable", VALID_STABLE),
+    HandshakeRule("data_stable", DATA_STABLE),
+    HandshakeRule("slow_ready", MAX_LATENCY, limit=1, severity="warning"),
+    HandshakeRule("max_latency", MAX_LATENCY, limit=3, severity="warning"),
+)
+
+
+class HandshakeRuleSet:
+    """
+    Rules compiled into a transition table.
+
+    The table is indexed by (stalled << 2) | (ready << 1) | valid and each
+    entry holds the action flags plus the violation bits that follow from
+    the index alone (valid dropped while stalled). Data comparison and
+    latency limits need one extra integer compare each, driven by the
+    COMPARE_DATA and COUNT_WAIT flags.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES):
+        self.rules = tuple(rules)
+        self.names = [rule.name for rule in self.rules]
+        self.is_error = [rule.severity == "error" for rule in self.rules]
+        valid_mask = 0
+        self.data_mask = 0
+        self.latency_at = {}  # Wait count -> violation bits
+        for i, rule in enumerate(self.rules):
+            bit = 1 << i
+            if rule.kind == VALID_STABLE:
+                valid_mask |= bit
+            elif rule.kind == DATA_STABLE:
+                self.data_mask |= bit
+            else:
+                self.latency_at[rule.limit + 1] = self.latency_at.get(rule.limit + 1, 0) | bit
+        self.table = []
+        for index in range(8):
+            stalled, ready, valid = index >> 2, (index >> 1) & 1, index & 1
+            entry = 0
+            if valid and not ready:
+                entry |= NEXT_STALLED
+                if self.latency_at:
+                    entry |= COUNT_WAIT
+            if valid and ready:
+                entry |= HANDSHAKE
+            if stalled and valid and self.data_mask:
+                entry |= COMPARE_DATA
+            if stalled and not valid:
+                entry |= valid_mask << RULE_SHIFT
+            self.table.append(entry)
+
+
+class HandshakeMachine:
+    """
+    Per-cycle checker for one valid/ready channel.
+
+    sample() costs one table lookup plus at most two integer compares.
+    Each violation increments counts[rule] and is kept as a
+    (timestamp, rule index, data) tuple in records, which only holds the
+    last max_records violations.
+    """
+
+    def __init__(self, ruleset, max_records=64):
+        self.ruleset = ruleset
+        self._table = ruleset.table
+        self._data_mask = ruleset.data_mask
+        self._latency_at = ruleset.latency_at
+        self.records = deque(maxlen=max_records)
+        self.counts = [0] * len(ruleset.rules)
+        self.cycles = 0
+        self.transfers = 0
+        self.stall_cycles = 0
+        self._state = 0  # 4 while stalled, so it can be or-ed into the index
+        self._wait = 0
+        self._data = 0
+
+    def sample(self, valid, ready, data, timestamp):
+        """Check one clock; returns the violation bits (0 if none)."""
+        entry = self._table[self._state | (ready << 1) | valid]
+        failed = entry >> RULE_SHIFT
+        if entry & COMPARE_DATA and data != self._data:
+            failed |= self._data_mask
+        if entry & COUNT_WAIT:
+            self._wait += 1
+            self.stall_cycles += 1
+            failed |= self._latency_at.get(self._wait, 0)
+        else:
+            self._wait = 0
+        if entry & NEXT_STALLED:
+            self._state = 4
+            self._data = data
+        else:
+            self._state = 0
+        if entry & HANDSHAKE:
+            self.transfers += 1
+        self.cycles += 1
+        if failed:
+            self._record(failed, timestamp, data)
+        return failed
+
+    def _record(self, failed, timestamp, data):
+        rule = 0
+        while failed:
+            if failed & 1:
+                self.counts[rule] += 1
+                self.records.append((timestamp, rule, data))
+            failed >>= 1
+            rule += 1
+
+    @property
+    def errors(self):
+        return sum(n for n, is_error in zip(self.counts, self.ruleset.is_error) if is_error)
+
+    @property
+    def warnings(self):
+        return sum(n for n, is_error in zip(self.counts, self.ruleset.is_error) if not is_error)
+
+    def describe(self, record):
+        timestamp, rule, data = record
+        return f"{self.ruleset.rules[rule]} violated at time {timestamp} (data=0x{data:02X})"
+
+
 class ProtocolTransaction(uvm_sequence_item):
     """Transaction for protocol checker."""
-    
+
     def __init__(self, name="ProtocolTransaction"):
         super().__init__(name)
         self.valid = False
         self.ready = False
         self.data = 0
         self.timestamp = 0
-    
+
     def __str__(self):
         return f"valid={self.valid}, ready={self.ready}, data=0x{self.data:02X}"
 
@@ -69,136 +249,192 @@ class ProtocolChecker(uvm_subscriber):
     - Protocol rule checking
     - Error detection
     - Protocol compliance monitoring
+
+    Rules come from ConfigDB "protocol_rules" (default DEFAULT_RULES) and
+    the number of retained violation records from
+    "protocol_max_violations" (default 64). Only the first LOG_LIMIT
+    violations are logged as they happen.
     """
 
-    def __init__(self, name="ProtocolChecker", parent=None):
-        super().__init__(name, parent)
-        # uvm_subscriber automatically provides analysis_export
-        
-        # Protocol state
-        self.prev_valid = False
-        self.prev_ready = False
-        self.errors = []
-        self.warnings = []
-    
+    LOG_LIMIT = 10
+
+    def build_phase(self):
+        try:
+            rules = ConfigDB().get(self, "", "protocol_rules")
+        except UVMConfigItemNotFound:
+            rules = DEFAULT_RULES
+        try:
+            max_records = ConfigDB().get(self, "", "protocol_max_violations")
+        except UVMConfigItemNotFound:
+            max_records = 64
+        self.machine = HandshakeMachine(HandshakeRuleSet(rules), max_records)
+        self.logged = 0
+
     def write(self, txn):
         """Write method - check protocol compliance."""
-        self.logger.debug(f"[{self.get_name()}] Checking: {txn}")
-        
-        # Protocol Rule 1: valid should not change while ready is asserted
-        if self.prev_ready and self.prev_valid and txn.valid != self.prev_valid:
-            error = f"Protocol violation: valid changed while ready asserted at time {txn.timestamp}"
-            self.errors.append(error)
-            self.logger.error(f"[{self.get_name()}] {error}")
-        
-        # Protocol Rule 2: ready should not change while valid is asserted
-        if self.prev_valid and self.prev_ready and txn.ready != self.prev_ready:
-            error = f"Protocol violation: ready changed while valid asserted at time {txn.timestamp}"
-            self.errors.append(error)
-            self.logger.error(f"[{self.get_name()}] {error}")
-        
-        # Protocol Rule 3: Data should be valid when valid and ready are both high
-        if txn.valid and txn.ready:
-            self.logger.info(f"[{self.get_name()}] Protocol OK: Valid handshake, data=0x{txn.data:02X}")
-        
-        # Protocol Rule 4: Warning if valid asserted without ready
-        if txn.valid and not txn.ready:
-            warning = f"Warning: valid asserted without ready at time {txn.timestamp}"
-            self.warnings.append(warning)
-            self.logger.warning(f"[{self.get_name()}] {warning}")
-        
-        # Update previous state
-        self.prev_valid = txn.valid
-        self.prev_ready = txn.ready
-    
+        failed = self.machine.sample(txn.valid, txn.ready, txn.data, txn.timestamp)
+        if failed and self.logged < self.LOG_LIMIT:
+            machine = self.machine
+            for record in list(machine.records)[-bin(failed).count("1"):]:
+                self.logged += 1
+                if machine.ruleset.is_error[record[1]]:
+                    self.logger.error(f"[{self.get_name()}] Protocol violation: {machine.describe(record)}")
+                else:
+                    self.logger.warning(f"[{self.get_name()}] Protocol warning: {machine.describe(record)}")
+
     def check_phase(self):
         """Check phase - report protocol compliance."""
+        machine = self.machine
         self.logger.info("=" * 60)
         self.logger.info(f"[{self.get_name()}] Protocol Checker Report")
         self.logger.info("=" * 60)
-        self.logger.info(f"Total errors: {len(self.errors)}")
-        self.logger.info(f"Total warnings: {len(self.warnings)}")
-        
-        if len(self.errors) == 0:
+        self.logger.info(f"Cycles checked: {machine.cycles}, transfers: {machine.transfers}, "
+                         f"stall cycles: {machine.stall_cycles}")
+        for rule, count in zip(machine.ruleset.rules, machine.counts):
+            self.logger.info(f"  {rule} ({rule.severity}): {count}")
+        self.logger.info(f"Total errors: {machine.errors}")
+        self.logger.info(f"Total warnings: {machine.warnings}")
+
+        if machine.errors == 0:
             self.logger.info("✓ Protocol compliance: PASSED")
         else:
             self.logger.error("✗ Protocol compliance: FAILED")
-            for error in self.errors:
-                self.logger.error(f"  {error}")
-        
-        if len(self.warnings) > 0:
-            for warning in self.warnings:
-                self.logger.warning(f"  {warning}")
-        
+        if machine.records:
+            self.logger.info(f"Last {len(machine.records)} violations:")
+            for record in machine.records:
+                self.logger.info(f"  {machine.describe(record)}")
+
         self.logger.info("=" * 60)
 
 
 class ProtocolMonitor(uvm_monitor):
     """Monitor that sends transactions to protocol checker."""
-    
+
     def build_phase(self):
         self.logger.info(f"[{self.get_name()}] Building protocol monitor")
         self.ap = uvm_analysis_port("ap", self)
-    
+
     async def run_phase(self):
         """Run phase - generate sample protocol transactions."""
         self.logger.info(f"[{self.get_name()}] Starting protocol monitor")
-        
+
         # Generate protocol transactions (some valid, some invalid)
         protocol_vectors = [
             (False, False, 0x00),  # Idle
-            (True, False, 0xAA),   # Valid without ready (warning)
-            (True, True, 0xBB),    # Valid handshake (OK)
+            (True, False, 0xAA),   # Valid without ready (stall)
+            (True, True, 0xBB),    # Handshake, but data changed while stalled (data_stable)
             (False, True, 0xCC),   # Ready without valid (OK)
-            (True, False, 0xDD),   # Valid without ready (warning)
-            (False, False, 0x00),  # Idle
+            (True, False, 0xDD),   # Valid without ready (stall)
+            (False, False, 0x00),  # Valid dropped before ready (valid_stable)
             (True, True, 0xEE),    # Valid handshake (OK)
+            (True, False, 0x11),   # Stall, 1 cycle
+            (True, False, 0x11),   # Stall, 2 cycles (slow_ready warning)
+            (True, False, 0x11),   # Stall, 3 cycles
+            (True, False, 0x11),   # Stall, 4 cycles (max_latency error)
+            (True, False, 0x11),   # Stall, 5 cycles (reported once per transfer)
+            (True, True, 0x11),    # Valid handshake (OK)
+            (False, False, 0x00),  # Idle
         ]
-        
+
         for i, (valid, ready, data) in enumerate(protocol_vectors):
             txn = ProtocolTransaction()
             txn.valid = valid
             txn.ready = ready
             txn.data = data
             txn.timestamp = i * 10
-            
+
             self.ap.write(txn)
             await Timer(10, unit="ns")
 
 
 class ProtocolEnv(uvm_env):
     """Environment with protocol checker."""
-    
+
     def build_phase(self):
         self.logger.info("Building ProtocolEnv")
         self.monitor = ProtocolMonitor.create("monitor", self)
         self.checker = ProtocolChecker.create("checker", self)
-    
+
     def connect_phase(self):
         self.logger.info("Connecting ProtocolEnv")
         self.monitor.ap.connect(self.checker.analysis_export)
 
 
+def legal_handshakes(cycles, seed, ready_pct=60):
+    """(valid, ready, data) per cycle from a source that never breaks the protocol."""
+    rng = random.Random(seed)
+    valid, data = 0, 0
+    for _ in range(cycles):
+        if not valid:
+            valid = 1 if rng.random() < 0.7 else 0
+            data = rng.getrandbits(8)
+        ready = 1 if rng.randrange(100) < ready_pct else 0
+        yield valid, ready, data
+        if valid and ready:
+            valid = 0
+
+
 # Note: @uvm_test() decorator removed to avoid import-time TypeError
 # Using cocotb test wrapper instead for compatibility with cocotb test discovery
 class ProtocolCheckerTest(uvm_test):
-    """Test demonstrating protocol checker."""
-    
+    """
+    Test demonstrating protocol checker.
+
+    1. Directed vectors through the monitor: one violation of each rule
+    2. Soak: SOAK_CYCLES legal cycles straight into a HandshakeMachine
+       with SOAK_RULES, reporting checked cycles per second and the
+       bounded record count; any error there is a checker bug
+    """
+
+    SOAK_CYCLES = 200_000
+    EXPECTED = {"valid_stable": 1, "data_stable": 1, "slow_ready": 1, "max_latency": 1}
+
     def build_phase(self):
         self.logger.info("=" * 60)
         self.logger.info("Protocol Checker Example Test")
         self.logger.info("=" * 60)
         self.env = ProtocolEnv.create("env", self)
-    
+        self.errors = 0
+        self.soak = None
+
     async def run_phase(self):
         self.raise_objection()
         self.logger.info("Running protocol checker test")
-        await Timer(100, unit="ns")
+        await Timer(200, unit="ns")
+
+        machine = HandshakeMachine(HandshakeRuleSet(SOAK_RULES), max_records=64)
+        start = time.perf_counter()
+        sample = machine.sample
+        for cycle, (valid, ready, data) in enumerate(legal_handshakes(self.SOAK_CYCLES, seed=1)):
+            sample(valid, ready, data, cycle * 10)
+        self.soak = (machine, time.perf_counter() - start)
         self.drop_objection()
-    
+
+    def check_phase(self):
+        machine = self.env.checker.machine
+        counts = dict(zip(machine.ruleset.names, machine.counts))
+        if counts != self.EXPECTED:
+            self.errors += 1
+            self.logger.error(f"Directed violations: got {counts}, expected {self.EXPECTED}")
+        machine, _ = self.soak
+        counts = dict(zip(machine.ruleset.names, machine.counts))
+        if machine.errors:
+            self.errors += 1
+            self.logger.error(f"Soak: legal source reported {machine.errors} errors: {counts}")
+
     def report_phase(self):
         self.logger.info("=" * 60)
-        self.logger.info("Protocol checker test completed")
+        machine, elapsed = self.soak
+        self.logger.info(f"Soak: {machine.cycles} cycles in {elapsed:.3f} s "
+                         f"({machine.cycles / elapsed:,.0f} cycles/s), {machine.transfers} transfers, "
+                         f"{machine.errors} errors, {len(machine.records)} records retained")
+        counts = dict(zip(machine.ruleset.names, machine.counts))
+        self.logger.info(f"Soak: {machine.warnings} latency warnings, expected from random ready "
+                         f"(slow_ready {counts['slow_ready']}, max_latency {counts['max_latency']})")
+        if self.errors:
+            self.logger.error(f"Protocol checker test FAILED with {self.errors} errors")
+        else:
+            self.logger.info("Protocol checker test completed")
         self.logger.info("=" * 60)
 
 
@@ -12,6 +12,12 @@
  *   dma_dst_addr: Destination address
  *   dma_length:  Transfer length
  *   dma_channel: DMA channel select
+ *
+ * A transfer is accepted on a clock edge where dma_start is high and the
+ * controller is idle. The controller then moves one byte per clock
+ * (length cycles) and pulses dma_done for one cycle; the latched
+ * descriptor stays in src_addr_reg/dst_addr_reg/length_reg/channel_reg
+ * until the next transfer is accepted.
  */
 
 module simple_dma (
@@ -30,6 +36,7 @@ module simple_dma (
     reg [15:0] length_reg;
     reg [2:0]  channel_reg;
     reg [15:0] count;
+    reg        busy;
     
     always @(posedge clk or negedge rst_n) begin
         if (!rst_n) begin
@@ -39,21 +46,23 @@ module simple_dma (
             length_reg <= 16'h0;
             channel_reg <= 3'h0;
             count <= 16'h0;
+            busy <= 1'b0;
         end else begin
-            if (dma_start && !dma_done) begin
-                src_addr_reg <= dma_src_addr;
-                dst_addr_reg <= dma_dst_addr;
-                length_reg <= dma_length;
-                channel_reg <= dma_channel;
-                count <= 16'h0;
-            end else if (!dma_done) begin
-                if (count < length_reg) begin
-                    count <= count + 1;
-                end else begin
-                    dma_done <= 1'b1;
-                end
-            end else if (dma_done) begin
+            if (!busy) begin
                 dma_done <= 1'b0;
+                if (dma_start) begin
+                    src_addr_reg <= dma_src_addr;
+                    dst_addr_reg <= dma_dst_addr;
+                    length_reg <= dma_length;
+                    channel_reg <= dma_channel;
+                    count <= 16'h0;
+                    busy <= 1'b1;
+                end
+            end else if (count < length_reg) begin
+                count <= count + 1;
+            end else begin
+                dma_done <= 1'b1;
+                busy <= 1'b0;
             end
         end
     end
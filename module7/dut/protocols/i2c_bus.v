@@ -0,0 +1,34 @@
+/**
+ * Module 7: I2C Bus
+ * 
+ * Open-drain I2C bus with pull-ups for two masters and one slave.
+ * 
+ * Each agent controls an active-high driver enable per line: while an
+ * enable is 1 the agent pulls that line low, while it is 0 the agent
+ * releases the line. A line is high only when every agent releases it
+ * (wired-AND), which is what clock stretching, clock synchronisation and
+ * arbitration rely on.
+ * 
+ * Ports:
+ *   m1_scl_oe, m1_sda_oe: Master 1 pull-down enables
+ *   m2_scl_oe, m2_sda_oe: Master 2 pull-down enables
+ *   s_scl_oe,  s_sda_oe:  Slave pull-down enables
+ *   scl:                  Resolved serial clock line
+ *   sda:                  Resolved serial data line
+ */
+
+module i2c_bus (
+    input  wire m1_scl_oe,
+    input  wire m1_sda_oe,
+    input  wire m2_scl_oe,
+    input  wire m2_sda_oe,
+    input  wire s_scl_oe,
+    input  wire s_sda_oe,
+    output wire scl,
+    output wire sda
+);
+
+    assign scl = ~(m1_scl_oe | m2_scl_oe | s_scl_oe);
+    assign sda = ~(m1_sda_oe | m2_sda_oe | s_sda_oe);
+
+endmodule
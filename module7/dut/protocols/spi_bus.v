@@ -0,0 +1,35 @@
+/**
+ * Module 7: SPI Bus
+ * 
+ * SPI interconnect for one master and four slaves.
+ * 
+ * The master drives sclk, mosi and one active-low chip select per slave;
+ * slaves read them directly. Each slave drives its own MISO output and
+ * only the selected slave reaches the master's miso line.
+ * 
+ * Ports:
+ *   sclk:           Serial clock (idle level set by CPOL)
+ *   mosi:           Master Out Slave In
+ *   cs0_n..cs3_n:   Active-low chip selects
+ *   miso0..miso3:   MISO outputs of slaves 0-3
+ *   miso:           MISO seen by the master
+ */
+
+module spi_bus (
+    input  wire sclk,
+    input  wire mosi,
+    input  wire cs0_n,
+    input  wire cs1_n,
+    input  wire cs2_n,
+    input  wire cs3_n,
+    input  wire miso0,
+    input  wire miso1,
+    input  wire miso2,
+    input  wire miso3,
+    output wire miso
+);
+
+    assign miso = (~cs0_n & miso0) | (~cs1_n & miso1) |
+                  (~cs2_n & miso2) | (~cs3_n & miso3);
+
+endmodule
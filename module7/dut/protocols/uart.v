@@ -1,7 +1,10 @@
 /**
  * Module 7: UART Transmitter/Receiver
  * 
- * A simple UART for protocol verification.
+ * A simple 8N1 UART for protocol verification.
+ * 
+ * Parameters:
+ *   CLKS_PER_BIT: Clock cycles per bit (default 100: 1 Mbaud at 100 MHz)
  * 
  * Ports:
  *   clk:      Clock signal
@@ -12,10 +15,13 @@
  *   tx_start: Start transmission
  *   tx_busy:  Transmission in progress
  *   rx_data:  Received data
- *   rx_ready: Received data ready
+ *   rx_ready: Received data ready (set at the middle of a valid stop bit,
+ *             cleared when the next start bit is detected)
  */
 
-module uart (
+module uart #(
+    parameter CLKS_PER_BIT = 100
+) (
     input  wire       clk,
     input  wire       rst_n,
     output reg        tx,
@@ -28,9 +34,10 @@ module uart (
 );
 
     // UART transmitter state machine
-    reg [3:0] tx_state;
-    reg [7:0] tx_shift;
-    reg [3:0] tx_bit_count;
+    reg [3:0]  tx_state;
+    reg [7:0]  tx_shift;
+    reg [3:0]  tx_bit_count;
+    reg [15:0] tx_clk_count;
     
     localparam TX_IDLE = 4'h0;
     localparam TX_START = 4'h1;
@@ -38,16 +45,17 @@ module uart (
     localparam TX_STOP = 4'h3;
     
     // UART receiver state machine
-    reg [3:0] rx_state;
-    reg [7:0] rx_shift;
-    reg [3:0] rx_bit_count;
+    reg [3:0]  rx_state;
+    reg [7:0]  rx_shift;
+    reg [3:0]  rx_bit_count;
+    reg [15:0] rx_clk_count;
     
     localparam RX_IDLE = 4'h0;
     localparam RX_START = 4'h1;
     localparam RX_DATA = 4'h2;
     localparam RX_STOP = 4'h3;
     
-    // Transmitter
+    // Transmitter: each bit is held for CLKS_PER_BIT clocks
     always @(posedge clk or negedge rst_n) begin
         if (!rst_n) begin
             tx <= 1'b1;
@@ -55,33 +63,52 @@ module uart (
             tx_state <= TX_IDLE;
             tx_shift <= 8'h0;
             tx_bit_count <= 4'h0;
+            tx_clk_count <= 16'h0;
         end else begin
             case (tx_state)
                 TX_IDLE: begin
                     if (tx_start) begin
-                        tx_state <= TX_START;
+                        tx <= 1'b0;  // Start bit
                         tx_shift <= tx_data;
                         tx_busy <= 1'b1;
+                        tx_clk_count <= 16'h0;
+                        tx_state <= TX_START;
                     end
                 end
                 TX_START: begin
-                    tx <= 1'b0;  // Start bit
-                    tx_state <= TX_DATA;
-                    tx_bit_count <= 4'h0;
+                    if (tx_clk_count == CLKS_PER_BIT - 1) begin
+                        tx <= tx_shift[0];
+                        tx_shift <= {1'b0, tx_shift[7:1]};
+                        tx_bit_count <= 4'h0;
+                        tx_clk_count <= 16'h0;
+                        tx_state <= TX_DATA;
+                    end else begin
+                        tx_clk_count <= tx_clk_count + 1;
+                    end
                 end
                 TX_DATA: begin
-                    tx <= tx_shift[0];
-                    tx_shift <= {1'b0, tx_shift[7:1]};
-                    if (tx_bit_count == 4'h7) begin
-                        tx_state <= TX_STOP;
+                    if (tx_clk_count == CLKS_PER_BIT - 1) begin
+                        tx_clk_count <= 16'h0;
+                        if (tx_bit_count == 4'h7) begin
+                            tx <= 1'b1;  // Stop bit
+                            tx_state <= TX_STOP;
+                        end else begin
+                            tx <= tx_shift[0];
+                            tx_shift <= {1'b0, tx_shift[7:1]};
+                            tx_bit_count <= tx_bit_count + 1;
+                        end
                     end else begin
-                        tx_bit_count <= tx_bit_count + 1;
+                        tx_clk_count <= tx_clk_count + 1;
                     end
                 end
                 TX_STOP: begin
-                    tx <= 1'b1;  // Stop bit
-                    tx_state <= TX_IDLE;
-                    tx_busy <= 1'b0;
+                    if (tx_clk_count == CLKS_PER_BIT - 1) begin
+                        tx_clk_count <= 16'h0;
+                        tx_busy <= 1'b0;
+                        tx_state <= TX_IDLE;
+                    end else begin
+                        tx_clk_count <= tx_clk_count + 1;
+                    end
                 end
                 default: begin
                     tx_state <= TX_IDLE;
@@ -91,7 +118,7 @@ module uart (
         end
     end
     
-    // Receiver (simplified - would need proper sampling in real implementation)
+    // Receiver: detect the start bit, then sample every bit at its middle
     always @(posedge clk or negedge rst_n) begin
         if (!rst_n) begin
             rx_data <= 8'h0;
@@ -99,30 +126,50 @@ module uart (
             rx_state <= RX_IDLE;
             rx_shift <= 8'h0;
             rx_bit_count <= 4'h0;
+            rx_clk_count <= 16'h0;
         end else begin
             case (rx_state)
                 RX_IDLE: begin
                     if (!rx) begin  // Start bit detected
                         rx_state <= RX_START;
                         rx_ready <= 1'b0;
+                        rx_clk_count <= 16'h0;
                     end
                 end
                 RX_START: begin
-                    rx_state <= RX_DATA;
-                    rx_bit_count <= 4'h0;
+                    if (rx_clk_count == CLKS_PER_BIT / 2 - 1) begin
+                        // Middle of the start bit: still low, or it was a glitch
+                        rx_state <= rx ? RX_IDLE : RX_DATA;
+                        rx_bit_count <= 4'h0;
+                        rx_clk_count <= 16'h0;
+                    end else begin
+                        rx_clk_count <= rx_clk_count + 1;
+                    end
                 end
                 RX_DATA: begin
-                    rx_shift <= {rx, rx_shift[7:1]};
-                    if (rx_bit_count == 4'h7) begin
-                        rx_state <= RX_STOP;
+                    if (rx_clk_count == CLKS_PER_BIT - 1) begin
+                        rx_clk_count <= 16'h0;
+                        rx_shift <= {rx, rx_shift[7:1]};
+                        if (rx_bit_count == 4'h7) begin
+                            rx_state <= RX_STOP;
+                        end else begin
+                            rx_bit_count <= rx_bit_count + 1;
+                        end
                     end else begin
-                        rx_bit_count <= rx_bit_count + 1;
+                        rx_clk_count <= rx_clk_count + 1;
                     end
                 end
                 RX_STOP: begin
-                    rx_data <= rx_shift;
-                    rx_ready <= 1'b1;
-                    rx_state <= RX_IDLE;
+                    if (rx_clk_count == CLKS_PER_BIT - 1) begin
+                        rx_clk_count <= 16'h0;
+                        if (rx) begin  // Valid stop bit
+                            rx_data <= rx_shift;
+                            rx_ready <= 1'b1;
+                        end
+                        rx_state <= RX_IDLE;
+                    end else begin
+                        rx_clk_count <= rx_clk_count + 1;
+                    end
                 end
                 default: begin
                     rx_state <= RX_IDLE;
@@ -133,4 +180,3 @@ module uart (
     end
 
 endmodule
-
@@ -1,6 +1,22 @@
 """
 Module 7 Example 7.1: DMA Verification
 Demonstrates complete DMA controller verification environment.
+
+The driver programs simple_dma.v through its register ports and the
+monitor reports each segment the DUT completed from its latched
+descriptor. Data movement is modelled in Python: a system memory applies
+every completed segment, a reference model applies every programmed
+transfer (including SCATTER_GATHER descriptor lists), and the scoreboard
+compares each destination region of the two images. Both images are
+sparse paged memories (a dict of fixed-size bytearray pages) moved with
+memoryview slice copies and compared with one buffer comparison per
+page, so multi-megabyte transfers per channel cost a few hundred
+memcpy/memcmp calls rather than a Python loop over bytes.
+
+With STIM_CAPTURE set, the driver also writes every transfer it drives,
+with its sim time, to a stimulus trace (stimulus_trace.py).
+DMAReplayTest drives a captured trace again without running any
+sequence, optionally starting at STIM_REPLAY_FROM_NS.
 """
 
 from pyuvm import *
@@ -33,12 +49,168 @@ if _uvm_analysis_imp is not None:
     globals()['uvm_analysis_imp'] = _uvm_analysis_imp
 
 import cocotb
-from cocotb.triggers import Timer
+from cocotb.clock import Clock
+from cocotb.triggers import Timer, RisingEdge
+from cocotb.utils import get_sim_time
+import os
+import random
+import struct
+import time
+
+from stimulus_trace import TraceReader, TraceWriter
+from wave_window import WaveWindow
+
+
+CLK_PERIOD_NS = 10
+PAGE_SIZE = 4096
+MAX_SEGMENT = 0xFFFF  # dma_length is 16 bits wide
+NUM_CHANNELS = 8  # dma_channel is 3 bits wide
+BURST_BYTES = 256  # Bus burst size used by DMASystemMemory
+TRACE_KIND = "dma"
+TRANSFER_TYPES = ("SIMPLE", "SCATTER_GATHER")
+_TRACE_HEADER = struct.Struct("<BBH")  # channel, transfer type, segment count
+_TRACE_SEGMENT = struct.Struct("<III")  # src_addr, dst_addr, length
+
+
+def _buffers_equal(a, b):
+    """
+    Compare two byte buffers.
+
+    bytearray comparison accepts any buffer on the right-hand side and
+    uses memcmp; memoryview == memoryview unpacks item by item, so the
+    left operand is made a bytearray first.
+    """
+    if not isinstance(a, bytearray):
+        a = bytearray(a)
+    return a == b
+
+
+def _first_difference(a, b):
+    """Offset of the first differing byte of two unequal buffers (bisection)."""
+    a, b = memoryview(a), memoryview(b)
+    lo, hi = 0, len(a)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if _buffers_equal(a[lo:mid], b[lo:mid]):
+            lo = mid
+        else:
+            hi = mid
+    return lo
+
+
+class SparseMemory:
+    """
+    Sparse byte-addressable memory made of fixed-size bytearray pages.
+
+    Pages are allocated on first write and unwritten bytes read as zero.
+    Every access is split at page boundaries and moved with memoryview
+    slice assignments, so copying or comparing a region costs one
+    memcpy/memcmp per page.
+    """
+
+    def __init__(self, page_size=PAGE_SIZE):
+        if page_size <= 0 or page_size & (page_size - 1):
+            raise ValueError(f"page_size must be a power of two, got {page_size}")
+        self.page_size = page_size
+        self.page_shift = page_size.bit_length() - 1
+        self.pages = {}
+        self._zero = bytearray(page_size)  # Stands in for unallocated pages; never written
+
+    @property
+    def allocated_bytes(self):
+        return len(self.pages) * self.page_size
+
+    def _chunks(self, addr, length):
+        """Yield (page_index, offset, count) for each page a region touches."""
+        mask = self.page_size - 1
+        while length > 0:
+            offset = addr & mask
+            count = min(self.page_size - offset, length)
+            yield addr >> self.page_shift, offset, count
+            addr += count
+            length -= count
+
+    def _page(self, index):
+        page = self.pages.get(index)
+        if page is None:
+            page = self.pages[index] = bytearray(self.page_size)
+        return page
+
+    def _slice(self, index, offset, count):
+        """Bytes [offset, offset + count) of one page, without copying."""
+        page = self.pages.get(index, self._zero)
+        if count == self.page_size:
+            return page
+        return memoryview(page)[offset:offset + count]
+
+    def _region(self, addr, length):
+        """A buffer holding a region: a page view if it fits in one page, else a copy."""
+        offset = addr & (self.page_size - 1)
+        if offset + length <= self.page_size:
+            return self._slice(addr >> self.page_shift, offset, length)
+        return self.read(addr, length)
+
+    def write(self, addr, data):
+        """Write a bytes-like object at addr."""
+        src = memoryview(data)
+        pos = 0
+        for index, offset, count in self._chunks(addr, len(src)):
+            memoryview(self._page(index))[offset:offset + count] = src[pos:pos + count]
+            pos += count
+
+    def read(self, addr, length):
+        """Return length bytes starting at addr as a bytearray."""
+        out = bytearray(length)
+        view = memoryview(out)
+        pos = 0
+        for index, offset, count in self._chunks(addr, length):
+            page = self.pages.get(index)
+            if page is not None:
+                view[pos:pos + count] = memoryview(page)[offset:offset + count]
+            pos += count
+        return out
+
+    def copy(self, src_addr, dst_addr, length, source=None):
+        """
+        Copy length bytes from src_addr in source (default: this memory)
+        to dst_addr. Overlapping regions behave like memmove.
+        """
+        source = self if source is None else source
+        if source is self and src_addr < dst_addr + length and dst_addr < src_addr + length:
+            self.write(dst_addr, self.read(src_addr, length))
+            return
+        dst = dst_addr
+        for index, offset, count in source._chunks(src_addr, length):
+            self.write(dst, source._slice(index, offset, count))
+            dst += count
+
+    def compare(self, other, addr, length):
+        """
+        Compare a region of this memory with the same region of other.
+
+        Returns None if they are equal, otherwise the address of the first
+        differing byte. Each page is checked with a single buffer
+        comparison; only a mismatching page is bisected.
+        """
+        for index, offset, count in self._chunks(addr, length):
+            chunk_addr = (index << self.page_shift) + offset
+            mine = self._slice(index, offset, count)
+            theirs = other._region(chunk_addr, count)
+            if not _buffers_equal(mine, theirs):
+                return chunk_addr + _first_difference(mine, theirs)
+        return None
 
 
 class DMATransaction(uvm_sequence_item):
-    """Transaction for DMA verification."""
-    
+    """
+    Transaction for DMA verification.
+
+    A SIMPLE transfer is one (src_addr, dst_addr, length) segment. A
+    SCATTER_GATHER transfer carries a descriptor list in segments, which
+    the driver programs into the DUT one segment at a time; src_addr and
+    dst_addr then hold the first segment and length the total.
+    """
+
     def __init__(self, name="DMATransaction"):
         super().__init__(name)
         self.src_addr = 0
@@ -46,20 +218,60 @@ class DMATransaction(uvm_sequence_item):
         self.length = 0
         self.channel = 0
         self.transfer_type = "SIMPLE"  # SIMPLE, SCATTER_GATHER
-    
+        self.segments = []  # [(src_addr, dst_addr, length), ...] for SCATTER_GATHER
+
+    def set_segments(self, segments):
+        """Make this a SCATTER_GATHER transfer over segments."""
+        self.transfer_type = "SCATTER_GATHER"
+        self.segments = list(segments)
+        self.src_addr, self.dst_addr = self.segments[0][0], self.segments[0][1]
+        self.length = sum(seg[2] for seg in self.segments)
+
+    def descriptors(self):
+        """The (src_addr, dst_addr, length) segments the DUT is programmed with."""
+        if self.transfer_type == "SCATTER_GATHER" and self.segments:
+            return self.segments
+        return [(self.src_addr, self.dst_addr, self.length)]
+
     def __str__(self):
-        return (f"channel={self.channel}, type={self.transfer_type}, "
+        text = (f"channel={self.channel}, type={self.transfer_type}, "
                 f"src=0x{self.src_addr:08X}, dst=0x{self.dst_addr:08X}, "
                 f"len={self.length}")
+        if self.transfer_type == "SCATTER_GATHER":
+            text += f", segments={len(self.segments)}"
+        return text
+
+
+def pack_transfer(txn):
+    """Trace payload of a transfer: header, then one record per descriptor."""
+    segments = txn.descriptors()
+    parts = [_TRACE_HEADER.pack(txn.channel, TRANSFER_TYPES.index(txn.transfer_type), len(segments))]
+    parts.extend(_TRACE_SEGMENT.pack(*seg) for seg in segments)
+    return b"".join(parts)
+
+
+def unpack_transfer(payload, name="DMATransaction"):
+    """DMATransaction rebuilt from a pack_transfer() payload."""
+    channel, kind, count = _TRACE_HEADER.unpack_from(payload)
+    segments = list(_TRACE_SEGMENT.iter_unpack(payload[_TRACE_HEADER.size:]))
+    if len(segments) != count:
+        raise ValueError(f"Trace payload holds {len(segments)} segments, header says {count}")
+    txn = DMATransaction(name)
+    txn.channel = channel
+    if TRANSFER_TYPES[kind] == "SCATTER_GATHER":
+        txn.set_segments(segments)
+    else:
+        txn.src_addr, txn.dst_addr, txn.length = segments[0]
+    return txn
 
 
 class DMASequence(uvm_sequence):
     """Sequence for DMA transfers."""
-    
+
     async def body(self):
         """Generate DMA transfer transactions."""
         print(f"[{self.get_name()}] Starting DMA sequence")
-        
+
         # Simple transfer
         txn = DMATransaction()
         txn.channel = 0
@@ -69,110 +281,296 @@ class DMASequence(uvm_sequence):
         txn.length = 256
         await self.start_item(txn)
         await self.finish_item(txn)
-        
-        # Scatter-gather transfer
+
+        # Scatter-gather transfer: gather four scattered 128-byte blocks
+        # into one contiguous 512-byte destination
         txn = DMATransaction()
         txn.channel = 1
-        txn.transfer_type = "SCATTER_GATHER"
-        txn.src_addr = 0x3000
-        txn.dst_addr = 0x4000
-        txn.length = 512
+        txn.set_segments([(0x3000 + i * 0x400, 0x4000 + i * 128, 128) for i in range(4)])
         await self.start_item(txn)
         await self.finish_item(txn)
 
 
+class DMABulkSequence(uvm_sequence):
+    """
+    Sequence moving total_bytes on one channel with SCATTER_GATHER transfers.
+
+    The source region [src_base, src_base + total_bytes) is split into
+    segments of up to MAX_SEGMENT bytes, the segments are gathered in
+    shuffled order into a contiguous destination, and every transfer
+    carries up to segments_per_transfer descriptors.
+    """
+
+    def __init__(self, name="DMABulkSequence", channel=0, src_base=0, dst_base=0,
+                 total_bytes=1 << 20, segments_per_transfer=4, seed=0):
+        super().__init__(name)
+        self.channel = channel
+        self.src_base = src_base
+        self.dst_base = dst_base
+        self.total_bytes = total_bytes
+        self.segments_per_transfer = segments_per_transfer
+        self.seed = seed
+
+    def plan(self):
+        """The segment list this sequence will program, in order."""
+        rng = random.Random(self.seed)
+        sources = []
+        offset = 0
+        while offset < self.total_bytes:
+            length = min(rng.randint(MAX_SEGMENT // 2, MAX_SEGMENT), self.total_bytes - offset)
+            sources.append((offset, length))
+            offset += length
+        rng.shuffle(sources)
+        segments = []
+        dst = self.dst_base
+        for offset, length in sources:
+            segments.append((self.src_base + offset, dst, length))
+            dst += length
+        return segments
+
+    async def body(self):
+        segments = self.plan()
+        for i in range(0, len(segments), self.segments_per_transfer):
+            txn = DMATransaction(f"bulk_ch{self.channel}_{i}")
+            txn.channel = self.channel
+            txn.set_segments(segments[i:i + self.segments_per_transfer])
+            await self.start_item(txn)
+            await self.finish_item(txn)
+
+
 class DMARegisterDriver(uvm_driver):
-    """Driver for DMA register interface."""
-    
+    """
+    Driver for DMA register interface.
+
+    Programs each descriptor of a transfer into simple_dma.v, pulses
+    dma_start for one clock and waits for dma_done. Each transfer is
+    published on ap before it is driven, which is the stream the reference
+    model and coverage consume. With STIM_CAPTURE set, each transfer is
+    also written to that trace file with the sim time it was driven at.
+    """
+
+    CAPTURE = True  # Honour STIM_CAPTURE
+
     def build_phase(self):
         self.logger.info(f"[{self.get_name()}] Building DMA register driver")
         self.seq_item_port = uvm_seq_item_pull_port("dma_driver_seq_item_port", self)
-    
+        self.ap = uvm_analysis_port("ap", self)
+        path = os.environ.get("STIM_CAPTURE") if self.CAPTURE else None
+        self.trace = TraceWriter(path, TRACE_KIND) if path else None
+
     async def run_phase(self):
         """Run phase - drive DMA register transactions."""
         self.logger.info(f"[{self.get_name()}] Starting DMA register driver")
-        
+
         while True:
             item = await self.seq_item_port.get_next_item()
-            self.logger.info(f"[{self.get_name()}] Configuring DMA: {item}")
-            
-            # Configure DMA registers
-            # In real code: cocotb.dut.dma_src_addr.value = item.src_addr
-            # In real code: cocotb.dut.dma_dst_addr.value = item.dst_addr
-            # In real code: cocotb.dut.dma_length.value = item.length
-            # In real code: cocotb.dut.dma_start.value = 1
-            
-            await Timer(10, unit="ns")
+            self.logger.debug(f"[{self.get_name()}] Configuring DMA: {item}")
+            await self.drive(item)
             self.seq_item_port.item_done()
 
+    async def drive(self, item):
+        """Publish item on ap (and the trace), then program each descriptor."""
+        dut = cocotb.top
+        if self.trace is not None:
+            self.trace.write(int(get_sim_time("ns")), pack_transfer(item))
+        self.ap.write(item)
+
+        for src, dst, length in item.descriptors():
+            dut.dma_src_addr.value = src
+            dut.dma_dst_addr.value = dst
+            dut.dma_length.value = length
+            dut.dma_channel.value = item.channel
+            dut.dma_start.value = 1
+            await RisingEdge(dut.clk)
+            dut.dma_start.value = 0
+            await RisingEdge(dut.dma_done)
+
+    def final_phase(self):
+        if self.trace is not None:
+            self.trace.close()
+            self.logger.info(f"[{self.get_name()}] Captured {self.trace.count} transfers "
+                             f"({self.trace.bytes} payload bytes) to {self.trace.path}")
+
+
+class DMAReplayDriver(DMARegisterDriver):
+    """
+    Driver that replays a stimulus trace instead of pulling from the sequencer.
+
+    run_phase takes nothing from seq_item_port; the test awaits replay()
+    with a TraceReader. Every transfer is rebuilt from its payload and
+    goes through drive(), so ap, the scoreboard and coverage see it as in
+    the captured run. With paced=True each transfer waits until its
+    captured time offset from the first replayed one, which keeps any
+    idle gaps of the original run.
+    """
+
+    CAPTURE = False  # Never overwrite the trace being replayed
+
+    async def run_phase(self):
+        self.logger.info(f"[{self.get_name()}] DMA replay driver ready")
+
+    async def replay(self, trace, from_ns=0, paced=True):
+        """Drive every transfer of trace at or after from_ns; returns the count."""
+        offset = None
+        count = 0
+        for time_ns, payload in trace.records(from_ns):
+            if paced:
+                now = int(get_sim_time("ns"))
+                if offset is None:
+                    offset = now - time_ns
+                elif time_ns + offset > now:
+                    await Timer(time_ns + offset - now, unit="ns")
+            await self.drive(unpack_transfer(payload, f"replay_{count}"))
+            count += 1
+        return count
+
 
 class DMAMonitor(uvm_monitor):
-    """Monitor for DMA transfers."""
-    
+    """
+    Monitor for DMA transfers.
+
+    Wakes only on dma_done and reports the segment the DUT actually
+    latched (src_addr_reg, dst_addr_reg, length_reg, channel_reg).
+    """
+
     def build_phase(self):
         self.logger.info(f"[{self.get_name()}] Building DMA monitor")
         self.ap = uvm_analysis_port("ap", self)
-    
+        self.segments = 0
+
     async def run_phase(self):
         """Run phase - monitor DMA transfers."""
         self.logger.info(f"[{self.get_name()}] Starting DMA monitor")
-        
+        dut = cocotb.top
+
         while True:
-            # Monitor DMA transfer completion
-            # In real code: await RisingEdge(cocotb.dut.dma_done)
-            
-            await Timer(20, unit="ns")
-            
-            # Create transaction from monitored transfer
-            txn = DMATransaction()
-            txn.channel = 0  # Simulated
-            txn.transfer_type = "SIMPLE"  # Simulated
-            txn.src_addr = 0x1000  # Simulated
-            txn.dst_addr = 0x2000  # Simulated
-            txn.length = 256  # Simulated
-            
-            self.logger.info(f"[{self.get_name()}] Monitored DMA transfer: {txn}")
+            await RisingEdge(dut.dma_done)
+
+            txn = DMATransaction("observed")
+            txn.channel = int(dut.channel_reg.value)
+            txn.src_addr = int(dut.src_addr_reg.value)
+            txn.dst_addr = int(dut.dst_addr_reg.value)
+            txn.length = int(dut.length_reg.value)
+            self.segments += 1
+
+            self.logger.debug(f"[{self.get_name()}] Monitored DMA segment: {txn}")
             self.ap.write(txn)
 
 
-class DMAScoreboard(uvm_subscriber):
-    """Scoreboard for DMA verification."""
+class DMASystemMemory(uvm_subscriber):
+    """
+    System memory behind the DMA controller.
+
+    simple_dma.v has no memory port, so this model stands in for its data
+    path: every segment the monitor reports is moved in BURST_BYTES bus
+    bursts (the source segment is read first, as the engine's buffer
+    would) and then forwarded on ap to the scoreboard.
+    """
 
-    def __init__(self, name="DMAScoreboard", parent=None):
+    def __init__(self, name="DMASystemMemory", parent=None):
         super().__init__(name, parent)
-        self.expected = []
-        self.actual = []
-        self.mismatches = []
-    
+        self.memory = SparseMemory()
+
+    def build_phase(self):
+        self.ap = uvm_analysis_port("ap", self)
+
     def write(self, txn):
-        """Receive DMA transfer transactions."""
-        self.actual.append(txn)
-        self.logger.info(f"[{self.get_name()}] Scoreboard received: {txn}")
-        
-        # Check against expected
-        if len(self.expected) > 0:
-            exp = self.expected.pop(0)
-            if (txn.src_addr == exp.src_addr and 
-                txn.dst_addr == exp.dst_addr and 
-                txn.length == exp.length):
-                self.logger.info(f"[{self.get_name()}] Transfer match: {txn}")
-            else:
-                self.mismatches.append((exp, txn))
-                self.logger.error(f"[{self.get_name()}] Transfer mismatch: expected={exp}, actual={txn}")
-    
-    def add_expected(self, txn):
-        """Add expected DMA transfer."""
-        self.expected.append(txn)
-    
+        data = memoryview(self.memory.read(txn.src_addr, txn.length))
+        for offset in range(0, txn.length, BURST_BYTES):
+            self.memory.write(txn.dst_addr + offset, data[offset:offset + BURST_BYTES])
+        self.ap.write(txn)
+
+
+class DMAReferenceModel:
+    """Applies programmed DMA transfers to an expected memory image."""
+
+    def __init__(self, memory=None):
+        self.memory = SparseMemory() if memory is None else memory
+        self.transfers = 0
+        self.bytes_moved = 0
+
+    def apply(self, txn):
+        """Apply every segment of txn in order (later segments win on overlap)."""
+        for src, dst, length in txn.descriptors():
+            self.memory.copy(src, dst, length)
+            self.bytes_moved += length
+        self.transfers += 1
+
+
+class DMAScoreboard(uvm_component):
+    """
+    Scoreboard for DMA verification.
+
+    expected_fifo receives transfers as the driver programs them and
+    observed_fifo the segments the DUT completed, after the system memory
+    has moved their data. For each transfer the scoreboard checks the
+    descriptors the DUT latched, applies the transfer to the reference
+    model and compares every destination region of the reference image
+    against the system memory.
+    """
+
+    def build_phase(self):
+        self.expected_fifo = uvm_tlm_analysis_fifo("expected_fifo", self)
+        self.observed_fifo = uvm_tlm_analysis_fifo("observed_fifo", self)
+        self.reference = DMAReferenceModel()
+        self.system_memory = None  # SparseMemory, set by the environment
+        self.transfers = 0
+        self.bytes_checked = 0
+        self.check_time = 0.0
+        self.mismatches = []
+
+    async def run_phase(self):
+        # The next segment cannot complete in the same time step as the one
+        # just observed, so the system memory still holds exactly this
+        # transfer's result when it is compared.
+        while True:
+            exp = await self.expected_fifo.get()
+            for src, dst, length in exp.descriptors():
+                act = await self.observed_fifo.get()
+                if (act.channel, act.src_addr, act.dst_addr, act.length) != (exp.channel, src, dst, length):
+                    self.mismatches.append((exp, act))
+                    self.logger.error(f"[{self.get_name()}] Descriptor mismatch: expected "
+                                      f"ch{exp.channel} 0x{src:08X}->0x{dst:08X} len={length}, "
+                                      f"actual {act}")
+            self.check_transfer(exp)
+
+    def check_transfer(self, txn):
+        """Apply txn to the reference model and compare its destination regions."""
+        start = time.perf_counter()
+        self.reference.apply(txn)
+        for _, dst, length in txn.descriptors():
+            addr = self.reference.memory.compare(self.system_memory, dst, length)
+            if addr is not None:
+                expected = self.reference.memory.read(addr, 1)[0]
+                actual = self.system_memory.read(addr, 1)[0]
+                self.mismatches.append((txn, addr))
+                self.logger.error(f"[{self.get_name()}] Data mismatch in {txn}: first at "
+                                  f"0x{addr:08X} expected 0x{expected:02X} actual 0x{actual:02X}")
+            self.bytes_checked += length
+        self.check_time += time.perf_counter() - start
+        self.transfers += 1
+
     def check_phase(self):
         """Check phase."""
-        self.logger.info(f"[{self.get_name()}] DMA Scoreboard: expected={len(self.expected)}, "
-                        f"actual={len(self.actual)}, mismatches={len(self.mismatches)}")
+        pending = self.expected_fifo.used() + self.observed_fifo.used()
+        if pending:
+            self.mismatches.append(("pending", pending))
+            self.logger.error(f"[{self.get_name()}] {pending} transfers/segments never matched")
+        self.logger.info(f"[{self.get_name()}] DMA Scoreboard: transfers={self.transfers}, "
+                         f"bytes_checked={self.bytes_checked}, mismatches={len(self.mismatches)}")
+
+    def report_phase(self):
+        mb = self.reference.bytes_moved / 1e6
+        rate = mb / self.check_time if self.check_time else 0.0
+        self.logger.info(f"[{self.get_name()}] Reference model + region compare: {mb:.1f} MB in "
+                         f"{self.check_time * 1e3:.1f} ms ({rate:.0f} MB/s), expected image "
+                         f"{self.reference.memory.allocated_bytes // 1024} KiB in "
+                         f"{len(self.reference.memory.pages)} pages")
 
 
 class DMACoverage(uvm_subscriber):
     """Coverage model for DMA verification."""
-    
+
     def __init__(self, name="DMACoverage", parent=None):
         super().__init__(name, parent)
         self.coverage_data = {
@@ -180,23 +578,23 @@ class DMACoverage(uvm_subscriber):
             'transfer_types': set(),
             'length_ranges': {'small': 0, 'medium': 0, 'large': 0}
         }
-    
+
     def build_phase(self):
         """Build phase - uvm_subscriber provides analysis_export automatically."""
         pass
-    
+
     def write(self, txn):
         """Sample coverage."""
         self.coverage_data['channels'].add(txn.channel)
         self.coverage_data['transfer_types'].add(txn.transfer_type)
-        
+
         if txn.length < 256:
             self.coverage_data['length_ranges']['small'] += 1
         elif txn.length < 1024:
             self.coverage_data['length_ranges']['medium'] += 1
         else:
             self.coverage_data['length_ranges']['large'] += 1
-    
+
     def report_phase(self):
         """Report coverage."""
         self.logger.info(f"[{self.get_name()}] DMA Coverage:")
@@ -207,75 +605,262 @@ class DMACoverage(uvm_subscriber):
 
 class DMAAgent(uvm_agent):
     """Agent for DMA register interface."""
-    
+
     def build_phase(self):
         self.logger.info("Building DMAAgent")
         self.driver = DMARegisterDriver.create("driver", self)
         self.seqr = uvm_sequencer("sequencer", self)
-    
+
     def connect_phase(self):
         self.driver.seq_item_port.connect(self.seqr.seq_item_export)
 
 
 class DMAEnv(uvm_env):
     """Environment for DMA verification."""
-    
+
     def build_phase(self):
         self.logger.info("=" * 60)
         self.logger.info("Building DMA Environment")
         self.logger.info("=" * 60)
         self.agent = DMAAgent.create("agent", self)
         self.monitor = DMAMonitor.create("monitor", self)
+        self.system = DMASystemMemory.create("system", self)
         self.scoreboard = DMAScoreboard.create("scoreboard", self)
         self.coverage = DMACoverage.create("coverage", self)
-    
+
     def connect_phase(self):
         self.logger.info("Connecting DMA Environment")
-        self.monitor.ap.connect(self.scoreboard.analysis_export)
-        self.monitor.ap.connect(self.coverage.analysis_export)
+        self.agent.driver.ap.connect(self.scoreboard.expected_fifo.analysis_export)
+        self.agent.driver.ap.connect(self.coverage.analysis_export)
+        self.monitor.ap.connect(self.system.analysis_export)
+        self.system.ap.connect(self.scoreboard.observed_fifo.analysis_export)
+        self.scoreboard.system_memory = self.system.memory
+
+    def load(self, addr, data):
+        """Preload data into both the system memory and the reference image."""
+        self.system.memory.write(addr, data)
+        self.scoreboard.reference.memory.write(addr, data)
 
 
 # Note: @uvm_test() decorator removed to avoid import-time TypeError
 # Using cocotb test wrapper instead for compatibility with cocotb test discovery
 class DMATest(uvm_test):
-    """Test demonstrating DMA verification."""
-    
+    """
+    Test demonstrating DMA verification.
+
+    1. Directed SIMPLE and SCATTER_GATHER transfers
+    2. Bulk: dma_bytes_per_channel (ConfigDB, default 2 MiB) moved on each
+       of the 8 channels with shuffled SCATTER_GATHER descriptor lists
+    3. Error injection: a corrupted destination byte is located by the
+       region compare
+
+    With WAVE_WINDOW_US (or WAVE_START_US/WAVE_STOP_US) set, a WaveWindow
+    records the WAVE_SCOPES signals and dumps a VCD window around every
+    ERROR logged by the environment.
+    """
+
+    BYTES_PER_CHANNEL = 2 << 20
+    SRC_BASE = 0x1000_0000
+    DST_BASE = 0x8000_0000
+    REGION_STRIDE = 0x0100_0000  # Per-channel address window
+
     def build_phase(self):
         self.logger.info("=" * 60)
         self.logger.info("DMA Verification Example Test")
         self.logger.info("=" * 60)
         self.env = DMAEnv.create("env", self)
-    
+        try:
+            self.bytes_per_channel = ConfigDB().get(self, "", "dma_bytes_per_channel")
+        except UVMConfigItemNotFound:
+            self.bytes_per_channel = self.BYTES_PER_CHANNEL
+        self.errors = 0
+        self.bulk = []
+        self.waves = None
+
     def connect_phase(self):
         """Connect phase."""
         self.logger.info("Connecting DMA Test")
-    
+
+    async def reset_dut(self):
+        dut = cocotb.top
+        cocotb.start_soon(Clock(dut.clk, CLK_PERIOD_NS, unit="ns").start())
+        dut.dma_start.value = 0
+        dut.dma_src_addr.value = 0
+        dut.dma_dst_addr.value = 0
+        dut.dma_length.value = 0
+        dut.dma_channel.value = 0
+        dut.rst_n.value = 0
+        for _ in range(5):
+            await RisingEdge(dut.clk)
+        dut.rst_n.value = 1
+        await RisingEdge(dut.clk)
+
+    def start_waves(self):
+        """Start windowed wave recording if the WAVE_* make variables ask for it."""
+        self.waves = WaveWindow.from_env(cocotb.top.clk, name=self.get_name())
+        if self.waves is None:
+            return
+        self.env.add_logging_handler_hier(self.waves.error_trigger())
+        self.waves.begin()
+        self.logger.info(f"Wave recording: {len(self.waves.signals)} signals, "
+                         f"{self.waves.window_ns} ns pre-trigger window")
+
+    def report_waves(self):
+        waves = self.waves
+        if waves is None:
+            return
+        self.logger.info(f"Wave recording: {waves.samples_taken} samples, "
+                         f"{waves.triggers} triggers, {len(waves.dumps)} files")
+        if waves.began is not None:
+            wall = time.perf_counter() - waves.began
+            per_sample = waves.sample_s / max(waves.samples_taken, 1) * 1e6
+            self.logger.info(f"  Sampling {len(waves.signals)} signals took {waves.sample_s:.3f} s "
+                             f"({per_sample:.1f} us per cycle), {100 * waves.sample_s / wall:.1f}% "
+                             f"of {wall:.2f} s; compare with a WAVES=1 (--trace) run")
+        for time_ns, reasons, path in waves.dumps:
+            at = "" if time_ns is None else f" (trigger at {time_ns} ns)"
+            self.logger.info(f"  {path}{at}: {reasons[0]}")
+
+    def load_directed(self, rng):
+        """Source data of the directed transfers."""
+        self.env.load(0x1000, rng.randbytes(256))
+        for i in range(4):
+            self.env.load(0x3000 + i * 0x400, rng.randbytes(128))
+
+    def channel_window(self, channel):
+        """(src_base, dst_base) of a channel's bulk transfers."""
+        return (self.SRC_BASE + channel * self.REGION_STRIDE,
+                self.DST_BASE + channel * self.REGION_STRIDE)
+
     async def run_phase(self):
         self.raise_objection()
         self.logger.info("Running DMA test")
-        
-        # Add expected transfers
-        txn = DMATransaction()
-        txn.channel = 0
-        txn.src_addr = 0x1000
-        txn.dst_addr = 0x2000
-        txn.length = 256
-        self.env.scoreboard.add_expected(txn)
-        
-        # Start DMA sequence
+        await self.reset_dut()
+        self.start_waves()
+        rng = random.Random(1)
+
+        # 1. Directed transfers
+        self.load_directed(rng)
         seq = DMASequence.create("seq")
         await seq.start(self.env.agent.seqr)
-        
+
+        # 2. Bulk transfers, one channel after another
+        for channel in range(NUM_CHANNELS):
+            src_base, dst_base = self.channel_window(channel)
+            self.env.load(src_base, rng.randbytes(self.bytes_per_channel))
+            seq = DMABulkSequence(f"bulk_ch{channel}", channel, src_base, dst_base,
+                                  self.bytes_per_channel, seed=channel)
+            sim_start = get_sim_time("ns")
+            wall = time.perf_counter()
+            await seq.start(self.env.agent.seqr)
+            await RisingEdge(cocotb.top.clk)  # Let the scoreboard drain
+            self.bulk.append((channel, get_sim_time("ns") - sim_start,
+                              time.perf_counter() - wall))
+
+        # 3. Error injection on the last bulk destination
+        self.check_error_injection(dst_base)
+
         await Timer(100, unit="ns")
         self.drop_objection()
-    
+
+    def check_error_injection(self, dst_base):
+        system = self.env.system.memory
+        reference = self.env.scoreboard.reference.memory
+        addr = dst_base + self.bytes_per_channel // 3
+        original = system.read(addr, 1)
+        system.write(addr, bytes([original[0] ^ 0xFF]))
+        found = reference.compare(system, dst_base, self.bytes_per_channel)
+        system.write(addr, original)
+        if found != addr:
+            self.errors += 1
+            self.logger.error(f"Injected error at 0x{addr:08X} reported at {found}")
+        else:
+            self.logger.info(f"Injected error at 0x{addr:08X} located by region compare")
+
     def check_phase(self):
         """Check phase."""
         self.logger.info("Checking DMA test results")
-    
+        self.errors += len(self.env.scoreboard.mismatches)
+        if self.waves is not None:
+            self.waves.close()
+
+    def report_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info(f"DMA bulk transfers: {self.bytes_per_channel // 1024} KiB per channel")
+        for channel, sim_ns, wall in self.bulk:
+            self.logger.info(f"  channel {channel}: {sim_ns / 1e6:8.3f} ms sim  {wall:7.2f} s wall")
+        self.report_waves()
+        if self.errors:
+            self.logger.error(f"DMA test FAILED with {self.errors} errors")
+        else:
+            self.logger.info("DMA test completed")
+        self.logger.info("=" * 60)
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+# Using cocotb test wrapper instead for compatibility with cocotb test discovery
+class DMAReplayTest(DMATest):
+    """
+    Replay of a captured DMATest run.
+
+    1. DMAReplayDriver replaces DMARegisterDriver; no sequence is started
+    2. Source memory is preloaded exactly as DMATest loads it (same
+       random.Random(1) draws), then every transfer of STIM_REPLAY
+       (default STIM_CAPTURE) at or after STIM_REPLAY_FROM_NS is driven
+       from the trace and checked by the scoreboard as in DMATest
+    3. Error injection on the last channel's destination, as in DMATest
+
+    The trace must come from a run with the same dma_bytes_per_channel.
+    """
+
+    def build_phase(self):
+        uvm_factory().set_type_override_by_type(DMARegisterDriver, DMAReplayDriver)
+        super().build_phase()
+        self.trace_path = os.environ.get("STIM_REPLAY") or os.environ.get("STIM_CAPTURE")
+        self.from_ns = int(os.environ.get("STIM_REPLAY_FROM_NS") or 0)
+        self.replayed = 0
+        self.replay_sim_ns = 0
+        self.replay_wall = 0.0
+
+    async def run_phase(self):
+        self.raise_objection()
+        self.logger.info(f"Replaying {self.trace_path} from {self.from_ns} ns")
+        await self.reset_dut()
+        self.start_waves()
+        rng = random.Random(1)
+        self.load_directed(rng)
+        for channel in range(NUM_CHANNELS):
+            src_base, dst_base = self.channel_window(channel)
+            self.env.load(src_base, rng.randbytes(self.bytes_per_channel))
+
+        trace = TraceReader(self.trace_path, TRACE_KIND)
+        if not trace.indexed:
+            self.logger.warning(f"{self.trace_path} was not closed; replaying its complete records")
+        self.logger.info(f"Trace: {len(trace)} transfers captured between "
+                         f"{trace.span_ns[0]} and {trace.span_ns[1]} ns, first replayed #{trace.seek(self.from_ns)}")
+        sim_start = get_sim_time("ns")
+        wall = time.perf_counter()
+        self.replayed = await self.env.agent.driver.replay(trace, self.from_ns)
+        await RisingEdge(cocotb.top.clk)  # Let the scoreboard drain
+        self.replay_sim_ns = get_sim_time("ns") - sim_start
+        self.replay_wall = time.perf_counter() - wall
+        trace.close()
+
+        self.check_error_injection(dst_base)
+
+        await Timer(100, unit="ns")
+        self.drop_objection()
+
     def report_phase(self):
         self.logger.info("=" * 60)
-        self.logger.info("DMA test completed")
+        rate = self.replayed / self.replay_wall if self.replay_wall else 0.0
+        self.logger.info(f"DMA replay: {self.replayed} transfers in {self.replay_sim_ns / 1e6:.3f} ms sim, "
+                         f"{self.replay_wall:.2f} s wall ({rate:.0f} transfers/s)")
+        self.report_waves()
+        if self.errors:
+            self.logger.error(f"DMA replay test FAILED with {self.errors} errors")
+        else:
+            self.logger.info("DMA replay test completed")
         self.logger.info("=" * 60)
 
 
@@ -291,7 +876,18 @@ async def test_dma(dut):
     await uvm_root().run_test("DMATest")
 
 
+# Runs after test_dma, so STIM_CAPTURE alone captures and then replays
+@cocotb.test(skip=not (os.environ.get("STIM_REPLAY") or os.environ.get("STIM_CAPTURE")))
+async def test_dma_replay(dut):
+    """Cocotb test wrapper for pyuvm test."""
+    # Register the test class with uvm_root so run_test can find it
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["DMAReplayTest"] = DMAReplayTest
+    # Use uvm_root to run the test properly (executes all phases in hierarchy)
+    await uvm_root().run_test("DMAReplayTest")
+
+
 if __name__ == "__main__":
     print("This is a pyuvm DMA verification example.")
     print("To run with cocotb, use the Makefile in the test directory.")
-
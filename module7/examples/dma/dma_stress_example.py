@@ -0,0 +1,423 @@
+"""
+Module 7 Example 7.7: Multi-Channel DMA Stress
+Demonstrates concurrent constrained-random traffic on all eight DMA channels.
+
+One stress sequence per channel runs concurrently on the DMA sequencer.
+Each sequence draws descriptors from a DMADescriptorGenerator (weighted
+length buckets, optional scatter-gather, overlapping or non-overlapping
+address windows) and must hold a credit for every transfer it has in
+flight. DMAChannelDriver, a factory override of DMARegisterDriver, keeps
+one descriptor queue per channel whose depth is that channel's credit
+count, arbitrates the queues round-robin onto simple_dma.v and returns
+the credit when the transfer completes. The reference model, system
+memory and scoreboard from Example 7.1 check every byte, and
+DMAStressStats reports transfers per microsecond and min/avg/p99 latency
+per channel.
+"""
+
+from pyuvm import *
+
+import cocotb
+from cocotb.triggers import Timer, RisingEdge, Event
+from cocotb.utils import get_sim_time
+import math
+import random
+
+from dma_example import (
+    MAX_SEGMENT,
+    NUM_CHANNELS,
+    DMATransaction,
+    DMARegisterDriver,
+    DMAEnv,
+    DMATest,
+)
+
+
+class DMACredits:
+    """
+    Credit counter for one channel.
+
+    A sequence acquires a credit before handing a transfer to the driver
+    and the driver releases it when the transfer completes, so at most
+    `credits` transfers per channel are ever queued or in flight.
+    """
+
+    def __init__(self, credits):
+        self.credits = credits
+        self.available = credits
+        self.stall_ns = 0  # Sim time spent waiting for a credit
+        self._event = Event()
+
+    async def acquire(self):
+        if self.available == 0:
+            start = get_sim_time("ns")
+            while self.available == 0:
+                self._event.clear()
+                await self._event.wait()
+            self.stall_ns += get_sim_time("ns") - start
+        self.available -= 1
+
+    def release(self):
+        self.available += 1
+        self._event.set()
+
+
+class DMAStressConfig:
+    """
+    Constraints for DMADescriptorGenerator.
+
+    length_buckets is a list of (weight, min_length, max_length) tuples;
+    a transfer picks a bucket by weight and a length uniformly inside it.
+    With overlap=False every channel has private source and destination
+    windows; with overlap=True all channels read and write one shared
+    window, so regions overlap across channels and source/destination.
+    """
+
+    def __init__(self, length_buckets=None, scatter_gather_pct=30, max_segments=4,
+                 overlap=False, window=1 << 20):
+        self.length_buckets = length_buckets or [
+            (40, 1, 64),        # small
+            (40, 65, 1024),     # medium
+            (20, 1025, 16384),  # large
+        ]
+        self.scatter_gather_pct = scatter_gather_pct
+        self.max_segments = max_segments
+        self.overlap = overlap
+        self.window = window
+        if max(hi for _, _, hi in self.length_buckets) > min(window, MAX_SEGMENT * max_segments):
+            raise ValueError("Largest length bucket does not fit the window/segment limits")
+
+
+class DMADescriptorGenerator:
+    """Constrained-random DMATransaction source for one channel."""
+
+    SRC_BASE = 0x1000_0000
+    DST_BASE = 0x8000_0000
+    SHARED_BASE = 0x4000_0000
+    REGION_STRIDE = 0x0100_0000  # Per-channel window spacing
+
+    def __init__(self, channel, config, seed=0):
+        self.channel = channel
+        self.config = config
+        self.rng = random.Random(seed)
+        self._weights = [w for w, _, _ in config.length_buckets]
+        if config.overlap:
+            self.src_base = self.dst_base = self.SHARED_BASE
+        else:
+            self.src_base = self.SRC_BASE + channel * self.REGION_STRIDE
+            self.dst_base = self.DST_BASE + channel * self.REGION_STRIDE
+        self._dst_next = 0  # Destination allocation pointer (non-overlapping mode)
+        self.count = 0
+
+    def _length(self):
+        _, lo, hi = self.rng.choices(self.config.length_buckets, self._weights)[0]
+        return self.rng.randint(lo, hi)
+
+    def _split(self, length):
+        """Split length into 1..max_segments segment lengths, each <= MAX_SEGMENT."""
+        if self.rng.randrange(100) >= self.config.scatter_gather_pct or length < 2:
+            pieces = 1
+        else:
+            pieces = self.rng.randint(2, min(self.config.max_segments, length))
+        pieces = max(pieces, -(-length // MAX_SEGMENT))
+        cuts = sorted(self.rng.sample(range(1, length), pieces - 1))
+        return [b - a for a, b in zip([0] + cuts, cuts + [length])]
+
+    def _dst_offset(self, length):
+        window = self.config.window
+        if self.config.overlap:
+            return self.rng.randrange(window - length + 1)
+        if self._dst_next + length > window:
+            self._dst_next = 0
+        offset = self._dst_next
+        self._dst_next += length
+        return offset
+
+    def next_transfer(self):
+        length = self._length()
+        segments = []
+        dst = self._dst_offset(length)
+        for seg_len in self._split(length):
+            src = self.rng.randrange(self.config.window - seg_len + 1)
+            segments.append((self.src_base + src, self.dst_base + dst, seg_len))
+            dst += seg_len
+        txn = DMATransaction(f"stress_ch{self.channel}_{self.count}")
+        txn.channel = self.channel
+        if len(segments) == 1:
+            txn.src_addr, txn.dst_addr, txn.length = segments[0]
+        else:
+            txn.set_segments(segments)
+        self.count += 1
+        return txn
+
+
+class DMAStressSequence(uvm_sequence):
+    """Issues count generated transfers on one channel, one credit per transfer."""
+
+    def __init__(self, name="DMAStressSequence", generator=None, credits=None, count=100):
+        super().__init__(name)
+        self.generator = generator
+        self.credits = credits
+        self.count = count
+
+    async def body(self):
+        for _ in range(self.count):
+            txn = self.generator.next_transfer()
+            await self.credits.acquire()
+            txn.submit_ns = get_sim_time("ns")
+            await self.start_item(txn)
+            await self.finish_item(txn)
+
+
+class DMAChannelDriver(DMARegisterDriver):
+    """
+    Multi-channel driver for simple_dma.v.
+
+    Accepts items immediately into per-channel descriptor queues and lets
+    an engine coroutine program them into the single DUT engine, picking
+    channels round-robin. A queue never holds more items than its
+    channel has credits; completed transfers are published on
+    completed_ap and their credit is released.
+    """
+
+    CREDITS = 4
+    CAPTURE = False  # DMAReplayTest replays DMATest traces only
+
+    def build_phase(self):
+        super().build_phase()
+        self.completed_ap = uvm_analysis_port("completed_ap", self)
+        try:
+            credits = ConfigDB().get(self, "", "dma_channel_credits")
+        except UVMConfigItemNotFound:
+            credits = self.CREDITS
+        self.credits = [DMACredits(credits) for _ in range(NUM_CHANNELS)]
+        self.queues = [[] for _ in range(NUM_CHANNELS)]
+        self.pending = 0
+        self.max_depth = [0] * NUM_CHANNELS
+        self._work = Event()
+        self._idle = Event()
+        self._idle.set()
+        self._next_channel = 0
+
+    async def run_phase(self):
+        self.logger.info(f"[{self.get_name()}] Starting multi-channel DMA driver")
+        cocotb.start_soon(self.engine())
+
+        while True:
+            item = await self.seq_item_port.get_next_item()
+            queue = self.queues[item.channel]
+            queue.append(item)
+            if len(queue) > self.credits[item.channel].credits:
+                self.logger.error(f"[{self.get_name()}] Channel {item.channel} queue exceeded "
+                                  f"its {self.credits[item.channel].credits} credits")
+            self.max_depth[item.channel] = max(self.max_depth[item.channel], len(queue))
+            self.pending += 1
+            self._idle.clear()
+            self._work.set()
+            self.seq_item_port.item_done()
+
+    def _select(self):
+        """Next non-empty channel queue, round-robin."""
+        for i in range(NUM_CHANNELS):
+            channel = (self._next_channel + i) % NUM_CHANNELS
+            if self.queues[channel]:
+                self._next_channel = (channel + 1) % NUM_CHANNELS
+                return self.queues[channel].pop(0)
+        return None
+
+    async def engine(self):
+        while True:
+            item = self._select()
+            if item is None:
+                self._work.clear()
+                await self._work.wait()
+                continue
+
+            item.start_ns = get_sim_time("ns")
+            await self.drive(item)
+            item.complete_ns = get_sim_time("ns")
+
+            self.credits[item.channel].release()
+            self.completed_ap.write(item)
+            self.pending -= 1
+            if self.pending == 0:
+                self._idle.set()
+
+    async def wait_idle(self):
+        """Wait until every accepted transfer has completed."""
+        await self._idle.wait()
+
+
+class DMAChannelStats:
+    """Throughput and latency record for one channel."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.transfers = 0
+        self.bytes = 0
+        self.latencies = []  # ns, credit grant to completion
+        self.first_submit = None
+        self.last_complete = None
+
+    def record(self, txn):
+        self.transfers += 1
+        self.bytes += txn.length
+        self.latencies.append(txn.complete_ns - txn.submit_ns)
+        if self.first_submit is None or txn.submit_ns < self.first_submit:
+            self.first_submit = txn.submit_ns
+        self.last_complete = txn.complete_ns
+
+    @property
+    def transfers_per_us(self):
+        if not self.transfers:
+            return 0.0
+        span_us = (self.last_complete - self.first_submit) / 1000
+        return self.transfers / span_us if span_us else 0.0
+
+    def latency(self, pct):
+        """Latency percentile (nearest rank) in ns."""
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class DMAStressStats(uvm_subscriber):
+    """Collects DMAChannelStats from the driver's completed transfers."""
+
+    def __init__(self, name="DMAStressStats", parent=None):
+        super().__init__(name, parent)
+        self.runs = {}  # label -> [DMAChannelStats per channel]
+        self.current = None
+
+    def begin(self, label):
+        self.current = self.runs[label] = [DMAChannelStats(ch) for ch in range(NUM_CHANNELS)]
+
+    def write(self, txn):
+        self.current[txn.channel].record(txn)
+
+    def report_phase(self):
+        for label, channels in self.runs.items():
+            self.logger.info(f"[{self.get_name()}] {label}:")
+            self.logger.info(f"  {'ch':>2} {'xfers':>6} {'KiB':>7} {'xfer/us':>8} "
+                             f"{'min ns':>8} {'avg ns':>9} {'p99 ns':>9}")
+            for st in channels:
+                if not st.transfers:
+                    continue
+                avg = sum(st.latencies) / st.transfers
+                self.logger.info(f"  {st.channel:>2} {st.transfers:>6} {st.bytes / 1024:>7.1f} "
+                                 f"{st.transfers_per_us:>8.4f} {st.latency(0):>8.0f} "
+                                 f"{avg:>9.0f} {st.latency(99):>9.0f}")
+
+
+class DMAStressEnv(DMAEnv):
+    """DMAEnv plus per-channel statistics."""
+
+    def build_phase(self):
+        super().build_phase()
+        self.stats = DMAStressStats.create("stats", self)
+
+    def connect_phase(self):
+        super().connect_phase()
+        self.agent.driver.completed_ap.connect(self.stats.analysis_export)
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+# Using cocotb test wrapper instead for compatibility with cocotb test discovery
+class DMAStressTest(DMATest):
+    """
+    Stress test: all eight channels concurrently, twice.
+
+    1. Non-overlapping per-channel windows
+    2. One shared window, so transfers overlap across channels
+    dma_stress_transfers (ConfigDB, default 150) sets the transfers per
+    channel per run and dma_channel_credits (default 4) the credits.
+    """
+
+    TRANSFERS = 150
+
+    def build_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info("DMA Multi-Channel Stress Test")
+        self.logger.info("=" * 60)
+        uvm_factory().set_type_override_by_type(DMARegisterDriver, DMAChannelDriver)
+        self.env = DMAStressEnv.create("env", self)
+        try:
+            self.transfers = ConfigDB().get(self, "", "dma_stress_transfers")
+        except UVMConfigItemNotFound:
+            self.transfers = self.TRANSFERS
+        self.errors = 0
+        self.waves = None
+
+    async def stress(self, label, config, seed):
+        driver = self.env.agent.driver
+        self.env.stats.begin(label)
+        rng = random.Random(seed)
+        generators = [DMADescriptorGenerator(ch, config, seed=seed * NUM_CHANNELS + ch)
+                      for ch in range(NUM_CHANNELS)]
+        loaded = set()
+        for gen in generators:
+            if gen.src_base not in loaded:
+                self.env.load(gen.src_base, rng.randbytes(config.window))
+                loaded.add(gen.src_base)
+        for credits in driver.credits:
+            credits.stall_ns = 0
+
+        self.logger.info(f"Stress run '{label}': {self.transfers} transfers x {NUM_CHANNELS} channels")
+        sim_start = get_sim_time("ns")
+        seqs = [DMAStressSequence(f"stress_ch{gen.channel}", gen, driver.credits[gen.channel],
+                                  self.transfers) for gen in generators]
+        tasks = [cocotb.start_soon(seq.start(self.env.agent.seqr)) for seq in seqs]
+        for task in tasks:
+            await task
+        await driver.wait_idle()
+        await RisingEdge(cocotb.top.clk)  # Let the scoreboard drain
+        sim_us = (get_sim_time("ns") - sim_start) / 1000
+
+        stats = self.env.stats.current
+        total = sum(st.transfers for st in stats)
+        if total != self.transfers * NUM_CHANNELS:
+            self.errors += 1
+            self.logger.error(f"'{label}': {total} of {self.transfers * NUM_CHANNELS} transfers completed")
+        stalls = ", ".join(f"{c.stall_ns / 1000:.0f}" for c in driver.credits)
+        self.logger.info(f"'{label}': {total} transfers in {sim_us:.1f} us sim "
+                         f"({total / sim_us:.3f} transfers/us), credit stall us per channel: {stalls}")
+
+    async def run_phase(self):
+        self.raise_objection()
+        self.logger.info("Running DMA stress test")
+        await self.reset_dut()
+        self.start_waves()
+
+        await self.stress("non-overlapping", DMAStressConfig(overlap=False), seed=1)
+        await self.stress("overlapping", DMAStressConfig(overlap=True, scatter_gather_pct=50), seed=2)
+
+        depth = self.env.agent.driver.max_depth
+        self.logger.info(f"Max queue depth per channel: {depth}")
+
+        await Timer(100, unit="ns")
+        self.drop_objection()
+
+    def report_phase(self):
+        self.logger.info("=" * 60)
+        self.report_waves()
+        if self.errors:
+            self.logger.error(f"DMA stress test FAILED with {self.errors} errors")
+        else:
+            self.logger.info("DMA stress test completed")
+        self.logger.info("=" * 60)
+
+
+# Cocotb test function to run the pyuvm test
+@cocotb.test()
+async def test_dma_stress(dut):
+    """Cocotb test wrapper for pyuvm test."""
+    # Register the test class with uvm_root so run_test can find it
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["DMAStressTest"] = DMAStressTest
+    # Use uvm_root to run the test properly (executes all phases in hierarchy)
+    await uvm_root().run_test("DMAStressTest")
+
+
+if __name__ == "__main__":
+    print("This is a pyuvm multi-channel DMA stress example.")
+    print("To run with cocotb, use the Makefile in the test directory.")
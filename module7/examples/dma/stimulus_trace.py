@@ -0,0 +1,156 @@
+"""
+Module 7: Stimulus Trace
+Indexed binary traces of driven items, for capture and replay.
+
+Rerunning a seed to debug a failure, or after a change that only touches
+the DUT, spends the same Python time again on sequences, randomization
+and sequencer handshakes to produce stimulus that is already known.
+A driver in capture mode writes every item it drives, with the sim time
+it was driven at, to a trace file; a replay driver later reads the items
+back from a memory-mapped trace and drives them without any sequence or
+sequencer running.
+
+File layout (little-endian):
+
+    header   magic "STIMTRC1", u16 kind length, kind (e.g. "dma")
+    records  u64 time_ns, u32 payload length, payload
+    index    u64 time_ns[count], u64 record offset[count]
+    footer   u64 count, u64 index offset, magic "STIMIDX1"
+
+Payloads are opaque bytes; the driver that writes them decides their
+layout. The index has one entry per record, so seek(time_ns) is a binary
+search over the mapped index with no parsing. A trace whose writer never
+closed it (the simulation died) has no footer; TraceReader then rebuilds
+the index with one pass over the records.
+"""
+
+import bisect
+import mmap
+import struct
+
+_MAGIC = b"STIMTRC1"
+_INDEX_MAGIC = b"STIMIDX1"
+_RECORD = struct.Struct("<QI")
+_FOOTER = struct.Struct("<QQ8s")
+
+
+class TraceWriter:
+    """Appends (time_ns, payload) records to a trace file of a given kind."""
+
+    def __init__(self, path, kind):
+        self.path = path
+        self.kind = kind
+        self._file = open(path, "wb")
+        name = kind.encode()
+        self._file.write(_MAGIC + struct.pack("<H", len(name)) + name)
+        self._offset = self._file.tell()
+        self._times = []
+        self._offsets = []
+        self.bytes = 0
+
+    @property
+    def count(self):
+        return len(self._times)
+
+    def write(self, time_ns, payload):
+        if self._times and time_ns < self._times[-1]:
+            raise ValueError(f"Trace records must be in time order ({time_ns} < {self._times[-1]})")
+        self._times.append(time_ns)
+        self._offsets.append(self._offset)
+        self._file.write(_RECORD.pack(time_ns, len(payload)))
+        self._file.write(payload)
+        self._offset += _RECORD.size + len(payload)
+        self.bytes += len(payload)
+
+    def close(self):
+        """Write the index and footer. Further writes are an error."""
+        if self._file is None:
+            return
+        count = len(self._times)
+        self._file.write(struct.pack(f"<{count}Q", *self._times))
+        self._file.write(struct.pack(f"<{count}Q", *self._offsets))
+        self._file.write(_FOOTER.pack(count, self._offset, _INDEX_MAGIC))
+        self._file.close()
+        self._file = None
+
+
+class TraceReader:
+    """
+    Memory-mapped trace: len(), record(i), seek(time_ns) and iteration.
+
+    Payloads are returned as bytes copied out of the mapping, so they stay
+    valid after close(); the index itself is read in place.
+    """
+
+    def __init__(self, path, kind=None):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if self._view[:8] != _MAGIC:
+            raise ValueError(f"{path} is not a stimulus trace")
+        (length,) = struct.unpack_from("<H", self._view, 8)
+        self.kind = bytes(self._view[10:10 + length]).decode()
+        if kind is not None and kind != self.kind:
+            raise ValueError(f"{path} holds a {self.kind!r} trace, not {kind!r}")
+        self._start = 10 + length
+        count, index_offset, magic = 0, 0, None
+        if len(self._view) >= self._start + _FOOTER.size:
+            count, index_offset, magic = _FOOTER.unpack_from(self._view, len(self._view) - _FOOTER.size)
+        if magic == _INDEX_MAGIC:
+            self.indexed = True
+            self.times = self._view[index_offset:index_offset + 8 * count].cast("Q")
+            self.offsets = self._view[index_offset + 8 * count:index_offset + 16 * count].cast("Q")
+        else:
+            self.indexed = False
+            self.times, self.offsets = self._scan()
+
+    def _scan(self):
+        """Index of an unclosed trace: every complete record from the start."""
+        times, offsets = [], []
+        offset, end = self._start, len(self._view)
+        while offset + _RECORD.size <= end:
+            time_ns, length = _RECORD.unpack_from(self._view, offset)
+            if offset + _RECORD.size + length > end:
+                break
+            times.append(time_ns)
+            offsets.append(offset)
+            offset += _RECORD.size + length
+        return times, offsets
+
+    def __len__(self):
+        return len(self.times)
+
+    def record(self, index):
+        """(time_ns, payload) of record index."""
+        offset = self.offsets[index]
+        time_ns, length = _RECORD.unpack_from(self._view, offset)
+        start = offset + _RECORD.size
+        return time_ns, bytes(self._view[start:start + length])
+
+    def seek(self, time_ns):
+        """Index of the first record at or after time_ns."""
+        return bisect.bisect_left(self.times, time_ns)
+
+    def records(self, from_ns=0):
+        """(time_ns, payload) for every record at or after from_ns."""
+        for index in range(self.seek(from_ns), len(self.times)):
+            yield self.record(index)
+
+    def __iter__(self):
+        return self.records()
+
+    @property
+    def span_ns(self):
+        return (self.times[0], self.times[-1]) if len(self.times) else (0, 0)
+
+    def close(self):
+        if self._map is None:
+            return
+        if self.indexed:
+            self.times.release()
+            self.offsets.release()
+        self._view.release()
+        self._map.close()
+        self._file.close()
+        self._map = None
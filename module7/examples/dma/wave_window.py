@@ -0,0 +1,310 @@
+"""
+Windowed waveform recording.
+
+WAVES=1 makes Verilator trace every signal from time zero to the end of
+the run, which is slow and produces files far larger than the few
+microseconds around a failure that anyone looks at. The simulator's
+tracer cannot be started, stopped or rewound from Python, so
+WaveWindow records selected signals itself, once per clock, and writes
+plain VCD files:
+
+- start()/stop(): record everything between two points of the test.
+- arm(): keep a rolling pre-trigger window of the last window_ns in
+  memory. trigger() (or an ERROR log record, via error_trigger()) keeps
+  recording for post_ns more and then writes the window to a file.
+
+Signals are chosen by glob patterns on their hierarchical path, e.g.
+"simple_dma.dma_*" or "*.count". Sampling is done after the clock edge
+in the ReadOnly phase, so each sample is the settled value for that
+cycle. Nothing is sampled while the recorder is idle, and an armed
+recorder disarms itself after max_dumps windows.
+
+Every sample reads each selected signal through the GPI, which costs far
+more per signal than the simulator's own tracer, so keep the scopes to
+the few signals a failure needs (the DMA Makefile defaults to the
+simple_dma.dma_* ports). Samples keep the value objects and are only
+turned into VCD text for the windows that are written. sample_s is the
+host time spent sampling; compare it with the same run under WAVES=1
+(--trace) before widening the scopes.
+"""
+
+import fnmatch
+import logging
+import os
+import time
+from collections import deque
+
+import cocotb
+from cocotb.handle import HierarchyObject, LogicArrayObject, LogicObject
+from cocotb.triggers import ReadOnly, RisingEdge, Timer
+from cocotb.utils import get_sim_time
+
+
+def find_signals(root, patterns=("*",)):
+    """(path, handle) for every logic signal under root whose path matches a pattern."""
+    found = []
+
+    def walk(scope):
+        for child in scope:
+            if isinstance(child, HierarchyObject):
+                walk(child)
+            elif isinstance(child, (LogicObject, LogicArrayObject)):
+                if any(fnmatch.fnmatchcase(child._path, p) for p in patterns):
+                    found.append((child._path, child))
+
+    walk(root)
+    return sorted(found, key=lambda item: item[0])
+
+
+def _codes(count):
+    """Short VCD identifier codes from the printable ASCII range."""
+    codes = []
+    for n in range(count):
+        code = ""
+        while True:
+            code += chr(33 + n % 94)
+            n //= 94
+            if not n:
+                break
+        codes.append(code)
+    return codes
+
+
+class _Dump:
+    """A trigger waiting for its post-trigger samples."""
+
+    def __init__(self, time_ns, reason, until_ns):
+        self.time_ns = time_ns
+        self.reasons = [reason]
+        self.until_ns = until_ns
+
+
+class WaveWindow:
+    """
+    Per-clock VCD recorder for a set of signals.
+
+    clk is the sampling clock. scopes is a sequence of glob patterns on
+    signal paths (default every signal under the toplevel). window_ns and
+    post_ns are the pre- and post-trigger lengths used by arm(). Files go
+    to directory as <name>_<n>.vcd; dumps lists (time_ns, reasons, path)
+    for every file written.
+    """
+
+    def __init__(self, clk, scopes=("*",), window_ns=2000, post_ns=500,
+                 directory="waves", name="waves", max_dumps=4, root=None):
+        self.clk = clk
+        self.signals = find_signals(root if root is not None else cocotb.top, scopes)
+        if not self.signals:
+            raise ValueError(f"No signals match wave scopes {list(scopes)}")
+        self.window_ns = window_ns
+        self.post_ns = post_ns
+        self.directory = directory
+        self.name = name
+        self.max_dumps = max_dumps
+        self.start_ns = 0
+        self.stop_ns = None
+        self.dumps = []
+        self.triggers = 0
+        self.samples_taken = 0
+        self.sample_s = 0.0  # Host time spent sampling
+        self.began = None  # perf_counter() when recording first began
+        self._samples = deque()
+        self._mode = None  # None, "armed" or "recording"
+        self._pending = None
+        self._task = None
+
+    @classmethod
+    def from_env(cls, clk, name="waves", root=None):
+        """
+        Recorder configured by the WAVE_* make variables, or None when
+        WAVE_WINDOW_US, WAVE_START_US and WAVE_STOP_US are all unset.
+        """
+        env = os.environ
+        window_us = env.get("WAVE_WINDOW_US", "")
+        start_us = env.get("WAVE_START_US", "")
+        stop_us = env.get("WAVE_STOP_US", "")
+        if not (window_us or start_us or stop_us):
+            return None
+        scopes = env.get("WAVE_SCOPES", "*").replace(",", " ").split() or ["*"]
+        waves = cls(clk, scopes,
+                    window_ns=int(float(window_us or 0) * 1000),
+                    post_ns=int(float(env.get("WAVE_POST_US", "0.5")) * 1000),
+                    directory=env.get("WAVE_DIR", "waves"), name=name,
+                    max_dumps=int(env.get("WAVE_MAX_DUMPS", "4")), root=root)
+        waves.start_ns = int(float(start_us or 0) * 1000)
+        waves.stop_ns = int(float(stop_us) * 1000) if stop_us else None
+        return waves
+
+    def begin(self):
+        """Start what from_env() configured: a timed recording, or arm()."""
+        if self.start_ns or self.stop_ns is not None:
+            cocotb.start_soon(self.record_between(self.start_ns, self.stop_ns))
+        else:
+            self.arm()
+
+    @property
+    def active(self):
+        return self._mode is not None
+
+    def start(self):
+        """Record every cycle until stop()."""
+        self._begin("recording")
+
+    def stop(self):
+        """Stop recording and write the file. Returns its path, or None."""
+        if self._mode != "recording":
+            return None
+        path = self._write(["stop"])
+        self._end()
+        return path
+
+    def arm(self):
+        """Keep a rolling window of the last window_ns for trigger()."""
+        if not self.window_ns:
+            raise ValueError("arm() needs a window_ns greater than zero")
+        self._begin("armed")
+
+    def trigger(self, reason="trigger"):
+        """Write the window around now once post_ns more has been recorded."""
+        self.triggers += 1
+        if self._mode != "armed":
+            return
+        now = get_sim_time("ns")
+        if self._pending is not None:
+            self._pending.reasons.append(reason)
+        else:
+            self._pending = _Dump(now, reason, now + self.post_ns)
+
+    def error_trigger(self, level=logging.ERROR):
+        """logging.Handler that calls trigger() for records at level or above."""
+        return WaveTrigger(self, level)
+
+    async def record_between(self, start_ns=0, stop_ns=None):
+        """Record from sim time start_ns until stop_ns (or until stop()/close())."""
+        now = get_sim_time("ns")
+        if start_ns > now:
+            await Timer(start_ns - now, unit="ns")
+        self.start()
+        if stop_ns is not None:
+            await Timer(max(stop_ns - get_sim_time("ns"), 1), unit="ns")
+            self.stop()
+
+    def close(self):
+        """Write any pending window or open recording and stop sampling."""
+        if self._pending is not None:
+            self._flush()
+        self.stop()
+        self._end()
+
+    def _begin(self, mode):
+        if self._mode is not None:
+            raise RuntimeError(f"Wave recorder already {self._mode}")
+        self._mode = mode
+        self._samples.clear()
+        self._pending = None
+        if self.began is None:
+            self.began = time.perf_counter()
+        self._task = cocotb.start_soon(self._sample_loop())
+
+    def _end(self):
+        self._mode = None
+        self._pending = None
+        self._samples.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _sample_loop(self):
+        edge = RisingEdge(self.clk)
+        settle = ReadOnly()
+        handles = [handle for _, handle in self.signals]
+        samples = self._samples
+        clock = time.perf_counter
+        while True:
+            await edge
+            await settle
+            start = clock()
+            now = get_sim_time("ns")
+            samples.append((now, tuple([h.value for h in handles])))
+            self.samples_taken += 1
+            if self._mode == "armed":
+                if self._pending is None:
+                    oldest = now - self.window_ns
+                    while samples[0][0] < oldest:
+                        samples.popleft()
+                elif now >= self._pending.until_ns:
+                    self._flush()
+            self.sample_s += clock() - start
+            if self._mode is None:
+                self._task = None
+                return
+
+    def _flush(self):
+        dump = self._pending
+        self._pending = None
+        self._write(dump.reasons, dump.time_ns)
+        if len(self.dumps) >= self.max_dumps:
+            self._mode = None
+            self._samples.clear()
+
+    def _write(self, reasons, trigger_ns=None):
+        if not self._samples:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{self.name}_{len(self.dumps)}.vcd")
+        with open(path, "w") as f:
+            self._write_vcd(f, reasons, trigger_ns)
+        self.dumps.append((trigger_ns, list(reasons), path))
+        return path
+
+    def _write_vcd(self, f, reasons, trigger_ns):
+        codes = _codes(len(self.signals))
+        f.write("$timescale 1ns $end\n")
+        for reason in reasons:
+            at = "" if trigger_ns is None else f" at {trigger_ns} ns"
+            f.write(f"$comment {reason}{at} $end\n")
+
+        # Nested $scope blocks from the signal paths (already sorted)
+        scope = []
+        for (path, handle), code in zip(self.signals, codes):
+            *parents, leaf = path.split(".")
+            while scope and scope != parents[:len(scope)]:
+                f.write("$upscope $end\n")
+                scope.pop()
+            for part in parents[len(scope):]:
+                f.write(f"$scope module {part} $end\n")
+                scope.append(part)
+            width = len(handle) if isinstance(handle, LogicArrayObject) else 1
+            suffix = f" [{width - 1}:0]" if width > 1 else ""
+            f.write(f"$var wire {width} {code} {leaf}{suffix} $end\n")
+        for _ in scope:
+            f.write("$upscope $end\n")
+        f.write("$enddefinitions $end\n")
+
+        vector = [isinstance(h, LogicArrayObject) and len(h) > 1 for _, h in self.signals]
+        last = None
+        for time_ns, values in self._samples:
+            values = [str(value) for value in values]
+            changes = [(i, v) for i, v in enumerate(values) if last is None or v != last[i]]
+            if changes:
+                f.write(f"#{time_ns}\n")
+                if last is None:
+                    f.write("$dumpvars\n")
+                for i, value in changes:
+                    value = value.lower()
+                    f.write(f"b{value} {codes[i]}\n" if vector[i] else f"{value}{codes[i]}\n")
+                if last is None:
+                    f.write("$end\n")
+            last = values
+        f.write(f"#{self._samples[-1][0]}\n")
+
+
+class WaveTrigger(logging.Handler):
+    """Triggers a WaveWindow on every log record at or above level."""
+
+    def __init__(self, waves, level=logging.ERROR):
+        super().__init__(level)
+        self.waves = waves
+
+    def emit(self, record):
+        self.waves.trigger(record.getMessage())
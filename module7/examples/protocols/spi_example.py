@@ -1,133 +1,393 @@
 """
 Module 7 Example: SPI Protocol Verification
 Demonstrates SPI protocol verification with master-slave coordination.
+
+The agents drive spi_bus.v: one master, four slaves on their own chip
+selects, each slave in a different CPOL/CPHA mode. Transfers are full
+duplex: every frame shifts MOSI out and MISO in at the same time, and a
+frame can be any number of bits (8, 32, 256, ...), MSB first.
+
+The per-bit paths are kept allocation-free. The master builds the MOSI
+bit schedule of a frame once before asserting chip select, waits on one
+reused half-period Timer per clock edge and shifts MISO into an integer
+accumulator. Slaves and the monitor wake only on SCLK edges while their
+chip select is active, and keep their frame in integers as well.
 """
 
+import time
+
 from pyuvm import *
 
 # Use uvm_seq_item_port (pyuvm doesn't have uvm_seq_item_pull_port)
 uvm_seq_item_pull_port = uvm_seq_item_port
 
 import cocotb
-from cocotb.triggers import Timer, RisingEdge
+from cocotb.triggers import Timer, Event, ValueChange
+from cocotb.utils import get_sim_time
+
+
+T_HALF = 50  # Half SCLK period in ns (10 MHz)
+NUM_CS = 4
+
+
+def mode_bits(mode):
+    """(CPOL, CPHA) of SPI mode 0-3."""
+    return mode >> 1, mode & 1
+
+
+def mosi_schedule(data, bits):
+    """MOSI levels of a frame, MSB first."""
+    return [(data >> i) & 1 for i in range(bits - 1, -1, -1)]
+
+
+class SPIBus:
+    """Handles for spi_bus.v, with every master-driven line idle."""
+
+    def __init__(self, dut):
+        self.sclk = dut.sclk
+        self.mosi = dut.mosi
+        self.miso = dut.miso
+        self.cs_n = [getattr(dut, f"cs{i}_n") for i in range(NUM_CS)]
+        self.slave_miso = [getattr(dut, f"miso{i}") for i in range(NUM_CS)]
+        self.sclk.value = 0
+        self.mosi.value = 0
+        for cs_n, miso in zip(self.cs_n, self.slave_miso):
+            cs_n.value = 1
+            miso.value = 0
+
+
+class SPIMasterBFM:
+    """
+    SPI master: one full-duplex frame per transfer() call.
+
+    CPHA=0 puts the first MOSI bit out with chip select, samples MISO on
+    the leading SCLK edge and shifts on the trailing edge. CPHA=1 shifts on
+    the leading edge and samples on the trailing edge. Either way each
+    half period is one await of the same Timer object.
+    """
+
+    def __init__(self, bus, half_ns=T_HALF):
+        self.bus = bus
+        self._half = Timer(half_ns, unit="ns")
+        self.frames = 0
+        self.bits = 0
+
+    async def transfer(self, cs, mode, data, bits):
+        """Shift data out on chip select cs and return the received frame."""
+        cpol, cpha = mode_bits(mode)
+        bus = self.bus
+        sclk, mosi, miso, half = bus.sclk, bus.mosi, bus.miso, self._half
+        schedule = mosi_schedule(data, bits)
+        lead, trail = 1 - cpol, cpol
+        if sclk.value != cpol:
+            sclk.value = cpol  # Settle the idle level before selecting
+            await half
+        cs_n = bus.cs_n[cs]
+        cs_n.value = 0
+        rx = 0
+        if cpha == 0:
+            mosi.value = schedule[0]
+            await half
+            last = bits - 1
+            for i in range(bits):
+                sclk.value = lead
+                rx = (rx << 1) | (miso.value == 1)
+                await half
+                sclk.value = trail
+                if i < last:
+                    mosi.value = schedule[i + 1]
+                await half
+        else:
+            await half
+            for bit in schedule:
+                sclk.value = lead
+                mosi.value = bit
+                await half
+                sclk.value = trail
+                rx = (rx << 1) | (miso.value == 1)
+                await half
+        cs_n.value = 1
+        await half  # Chip select high time between frames
+        self.frames += 1
+        self.bits += bits
+        return rx
+
+
+class SPIFrameSampler:
+    """
+    Edge-driven receiver for one chip select in a fixed SPI mode.
+
+    A watcher on chip select opens and closes frames; the SCLK loop only
+    runs while selected and samples MOSI and MISO into integers on the
+    sampling edge of the mode. on_frame(cs, mosi, miso, bits) is called
+    when chip select rises.
+    """
+
+    def __init__(self, bus, cs, mode, on_frame=None):
+        self.bus = bus
+        self.cs = cs
+        self.mode = mode
+        self.cpol, self.cpha = mode_bits(mode)
+        self.on_frame = on_frame
+        self.selected = False
+        self.events = 0
+        self._select = Event()
+        self._mosi = 0
+        self._miso = 0
+        self._count = 0
+
+    def _begin(self):
+        self._mosi = 0
+        self._miso = 0
+        self._count = 0
+
+    def _end(self):
+        if self.on_frame is not None and self._count:
+            self.on_frame(self.cs, self._mosi, self._miso, self._count)
+
+    def _shift(self):
+        """Called on the shifting edge of the mode."""
+
+    async def _watch_cs(self):
+        cs_n = self.bus.cs_n[self.cs]
+        while True:
+            await ValueChange(cs_n)
+            self.events += 1
+            if cs_n.value == 0 and not self.selected:
+                self._begin()
+                self.selected = True
+                self._select.set()
+            elif cs_n.value == 1 and self.selected:
+                self.selected = False
+                self._select.clear()
+                self._end()
+
+    async def run(self):
+        cocotb.start_soon(self._watch_cs())
+        bus = self.bus
+        sclk, mosi, miso = bus.sclk, bus.mosi, bus.miso
+        sample_level = 1 - self.cpol if self.cpha == 0 else self.cpol
+        while True:
+            if not self.selected:
+                await self._select.wait()
+            await ValueChange(sclk)
+            self.events += 1
+            if not self.selected:
+                continue
+            if (sclk.value == 1) == (sample_level == 1):
+                self._mosi = (self._mosi << 1) | (mosi.value == 1)
+                self._miso = (self._miso << 1) | (miso.value == 1)
+                self._count += 1
+            else:
+                self._shift()
+
+
+class SPISlaveBFM(SPIFrameSampler):
+    """
+    SPI slave on one chip select: a shift register that answers each frame
+    with the previous frame it received (a loopback, like a daisy-chained
+    device), truncated or zero-extended to the current frame length.
+
+    The response is driven on the shifting edge; with CPHA=0 its first bit
+    is driven as soon as chip select falls. The slave cannot know the
+    length of the frame in advance, so it shifts the previous frame out MSB
+    first and pads with zeros once it runs out of bits.
+    """
+
+    def __init__(self, bus, cs, mode, on_frame=None):
+        super().__init__(bus, cs, mode, on_frame)
+        self.out = bus.slave_miso[cs]
+        self.last_frame = 0
+        self.last_bits = 8
+        self.frames = []
+        self._tx_bit = 0
+
+    def _next_bit(self):
+        self._tx_bit -= 1
+        return (self.last_frame >> self._tx_bit) & 1 if self._tx_bit >= 0 else 0
+
+    def _begin(self):
+        super()._begin()
+        self._tx_bit = self.last_bits
+        if self.cpha == 0:
+            self.out.value = self._next_bit()
+
+    def _shift(self):
+        # CPHA=0: the first trailing edge follows the first sample, so every
+        # shifting edge drives the next bit. CPHA=1: the leading edge drives.
+        self.out.value = self._next_bit()
+
+    def _end(self):
+        self.frames.append((self._mosi, self._count))
+        self.last_frame = self._mosi
+        self.last_bits = self._count
+        self.out.value = 0
+        super()._end()
 
 
 class SPITransaction(uvm_sequence_item):
     """Transaction for SPI verification."""
-    
+
     def __init__(self, name="SPITransaction"):
         super().__init__(name)
         self.data = 0
         self.mode = 0  # SPI mode (0-3)
         self.cs = 0  # Chip select
         self.is_master = True
-    
+        self.bits = 8  # Frame length
+        self.miso_data = None  # Set after the transfer
+
     def __str__(self):
         role = "MASTER" if self.is_master else "SLAVE"
-        return f"{role}: data=0x{self.data:02X}, mode={self.mode}, cs={self.cs}"
+        digits = (self.bits + 3) // 4
+        text = f"{role}: data=0x{self.data:0{digits}X}, mode={self.mode}, cs={self.cs}, bits={self.bits}"
+        if self.miso_data is not None:
+            text += f", miso=0x{self.miso_data:0{digits}X}"
+        return text
 
 
 class SPIDriver(uvm_driver):
-    """Driver for SPI protocol."""
-    
+    """Driver for SPI protocol: runs each item through an SPIMasterBFM."""
+
     def build_phase(self):
         super().build_phase()
         self.logger.info(f"[{self.get_name()}] Building SPI driver")
         self.seq_item_port = uvm_seq_item_pull_port("spi_driver_seq_item_port", self)
-    
+        self.bus = ConfigDB().get(self, "", "spi_bus")
+        self.bfm = SPIMasterBFM(self.bus)
+
     async def run_phase(self):
         """Run phase - implement SPI transmission."""
         self.logger.info(f"[{self.get_name()}] Starting SPI driver")
-        
+
         while True:
             item = await self.seq_item_port.get_next_item()
-            self.logger.info(f"[{self.get_name()}] Transmitting SPI: {item}")
-            
-            # SPI transmission: CS low -> Clock data -> CS high
-            # In real code: cocotb.dut.cs.value = 0  # Assert CS
-            # In real code: for i in range(8):  # 8 bits
-            # In real code:     cocotb.dut.sclk.value = 0
-            # In real code:     cocotb.dut.mosi.value = (item.data >> (7-i)) & 1
-            # In real code:     await Timer(period/2, units="ns")
-            # In real code:     cocotb.dut.sclk.value = 1
-            # In real code:     await Timer(period/2, units="ns")
-            # In real code: cocotb.dut.cs.value = 1  # Deassert CS
-            
-            await Timer(100, unit="ns")
+            item.miso_data = await self.bfm.transfer(item.cs, item.mode, item.data, item.bits)
+            self.logger.debug(f"[{self.get_name()}] Transmitted SPI: {item}")
             self.seq_item_port.item_done()
 
 
+class SPIResponder(uvm_component):
+    """Slave-side driver: one SPISlaveBFM per chip select, in its mode."""
+
+    def build_phase(self):
+        self.bus = ConfigDB().get(self, "", "spi_bus")
+        self.modes = ConfigDB().get(self, "", "spi_modes")
+        self.bfms = [SPISlaveBFM(self.bus, cs, mode) for cs, mode in enumerate(self.modes)]
+
+    async def run_phase(self):
+        for bfm in self.bfms:
+            self.logger.info(f"[{self.get_name()}] SPI slave on cs{bfm.cs} in mode {bfm.mode}")
+            cocotb.start_soon(bfm.run())
+
+
 class SPIMonitor(uvm_monitor):
-    """Monitor for SPI protocol."""
-    
+    """
+    Monitor for SPI protocol.
+
+    Runs a passive SPIFrameSampler per chip select and publishes one
+    SPITransaction per frame, with both directions filled in.
+    """
+
     def build_phase(self):
         self.logger.info(f"[{self.get_name()}] Building SPI monitor")
         self.ap = uvm_analysis_port("ap", self)
-    
+        self.bus = ConfigDB().get(self, "", "spi_bus")
+        self.modes = ConfigDB().get(self, "", "spi_modes")
+        self.frames = []
+        self.samplers = [SPIFrameSampler(self.bus, cs, mode, self._on_frame)
+                         for cs, mode in enumerate(self.modes)]
+
+    def _on_frame(self, cs, mosi, miso, bits):
+        txn = SPITransaction("observed")
+        txn.cs = cs
+        txn.mode = self.modes[cs]
+        txn.data = mosi
+        txn.miso_data = miso
+        txn.bits = bits
+        self.logger.debug(f"[{self.get_name()}] Received SPI: {txn}")
+        self.frames.append(txn)
+        self.ap.write(txn)
+
     async def run_phase(self):
         """Run phase - monitor SPI reception."""
         self.logger.info(f"[{self.get_name()}] Starting SPI monitor")
-        
-        while True:
-            # Monitor SPI reception
-            # In real code: await FallingEdge(cocotb.dut.cs)  # CS asserted
-            # In real code: data = 0
-            # In real code: for i in range(8):  # 8 bits
-            # In real code:     await RisingEdge(cocotb.dut.sclk)
-            # In real code:     data |= (cocotb.dut.miso.value << (7-i))
-            
-            await Timer(100, unit="ns")
-            
-            txn = SPITransaction()
-            txn.data = 0xBB  # Simulated
-            txn.mode = 0
-            txn.cs = 0
-            
-            self.logger.info(f"[{self.get_name()}] Received SPI: {txn}")
-            self.ap.write(txn)
+        for sampler in self.samplers:
+            cocotb.start_soon(sampler.run())
 
 
 class SPIAgent(uvm_agent):
-    """Agent for SPI protocol."""
-    
+    """
+    Agent for SPI protocol.
+
+    is_master is set by the environment: the master agent gets a driver,
+    sequencer and the bus monitor, the slave agent gets the responder.
+    """
+
+    is_master = True
+
     def build_phase(self):
         super().build_phase()
-        self.logger.info("Building SPI agent")
-        self.driver = SPIDriver.create("driver", self)
-        self.monitor = SPIMonitor.create("monitor", self)
-        self.seqr = uvm_sequencer("sequencer", self)
+        self.logger.info(f"Building SPI agent ({'master' if self.is_master else 'slave'})")
+        if self.is_master:
+            self.driver = SPIDriver.create("driver", self)
+            self.monitor = SPIMonitor.create("monitor", self)
+            self.seqr = uvm_sequencer("sequencer", self)
+        else:
+            self.responder = SPIResponder.create("responder", self)
 
     def connect_phase(self):
         super().connect_phase()
-        self.driver.seq_item_port.connect(self.seqr.seq_item_export)
+        if self.is_master:
+            self.driver.seq_item_port.connect(self.seqr.seq_item_export)
+
+
+def make_frame(cs, mode, data, bits=8):
+    txn = SPITransaction()
+    txn.cs = cs
+    txn.mode = mode
+    txn.data = data
+    txn.bits = bits
+    return txn
+
+
+class SPIItemsSequence(uvm_sequence):
+    """Sends a prepared list of SPITransaction items."""
 
+    def __init__(self, name="SPIItemsSequence", items=()):
+        super().__init__(name)
+        self.items = list(items)
 
-class SPISequence(uvm_sequence):
-    """Sequence for SPI transactions."""
-    
     async def body(self):
-        """Generate SPI transactions."""
-        test_data = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80]
-        
-        for data in test_data:
-            txn = SPITransaction()
-            txn.data = data
-            txn.mode = 0
-            txn.cs = 0
-            txn.is_master = True
-            
+        for txn in self.items:
             await self.start_item(txn)
             await self.finish_item(txn)
 
 
+class SPISequence(SPIItemsSequence):
+    """Sequence for SPI transactions: walking ones to every chip select."""
+
+    def __init__(self, name="SPISequence", modes=(0,)):
+        test_data = [0x01, 0x02, 0x04, 0x08, 0x10, 0x20, 0x40, 0x80]
+        super().__init__(name, [make_frame(cs, mode, data ^ (0x11 * cs))
+                                for data in test_data
+                                for cs, mode in enumerate(modes)])
+
+
 class SPIEnv(uvm_env):
     """Environment for SPI verification."""
-    
+
+    MODES = (0, 1, 2, 3)  # Mode of the slave on each chip select
+
     def build_phase(self):
         self.logger.info("Building SPIEnv")
+        self.bus = SPIBus(cocotb.top)
+        ConfigDB().set(self, "*", "spi_bus", self.bus)
+        ConfigDB().set(self, "*", "spi_modes", self.MODES)
         self.master_agent = SPIAgent.create("master_agent", self)
         self.slave_agent = SPIAgent.create("slave_agent", self)
-    
+        self.slave_agent.is_master = False
+
     def connect_phase(self):
         self.logger.info("Connecting SPIEnv")
 
@@ -135,36 +395,118 @@ class SPIEnv(uvm_env):
 # Note: @uvm_test() decorator removed to avoid import-time TypeError
 # Using cocotb test wrapper instead for compatibility with cocotb test discovery
 class SPITest(uvm_test):
-    """Test demonstrating SPI protocol verification."""
-    
+    """
+    Test demonstrating SPI protocol verification.
+
+    1. Walking ones to all four chip selects (one per CPOL/CPHA mode)
+    2. Full-duplex check: each slave returns its previous frame, the slave
+       and the monitor see exactly what the master sent
+    3. Benchmark: frames per wall-clock second at 8, 32 and 256 bits
+    """
+
+    BENCHMARK = ((8, 256), (32, 128), (256, 32))  # (frame bits, frames)
+
     def build_phase(self):
         self.logger.info("=" * 60)
         self.logger.info("SPI Protocol Example Test")
         self.logger.info("=" * 60)
         self.env = SPIEnv.create("env", self)
-    
+        self.errors = 0
+        self.results = []
+
     def connect_phase(self):
         """Connect phase."""
         self.logger.info("Connecting SPI Test")
-    
+
+    def expect(self, what, got, expected):
+        if got != expected:
+            self.errors += 1
+            self.logger.error(f"{what}: got {got}, expected {expected}")
+
+    def expected_miso(self, previous, txn):
+        """The slave's previous frame, aligned MSB first to txn.bits."""
+        data, bits = previous[txn.cs]
+        shift = txn.bits - bits
+        data = data << shift if shift >= 0 else data >> -shift
+        return data & ((1 << txn.bits) - 1)
+
+    async def run_sequence(self, seq):
+        """
+        Run seq on the master and check every frame against the slaves'
+        loopback and the monitor. Returns the wall-clock seconds taken.
+        """
+        slaves = self.env.slave_agent.responder.bfms
+        previous = {cs: (slave.last_frame, slave.last_bits) for cs, slave in enumerate(slaves)}
+        expected = []
+        for txn in seq.items:
+            expected.append(self.expected_miso(previous, txn))
+            previous[txn.cs] = (txn.data, txn.bits)
+        monitor = self.env.master_agent.monitor
+        observed = len(monitor.frames)
+        start = time.perf_counter()
+        await seq.start(self.env.master_agent.seqr)
+        elapsed = time.perf_counter() - start
+        name = seq.get_name()
+        for i, (txn, miso) in enumerate(zip(seq.items, expected)):
+            self.expect(f"{name}[{i}] cs{txn.cs} MISO", txn.miso_data, miso)
+        frames = monitor.frames[observed:]
+        self.expect(f"{name} monitored frames", len(frames), len(seq.items))
+        for i, (txn, seen) in enumerate(zip(seq.items, frames)):
+            self.expect(f"{name}[{i}] monitor",
+                        (seen.cs, seen.data, seen.miso_data, seen.bits),
+                        (txn.cs, txn.data, txn.miso_data, txn.bits))
+        return elapsed
+
     async def run_phase(self):
         self.raise_objection()
         self.logger.info("Running SPI test")
-        
-        # Start SPI sequence on master
-        seq = SPISequence.create("seq")
-        await seq.start(self.env.master_agent.seqr)
-        
-        await Timer(1000, unit="ns")
+        env = self.env
+        modes = SPIEnv.MODES
+        await Timer(T_HALF, unit="ns")
+
+        # 1. Walking ones to every chip select
+        walking = SPISequence("walking", modes)
+        await self.run_sequence(walking)
+
+        # 2. Mixed frame lengths; each slave must have received everything
+        mixed = [make_frame(cs, mode, (0xC3A5 + 0x1111 * cs) & 0xFFFF, 16) for cs, mode in enumerate(modes)]
+        mixed += [make_frame(cs, mode, 0x0123_4567 ^ (cs << 28), 32) for cs, mode in enumerate(modes)]
+        await self.run_sequence(SPIItemsSequence("mixed", mixed))
+        for cs, slave in enumerate(env.slave_agent.responder.bfms):
+            received = [data for data, _ in slave.frames]
+            sent = [txn.data for txn in walking.items + mixed if txn.cs == cs]
+            self.expect(f"slave cs{cs} received", received, sent)
+
+        # 3. Benchmark, one chip select (and mode) per frame size
+        for cs, (bits, count) in enumerate(self.BENCHMARK):
+            mask = (1 << bits) - 1
+            items = [make_frame(cs, modes[cs], (0x9E3779B97F4A7C15 * (i + 1)) & mask, bits)
+                     for i in range(count)]
+            sim_start = get_sim_time("ns")
+            elapsed = await self.run_sequence(SPIItemsSequence(f"bench{bits}", items))
+            self.results.append((bits, count, elapsed, get_sim_time("ns") - sim_start))
+
+        await Timer(T_HALF, unit="ns")
         self.drop_objection()
-    
+
     def check_phase(self):
         """Check phase."""
         self.logger.info("Checking SPI test results")
-    
+        bfm = self.env.master_agent.driver.bfm
+        self.expect("monitored frames", len(self.env.master_agent.monitor.frames), bfm.frames)
+
     def report_phase(self):
         self.logger.info("=" * 60)
-        self.logger.info("SPI test completed")
+        bfm = self.env.master_agent.driver.bfm
+        self.logger.info(f"SPI master: {bfm.frames} frames, {bfm.bits} bits")
+        for bits, count, elapsed, sim_ns in self.results:
+            self.logger.info(f"  {bits:3d}-bit frames: {count / elapsed:8.0f} frames/s, "
+                             f"{count * bits / elapsed / 1000:7.1f} kbit/s wall, "
+                             f"{sim_ns / count:7.0f} ns simulated per frame")
+        if self.errors:
+            self.logger.error(f"SPI test FAILED with {self.errors} errors")
+        else:
+            self.logger.info("SPI test completed")
         self.logger.info("=" * 60)
 
 
@@ -183,4 +525,3 @@ async def test_spi(dut):
 if __name__ == "__main__":
     print("This is a pyuvm SPI protocol example.")
     print("To run with cocotb, use the Makefile in the test directory.")
-
@@ -0,0 +1,526 @@
+"""
+Module 8 Example 8.10: Hot-Path Profiling
+Demonstrates opt-in, sim-time-aware profiling of pyuvm component hot paths.
+
+The profiler wraps phase methods, analysis port/export ``write`` calls and
+``seq_item_port.get_next_item``/``item_done`` on every component below the
+component it is attached to. It records call counts, cumulative wall time
+(inclusive and self) and the simulation time of each call, then emits a
+ranked per-component table and a Chrome-trace JSON file at report_phase.
+
+Profiling is enabled with the ``+profile`` plusarg or ``PYUVM_PROFILE=1``.
+When it is disabled nothing is wrapped, so the testbench runs unmodified.
+"""
+
+from pyuvm import *
+import cocotb
+from cocotb.triggers import Timer
+from cocotb.utils import get_sim_time
+import inspect
+import json
+import os
+import random
+import time
+
+
+# Phase methods wrapped on every component (only those its own classes
+# define; the no-op defaults inherited from pyuvm are left alone)
+PROFILED_PHASES = (
+    "build_phase",
+    "connect_phase",
+    "end_of_elaboration_phase",
+    "start_of_simulation_phase",
+    "run_phase",
+    "extract_phase",
+    "check_phase",
+    "report_phase",
+    "final_phase",
+)
+
+# Phases after which new children or ports may exist and must be attached
+RESCAN_PHASES = ("build_phase", "connect_phase")
+
+
+class ProfileStat:
+    """
+    Accumulated statistics for one (component, method) hot path.
+
+    Wall times are in nanoseconds of host time. Sim times are in ns.
+    """
+
+    __slots__ = ("component", "method", "calls", "total_ns", "self_ns",
+                 "max_ns", "first_sim", "last_sim")
+
+    def __init__(self, component, method):
+        self.component = component
+        self.method = method
+        self.calls = 0
+        self.total_ns = 0
+        self.self_ns = 0
+        self.max_ns = 0
+        self.first_sim = None
+        self.last_sim = 0
+
+    def __str__(self):
+        return (f"{self.component}.{self.method}: calls={self.calls}, "
+                f"total={self.total_ns / 1e6:.3f}ms, self={self.self_ns / 1e6:.3f}ms")
+
+
+class _Frame:
+    """Active measurement on the profiler call stack."""
+
+    __slots__ = ("stat", "start", "child_ns")
+
+    def __init__(self, stat, start):
+        self.stat = stat
+        self.start = start
+        self.child_ns = 0
+
+
+class _TimedCoroutine:
+    """
+    Awaitable that drives a coroutine and times each of its steps.
+
+    Only the host time spent inside the coroutine is counted; time spent
+    suspended on a trigger (waiting for the simulator) is not.
+    """
+
+    def __init__(self, profiler, stat, coro):
+        self._profiler = profiler
+        self._stat = stat
+        self._coro = coro
+
+    def __await__(self):
+        profiler = self._profiler
+        stat = self._stat
+        coro = self._coro
+        send_value = None
+        throw_exc = None
+        first = True
+        while True:
+            frame = profiler._enter(stat, count=first)
+            first = False
+            try:
+                if throw_exc is not None:
+                    yielded = coro.throw(throw_exc)
+                else:
+                    yielded = coro.send(send_value)
+            except StopIteration as stop:
+                profiler._exit(frame)
+                return stop.value
+            except BaseException:
+                profiler._exit(frame)
+                raise
+            profiler._exit(frame)
+            try:
+                send_value = yield yielded
+                throw_exc = None
+            except GeneratorExit:
+                coro.close()
+                raise
+            except BaseException as exc:
+                throw_exc = exc
+
+
+class HotPathProfiler:
+    """
+    Opt-in hot-path profiler for a pyuvm component tree.
+
+    Shows:
+    - Wrapping component methods without modifying component classes
+    - Timing coroutines per step so awaits on triggers are excluded
+    - Self time computed with an explicit call stack
+    - Ranked reporting and Chrome-trace export
+
+    Usage:
+        profiler = HotPathProfiler.from_plusargs()
+        profiler.attach(self)           # at the end of the test build_phase
+        ...
+        profiler.report(self.logger)    # in the test report_phase
+    """
+
+    def __init__(self, enabled=False, trace_file="profile_trace.json",
+                 max_trace_events=200000):
+        self.enabled = enabled
+        self.trace_file = trace_file
+        self.max_trace_events = max_trace_events
+        self.stats = {}
+        self.trace_events = []
+        self.dropped_events = 0
+        self._stack = []
+        self._tids = {}
+        self._attached = set()
+        self._origin_ns = time.perf_counter_ns()
+
+    @classmethod
+    def from_plusargs(cls):
+        """Create a profiler configured from plusargs or the environment."""
+        plusargs = getattr(cocotb, "plusargs", None) or {}
+        enabled = ("profile" in plusargs
+                   or os.environ.get("PYUVM_PROFILE", "0") not in ("", "0"))
+        trace_file = plusargs.get("profile_trace",
+                                  os.environ.get("PYUVM_PROFILE_TRACE", "profile_trace.json"))
+        return cls(enabled=enabled, trace_file=trace_file)
+
+    # ------------------------------------------------------------------
+    # Instrumentation
+    # ------------------------------------------------------------------
+
+    def attach(self, comp):
+        """
+        Instrument a component and every component below it.
+
+        Children created later in build_phase are attached automatically
+        when their parent's build_phase returns. Does nothing when disabled.
+        """
+        if not self.enabled:
+            return
+        self._attach_component(comp)
+
+    def _attach_component(self, comp):
+        if id(comp) not in self._attached:
+            self._attached.add(id(comp))
+            name = comp.get_full_name() or comp.get_name()
+            for phase in PROFILED_PHASES:
+                self._wrap_phase(comp, name, phase)
+        self._attach_ports(comp)
+        for child in comp.get_children():
+            # Ports and exports are components in pyuvm; _attach_ports
+            # instruments them under the name of the component owning them
+            if not isinstance(child, uvm_export_base):
+                self._attach_component(child)
+
+    def _attach_ports(self, comp):
+        """Wrap write/get_next_item/item_done on ports and exports owned by comp."""
+        name = comp.get_full_name() or comp.get_name()
+        for attr_name, value in list(vars(comp).items()):
+            if id(value) in self._attached:
+                continue
+            if not isinstance(value, uvm_export_base):
+                continue
+            wrapped = False
+            if callable(getattr(value, "write", None)):
+                self._wrap_method(value, name, f"{attr_name}.write", "write")
+                wrapped = True
+            if callable(getattr(value, "get_next_item", None)):
+                self._wrap_method(value, name, f"{attr_name}.get_next_item", "get_next_item")
+                self._wrap_method(value, name, f"{attr_name}.item_done", "item_done")
+                wrapped = True
+            if wrapped:
+                self._attached.add(id(value))
+
+    @staticmethod
+    def _defines_phase(comp, phase):
+        """True if a class of comp above the pyuvm base classes defines phase."""
+        for cls in type(comp).__mro__:
+            if cls.__module__.split(".")[0] == "pyuvm":
+                return False
+            if phase in cls.__dict__:
+                return True
+        return False
+
+    def _wrap_phase(self, comp, comp_name, phase):
+        if not self._defines_phase(comp, phase):
+            return
+        self._wrap_method(comp, comp_name, phase, phase,
+                          rescan=phase in RESCAN_PHASES)
+
+    def _wrap_method(self, obj, comp_name, label, method_name, rescan=False):
+        original = getattr(obj, method_name, None)
+        if not callable(original):
+            return
+        stat = self._stat(comp_name, label)
+        profiler = self
+
+        if inspect.iscoroutinefunction(original):
+            async def wrapper(*args, **kwargs):
+                result = await _TimedCoroutine(profiler, stat, original(*args, **kwargs))
+                if rescan:
+                    profiler._attach_component(obj)
+                return result
+        else:
+            def wrapper(*args, **kwargs):
+                frame = profiler._enter(stat)
+                try:
+                    return original(*args, **kwargs)
+                finally:
+                    profiler._exit(frame)
+                    if rescan:
+                        profiler._attach_component(obj)
+
+        wrapper.__wrapped__ = original
+        setattr(obj, method_name, wrapper)
+
+    def _stat(self, comp_name, label):
+        key = (comp_name, label)
+        stat = self.stats.get(key)
+        if stat is None:
+            stat = ProfileStat(comp_name, label)
+            self.stats[key] = stat
+        return stat
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+
+    def _enter(self, stat, count=True):
+        if count:
+            sim_now = get_sim_time("ns")
+            stat.calls += 1
+            if stat.first_sim is None:
+                stat.first_sim = sim_now
+            stat.last_sim = sim_now
+        frame = _Frame(stat, time.perf_counter_ns())
+        self._stack.append(frame)
+        return frame
+
+    def _exit(self, frame):
+        end = time.perf_counter_ns()
+        elapsed = end - frame.start
+        self._stack.pop()
+        stat = frame.stat
+        stat.total_ns += elapsed
+        stat.self_ns += elapsed - frame.child_ns
+        if elapsed > stat.max_ns:
+            stat.max_ns = elapsed
+        if self._stack:
+            self._stack[-1].child_ns += elapsed
+        self._record_event(stat, frame.start, elapsed)
+
+    def _record_event(self, stat, start_ns, elapsed_ns):
+        if len(self.trace_events) >= self.max_trace_events:
+            self.dropped_events += 1
+            return
+        tid = self._tids.get(stat.component)
+        if tid is None:
+            tid = len(self._tids) + 1
+            self._tids[stat.component] = tid
+        self.trace_events.append({
+            "name": stat.method,
+            "cat": "pyuvm",
+            "ph": "X",
+            "ts": (start_ns - self._origin_ns) / 1000.0,
+            "dur": elapsed_ns / 1000.0,
+            "pid": 1,
+            "tid": tid,
+            "args": {"sim_time_ns": stat.last_sim},
+        })
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def ranked(self):
+        """Return statistics ranked by self wall time (hottest first)."""
+        return sorted(self.stats.values(), key=lambda s: s.self_ns, reverse=True)
+
+    def component_totals(self):
+        """Return {component: self_ns} summed over all methods, hottest first."""
+        totals = {}
+        for stat in self.stats.values():
+            totals[stat.component] = totals.get(stat.component, 0) + stat.self_ns
+        return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+    def write_chrome_trace(self, filename=None):
+        """Write collected events in Chrome trace-event format."""
+        filename = filename or self.trace_file
+        metadata = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid,
+             "args": {"name": comp}}
+            for comp, tid in self._tids.items()
+        ]
+        with open(filename, "w") as f:
+            json.dump({"traceEvents": metadata + self.trace_events,
+                       "displayTimeUnit": "ms",
+                       "otherData": {"dropped_events": self.dropped_events}}, f)
+        return filename
+
+    def report(self, logger, top=20):
+        """Log the ranked hot-path table and write the Chrome trace."""
+        if not self.enabled:
+            return
+        logger.info("=" * 96)
+        logger.info("Hot-Path Profile (ranked by self wall time)")
+        logger.info("=" * 96)
+        logger.info(f"{'component':<32} {'method':<24} {'calls':>8} "
+                    f"{'self ms':>9} {'total ms':>9} {'avg us':>8} {'sim ns':>12}")
+        for stat in self.ranked()[:top]:
+            if stat.calls == 0:
+                continue
+            avg_us = stat.total_ns / stat.calls / 1000.0
+            sim_span = f"{stat.first_sim:.0f}-{stat.last_sim:.0f}"
+            logger.info(f"{stat.component[-32:]:<32} {stat.method[-24:]:<24} {stat.calls:>8} "
+                        f"{stat.self_ns / 1e6:>9.3f} {stat.total_ns / 1e6:>9.3f} "
+                        f"{avg_us:>8.2f} {sim_span:>12}")
+        logger.info("-" * 96)
+        for comp, self_ns in self.component_totals().items():
+            logger.info(f"  {comp:<40} {self_ns / 1e6:>9.3f} ms")
+        filename = self.write_chrome_trace()
+        logger.info(f"Chrome trace written to {filename} "
+                    f"({len(self.trace_events)} events, {self.dropped_events} dropped)")
+        logger.info("=" * 96)
+
+
+class ProfiledTransaction(uvm_sequence_item):
+    """Transaction for profiling example."""
+
+    def __init__(self, name="ProfiledTransaction"):
+        super().__init__(name)
+        self.data = 0
+        self.address = 0
+        self.command = 0
+
+    def __str__(self):
+        return f"data=0x{self.data:02X}, addr=0x{self.address:04X}, cmd=0x{self.command:02X}"
+
+
+class ProfiledSequence(uvm_sequence):
+    """Sequence generating random transactions for the profiled agent."""
+
+    def __init__(self, name="ProfiledSequence", num_items=200):
+        super().__init__(name)
+        self.num_items = num_items
+
+    async def body(self):
+        for _ in range(self.num_items):
+            txn = ProfiledTransaction()
+            txn.data = random.randint(0, 255)
+            txn.address = random.randint(0, 0xFFFF)
+            txn.command = random.randint(0, 7)
+            await self.start_item(txn)
+            await self.finish_item(txn)
+
+
+class ProfiledDriver(uvm_driver):
+    """Driver that consumes items and publishes what it drove."""
+
+    def build_phase(self):
+        self.ap = uvm_analysis_port("ap", self)
+
+    async def run_phase(self):
+        while True:
+            item = await self.seq_item_port.get_next_item()
+            await Timer(10, unit="ns")
+            self.ap.write(item)
+            self.seq_item_port.item_done()
+
+
+class CoverageCollector(uvm_subscriber):
+    """Coverage subscriber with per-item sampling cost (like CoverageModel)."""
+
+    def __init__(self, name="CoverageCollector", parent=None):
+        super().__init__(name, parent)
+        self.data_coverage = {}
+        self.cross_coverage = {}
+
+    def write(self, txn):
+        self.data_coverage[txn.data] = self.data_coverage.get(txn.data, 0) + 1
+        key = (txn.data, txn.command)
+        self.cross_coverage[key] = self.cross_coverage.get(key, 0) + 1
+
+
+class ProfiledScoreboard(uvm_subscriber):
+    """Scoreboard that keeps a reference copy of every transaction."""
+
+    def __init__(self, name="ProfiledScoreboard", parent=None):
+        super().__init__(name, parent)
+        self.received = []
+
+    def write(self, txn):
+        self.received.append((txn.address, txn.data))
+
+    def check_phase(self):
+        self.logger.info(f"[{self.get_name()}] Checked {len(self.received)} transactions")
+
+
+class ProfiledAgent(uvm_agent):
+    """Agent with sequencer and driver."""
+
+    def build_phase(self):
+        self.seqr = uvm_sequencer("sequencer", self)
+        self.driver = ProfiledDriver.create("driver", self)
+
+    def connect_phase(self):
+        self.driver.seq_item_port.connect(self.seqr.seq_item_export)
+
+
+class ProfiledEnv(uvm_env):
+    """Environment with an agent, coverage collector and scoreboard."""
+
+    def build_phase(self):
+        self.agent = ProfiledAgent.create("agent", self)
+        self.coverage = CoverageCollector.create("coverage", self)
+        self.scoreboard = ProfiledScoreboard.create("scoreboard", self)
+
+    def connect_phase(self):
+        self.agent.driver.ap.connect(self.coverage.analysis_export)
+        self.agent.driver.ap.connect(self.scoreboard.analysis_export)
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+# Using cocotb test wrapper instead for compatibility with cocotb test discovery
+class ProfilingTest(uvm_test):
+    """Test demonstrating hot-path profiling of a small environment."""
+
+    def build_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info("Hot-Path Profiling Example Test")
+        self.logger.info("=" * 60)
+        self.errors = 0
+        self.env = ProfiledEnv.create("env", self)
+        self.profiler = HotPathProfiler.from_plusargs()
+        self.profiler.attach(self)
+        state = "enabled" if self.profiler.enabled else "disabled (use +profile)"
+        self.logger.info(f"Profiler {state}")
+
+    async def run_phase(self):
+        self.raise_objection()
+        seq = ProfiledSequence.create("seq")
+        await seq.start(self.env.agent.seqr)
+        await Timer(20, unit="ns")
+        self.drop_objection()
+
+    def check_phase(self):
+        """With the profiler on, every port and export hot path must have stats."""
+        if not self.profiler.enabled:
+            return
+        driver = self.env.agent.driver.get_full_name()
+        expected = [
+            (driver, "ap.write"),
+            (driver, "seq_item_port.get_next_item"),
+            (driver, "seq_item_port.item_done"),
+            (self.env.agent.seqr.get_full_name(), "seq_item_export.get_next_item"),
+            (self.env.coverage.get_full_name(), "analysis_export.write"),
+            (self.env.scoreboard.get_full_name(), "analysis_export.write"),
+        ]
+        for key in expected:
+            stat = self.profiler.stats.get(key)
+            if stat is None or stat.calls == 0:
+                self.errors += 1
+                self.logger.error(f"No profile stats for {key[0]}.{key[1]}")
+
+    def report_phase(self):
+        self.profiler.report(self.logger)
+        if self.errors:
+            self.logger.error(f"Profiling test FAILED with {self.errors} errors")
+        self.logger.info("=" * 60)
+        self.logger.info("Profiling test completed")
+        self.logger.info("=" * 60)
+
+
+# Cocotb test function to run the pyuvm test
+@cocotb.test()
+async def test_profiling(dut):
+    """Cocotb test wrapper for pyuvm test."""
+    # Register the test class with uvm_root so run_test can find it
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["ProfilingTest"] = ProfilingTest
+    # Use uvm_root to run the test properly (executes all phases in hierarchy)
+    await uvm_root().run_test("ProfilingTest")
+
+
+if __name__ == "__main__":
+    print("This is a pyuvm hot-path profiling example.")
+    print("To run with cocotb, use the Makefile in the test directory.")
+    print("Enable profiling with: make SIM=verilator PLUSARGS=+profile")
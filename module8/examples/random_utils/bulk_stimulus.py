@@ -0,0 +1,120 @@
+"""
+Module 8: Bulk Stimulus
+Whole columns of random field values, with items built only when used.
+
+A sequence that calls random.randint() for every field of every item
+inside its await loop spends a few microseconds of Python per item before
+the DUT sees anything. BulkStimulus draws all N values of each field in
+one call instead:
+
+- columns(count): {field: column of count values}, each field uniform
+  over its range, or over the multiples of its alignment in that range
+  (so alignment adds no skew)
+- items(item_type, count): a LazyItems view over the columns. An item is
+  constructed, named and filled in only when the sequence reaches it, so
+  a sequence stopped early never pays for the rest.
+
+With NumPy installed the columns come from numpy.random.Generator; a
+million values take a few milliseconds. Without NumPy the same ranges are
+drawn with random.Random.choices(), which is slower but needs nothing.
+The seed defaults to one drawn from the random module, so random.seed()
+still makes a run reproducible.
+"""
+
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class BulkStimulus:
+    """
+    Column generator for the integer fields of one item type.
+
+    fields maps a field name to (lo, hi) or (lo, hi, alignment), both
+    bounds inclusive. use_numpy=False forces the pure-Python path.
+    """
+
+    def __init__(self, fields, seed=None, use_numpy=True):
+        self.fields = {}
+        for name, spec in fields.items():
+            lo, hi, align = spec if len(spec) == 3 else (*spec, 1)
+            if align < 1:
+                raise ValueError(f"{name}: alignment must be positive")
+            first = lo + (-lo) % align
+            last = hi - hi % align
+            if first > last:
+                raise ValueError(f"{name}: no multiple of {align} in [{lo}, {hi}]")
+            self.fields[name] = (first, last, align)
+        if seed is None:
+            seed = random.getrandbits(64)
+        self.numpy = use_numpy and np is not None
+        self.rng = np.random.default_rng(seed) if self.numpy else random.Random(seed)
+        self.generated = 0
+
+    def columns(self, count):
+        """{field: count values}; NumPy int64 arrays, or lists without NumPy."""
+        self.generated += count
+        columns = {}
+        for name, (first, last, align) in self.fields.items():
+            if self.numpy:
+                values = self.rng.integers(0, (last - first) // align + 1, size=count, dtype=np.int64)
+                if align != 1:
+                    values *= align
+                if first:
+                    values += first
+                columns[name] = values
+            else:
+                columns[name] = self.rng.choices(range(first, last + 1, align), k=count)
+        return columns
+
+    def items(self, item_type, count, name="item"):
+        """LazyItems of item_type over count freshly generated values per field."""
+        return LazyItems(item_type, self.columns(count), name)
+
+
+class LazyItems:
+    """
+    Read-only sequence of items backed by field columns.
+
+    items[i] builds item_type(f"{name}_{i}") and sets its fields from row
+    i; nothing is built before that. values(i) returns the row without
+    building an item.
+    """
+
+    def __init__(self, item_type, columns, name="item"):
+        self.item_type = item_type
+        self.name = name
+        self.fields = list(columns)
+        # One C-level conversion per column, so a row read is plain list indexing
+        self._columns = [col.tolist() if hasattr(col, "tolist") else list(col)
+                         for col in columns.values()]
+        lengths = {len(col) for col in self._columns}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns differ in length: {sorted(lengths)}")
+        self._len = lengths.pop() if lengths else 0
+        self.built = 0
+
+    def __len__(self):
+        return self._len
+
+    def values(self, index):
+        """Field values of row index, in field order."""
+        return tuple(col[index] for col in self._columns)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError(index)
+        item = self.item_type(f"{self.name}_{index}")
+        for field, col in zip(self.fields, self._columns):
+            setattr(item, field, col[index])
+        self.built += 1
+        return item
+
+    def __iter__(self):
+        for index in range(self._len):
+            yield self[index]
@@ -0,0 +1,552 @@
+"""
+Module 8: Declarative Constraints
+Per-class constraint sets compiled into direct sampling plans.
+
+randomize_constrained() draws each field with its own random.randint()
+call, and anything more than a range is patched afterwards. Patches skew
+the distribution: rounding an address down to a multiple of 4 makes the
+top of the range four times rarer than every other value. Fields that
+depend on each other (address + length inside a window) cannot be
+written at all. Constraints collects the rules once per class:
+
+- rand(name, lo, hi): integer range
+- aligned(name, alignment, offset=0): value % alignment == offset
+- inside(name, values): value from a set
+- dist(name, {value or (lo, hi): weight}): weighted choice; a range's
+  weight is shared by its values (SystemVerilog :/)
+- relation("address + length <= 0x2000"): linear relation (<, <=, >,
+  >=, ==, !=) between fields
+- solve_before("length", "address"): draw length before address
+- check(predicate): anything else, by rejection
+
+compile() (run on first use) turns them into a plan: a drawing order,
+one domain per field with range, alignment, set and weights folded in
+and narrowed by interval propagation through the relations, and for each
+field the relations it closes. A field is drawn directly from the values
+left by the fields drawn before it, so none of the declarative rules
+needs a retry. Only a dead end (no value left for a field), a != clash
+or a failed check() restarts the item.
+
+Fields are drawn in order, each uniformly (or by its weights) among its
+remaining values. As with solve...before in SystemVerilog the order
+shapes the distribution of related fields; it is not uniform over the
+joint solutions.
+"""
+
+import bisect
+import random
+import re
+
+
+_TOKEN = re.compile(r"\s*(?:(0[xX][0-9a-fA-F_]+|0[bB][01_]+|\d[\d_]*)"
+                    r"|([A-Za-z_]\w*)|(<=|>=|==|!=|[-+*<>]))")
+_COMPARISONS = ("<=", ">=", "==", "!=", "<", ">")
+_EXCLUDE_TRIES = 16
+
+
+def _tokens(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise ValueError(f"Cannot parse relation {text!r} at {text[pos:]!r}")
+        number, name, op = match.groups()
+        if number is not None:
+            tokens.append(("num", int(number, 0)))
+        elif name is not None:
+            tokens.append(("name", name))
+        else:
+            tokens.append(("op", op))
+        pos = match.end()
+    return tokens
+
+
+def _linear(tokens, text):
+    """({field: coefficient}, constant) of a sum of terms like 4*length or -2."""
+    if not tokens:
+        raise ValueError(f"Relation {text!r} has an empty side")
+    coefs = {}
+    const = 0
+    i = 0
+    while i < len(tokens):
+        sign = 1
+        while i < len(tokens) and tokens[i] in (("op", "+"), ("op", "-")):
+            sign = -sign if tokens[i][1] == "-" else sign
+            i += 1
+        coef, name = sign, None
+        while True:
+            if i == len(tokens):
+                raise ValueError(f"Relation {text!r} ends in an operator")
+            kind, value = tokens[i]
+            i += 1
+            if kind == "num":
+                coef *= value
+            elif kind == "name" and name is None:
+                name = value
+            else:
+                raise ValueError(f"Relation {text!r} is not linear")
+            if i < len(tokens) and tokens[i] == ("op", "*"):
+                i += 1
+                continue
+            break
+        if name is None:
+            const += coef
+        else:
+            coefs[name] = coefs.get(name, 0) + coef
+        if i < len(tokens) and tokens[i] not in (("op", "+"), ("op", "-")):
+            raise ValueError(f"Relation {text!r}: expected + or - before {tokens[i][1]!r}")
+    return coefs, const
+
+
+def parse_relation(text):
+    """
+    Relation text as (kind, {field: coefficient}, constant) meaning
+    sum(coefficient * field) + constant <kind> 0, with kind one of
+    "<=", "==" or "!=".
+    """
+    tokens = _tokens(text)
+    split = [i for i, token in enumerate(tokens) if token[0] == "op" and token[1] in _COMPARISONS]
+    if len(split) != 1:
+        raise ValueError(f"Relation {text!r} needs exactly one comparison")
+    op = tokens[split[0]][1]
+    lhs, lhs_const = _linear(tokens[:split[0]], text)
+    rhs, rhs_const = _linear(tokens[split[0] + 1:], text)
+    coefs = dict(lhs)
+    for name, coef in rhs.items():
+        coefs[name] = coefs.get(name, 0) - coef
+    const = lhs_const - rhs_const
+    if op in (">=", ">"):
+        coefs = {name: -coef for name, coef in coefs.items()}
+        const = -const
+    if op in ("<", ">"):
+        const += 1  # e < 0 is e + 1 <= 0 for integers
+    kind = {"<": "<=", ">": "<=", ">=": "<="}.get(op, op)
+    return kind, {name: coef for name, coef in coefs.items() if coef}, const
+
+
+def _ceil_div(a, b):
+    return -(-a // b)
+
+
+# rand() has 53 random bits, so int(rand() * count) cannot reach every
+# value once count is larger than this
+_EXACT = 1 << 53
+
+
+def _below(rand, count):
+    """Uniform integer in [0, count) from rand(), for any count."""
+    if count <= _EXACT:
+        return int(rand() * count)
+    bits = (count - 1).bit_length()
+    chunks = _ceil_div(bits, 53)
+    while True:
+        value = 0
+        for _ in range(chunks):
+            value = (value << 53) | int(rand() * _EXACT)
+        value >>= chunks * 53 - bits
+        if value < count:
+            return value
+
+
+class _Runs:
+    """
+    Weighted arithmetic runs: (lo, hi, step, weight per value), lo and hi
+    both in the run. A plain range is one run of weight 1.
+    """
+
+    def __init__(self, runs):
+        self.runs = [run for run in runs if run[0] <= run[1] and run[3] > 0]
+        total = 0.0
+        self.cum = []
+        for lo, hi, step, weight in self.runs:
+            total += weight * ((hi - lo) // step + 1)
+            self.cum.append(total)
+        self.total = total
+
+    def __bool__(self):
+        return bool(self.runs)
+
+    def bounds(self):
+        return min(run[0] for run in self.runs), max(run[1] for run in self.runs)
+
+    @staticmethod
+    def _clip(run, lo_bound, hi_bound):
+        lo, hi, step, weight = run
+        if lo_bound > lo:
+            lo += _ceil_div(lo_bound - lo, step) * step
+        if hi_bound < hi:
+            hi = run[0] + ((hi_bound - run[0]) // step) * step
+        return lo, hi, step, weight
+
+    def clip(self, lo_bound, hi_bound):
+        return _Runs([self._clip(run, lo_bound, hi_bound) for run in self.runs])
+
+    def sampler(self):
+        """Plan step (values so far, rand) -> value, bounded only by the domain."""
+        if len(self.runs) == 1:
+            lo, hi, step, _ = self.runs[0]
+            count = (hi - lo) // step + 1
+            if count > _EXACT:
+                return lambda v, rand: lo + step * _below(rand, count)
+            if step == 1:
+                return lambda v, rand: lo + int(rand() * count)
+            return lambda v, rand: lo + step * int(rand() * count)
+        runs = self.runs
+        cum = self.cum
+        total = self.total
+        last = len(runs) - 1
+
+        def sample(v, rand):
+            i = min(bisect.bisect_right(cum, rand() * total), last)
+            lo, hi, step, _ = runs[i]
+            return lo + step * _below(rand, (hi - lo) // step + 1)
+        return sample
+
+    def draw(self, rand, lo_bound, hi_bound):
+        """Value within [lo_bound, hi_bound] by the domain's weights, or None."""
+        if len(self.runs) == 1:
+            lo, hi, step, _ = self._clip(self.runs[0], lo_bound, hi_bound)
+            if lo > hi:
+                return None
+            return lo + step * _below(rand, (hi - lo) // step + 1)
+        clipped = [self._clip(run, lo_bound, hi_bound) for run in self.runs]
+        weights = [w * ((hi - lo) // step + 1) if lo <= hi else 0.0
+                   for lo, hi, step, w in clipped]
+        total = sum(weights)
+        if not total:
+            return None
+        target = rand() * total
+        for (lo, hi, step, _), weight in zip(clipped, weights):
+            if target < weight:
+                break
+            target -= weight
+        else:
+            lo, hi, step, _ = next(run for run, w in zip(clipped, weights) if w)
+        return lo + step * _below(rand, (hi - lo) // step + 1)
+
+
+class _Values:
+    """Sorted set of equally likely values."""
+
+    def __init__(self, values):
+        self.values = tuple(sorted(set(values)))
+
+    def __bool__(self):
+        return bool(self.values)
+
+    def bounds(self):
+        return self.values[0], self.values[-1]
+
+    def clip(self, lo_bound, hi_bound):
+        return _Values(v for v in self.values if lo_bound <= v <= hi_bound)
+
+    def sampler(self):
+        """Plan step (values so far, rand) -> value."""
+        values = self.values
+        count = len(values)
+        return lambda v, rand: values[int(rand() * count)]
+
+    def draw(self, rand, lo_bound, hi_bound):
+        i = bisect.bisect_left(self.values, lo_bound)
+        j = bisect.bisect_right(self.values, hi_bound)
+        if i >= j:
+            return None
+        return self.values[i + int(rand() * (j - i))]
+
+
+def _dynamic_step(domain, relations):
+    """
+    Step drawing a field bounded by relations on fields already drawn.
+    relations: (kind, coefficient of this field, constant, [(coefficient, other field)]).
+    """
+    domain_lo, domain_hi = domain.bounds()
+
+    def step(v, rand):
+        lo, hi = domain_lo, domain_hi
+        excluded = None
+        for kind, a, const, others in relations:
+            rest = const
+            for c, name in others:
+                rest += c * v[name]
+            m = -rest  # a * x <kind> m
+            if kind == "<=":
+                if a > 0:
+                    hi = min(hi, m // a)
+                else:
+                    lo = max(lo, _ceil_div(m, a))
+            elif kind == "==":
+                if m % a:
+                    return None
+                lo = max(lo, m // a)
+                hi = min(hi, m // a)
+            elif not m % a:
+                excluded = (excluded or set()) | {m // a}
+        if lo > hi:
+            return None
+        value = domain.draw(rand, lo, hi)
+        if excluded:
+            for _ in range(_EXCLUDE_TRIES):
+                if value not in excluded:
+                    break
+                value = domain.draw(rand, lo, hi)
+            else:
+                return None
+        return value
+    return step
+
+
+class Plan:
+    """
+    Compiled constraints: drawing order and one step per field.
+
+    solve() returns {field: value} or None; solved, restarts and failures
+    count the outcomes.
+    """
+
+    def __init__(self, steps, checks, max_tries):
+        self.steps = steps
+        self.checks = checks
+        self.max_tries = max_tries
+        self.order = [name for name, _ in steps]
+        self.solved = 0
+        self.restarts = 0
+        self.failures = 0
+
+    def solve(self, rand=None):
+        rand = rand or random.random
+        for attempt in range(self.max_tries):
+            v = {}
+            for name, step in self.steps:
+                value = step(v, rand)
+                if value is None:
+                    break
+                v[name] = value
+            else:
+                if all(check(v) for check in self.checks):
+                    self.solved += 1
+                    self.restarts += attempt
+                    return v
+        self.failures += 1
+        self.restarts += self.max_tries - 1
+        return None
+
+    def report(self):
+        tries = (self.solved + self.failures + self.restarts) / max(self.solved + self.failures, 1)
+        return (f"{self.solved} solved, {self.failures} failed, {self.restarts} restarts "
+                f"({tries:.3f} tries per item); order {', '.join(self.order)}")
+
+
+class Constraints:
+    """
+    Declarative constraint set for one sequence item class.
+
+    Methods return self so a set can be written as one expression and
+    kept as a class attribute. Fields are drawn in the order they are
+    first mentioned unless solve_before() says otherwise.
+    """
+
+    def __init__(self, max_tries=100):
+        self.max_tries = max_tries
+        self._fields = []
+        self._ranges = {}
+        self._align = {}
+        self._inside = {}
+        self._dist = {}
+        self._relations = []
+        self._before = []
+        self._checks = []
+        self._plan = None
+
+    def _field(self, name):
+        if name not in self._fields:
+            self._fields.append(name)
+        self._plan = None
+        return self
+
+    def rand(self, name, lo=None, hi=None):
+        """Random integer field in [lo, hi]; lo/hi may be omitted with inside() or dist()."""
+        if lo is not None and hi is not None and lo > hi:
+            raise ValueError(f"{name}: empty range [{lo}, {hi}]")
+        self._ranges[name] = (lo, hi)
+        return self._field(name)
+
+    def aligned(self, name, alignment, offset=0):
+        if alignment < 1:
+            raise ValueError(f"{name}: alignment must be positive")
+        self._align[name] = (alignment, offset % alignment)
+        return self._field(name)
+
+    def inside(self, name, values):
+        if name in self._dist:
+            raise ValueError(f"{name}: use either inside() or dist()")
+        self._inside[name] = tuple(values)
+        return self._field(name)
+
+    def dist(self, name, weights):
+        """
+        Weighted choice. Keys are values or inclusive (lo, hi) ranges;
+        a range's weight is spread evenly over its values.
+        """
+        if name in self._inside:
+            raise ValueError(f"{name}: use either inside() or dist()")
+        self._dist[name] = dict(weights)
+        return self._field(name)
+
+    def relation(self, text):
+        """Linear relation between fields, e.g. "address + length <= 0x2000"."""
+        kind, coefs, const = parse_relation(text)
+        self._relations.append((text, kind, coefs, const))
+        self._plan = None
+        return self
+
+    def solve_before(self, first, *later):
+        """Draw first before each field in later."""
+        for name in later:
+            self._before.append((first, name))
+        self._plan = None
+        return self
+
+    def check(self, predicate):
+        """Predicate on {field: value}; items failing it are redrawn (rejection)."""
+        self._checks.append(predicate)
+        self._plan = None
+        return self
+
+    def copy(self):
+        """Independent copy, for a subclass that adds constraints."""
+        other = Constraints(self.max_tries)
+        other._fields = list(self._fields)
+        other._ranges = dict(self._ranges)
+        other._align = dict(self._align)
+        other._inside = dict(self._inside)
+        other._dist = {name: dict(w) for name, w in self._dist.items()}
+        other._relations = list(self._relations)
+        other._before = list(self._before)
+        other._checks = list(self._checks)
+        return other
+
+    def _domain(self, name):
+        lo, hi = self._ranges.get(name, (None, None))
+        align, offset = self._align.get(name, (1, 0))
+        if name in self._inside:
+            return _Values(v for v in self._inside[name]
+                           if (lo is None or v >= lo) and (hi is None or v <= hi)
+                           and v % align == offset)
+        if name in self._dist:
+            spec = self._dist[name]
+        elif lo is None or hi is None:
+            raise ValueError(f"{name}: needs a range, inside() or dist()")
+        else:
+            spec = {(lo, hi): 1}
+        runs = []
+        for key, weight in spec.items():
+            run_lo, run_hi = key if isinstance(key, tuple) else (key, key)
+            per_value = weight / (run_hi - run_lo + 1)
+            run_lo = run_lo if lo is None else max(run_lo, lo)
+            run_hi = run_hi if hi is None else min(run_hi, hi)
+            run_lo += (offset - run_lo) % align
+            run_hi -= (run_hi - offset) % align
+            runs.append((run_lo, run_hi, align, per_value))
+        return _Runs(runs)
+
+    def _order(self):
+        """Declaration order, adjusted by solve_before() edges (stable topological sort)."""
+        rank = {name: i for i, name in enumerate(self._fields)}
+        waits = {name: set() for name in self._fields}
+        for first, later in self._before:
+            for name in (first, later):
+                if name not in rank:
+                    raise ValueError(f"solve_before: unknown field {name!r}")
+            waits[later].add(first)
+        order = []
+        while waits:
+            ready = [name for name, deps in waits.items() if not deps]
+            if not ready:
+                raise ValueError(f"solve_before cycle among {sorted(waits)}")
+            name = min(ready, key=rank.__getitem__)
+            order.append(name)
+            del waits[name]
+            for deps in waits.values():
+                deps.discard(name)
+        return order
+
+    def _propagate(self, domains):
+        """Narrow every domain to values some assignment of the others could satisfy."""
+        bounds = []
+        for text, kind, coefs, const in self._relations:
+            if kind == "==":
+                bounds.append((coefs, const))
+                bounds.append(({n: -c for n, c in coefs.items()}, -const))
+            elif kind == "<=":
+                bounds.append((coefs, const))
+        for _ in range(20):
+            changed = False
+            for coefs, const in bounds:
+                # a * x <= -(const + sum of the others' smallest terms)
+                low = {n: min(c * domains[n].bounds()[0], c * domains[n].bounds()[1])
+                       for n, c in coefs.items()}
+                total = const + sum(low.values())
+                for name, a in coefs.items():
+                    m = -(total - low[name])
+                    lo, hi = domains[name].bounds()
+                    new_lo, new_hi = (lo, min(hi, m // a)) if a > 0 else (max(lo, _ceil_div(m, a)), hi)
+                    if (new_lo, new_hi) != (lo, hi):
+                        domains[name] = domains[name].clip(new_lo, new_hi)
+                        if not domains[name]:
+                            raise ValueError(f"Constraints on {name!r} cannot be satisfied")
+                        changed = True
+            if not changed:
+                break
+
+    def compile(self):
+        """Build (and keep) the sampling plan."""
+        for text, kind, coefs, const in self._relations:
+            unknown = set(coefs) - set(self._fields)
+            if unknown:
+                raise ValueError(f"Relation {text!r} uses undeclared fields {sorted(unknown)}")
+            if not coefs and not {"<=": const <= 0, "==": const == 0, "!=": const != 0}[kind]:
+                raise ValueError(f"Relation {text!r} is always false")
+        domains = {}
+        for name in self._fields:
+            domains[name] = self._domain(name)
+            if not domains[name]:
+                raise ValueError(f"Constraints on {name!r} cannot be satisfied")
+        self._propagate(domains)
+
+        order = self._order()
+        position = {name: i for i, name in enumerate(order)}
+        closing = {name: [] for name in order}
+        for text, kind, coefs, const in self._relations:
+            if not coefs:
+                continue
+            last = max(coefs, key=position.__getitem__)
+            others = [(c, n) for n, c in coefs.items() if n != last]
+            closing[last].append((kind, coefs[last], const, others))
+
+        steps = []
+        for name in order:
+            if closing[name]:
+                steps.append((name, _dynamic_step(domains[name], closing[name])))
+            else:
+                steps.append((name, domains[name].sampler()))
+        self._plan = Plan(steps, list(self._checks), self.max_tries)
+        return self._plan
+
+    @property
+    def plan(self):
+        return self._plan or self.compile()
+
+    def solve(self, rng=None):
+        """{field: value} satisfying every constraint, or None after max_tries."""
+        return self.plan.solve(rng.random if rng is not None else random.random)
+
+    def randomize(self, item, rng=None):
+        """Set item's fields to a solution. Returns False if none was found."""
+        values = self.plan.solve(rng.random if rng is not None else random.random)
+        if values is None:
+            return False
+        for name, value in values.items():
+            setattr(item, name, value)
+        return True
@@ -1,28 +1,52 @@
 """
 Module 8 Example 8.8: Random Utilities
 Demonstrates random number generation and constrained randomization.
+
+Constrained fields go through constraints.Constraints: declarative
+ranges, alignment, dist, inside and linear relations, compiled once per
+class into a sampling plan. ConstraintThroughputTest measures how many
+items per second each approach solves. BulkStimulusTest measures
+generating whole columns of field values at once (bulk_stimulus), with
+items built lazily as BulkRandomSequence starts them.
+
+The sequences draw from rng_streams instead of the global random
+module: each sequence has its own counter-based stream derived from the
+master +seed and its path, and item N of a stream can be regenerated
+directly. RngStreamTest checks both.
 """
 
 from pyuvm import *
+import os
 import random
+import time
 import cocotb
 from cocotb.triggers import Timer
 
+from bulk_stimulus import BulkStimulus
+from constraints import Constraints
+from rng_streams import CounterRandom, sequence_path, sequence_stream, streams
+
 
 class RandomDriver(uvm_driver):
     """Driver for random utilities example."""
 
     def __init__(self, name="RandomDriver", parent=None):
         super().__init__(name, parent)
+        self.driven = []
 
     async def run_phase(self):
         while True:
             txn = await self.seq_item_port.get_next_item()
             # Just consume the transaction - no actual DUT interaction needed for this example
             self.logger.info(f"Driving: {txn}")
+            self.driven.append(txn)
             self.seq_item_port.item_done()
 
 
+# Compiled constraint sets for randomize_constrained(), keyed by its arguments
+_RANGE_CONSTRAINTS = {}
+
+
 class RandomTransaction(uvm_sequence_item):
     """Transaction with random fields."""
     
@@ -32,46 +56,132 @@ class RandomTransaction(uvm_sequence_item):
         self.address = 0
         self.length = 0
     
-    def randomize(self, seed=None):
-        """Randomize transaction fields."""
+    @staticmethod
+    def draw(rng):
+        """(data, address, length) as randomize() draws them from rng."""
+        return rng.randint(0, 0xFF), rng.randint(0, 0xFFFF), rng.randint(1, 256)
+
+    def randomize(self, seed=None, rng=None):
+        """Randomize transaction fields from rng (default: the global random module)."""
         if seed is not None:
             random.seed(seed)
         
-        self.data = random.randint(0, 0xFF)
-        self.address = random.randint(0, 0xFFFF)
-        self.length = random.randint(1, 256)
+        self.data, self.address, self.length = self.draw(rng or random)
     
     def randomize_constrained(self, data_min=0, data_max=0xFF, 
                               addr_min=0, addr_max=0xFFFF,
-                              length_min=1, length_max=256, seed=None):
-        """Randomize with constraints."""
+                              length_min=1, length_max=256, addr_align=1, seed=None, rng=None):
+        """Randomize with constraints; address is drawn only from multiples of addr_align."""
         if seed is not None:
             random.seed(seed)
         
-        self.data = random.randint(data_min, data_max)
-        self.address = random.randint(addr_min, addr_max)
-        self.length = random.randint(length_min, length_max)
+        key = (data_min, data_max, addr_min, addr_max, length_min, length_max, addr_align)
+        constraints = _RANGE_CONSTRAINTS.get(key)
+        if constraints is None:
+            constraints = _RANGE_CONSTRAINTS[key] = (
+                Constraints()
+                .rand("data", data_min, data_max)
+                .rand("address", addr_min, addr_max).aligned("address", addr_align)
+                .rand("length", length_min, length_max))
+        return constraints.randomize(self, rng)
     
     def __str__(self):
         return f"data=0x{self.data:02X}, addr=0x{self.address:04X}, len={self.length}"
 
 
+KIND_READ, KIND_WRITE, KIND_IDLE = 0, 1, 2
+
+
+def _within_1k(v):
+    """A burst must not cross a 1 KB boundary (not linear, so checked by rejection)."""
+    return v["address"] // 1024 == (v["address"] + v["length"] - 1) // 1024
+
+
+class BurstTransaction(uvm_sequence_item):
+    """Burst inside the 0x1000-0x1FFF window, with cross-field constraints."""
+
+    CONSTRAINTS = (Constraints()
+                   .dist("kind", {KIND_READ: 60, KIND_WRITE: 30, KIND_IDLE: 10})
+                   .rand("address", 0x1000, 0x1FFF).aligned("address", 4)
+                   .rand("length", 4, 256).aligned("length", 4)
+                   .inside("burst", (1, 4, 8, 16))
+                   .dist("data", {0x00: 10, 0xFF: 10, (0x01, 0xFE): 80})
+                   .relation("address + length <= 0x2000")
+                   .relation("length >= 4 * burst")
+                   .solve_before("length", "address")
+                   .check(_within_1k))
+
+    def __init__(self, name="BurstTransaction"):
+        super().__init__(name)
+        self.kind = KIND_READ
+        self.address = 0x1000
+        self.length = 4
+        self.burst = 1
+        self.data = 0
+
+    def randomize(self):
+        return self.CONSTRAINTS.randomize(self)
+
+    def valid(self):
+        """True if the fields satisfy every constraint."""
+        return (self.kind in (KIND_READ, KIND_WRITE, KIND_IDLE)
+                and 0x1000 <= self.address and self.address % 4 == 0
+                and 4 <= self.length <= 256 and self.length % 4 == 0
+                and self.burst in (1, 4, 8, 16) and 0 <= self.data <= 0xFF
+                and self.address + self.length <= 0x2000
+                and self.length >= 4 * self.burst
+                and _within_1k(vars(self)))
+
+    def __str__(self):
+        return (f"kind={self.kind}, addr=0x{self.address:04X}, len={self.length}, "
+                f"burst={self.burst}, data=0x{self.data:02X}")
+
+
 class RandomSequence(uvm_sequence):
-    """Sequence generating random transactions."""
+    """
+    Sequence generating random transactions.
+
+    Item i is drawn from item i of the sequence's own stream, so
+    first_item = N replays the run from item N without drawing items
+    0..N-1. seed, if set, replaces the master seed for this sequence.
+    """
     
-    def __init__(self, name="RandomSequence", seed=None):
+    def __init__(self, name="RandomSequence", seed=None, num_items=10, first_item=0):
         super().__init__(name)
         self.seed = seed
+        self.num_items = num_items
+        self.first_item = first_item
     
     async def body(self):
         """Generate random transactions."""
-        if self.seed is not None:
-            random.seed(self.seed)
-            # Note: Sequences don't have logger, so we skip logging here
-        
-        for i in range(10):
+        stream = sequence_stream(self, self.seed)
+        for i in range(self.first_item, self.first_item + self.num_items):
             txn = RandomTransaction()
-            txn.randomize()
+            txn.randomize(rng=stream.item(i))
+            await self.start_item(txn)
+            await self.finish_item(txn)
+            await Timer(10, unit="ns")
+
+
+# Field ranges of RandomTransaction.randomize(), for BulkStimulus
+RANDOM_FIELDS = {"data": (0, 0xFF), "address": (0, 0xFFFF), "length": (1, 256)}
+
+
+class BulkRandomSequence(uvm_sequence):
+    """RandomSequence with all field values generated up front as columns."""
+
+    def __init__(self, name="BulkRandomSequence", seed=None, num_items=10):
+        super().__init__(name)
+        self.seed = seed
+        self.num_items = num_items
+        self.items = None
+
+    async def body(self):
+        """Start items built lazily from the columns."""
+        seed = sequence_stream(self, self.seed).seed()
+        self.items = BulkStimulus(RANDOM_FIELDS, seed).items(
+            RandomTransaction, self.num_items, name="txn")
+        for txn in self.items:
             await self.start_item(txn)
             await self.finish_item(txn)
             await Timer(10, unit="ns")
@@ -80,19 +190,18 @@ class RandomSequence(uvm_sequence):
 class ConstrainedRandomSequence(uvm_sequence):
     """Sequence with constrained randomization."""
     
-    def __init__(self, name="ConstrainedRandomSequence", seed=None):
+    def __init__(self, name="ConstrainedRandomSequence", seed=None, first_item=0):
         super().__init__(name)
         self.seed = seed
+        self.first_item = first_item
     
     async def body(self):
         """Generate constrained random transactions."""
-        if self.seed is not None:
-            random.seed(self.seed)
-            # Note: Sequences don't have logger, so we skip logging here
-        
-        for i in range(10):
+        stream = sequence_stream(self, self.seed)
+        for i in range(self.first_item, self.first_item + 10):
             txn = RandomTransaction()
             # Constrain: data in range 0x10-0xF0, address aligned to 4-byte boundary
+            # (alignment is part of the constraint, so every aligned address is equally likely)
             txn.randomize_constrained(
                 data_min=0x10,
                 data_max=0xF0,
@@ -100,10 +209,9 @@ class ConstrainedRandomSequence(uvm_sequence):
                 addr_max=0x2000,
                 length_min=16,
                 length_max=64,
-                seed=self.seed
+                addr_align=4,
+                rng=stream.item(i)
             )
-            # Align address to 4-byte boundary
-            txn.address = (txn.address // 4) * 4
             
             await self.start_item(txn)
             await self.finish_item(txn)
@@ -222,6 +330,297 @@ class RandomUtilsTest(uvm_test):
         self.logger.info("=" * 60)
 
 
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+class ConstraintThroughputTest(uvm_test):
+    """
+    Items solved per second, ITEMS items per approach.
+
+    1. RandomTransaction.randomize(): three independent random.randint() calls
+    2. randomize_constrained() with addr_align=4, through a compiled plan
+    3. BurstTransaction: dist, inside, alignment, relations and a check()
+    4. The BurstTransaction rules by plain rejection sampling (ITEMS // 10)
+    """
+
+    ITEMS = int(os.environ.get("RANDOMIZE_ITEMS", "1000000"))
+    SAMPLES = 100_000
+    SEED = 2024
+
+    def build_phase(self):
+        self.errors = 0
+        self.rates = {}
+        self.rejection_tries = 0
+
+    def expect(self, what, ok):
+        if not ok:
+            self.errors += 1
+            self.logger.error(f"Constraint check failed: {what}")
+
+    def rate(self, randomize, items):
+        start = time.perf_counter()
+        for _ in range(items):
+            randomize()
+        return items / (time.perf_counter() - start)
+
+    def rejection_burst(self, txn):
+        """Draw every BurstTransaction field independently until all constraints hold."""
+        while True:
+            self.rejection_tries += 1
+            txn.kind = random.choices((KIND_READ, KIND_WRITE, KIND_IDLE), (60, 30, 10))[0]
+            txn.address = random.randint(0x1000, 0x1FFF)
+            txn.length = random.randint(4, 256)
+            txn.burst = random.choice((1, 4, 8, 16))
+            txn.data = random.choices((0x00, 0xFF, random.randint(0x01, 0xFE)), (10, 10, 80))[0]
+            if txn.valid():
+                return True
+
+    def check_samples(self):
+        txn = RandomTransaction()
+        counts = {}
+        for _ in range(self.SAMPLES):
+            txn.randomize_constrained(0x10, 0xF0, 0x1000, 0x2000, 16, 64, addr_align=4)
+            counts[txn.address] = counts.get(txn.address, 0) + 1
+        self.expect("addresses 4-byte aligned", all(a % 4 == 0 for a in counts))
+        # Rounding down made 0x2000 a quarter as likely as other addresses
+        mean = self.SAMPLES / 1025
+        self.expect(f"0x2000 drawn {counts.get(0x2000, 0)} times (mean {mean:.0f})",
+                    counts.get(0x2000, 0) > mean / 2)
+
+        burst = BurstTransaction()
+        kinds = [0, 0, 0]
+        for _ in range(self.SAMPLES):
+            self.expect("BurstTransaction solved", burst.randomize())
+            if not burst.valid():
+                self.expect(f"valid burst: {burst}", False)
+                break
+            kinds[burst.kind] += 1
+        for kind, weight in ((KIND_READ, 0.6), (KIND_WRITE, 0.3), (KIND_IDLE, 0.1)):
+            share = kinds[kind] / self.SAMPLES
+            self.expect(f"kind {kind} share {share:.3f} vs {weight}", abs(share - weight) < 0.01)
+
+    async def run_phase(self):
+        self.raise_objection()
+        random.seed(self.SEED)
+        txn = RandomTransaction()
+        burst = BurstTransaction()
+        self.rates["randint, 3 fields"] = self.rate(txn.randomize, self.ITEMS)
+        self.rates["plan, ranges + align"] = self.rate(
+            lambda: txn.randomize_constrained(0x10, 0xF0, 0x1000, 0x2000, 16, 64, addr_align=4),
+            self.ITEMS)
+        self.rates["plan, cross-field"] = self.rate(burst.randomize, self.ITEMS)
+        self.rates["rejection, cross-field"] = self.rate(
+            lambda: self.rejection_burst(burst), self.ITEMS // 10)
+        self.check_samples()
+        await Timer(10, unit="ns")
+        self.drop_objection()
+
+    def report_phase(self):
+        plan = BurstTransaction.CONSTRAINTS.plan
+        self.logger.info("=" * 60)
+        self.logger.info(f"Constraint solve throughput ({self.ITEMS:,} items per approach)")
+        for what, rate in self.rates.items():
+            self.logger.info(f"  {what:<24}{rate:>12,.0f} items/s")
+        self.logger.info(f"  BurstTransaction plan: {plan.report()}")
+        self.logger.info(f"  Rejection sampling: "
+                         f"{self.rejection_tries / (self.ITEMS // 10):.1f} tries per item")
+        if self.errors:
+            self.logger.error(f"Constraint throughput test FAILED with {self.errors} errors")
+        self.logger.info("=" * 60)
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+class BulkStimulusTest(uvm_test):
+    """
+    Cost of generating stimulus, in microseconds per 1,000 items.
+
+    1. Per item: three random.randint() calls, as RandomSequence does
+    2. BulkStimulus columns with NumPy (when installed)
+    3. BulkStimulus columns without NumPy
+    4. Building uvm_sequence_items from the columns (LazyItems)
+    Then BulkRandomSequence drives SEQUENCE_ITEMS items through the
+    sequencer and the driven items are compared with the columns.
+    """
+
+    ITEMS = int(os.environ.get("BULK_ITEMS", "1000000"))
+    BUILD_ITEMS = 10_000
+    SEQUENCE_ITEMS = 100
+    SEED = 2024
+
+    def build_phase(self):
+        self.errors = 0
+        self.costs = {}
+        self.env = RandomEnv.create("env", self)
+
+    def expect(self, what, ok):
+        if not ok:
+            self.errors += 1
+            self.logger.error(f"Bulk stimulus check failed: {what}")
+
+    def cost(self, label, generate, items):
+        start = time.perf_counter()
+        generate()
+        self.costs[label] = (time.perf_counter() - start) * 1e6 * 1000 / items
+
+    def per_item(self):
+        randint = random.randint
+        for _ in range(self.ITEMS):
+            randint(0, 0xFF)
+            randint(0, 0xFFFF)
+            randint(1, 256)
+
+    def check_columns(self, columns, fields):
+        for name, (lo, hi, *align) in fields.items():
+            column = list(columns[name])
+            step = align[0] if align else 1
+            self.expect(f"{name} within [{lo:#x}, {hi:#x}]", lo <= min(column) and max(column) <= hi)
+            self.expect(f"{name} aligned to {step}", all(v % step == 0 for v in column))
+
+    async def run_phase(self):
+        self.raise_objection()
+        random.seed(self.SEED)
+        aligned = dict(RANDOM_FIELDS, address=(0x1000, 0x2000, 4))
+        self.cost("randint per item", self.per_item, self.ITEMS)
+        for use_numpy in (True, False):
+            stimulus = BulkStimulus(aligned, use_numpy=use_numpy)
+            if use_numpy and not stimulus.numpy:
+                self.logger.info("NumPy not installed; skipping the NumPy columns")
+                continue
+            columns = {}
+            self.cost(f"columns, {'NumPy' if use_numpy else 'no NumPy'}",
+                      lambda: columns.update(stimulus.columns(self.ITEMS)), self.ITEMS)
+            self.check_columns(columns, aligned)
+        items = BulkStimulus(RANDOM_FIELDS).items(RandomTransaction, self.BUILD_ITEMS)
+        self.cost("build items (lazy)", lambda: [items[i] for i in range(len(items))],
+                  self.BUILD_ITEMS)
+
+        seq = BulkRandomSequence.create("bulk_seq")
+        seq.seed = self.SEED
+        seq.num_items = self.SEQUENCE_ITEMS
+        await seq.start(self.env.agent.seqr)
+        driven = self.env.agent.driver.driven
+        self.expect(f"{self.SEQUENCE_ITEMS} items driven, got {len(driven)}",
+                    len(driven) == self.SEQUENCE_ITEMS)
+        for i, txn in enumerate(driven):
+            if (txn.data, txn.address, txn.length) != seq.items.values(i):
+                self.expect(f"item {i} {txn} matches column row {seq.items.values(i)}", False)
+                break
+        self.drop_objection()
+
+    def report_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info(f"Stimulus generation cost ({self.ITEMS:,} items, 3 fields)")
+        for what, us in self.costs.items():
+            self.logger.info(f"  {what:<24}{us:>10,.1f} us per 1,000 items")
+        if self.errors:
+            self.logger.error(f"Bulk stimulus test FAILED with {self.errors} errors")
+        self.logger.info("=" * 60)
+
+
+# Note: @uvm_test() decorator removed to avoid import-time TypeError
+class RngStreamTest(uvm_test):
+    """
+    Per-sequence random streams.
+
+    1. Independence: two sequences' items are the same whether each runs
+       alone or both interleave (and differ, for contrast, when they
+       share the global random module)
+    2. Jump: output REPLAY_ITEM of a CounterRandom reached with jump()
+       equals the same output reached by drawing every output before it
+    3. Replay: RandomSequence restarted at first_item = REPLAY_ITEMS - 3
+       drives the last items its full run drove
+    4. Same-named sequences started on one sequencer get distinct streams
+    """
+
+    ITEMS = 1000
+    REPLAY_ITEMS = 8
+    REPLAY_ITEM = int(os.environ.get("REPLAY_ITEM", "200000"))
+
+    def build_phase(self):
+        self.errors = 0
+        self.env = RandomEnv.create("env", self)
+        self.streams = streams()
+
+    def expect(self, what, ok):
+        if not ok:
+            self.errors += 1
+            self.logger.error(f"Stream check failed: {what}")
+
+    def interleaved(self, draw_a, draw_b):
+        """ITEMS items of A, drawn alone and drawn alternately with B at random."""
+        alone = [draw_a(i) for i in range(self.ITEMS)]
+        order = random.Random(1).choices("ab", k=2 * self.ITEMS)
+        mixed, a, b = [], 0, 0
+        for who in order:
+            if who == "a" and a < self.ITEMS:
+                mixed.append(draw_a(a))
+                a += 1
+            elif b < self.ITEMS:
+                draw_b(b)
+                b += 1
+        mixed.extend(draw_a(i) for i in range(a, self.ITEMS))
+        return alone, mixed
+
+    async def run_phase(self):
+        self.raise_objection()
+        seqr = self.env.agent.seqr.get_full_name()
+        seq_a = self.streams.stream(f"{seqr}.seq_a")
+        seq_b = self.streams.stream(f"{seqr}.seq_b")
+        alone, mixed = self.interleaved(lambda i: RandomTransaction.draw(seq_a.item(i)),
+                                        lambda i: RandomTransaction.draw(seq_b.item(i)))
+        self.expect("stream A unaffected by stream B", alone == mixed)
+        random.seed(1)
+        alone, _ = self.interleaved(lambda i: RandomTransaction.draw(random), lambda i: None)
+        random.seed(1)
+        _, mixed = self.interleaved(lambda i: RandomTransaction.draw(random),
+                                    lambda i: RandomTransaction.draw(random))
+        self.global_shared = alone != mixed
+
+        key = self.streams.stream(f"{seqr}.replay_seq").key
+        rng = CounterRandom(key)
+        start = time.perf_counter()
+        for _ in range(self.REPLAY_ITEM):
+            rng.getrandbits(64)
+        sequential = rng.getrandbits(64)
+        self.sequential_s = time.perf_counter() - start
+        start = time.perf_counter()
+        rng = CounterRandom(key)
+        rng.jump(self.REPLAY_ITEM)
+        jumped = rng.getrandbits(64)
+        self.jump_s = time.perf_counter() - start
+        self.expect(f"output {self.REPLAY_ITEM} by jump {jumped:#x} vs sequential {sequential:#x}",
+                    jumped == sequential)
+
+        driven = self.env.agent.driver.driven
+        seq = RandomSequence.create("replay_seq")
+        seq.num_items = self.REPLAY_ITEMS
+        await seq.start(self.env.agent.seqr)
+        full = [(t.data, t.address, t.length) for t in driven[-self.REPLAY_ITEMS:]]
+        seq.first_item, seq.num_items = self.REPLAY_ITEMS - 3, 3
+        await seq.start(self.env.agent.seqr)
+        replayed = [(t.data, t.address, t.length) for t in driven[-3:]]
+        self.expect(f"replayed items {replayed} vs full run {full[-3:]}", replayed == full[-3:])
+
+        twins = []
+        for _ in range(2):
+            twin = RandomSequence.create("twin_seq")
+            twin.num_items = 3
+            await twin.start(self.env.agent.seqr)
+            twins.append((sequence_path(twin), [(t.data, t.address, t.length) for t in driven[-3:]]))
+        self.expect(f"same-named sequences share a stream: {twins}",
+                    twins[0][0] != twins[1][0] and twins[0][1] != twins[1][1])
+        self.drop_objection()
+
+    def report_phase(self):
+        self.logger.info("=" * 60)
+        self.logger.info(f"Random streams: {self.streams.report()}")
+        self.logger.info(f"  Interleaving changes a sequence's items when sharing the "
+                         f"global random module: {self.global_shared}")
+        self.logger.info(f"  Output {self.REPLAY_ITEM:,}: {self.sequential_s:.2f} s by drawing "
+                         f"every output before it, {self.jump_s * 1e6:.1f} us by jump()")
+        if self.errors:
+            self.logger.error(f"Random stream test FAILED with {self.errors} errors")
+        self.logger.info("=" * 60)
+
+
 # Cocotb test function to run the pyuvm test
 @cocotb.test()
 async def test_random_utils(dut):
@@ -234,6 +633,33 @@ async def test_random_utils(dut):
     await uvm_root().run_test("RandomUtilsTest")
 
 
+@cocotb.test()
+async def test_bulk_stimulus(dut):
+    """Cocotb test wrapper for BulkStimulusTest."""
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["BulkStimulusTest"] = BulkStimulusTest
+    await uvm_root().run_test("BulkStimulusTest")
+
+
+@cocotb.test()
+async def test_rng_streams(dut):
+    """Cocotb test wrapper for RngStreamTest."""
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["RngStreamTest"] = RngStreamTest
+    await uvm_root().run_test("RngStreamTest")
+
+
+@cocotb.test()
+async def test_constraint_throughput(dut):
+    """Cocotb test wrapper for ConstraintThroughputTest."""
+    if not hasattr(uvm_root(), 'm_uvm_test_classes'):
+        uvm_root().m_uvm_test_classes = {}
+    uvm_root().m_uvm_test_classes["ConstraintThroughputTest"] = ConstraintThroughputTest
+    await uvm_root().run_test("ConstraintThroughputTest")
+
+
 if __name__ == "__main__":
     print("This is a pyuvm random utilities example.")
     print("Python's random module provides randomization capabilities.")
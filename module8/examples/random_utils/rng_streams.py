@@ -0,0 +1,191 @@
+"""
+Module 8: Random Streams
+Independent, counter-based random streams per component, from one master seed.
+
+Sequences that call random.seed() share Python's global generator: two
+sequences running at once take turns drawing from it, so each one's
+stimulus depends on how they interleave, and item N can only be
+reproduced by drawing everything before it again. Here every value is a
+function of (master seed, stream path, item index, draw index):
+
+- RngStreams(master_seed).stream(path) gives the stream of a component
+  or sequence path, e.g. "uvm_test_top.env.agent.sequencer.seq"
+  (sequence_path() adds "#1", "#2", ... for later same-named sequences)
+- stream.item(n) gives the generator for item n of that stream, in O(1),
+  whatever was drawn before
+- CounterRandom is a random.Random, so randint(), choice(), shuffle()
+  and the Constraints/BulkStimulus helpers accept it unchanged
+
+Values come from the SplitMix64 output function applied to a counter, so
+jumping is setting the counter. Stream and item keys are derived with
+BLAKE2b from the master seed and the path. streams() returns the shared
+instance, seeded from +seed or, without it, from cocotb's RANDOM_SEED.
+"""
+
+import hashlib
+import random
+
+import cocotb
+
+
+_MASK = (1 << 64) - 1
+_GAMMA = 0x9E3779B97F4A7C15
+
+
+def _mix64(z):
+    """SplitMix64 output function."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+def derive_key(*parts):
+    """64-bit key from any printable parts (seed, path, ...)."""
+    text = "\0".join(str(part) for part in parts).encode()
+    return int.from_bytes(hashlib.blake2b(text, digest_size=8).digest(), "little")
+
+
+class CounterRandom(random.Random):
+    """
+    random.Random whose n-th 64-bit output is a pure function of (key, n).
+
+    jump(n) makes the next draw the n-th, without drawing the ones
+    before it. getstate()/setstate() are (key, counter).
+    """
+
+    def __init__(self, key=0, counter=0):
+        super().__init__(key)
+        self.counter = counter
+
+    def seed(self, a=0, version=2):
+        self.key = a & _MASK if isinstance(a, int) else derive_key(a)
+        self.counter = 0
+        self.gauss_next = None
+
+    def jump(self, counter):
+        self.counter = counter
+        self.gauss_next = None
+
+    def getstate(self):
+        return self.key, self.counter
+
+    def setstate(self, state):
+        self.key, self.counter = state
+        self.gauss_next = None
+
+    def _next64(self):
+        self.counter += 1
+        return _mix64((self.key + self.counter * _GAMMA) & _MASK)
+
+    def random(self):
+        return (self._next64() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k):
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self._next64() << shift
+        return bits & ((1 << k) - 1)
+
+
+class Stream:
+    """The random stream of one path: one CounterRandom per item index."""
+
+    def __init__(self, key, path=""):
+        self.key = key
+        self.path = path
+
+    def seed(self, index=0):
+        """64-bit seed of item index, for generators that take a seed (BulkStimulus)."""
+        return _mix64(self.key ^ _mix64(((index + 1) * _GAMMA) & _MASK))
+
+    def item(self, index):
+        """Generator for item index of this stream, positioned at its first draw."""
+        return CounterRandom(self.seed(index))
+
+    def __repr__(self):
+        return f"Stream({self.path!r}, key={self.key:#018x})"
+
+
+class RngStreams:
+    """Streams for every path, all derived from master_seed."""
+
+    def __init__(self, master_seed):
+        self.master_seed = int(master_seed)
+        self._streams = {}
+
+    @classmethod
+    def from_plusargs(cls):
+        """Master seed from +seed=<n>, else cocotb.RANDOM_SEED, else 0."""
+        plusargs = getattr(cocotb, "plusargs", None) or {}
+        seed = plusargs.get("seed")
+        if seed is None or seed is True:
+            seed = getattr(cocotb, "RANDOM_SEED", 0)
+        return cls(int(str(seed), 0))
+
+    def stream(self, path):
+        stream = self._streams.get(path)
+        if stream is None:
+            stream = self._streams[path] = Stream(derive_key(self.master_seed, path), path)
+        return stream
+
+    def item(self, path, index):
+        """Generator for item index of path's stream."""
+        return self.stream(path).item(index)
+
+    def report(self):
+        return f"master seed {self.master_seed}, {len(self._streams)} streams"
+
+
+_streams = None
+
+
+def streams():
+    """The shared RngStreams, created from the plusargs on first use."""
+    global _streams
+    if _streams is None:
+        _streams = RngStreams.from_plusargs()
+    return _streams
+
+
+def set_master_seed(seed):
+    """Replace the shared RngStreams with one for seed."""
+    global _streams
+    _streams = RngStreams(seed)
+    return _streams
+
+
+def sequence_path(sequence):
+    """
+    Stream path of a started sequence: its sequencer's full name plus its
+    name, and "#k" for the k-th later start of another sequence with the
+    same name on that sequencer (k >= 1), so same-named sequences get
+    streams of their own. A sequence keeps its path when it is restarted
+    on the same sequencer, so first_item replays its own items.
+    """
+    sequencer = getattr(sequence, "sequencer", None)
+    cached = getattr(sequence, "_stream_path", None)
+    if cached is not None and cached[0] is sequencer:
+        return cached[1]
+    name = sequence.get_name()
+    if sequencer is None:
+        path = name
+    else:
+        # Start counts live on the sequencer, so each test's new
+        # sequencer numbers its sequences from scratch
+        starts = sequencer.__dict__.setdefault("_stream_starts", {})
+        index = starts.get(name, 0)
+        starts[name] = index + 1
+        path = f"{sequencer.get_full_name()}.{name}" + (f"#{index}" if index else "")
+    sequence._stream_path = (sequencer, path)
+    return path
+
+
+def sequence_stream(sequence, seed=None):
+    """
+    Stream of a started sequence, from the shared streams, or from a
+    master seed of its own when seed is given.
+    """
+    source = RngStreams(seed) if seed is not None else streams()
+    return source.stream(sequence_path(sequence))
@@ -0,0 +1,312 @@
+"""
+Inputs of the runnable example and test directories.
+
+Every directory the moduleN.sh scripts run has a cocotb Makefile that
+names its DUT (VERILOG_SOURCES) and its test module (MODULE,
+COCOTB_TEST_MODULES or TEST). This module reads those Makefiles and the
+Python files they load:
+
+- MakefileVars evaluates the subset of make these Makefiles use:
+  =, :=, ?=, +=, export, ifeq/ifneq/ifdef/ifndef/else/endif and $(VAR)
+  references, with command-line overrides such as MODULE=uart_example.
+  Make functions ($(shell ...), ...) expand to nothing.
+- python_closure() follows import statements from the test modules to
+  every local .py file they load, transitively.
+- example_inputs() puts both together for one directory and one set of
+  make arguments.
+
+result_cache.py hashes these inputs; impact.py maps changed files back
+to the runs that use them.
+"""
+
+import ast
+import os
+import re
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HDL_VARIABLES = ("VERILOG_SOURCES", "VHDL_SOURCES")
+_ASSIGN = re.compile(r"^(?:(export|override)\s+)?([A-Za-z_][A-Za-z0-9_]*)\s*(\?=|::=|:=|\+=|=)\s*(.*)$")
+_CONDITIONAL = re.compile(r"^(ifeq|ifneq|ifdef|ifndef)\b\s*(.*)$")
+
+
+def _logical_lines(text):
+    """Makefile lines with continuations joined, comments and recipes dropped."""
+    pending = ""
+    for raw in text.splitlines():
+        if raw.startswith("\t") and not pending:
+            continue  # Recipe line
+        line = raw
+        if "#" in line:
+            line = re.sub(r"(?<!\\)#.*", "", line)
+        if line.endswith("\\"):
+            pending += line[:-1] + " "
+            continue
+        line = (pending + line).strip()
+        pending = ""
+        if line:
+            yield line
+
+
+def _split_condition(text):
+    """(left, right) of an ifeq/ifneq condition: (a,b), "a" "b" or 'a' 'b'."""
+    text = text.strip()
+    if text.startswith("("):
+        depth = 0
+        for i, char in enumerate(text):
+            if char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+            elif char == "," and depth == 1:
+                return text[1:i], text[i + 1:text.rindex(")")]
+        return text[1:-1], ""
+    quoted = re.findall(r"\"([^\"]*)\"|'([^']*)'", text)
+    values = [a or b for a, b in quoted] + ["", ""]
+    return values[0], values[1]
+
+
+class MakefileVars:
+    """
+    Variables of one Makefile, as make would see them for a set of
+    command-line overrides ({name: value}) and an environment.
+    """
+
+    def __init__(self, path, overrides=None, environ=None):
+        self.path = os.path.abspath(path)
+        self.directory = os.path.dirname(self.path)
+        self.overrides = dict(overrides or {})
+        self.environ = os.environ if environ is None else environ
+        self.vars = {}  # name -> (value, recursive)
+        self.exported = set()
+        with open(self.path) as f:
+            self._parse(f.read())
+
+    def _parse(self, text):
+        stack = []  # [active, branch taken] per open conditional
+        for line in _logical_lines(text):
+            active = all(frame[0] for frame in stack)
+            match = _CONDITIONAL.match(line)
+            if match:
+                taken = active and self._condition(*match.groups())
+                stack.append([taken, taken])
+                continue
+            if line == "endif":
+                if stack:
+                    stack.pop()
+                continue
+            if line == "else" or line.startswith("else "):
+                if not stack:
+                    continue
+                frame = stack.pop()
+                parent = all(f[0] for f in stack)
+                match = _CONDITIONAL.match(line[4:].strip())
+                if frame[1]:
+                    frame[0] = False
+                elif match:
+                    frame[0] = parent and self._condition(*match.groups())
+                else:
+                    frame[0] = parent
+                frame[1] = frame[1] or frame[0]
+                stack.append(frame)
+                continue
+            if not active:
+                continue
+            match = _ASSIGN.match(line)
+            if match:
+                self._assign(*match.groups())
+            elif line.startswith("export "):
+                self.exported.update(line.split()[1:])
+
+    def _condition(self, kind, text):
+        if kind in ("ifdef", "ifndef"):
+            defined = bool(self.get(self.expand(text.strip())))
+            return defined if kind == "ifdef" else not defined
+        left, right = _split_condition(text)
+        equal = self.expand(left).strip() == self.expand(right).strip()
+        return equal if kind == "ifeq" else not equal
+
+    def _assign(self, prefix, name, op, value):
+        if prefix == "export":
+            self.exported.add(name)
+        if name in self.overrides and prefix != "override":
+            return
+        if op == "?=":
+            if name not in self.vars and name not in self.environ:
+                self.vars[name] = (value, True)
+        elif op in (":=", "::="):
+            self.vars[name] = (self.expand(value), False)
+        elif op == "+=":
+            old, recursive = self.vars.get(name, (self.environ.get(name, ""), True))
+            appended = value if recursive else self.expand(value)
+            self.vars[name] = ((old + " " + appended).strip(), recursive)
+        else:
+            self.vars[name] = (value, True)
+
+    def get(self, name, _seen=()):
+        """Expanded value of name ("" if undefined)."""
+        if name in self.overrides:
+            return self.overrides[name]
+        if name in self.vars:
+            value, recursive = self.vars[name]
+            if not recursive or name in _seen:
+                return value
+            return self.expand(value, _seen + (name,))
+        if name in ("CURDIR", "PWD"):
+            return self.directory
+        return self.environ.get(name, "")
+
+    def words(self, name):
+        return self.get(name).split()
+
+    def expand(self, text, _seen=()):
+        """text with $(VAR), ${VAR}, $X and $$ expanded; make functions give ""."""
+        out = []
+        i = 0
+        while i < len(text):
+            char = text[i]
+            if char != "$" or i + 1 == len(text):
+                out.append(char)
+                i += 1
+                continue
+            nxt = text[i + 1]
+            if nxt == "$":
+                out.append("$")
+                i += 2
+            elif nxt in "({":
+                close = ")" if nxt == "(" else "}"
+                depth, j = 1, i + 2
+                while j < len(text) and depth:
+                    if text[j] == nxt:
+                        depth += 1
+                    elif text[j] == close:
+                        depth -= 1
+                    j += 1
+                inner = text[i + 2:j - 1]
+                if not re.match(r"^[A-Za-z_][A-Za-z0-9_]*\s", inner):
+                    out.append(self.get(self.expand(inner, _seen), _seen))
+                i = j
+            else:
+                out.append(self.get(nxt, _seen))
+                i += 2
+        return "".join(out)
+
+
+def test_modules(makefile):
+    """Python test module names of a MakefileVars (COCOTB_TEST_MODULES, else MODULE)."""
+    names = makefile.get("COCOTB_TEST_MODULES") or makefile.get("MODULE")
+    return [name for name in re.split(r"[,\s]+", names) if name]
+
+
+def _module_file(name, search):
+    """Path of module name (dotted) in the first search directory holding it."""
+    parts = name.split(".")
+    for base in search:
+        stem = os.path.join(base, *parts)
+        for path in (stem + ".py", os.path.join(stem, "__init__.py")):
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+def _imported_names(path):
+    """Module names imported anywhere in a file, with relative imports resolved to paths."""
+    try:
+        with open(path) as f:
+            tree = ast.parse(f.read(), path)
+    except (SyntaxError, UnicodeDecodeError, ValueError):
+        return [], []
+    names, relative = [], []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = os.path.dirname(path)
+                for _ in range(node.level - 1):
+                    base = os.path.dirname(base)
+                prefix = node.module.split(".") if node.module else []
+                relative.append(os.path.join(base, *prefix))
+                relative.extend(os.path.join(base, *prefix, alias.name) for alias in node.names)
+            elif node.module:
+                names.append(node.module)
+                names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+    return names, relative
+
+
+def python_closure(modules, search, files=(), root=PROJECT_ROOT):
+    """
+    Every local .py file loaded by importing modules, plus files: the
+    modules found in the search directories and, transitively, the local
+    files they import. Files outside root (installed packages) are left out.
+    """
+    root = os.path.abspath(root) + os.sep
+    found = set()
+    pending = [path for path in (_module_file(name, search) for name in modules) if path]
+    pending.extend(path for path in files if os.path.isfile(path))
+    while pending:
+        path = os.path.abspath(pending.pop())
+        if path in found or not path.startswith(root):
+            continue
+        found.add(path)
+        names, relative = _imported_names(path)
+        for name in names:
+            module = _module_file(name, search)
+            if module:
+                pending.append(module)
+        for stem in relative:
+            for candidate in (stem + ".py", os.path.join(stem, "__init__.py")):
+                if os.path.isfile(candidate):
+                    pending.append(candidate)
+    return sorted(found)
+
+
+def parse_make_args(args):
+    """{name: value} of the VAR=value items of a make command line."""
+    overrides = {}
+    for arg in args:
+        name, sep, value = arg.partition("=")
+        if sep and re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", name):
+            overrides[name] = value
+    return overrides
+
+
+def example_inputs(directory, overrides=None, environ=None, root=PROJECT_ROOT):
+    """
+    Inputs of one make run in directory, a directory of the tree at root:
+
+    {"makefile": path, "modules": [...], "python": [paths], "hdl": [paths],
+     "exported": [names]}
+    """
+    directory = os.path.abspath(directory)
+    makefile = MakefileVars(os.path.join(directory, "Makefile"), overrides, environ)
+    search = [directory]
+    for entry in makefile.get("PYTHONPATH").split(os.pathsep):
+        if entry.strip():
+            search.append(os.path.join(directory, entry.strip()))
+    modules = test_modules(makefile)
+    hdl = []
+    for variable in HDL_VARIABLES:
+        for source in makefile.words(variable):
+            hdl.append(os.path.normpath(os.path.join(directory, source)))
+    return {
+        "makefile": makefile.path,
+        "modules": modules,
+        "python": python_closure(modules, search, [os.path.join(directory, name)
+                                                   for name in makefile.words("PYTHON_FILES")], root),
+        "hdl": hdl,
+        "exported": sorted(makefile.exported),
+    }
+
+
+def find_example_dirs(root=PROJECT_ROOT):
+    """Every directory under moduleN/ with a cocotb Makefile, sorted."""
+    dirs = []
+    for name in sorted(os.listdir(root)):
+        if not re.match(r"^module\d+$", name):
+            continue
+        for current, subdirs, files in os.walk(os.path.join(root, name)):
+            subdirs[:] = sorted(d for d in subdirs if d != "sim_build" and not d.startswith("."))
+            if "Makefile" in files:
+                dirs.append(current)
+    return dirs
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Test impact analysis: which examples and tests does a change affect?
+
+The graph has one node per run: an example or test directory with its
+make arguments. A directory whose Makefile selects the test module with
+`MODULE ?=` or `TEST ?=` gets one run per cocotb test module in it, and
+a `make ... VAR=value` line in the Makefile's Usage comment adds a run
+when it changes what make builds (the inputs, or a variable the Makefile
+expands, such as CLOCK_SOURCE=verilog); runtime knobs that are only
+exported (WAVE_*, STIM_*) do not. Each run depends on the files
+example_deps reads for it: the Makefile, the test module and its
+transitive local imports, and its VERILOG_SOURCES. Runs sharing a DUT
+(simple_register.v across module2, module7/dut/dma/simple_dma.v across
+module7) all depend on it.
+
+A changed file selects every run that depends on it. A deleted file no
+longer shows up in the graph of the working tree, so it is looked up in
+the graph of the base commit instead: it selects the runs that depended
+on it there and still exist (a deleted shared DUT selects every run that
+used it). A changed scripts/moduleN.sh selects every run of module N.
+Anything else (docs, tooling) selects nothing.
+
+Runs of a directory whose Makefile selects the test module carry the
+explicit TEST=/MODULE= argument, as the moduleN.sh scripts pass it, so
+the labels name the test module and the result cache keys match.
+
+Usage:
+    impact.py                      # changes in the working tree vs HEAD
+    impact.py --base main          # changes since the merge base with main
+    impact.py --files a.py b.v     # given files
+    impact.py --base main --run    # run the selection through result_cache.py
+    impact.py --graph              # print every run and its inputs
+"""
+
+import argparse
+import io
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+import result_cache
+from example_deps import MakefileVars, PROJECT_ROOT, example_inputs, find_example_dirs, parse_make_args
+
+_SELECTORS = ("TEST", "MODULE")
+_USAGE = re.compile(r"^#\s*(?:Usage:)?\s*make\s+(.*)$")
+_REFERENCE = re.compile(r"\$[({]([A-Za-z_][A-Za-z0-9_]*)[)}]")
+
+
+def _rel(path):
+    return os.path.relpath(path, PROJECT_ROOT)
+
+
+def _has_cocotb_tests(path):
+    try:
+        with open(path) as f:
+            return "@cocotb.test" in f.read()
+    except (OSError, UnicodeDecodeError):
+        return False
+
+
+def run_variants(directory, root=PROJECT_ROOT):
+    """
+    (make args, input files) of the distinct runs of directory: one per
+    test module if the Makefile selects it, else the default, then the
+    Usage lines that build something else.
+    """
+    path = os.path.join(directory, "Makefile")
+    with open(path) as f:
+        text = f.read()
+    referenced = sorted(set(_REFERENCE.findall(text)) - {"SIM"})
+    candidates = []
+    selector = next((name for name in _SELECTORS
+                     if re.search(rf"^{name}\s*\?=", text, re.M)), None)
+    if selector:
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py") and _has_cocotb_tests(os.path.join(directory, name)):
+                candidates.append([f"{selector}={name[:-3]}"])
+    candidates.append([])
+    for line in text.splitlines():
+        match = _USAGE.match(line.strip())
+        if match:
+            try:
+                words = shlex.split(match.group(1))
+            except ValueError:
+                continue
+            candidates.append([arg for arg in words if "=" in arg and not arg.startswith("SIM=")])
+    variants, seen = [], set()
+    for args in candidates:
+        overrides = parse_make_args(args)
+        inputs = example_inputs(directory, overrides, root=root)
+        files = frozenset([inputs["makefile"], *inputs["python"], *inputs["hdl"]])
+        makefile = MakefileVars(path, overrides)
+        signature = (tuple(inputs["modules"]), files,
+                     tuple(makefile.get(name) for name in referenced))
+        if signature not in seen:
+            seen.add(signature)
+            variants.append((args, set(files)))
+    return variants
+
+
+class ImpactGraph:
+    """Runs of every example/test directory and the files each one depends on."""
+
+    def __init__(self, root=PROJECT_ROOT):
+        self.root = root
+        self.runs = []  # (directory, make args, set of input paths)
+        for directory in find_example_dirs(root):
+            for args, files in run_variants(directory, root):
+                self.runs.append((directory, args, files))
+
+    @classmethod
+    def at_commit(cls, ref):
+        """Graph of the tree at git ref, with paths as if it were checked out at PROJECT_ROOT."""
+        names = [name for name in _git("ls-tree", "--name-only", ref) if re.match(r"^module\d+$", name)]
+        archive = subprocess.run(["git", "archive", "--format=tar", ref, *names],
+                                 cwd=PROJECT_ROOT, capture_output=True, check=True).stdout
+        root = tempfile.mkdtemp(prefix="impact_base_")
+        try:
+            with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+                tar.extractall(root, filter="data")
+            graph = cls(root)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+        def rebase(path):
+            return os.path.join(PROJECT_ROOT, os.path.relpath(path, root))
+
+        graph.runs = [(rebase(directory), args, {rebase(path) for path in files})
+                      for directory, args, files in graph.runs]
+        graph.root = PROJECT_ROOT
+        return graph
+
+    @staticmethod
+    def label(run):
+        directory, args, _ = run
+        return " ".join([_rel(directory)] + args)
+
+    def affected(self, changed, base=None):
+        """
+        (selected runs, {changed file: runs it selected}) for absolute
+        paths. Deleted files are looked up in base, the graph of the base
+        commit; without one, a deleted file selects every run of its directory.
+        """
+        selected, reasons = [], {}
+        current = {(directory, tuple(args)) for directory, args, _ in self.runs}
+        for path in changed:
+            hits = []
+            module = re.match(r"^scripts/(module\d+)\.sh$", _rel(path))
+            deleted = not os.path.exists(path)
+            before, gone = set(), set()
+            if deleted and base is not None:
+                # Runs that used the file; a run whose arguments no longer
+                # exist stands for every run left in its directory
+                before = {(directory, tuple(args)) for directory, args, files in base.runs if path in files}
+                gone = {directory for directory, args in before - current}
+            for run in self.runs:
+                directory, args, files = run
+                if deleted and base is not None:
+                    used = (directory, tuple(args)) in before or directory in gone
+                else:
+                    used = path in files or (deleted and os.path.dirname(path) == directory)
+                if used or (module and _rel(directory).split(os.sep)[0] == module.group(1)):
+                    hits.append(run)
+            reasons[path] = hits
+            selected.extend(run for run in hits if run not in selected)
+        order = {id(run): i for i, run in enumerate(self.runs)}
+        return sorted(selected, key=lambda run: order[id(run)]), reasons
+
+
+def _git(*args):
+    out = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return [line for line in out.stdout.splitlines() if line]
+
+
+def base_commit(base="HEAD"):
+    """Commit the changes are taken against: base itself for HEAD, else its merge base with HEAD."""
+    return base if base == "HEAD" else _git("merge-base", base, "HEAD")[0]
+
+
+def changed_files(base="HEAD"):
+    """Files changed between base (its merge base with HEAD) and the working tree, plus untracked files."""
+    names = _git("diff", "--name-only", "--no-renames", base_commit(base))
+    names += _git("ls-files", "--others", "--exclude-standard")
+    return sorted({os.path.join(PROJECT_ROOT, name) for name in names})
+
+
+def run_selection(runs, sim, force=False):
+    """Run each selected run through result_cache.py, like the moduleN.sh scripts; returns failures."""
+    session = tempfile.NamedTemporaryFile(prefix="impact_", suffix=".jsonl", delete=False).name
+    try:
+        lib_dir = subprocess.run(["cocotb-config", "--lib-dir"], capture_output=True, text=True).stdout.strip()
+        if lib_dir:
+            os.environ["LD_LIBRARY_PATH"] = os.environ.get("LD_LIBRARY_PATH", "") + os.pathsep + lib_dir
+    except OSError:
+        pass
+    failures = 0
+    cwd = os.getcwd()
+    try:
+        for run in runs:
+            directory, args, _ = run
+            print(f"=== {ImpactGraph.label(run)}", flush=True)
+            os.chdir(directory)
+            subprocess.run(["make", "clean"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            command = ["run", "--session", session, "--label", ImpactGraph.label(run)]
+            if force:
+                command.append("--force")
+            if result_cache.main(command + ["--", "make", f"SIM={sim}", *args]) != 0:
+                failures += 1
+        result_cache.main(["report", "--session", session])
+    finally:
+        os.chdir(cwd)
+        os.unlink(session)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Select the examples and tests affected by a change.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--base", default="HEAD", help="git ref to diff the working tree against (default HEAD)")
+    source.add_argument("--files", nargs="+", metavar="PATH", help="changed files instead of a git diff")
+    parser.add_argument("--graph", action="store_true", help="print every run and its inputs, then exit")
+    parser.add_argument("--verbose", "-v", action="store_true", help="show which file selected each run")
+    parser.add_argument("--run", action="store_true", help="run the selection through result_cache.py")
+    parser.add_argument("--sim", default=os.environ.get("SIM", "verilator"), help="simulator for --run")
+    parser.add_argument("--force", action="store_true", help="with --run, ignore cached results")
+    args = parser.parse_args(argv)
+
+    graph = ImpactGraph()
+    if args.graph:
+        for run in graph.runs:
+            print(graph.label(run))
+            for path in sorted(run[2]):
+                print(f"    {_rel(path)}")
+        return 0
+
+    if args.files:
+        changed = sorted({os.path.abspath(path) for path in args.files})
+    else:
+        changed = changed_files(args.base)
+    base = None
+    if any(not os.path.exists(path) for path in changed):
+        try:
+            base = ImpactGraph.at_commit(base_commit(args.base))
+        except (OSError, subprocess.CalledProcessError, tarfile.TarError) as exc:
+            print(f"No graph of {args.base} for the deleted files ({exc}); "
+                  f"selecting their directories' runs", file=sys.stderr)
+    selected, reasons = graph.affected(changed, base)
+
+    print(f"{len(changed)} changed files select {len(selected)} of {len(graph.runs)} runs", file=sys.stderr)
+    if args.verbose:
+        for path, hits in reasons.items():
+            what = ", ".join(graph.label(run) for run in hits) or "no run"
+            print(f"  {_rel(path)} -> {what}", file=sys.stderr)
+    if not args.run:
+        for run in selected:
+            print(graph.label(run))
+        return 0
+    return 1 if run_selection(selected, args.sim, args.force) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
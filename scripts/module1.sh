@@ -30,6 +30,8 @@ RUN_COCOTB_TESTS=true
 RUN_PYUVM_TESTS=true
 USE_VENV=true
 SIMULATOR="verilator"
+FORCE=false
+CACHE_SESSION=""
 
 # Function to print colored output
 print_status() {
@@ -76,6 +78,7 @@ OPTIONS:
         --sim SIMULATOR        Simulator to use (default: verilator)
     
     Other:
+        --force                Rerun tests whose passing results are cached
         --help, -h             Show this help message
 
 EXAMPLES:
@@ -139,6 +142,17 @@ check_prerequisites() {
     print_status $GREEN "Prerequisites check passed"
 }
 
+# Function to run make through scripts/result_cache.py: the run is skipped
+# when the same test module, imports, DUT sources, simulator and plusargs
+# already passed (--force runs it anyway)
+cached_make() {
+    local cache_args=(run --session "$CACHE_SESSION")
+    if [[ "$FORCE" == true ]]; then
+        cache_args+=(--force)
+    fi
+    python3 "$SCRIPT_DIR/result_cache.py" "${cache_args[@]}" -- make "$@"
+}
+
 # Function to run Python example
 run_python_example() {
     local example_file=$1
@@ -179,7 +193,7 @@ run_cocotb_tests() {
     # Clean previous build to ensure correct TOPLEVEL
     make clean >/dev/null 2>&1 || true
     set +e  # Temporarily disable exit on error to capture exit code
-    make SIM="$SIMULATOR" TEST=test_and_gate 2>&1 | tee /tmp/cocotb_and_gate.log
+    cached_make SIM="$SIMULATOR" TEST=test_and_gate 2>&1 | tee /tmp/cocotb_and_gate.log
     local exit_code=${PIPESTATUS[0]}
     set -e  # Re-enable exit on error
     if [[ $exit_code -eq 0 ]]; then
@@ -195,7 +209,7 @@ run_cocotb_tests() {
     # Clean previous build to ensure correct TOPLEVEL
     make clean >/dev/null 2>&1 || true
     set +e  # Temporarily disable exit on error to capture exit code
-    make SIM="$SIMULATOR" TEST=test_counter 2>&1 | tee /tmp/cocotb_counter.log
+    cached_make SIM="$SIMULATOR" TEST=test_counter 2>&1 | tee /tmp/cocotb_counter.log
     local exit_code=${PIPESTATUS[0]}
     set -e  # Re-enable exit on error
     if [[ $exit_code -eq 0 ]]; then
@@ -232,7 +246,7 @@ run_pyuvm_tests() {
     
     print_status $BLUE "Running pyuvm AND gate test..."
     set +e  # Temporarily disable exit on error to capture exit code
-    make SIM="$SIMULATOR" TEST=test_and_gate_uvm 2>&1 | tee /tmp/pyuvm_and_gate.log
+    cached_make SIM="$SIMULATOR" TEST=test_and_gate_uvm 2>&1 | tee /tmp/pyuvm_and_gate.log
     local exit_code=${PIPESTATUS[0]}
     set -e  # Re-enable exit on error
     if [[ $exit_code -eq 0 ]]; then
@@ -313,6 +327,10 @@ parse_args() {
                 SIMULATOR="$2"
                 shift 2
                 ;;
+            --force)
+                FORCE=true
+                shift
+                ;;
             --help|-h)
                 show_usage
                 exit 0
@@ -332,6 +350,7 @@ main() {
     
     # Parse arguments
     parse_args "$@"
+    CACHE_SESSION="$(mktemp)"
     
     # Check prerequisites
     check_prerequisites
@@ -391,6 +410,8 @@ main() {
     
     # Summary
     print_header "Summary"
+    python3 "$SCRIPT_DIR/result_cache.py" report --session "$CACHE_SESSION"
+    rm -f "$CACHE_SESSION"
     
     if [[ $errors -eq 0 ]]; then
         print_status $GREEN "✓ All examples and tests completed successfully!"
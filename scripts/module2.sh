@@ -29,6 +29,8 @@ RUN_COMMON_PATTERNS=true
 RUN_COCOTB_TESTS=true
 USE_VENV=true
 SIMULATOR="verilator"
+FORCE=false
+CACHE_SESSION=""
 
 # Function to print colored output
 print_status() {
@@ -73,6 +75,7 @@ OPTIONS:
         --sim SIMULATOR       Simulator to use (default: verilator)
     
     Other:
+        --force               Rerun tests whose passing results are cached
         --help, -h            Show this help message
 
 EXAMPLES:
@@ -131,10 +134,23 @@ check_prerequisites() {
     print_status $GREEN "Prerequisites check passed"
 }
 
+# Function to run make through scripts/result_cache.py: the run is skipped
+# when the same test module, imports, DUT sources, simulator and plusargs
+# already passed (--force runs it anyway)
+cached_make() {
+    local cache_args=(run --session "$CACHE_SESSION")
+    if [[ "$FORCE" == true ]]; then
+        cache_args+=(--force)
+    fi
+    python3 "$SCRIPT_DIR/result_cache.py" "${cache_args[@]}" -- make "$@"
+}
+
 # Function to run cocotb example
 run_cocotb_example() {
     local example_dir=$1
     local example_name=$2
+    shift 2
+    # Remaining arguments are passed to make (e.g. CLOCK_SOURCE=verilog)
 
     print_header "Running: $example_name"
 
@@ -158,7 +174,7 @@ run_cocotb_example() {
     make clean > /dev/null 2>&1 || true
 
     print_status $BLUE "Running cocotb test for $example_name..."
-    if make SIM="$SIMULATOR" 2>&1 | tee "/tmp/cocotb_${example_dir}.log"; then
+    if cached_make SIM="$SIMULATOR" "$@" 2>&1 | tee "/tmp/cocotb_${example_dir}.log"; then
         print_status $GREEN "✓ $example_name completed successfully"
         cd "$PROJECT_ROOT"
         return 0
@@ -189,7 +205,7 @@ run_cocotb_tests() {
 
     # Run simple register tests
     print_status $BLUE "Running simple register tests..."
-    if make SIM="$SIMULATOR" TEST=test_simple_register 2>&1 | tee /tmp/cocotb_register.log; then
+    if cached_make SIM="$SIMULATOR" TEST=test_simple_register 2>&1 | tee /tmp/cocotb_register.log; then
         print_status $GREEN "✓ Simple register tests passed"
     else
         print_status $RED "✗ Simple register tests failed"
@@ -201,7 +217,7 @@ run_cocotb_tests() {
 
     # Run shift register tests
     print_status $BLUE "Running shift register tests..."
-    if make SIM="$SIMULATOR" TEST=test_shift_register 2>&1 | tee /tmp/cocotb_shift_register.log; then
+    if cached_make SIM="$SIMULATOR" TEST=test_shift_register 2>&1 | tee /tmp/cocotb_shift_register.log; then
         print_status $GREEN "✓ Shift register tests passed"
     else
         print_status $RED "✗ Shift register tests failed"
@@ -285,6 +301,10 @@ parse_args() {
                 SIMULATOR="$2"
                 shift 2
                 ;;
+            --force)
+                FORCE=true
+                shift
+                ;;
             --help|-h)
                 show_usage
                 exit 0
@@ -313,6 +333,7 @@ main() {
     
     # Parse arguments
     parse_args "$@"
+    CACHE_SESSION="$(mktemp)"
     
     # Check prerequisites
     check_prerequisites
@@ -336,6 +357,9 @@ main() {
             if ! run_cocotb_example "clock_generation" "Clock Generation"; then
                 errors=$((errors + 1))
             fi
+            if ! run_cocotb_example "clock_generation" "Clock Generation (Verilog clock)" CLOCK_SOURCE=verilog; then
+                errors=$((errors + 1))
+            fi
         fi
         
         if [[ "$RUN_TRIGGERS" == true ]]; then
@@ -366,6 +390,8 @@ main() {
     
     # Summary
     print_header "Summary"
+    python3 "$SCRIPT_DIR/result_cache.py" report --session "$CACHE_SESSION"
+    rm -f "$CACHE_SESSION"
     
     if [[ $errors -eq 0 ]]; then
         print_status $GREEN "✓ All examples and tests completed successfully!"
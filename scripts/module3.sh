@@ -30,6 +30,8 @@ RUN_OBJECTIONS=true
 RUN_PYUVM_TESTS=true
 USE_VENV=true
 SIMULATOR="verilator"
+FORCE=false
+CACHE_SESSION=""
 
 # Function to print colored output
 print_status() {
@@ -75,6 +77,7 @@ OPTIONS:
         --sim SIMULATOR      Simulator to use (default: verilator)
     
     Other:
+        --force              Rerun tests whose passing results are cached
         --help, -h           Show this help message
 
 EXAMPLES:
@@ -142,6 +145,17 @@ check_prerequisites() {
     print_status $GREEN "Prerequisites check passed"
 }
 
+# Function to run make through scripts/result_cache.py: the run is skipped
+# when the same test module, imports, DUT sources, simulator and plusargs
+# already passed (--force runs it anyway)
+cached_make() {
+    local cache_args=(run --session "$CACHE_SESSION")
+    if [[ "$FORCE" == true ]]; then
+        cache_args+=(--force)
+    fi
+    python3 "$SCRIPT_DIR/result_cache.py" "${cache_args[@]}" -- make "$@"
+}
+
 # Function to run Python example (run with cocotb)
 run_python_example() {
     local example_dir=$1
@@ -172,7 +186,7 @@ run_python_example() {
     make clean 2>/dev/null || true
     
     print_status $BLUE "Running pyuvm test for $example_name..."
-    if make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
+    if cached_make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
         print_status $GREEN "✓ $example_name completed successfully"
         cd "$PROJECT_ROOT"
         return 0
@@ -203,7 +217,7 @@ run_pyuvm_tests() {
     make clean 2>/dev/null || true
     
     print_status $BLUE "Running simple UVM test..."
-    if make SIM="$SIMULATOR" TEST=test_simple_uvm 2>&1 | tee /tmp/pyuvm_test.log; then
+    if cached_make SIM="$SIMULATOR" TEST=test_simple_uvm 2>&1 | tee /tmp/pyuvm_test.log; then
         print_status $GREEN "✓ pyuvm test passed"
         cd "$PROJECT_ROOT"
         return 0
@@ -287,6 +301,10 @@ parse_args() {
                 SIMULATOR="$2"
                 shift 2
                 ;;
+            --force)
+                FORCE=true
+                shift
+                ;;
             --help|-h)
                 show_usage
                 exit 0
@@ -316,6 +334,7 @@ main() {
     
     # Parse arguments
     parse_args "$@"
+    CACHE_SESSION="$(mktemp)"
     
     # Check prerequisites
     check_prerequisites
@@ -375,6 +394,8 @@ main() {
     
     # Summary
     print_header "Summary"
+    python3 "$SCRIPT_DIR/result_cache.py" report --session "$CACHE_SESSION"
+    rm -f "$CACHE_SESSION"
     
     if [[ $errors -eq 0 ]]; then
         print_status $GREEN "✓ All examples and tests completed successfully!"
@@ -28,9 +28,12 @@ RUN_TLM=true
 RUN_SCOREBOARDS=true
 RUN_TRANSACTIONS=true
 RUN_AGENTS=true
+RUN_SEQUENCER_THROUGHPUT=true
 RUN_PYUVM_TESTS=true
 USE_VENV=true
 SIMULATOR="verilator"
+FORCE=false
+CACHE_SESSION=""
 
 # Function to print colored output
 print_status() {
@@ -65,6 +68,7 @@ OPTIONS:
         --scoreboards      Run scoreboard examples
         --transactions     Run transaction examples
         --agents           Run complete agent examples
+        --sequencer-throughput Run batched sequencer throughput examples
         --all-examples     Run all examples (default)
         --skip-examples    Skip all examples
     
@@ -77,6 +81,7 @@ OPTIONS:
         --sim SIMULATOR    Simulator to use (default: verilator)
     
     Other:
+        --force             Rerun tests whose passing results are cached
         --help, -h          Show this help message
 
 EXAMPLES:
@@ -168,6 +173,17 @@ clean_build_artifacts() {
     fi
 }
 
+# Function to run make through scripts/result_cache.py: the run is skipped
+# when the same test module, imports, DUT sources, simulator and plusargs
+# already passed (--force runs it anyway)
+cached_make() {
+    local cache_args=(run --session "$CACHE_SESSION")
+    if [[ "$FORCE" == true ]]; then
+        cache_args+=(--force)
+    fi
+    python3 "$SCRIPT_DIR/result_cache.py" "${cache_args[@]}" -- make "$@"
+}
+
 # Function to run Python example (run with cocotb)
 run_python_example() {
     local example_dir=$1
@@ -194,7 +210,7 @@ run_python_example() {
     fi
     
     print_status $BLUE "Running pyuvm test for $example_name..."
-    if make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
+    if cached_make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
         print_status $GREEN "✓ $example_name completed successfully"
         cd "$PROJECT_ROOT"
         return 0
@@ -221,7 +237,7 @@ run_pyuvm_tests() {
     fi
     
     print_status $BLUE "Running complete agent test..."
-    if make SIM="$SIMULATOR" TEST=test_complete_agent 2>&1 | tee /tmp/pyuvm_test.log; then
+    if cached_make SIM="$SIMULATOR" TEST=test_complete_agent 2>&1 | tee /tmp/pyuvm_test.log; then
         print_status $GREEN "✓ pyuvm test passed"
         cd "$PROJECT_ROOT"
         return 0
@@ -274,6 +290,11 @@ parse_args() {
                 has_specific_option=true
                 shift
                 ;;
+            --sequencer-throughput)
+                RUN_SEQUENCER_THROUGHPUT=true
+                has_specific_option=true
+                shift
+                ;;
             --all-examples)
                 RUN_DRIVERS=true
                 RUN_MONITORS=true
@@ -282,6 +303,7 @@ parse_args() {
                 RUN_SCOREBOARDS=true
                 RUN_TRANSACTIONS=true
                 RUN_AGENTS=true
+                RUN_SEQUENCER_THROUGHPUT=true
                 has_specific_option=true
                 shift
                 ;;
@@ -293,6 +315,7 @@ parse_args() {
                 RUN_SCOREBOARDS=false
                 RUN_TRANSACTIONS=false
                 RUN_AGENTS=false
+                RUN_SEQUENCER_THROUGHPUT=false
                 shift
                 ;;
             --pyuvm-tests)
@@ -312,6 +335,10 @@ parse_args() {
                 SIMULATOR="$2"
                 shift 2
                 ;;
+            --force)
+                FORCE=true
+                shift
+                ;;
             --help|-h)
                 show_usage
                 exit 0
@@ -333,6 +360,7 @@ parse_args() {
         RUN_SCOREBOARDS=true
         RUN_TRANSACTIONS=true
         RUN_AGENTS=true
+        RUN_SEQUENCER_THROUGHPUT=true
     fi
 }
 
@@ -342,6 +370,7 @@ main() {
     
     # Parse arguments
     parse_args "$@"
+    CACHE_SESSION="$(mktemp)"
     
     # Check prerequisites
     check_prerequisites
@@ -355,7 +384,8 @@ main() {
     if [[ "$RUN_DRIVERS" == true ]] || [[ "$RUN_MONITORS" == true ]] || \
        [[ "$RUN_SEQUENCERS" == true ]] || [[ "$RUN_TLM" == true ]] || \
        [[ "$RUN_SCOREBOARDS" == true ]] || [[ "$RUN_TRANSACTIONS" == true ]] || \
-       [[ "$RUN_AGENTS" == true ]]; then
+       [[ "$RUN_AGENTS" == true ]] || \
+       [[ "$RUN_SEQUENCER_THROUGHPUT" == true ]]; then
         
         print_header "Running UVM Component Examples"
         
@@ -400,6 +430,12 @@ main() {
                 errors=$((errors + 1))
             fi
         fi
+        
+        if [[ "$RUN_SEQUENCER_THROUGHPUT" == true ]]; then
+            if ! run_python_example "sequencer_throughput" "Sequencer Throughput Mode"; then
+                errors=$((errors + 1))
+            fi
+        fi
     fi
     
     # Run tests
@@ -411,6 +447,8 @@ main() {
     
     # Summary
     print_header "Summary"
+    python3 "$SCRIPT_DIR/result_cache.py" report --session "$CACHE_SESSION"
+    rm -f "$CACHE_SESSION"
     
     if [[ $errors -eq 0 ]]; then
         print_status $GREEN "✓ All examples and tests completed successfully!"
@@ -26,9 +26,12 @@ RUN_COVERAGE=true
 RUN_CONFIGURATION=true
 RUN_CALLBACKS=true
 RUN_REGISTER_MODEL=true
+RUN_SEQUENCER_ARBITRATION=true
 RUN_PYUVM_TESTS=true
 USE_VENV=true
 SIMULATOR="verilator"
+FORCE=false
+CACHE_SESSION=""
 
 # Function to print colored output
 print_status() {
@@ -61,6 +64,7 @@ OPTIONS:
         --configuration      Run configuration object examples
         --callbacks          Run callback examples
         --register-model     Run register model examples
+        --sequencer-arbitration Run sequencer arbitration examples
         --all-examples       Run all examples (default)
         --skip-examples      Skip all examples
     
@@ -73,6 +77,7 @@ OPTIONS:
         --sim SIMULATOR      Simulator to use (default: verilator)
     
     Other:
+        --force               Rerun tests whose passing results are cached
         --help, -h            Show this help message
 
 EXAMPLES:
@@ -85,6 +90,7 @@ EXAMPLES:
     $0 --configuration
     $0 --callbacks
     $0 --register-model
+    $0 --sequencer-arbitration
     
     # Run tests
     $0 --pyuvm-tests
@@ -142,6 +148,17 @@ check_prerequisites() {
     print_status $GREEN "Prerequisites check passed"
 }
 
+# Function to run make through scripts/result_cache.py: the run is skipped
+# when the same test module, imports, DUT sources, simulator and plusargs
+# already passed (--force runs it anyway)
+cached_make() {
+    local cache_args=(run --session "$CACHE_SESSION")
+    if [[ "$FORCE" == true ]]; then
+        cache_args+=(--force)
+    fi
+    python3 "$SCRIPT_DIR/result_cache.py" "${cache_args[@]}" -- make "$@"
+}
+
 # Function to run Python example (run with cocotb)
 run_python_example() {
     local example_dir=$1
@@ -169,7 +186,7 @@ run_python_example() {
     make clean > /dev/null 2>&1 || true
 
     print_status $BLUE "Running pyuvm test for $example_name..."
-    if make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
+    if cached_make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
         print_status $GREEN "✓ $example_name completed successfully"
         cd "$PROJECT_ROOT"
         return 0
@@ -197,7 +214,7 @@ run_pyuvm_tests() {
     make clean > /dev/null 2>&1 || true
 
     print_status $BLUE "Running advanced UVM test..."
-    if make SIM="$SIMULATOR" TEST=test_advanced_uvm 2>&1 | tee /tmp/pyuvm_test.log; then
+    if cached_make SIM="$SIMULATOR" TEST=test_advanced_uvm 2>&1 | tee /tmp/pyuvm_test.log; then
         print_status $GREEN "✓ pyuvm test passed"
         cd "$PROJECT_ROOT"
         return 0
@@ -240,12 +257,18 @@ parse_args() {
                 has_specific_option=true
                 shift
                 ;;
+            --sequencer-arbitration)
+                RUN_SEQUENCER_ARBITRATION=true
+                has_specific_option=true
+                shift
+                ;;
             --all-examples)
                 RUN_VIRTUAL_SEQUENCES=true
                 RUN_COVERAGE=true
                 RUN_CONFIGURATION=true
                 RUN_CALLBACKS=true
                 RUN_REGISTER_MODEL=true
+                RUN_SEQUENCER_ARBITRATION=true
                 has_specific_option=true
                 shift
                 ;;
@@ -255,6 +278,7 @@ parse_args() {
                 RUN_CONFIGURATION=false
                 RUN_CALLBACKS=false
                 RUN_REGISTER_MODEL=false
+                RUN_SEQUENCER_ARBITRATION=false
                 shift
                 ;;
             --pyuvm-tests)
@@ -274,6 +298,10 @@ parse_args() {
                 SIMULATOR="$2"
                 shift 2
                 ;;
+            --force)
+                FORCE=true
+                shift
+                ;;
             --help|-h)
                 show_usage
                 exit 0
@@ -293,6 +321,7 @@ parse_args() {
         RUN_CONFIGURATION=true
         RUN_CALLBACKS=true
         RUN_REGISTER_MODEL=true
+        RUN_SEQUENCER_ARBITRATION=true
     fi
 }
 
@@ -302,6 +331,7 @@ main() {
     
     # Parse arguments
     parse_args "$@"
+    CACHE_SESSION="$(mktemp)"
     
     # Check prerequisites
     check_prerequisites
@@ -311,7 +341,8 @@ main() {
     # Run examples
     if [[ "$RUN_VIRTUAL_SEQUENCES" == true ]] || [[ "$RUN_COVERAGE" == true ]] || \
        [[ "$RUN_CONFIGURATION" == true ]] || [[ "$RUN_CALLBACKS" == true ]] || \
-       [[ "$RUN_REGISTER_MODEL" == true ]]; then
+       [[ "$RUN_REGISTER_MODEL" == true ]] || \
+       [[ "$RUN_SEQUENCER_ARBITRATION" == true ]]; then
         
         print_header "Running Advanced UVM Examples"
         
@@ -344,6 +375,12 @@ main() {
                 errors=$((errors + 1))
             fi
         fi
+        
+        if [[ "$RUN_SEQUENCER_ARBITRATION" == true ]]; then
+            if ! run_python_example "sequencer_arbitration" "Sequencer Arbitration"; then
+                errors=$((errors + 1))
+            fi
+        fi
     fi
     
     # Run tests
@@ -355,6 +392,8 @@ main() {
     
     # Summary
     print_header "Summary"
+    python3 "$SCRIPT_DIR/result_cache.py" report --session "$CACHE_SESSION"
+    rm -f "$CACHE_SESSION"
     
     if [[ $errors -eq 0 ]]; then
         print_status $GREEN "✓ All examples and tests completed successfully!"
@@ -26,9 +26,14 @@ RUN_PROTOCOL=true
 RUN_PROTOCOL_CHECKERS=true
 RUN_SCOREBOARDS=true
 RUN_ARCHITECTURE=true
+RUN_AXI4_LITE_MASTER=true
+RUN_AXI4_LITE_MONITOR=true
+RUN_AXI4_LITE_ASSERTIONS=true
 RUN_PYUVM_TESTS=true
 USE_VENV=true
 SIMULATOR="verilator"
+FORCE=false
+CACHE_SESSION=""
 
 # Function to print colored output
 print_status() {
@@ -61,6 +66,9 @@ OPTIONS:
         --protocol-checkers   Run protocol checker examples
         --scoreboards         Run multi-channel scoreboard examples
         --architecture        Run testbench architecture examples
+        --axi4-lite-master    Run pipelined AXI4-Lite master examples
+        --axi4-lite-monitor   Run signal-driven AXI4-Lite monitor examples
+        --axi4-lite-assertions Run temporal assertion examples
         --all-examples        Run all examples (default)
         --skip-examples       Skip all examples
     
@@ -73,6 +81,7 @@ OPTIONS:
         --sim SIMULATOR       Simulator to use (default: verilator)
     
     Other:
+        --force                Rerun tests whose passing results are cached
         --help, -h             Show this help message
 
 EXAMPLES:
@@ -85,6 +94,9 @@ EXAMPLES:
     $0 --protocol-checkers
     $0 --scoreboards
     $0 --architecture
+    $0 --axi4-lite-master
+    $0 --axi4-lite-monitor
+    $0 --axi4-lite-assertions
     
     # Run tests
     $0 --pyuvm-tests
@@ -142,10 +154,22 @@ check_prerequisites() {
     print_status $GREEN "Prerequisites check passed"
 }
 
+# Function to run make through scripts/result_cache.py: the run is skipped
+# when the same test module, imports, DUT sources, simulator and plusargs
+# already passed (--force runs it anyway)
+cached_make() {
+    local cache_args=(run --session "$CACHE_SESSION")
+    if [[ "$FORCE" == true ]]; then
+        cache_args+=(--force)
+    fi
+    python3 "$SCRIPT_DIR/result_cache.py" "${cache_args[@]}" -- make "$@"
+}
+
 # Function to run Python example (run with cocotb)
 run_python_example() {
     local example_dir=$1
     local example_name=$2
+    local module_name=${3:-}  # Optional module name for directories with several examples
 
     print_header "Running: $example_name"
 
@@ -169,14 +193,27 @@ run_python_example() {
     make clean > /dev/null 2>&1 || true
 
     print_status $BLUE "Running pyuvm test for $example_name..."
-    if make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
-        print_status $GREEN "✓ $example_name completed successfully"
-        cd "$PROJECT_ROOT"
-        return 0
+    if [[ -n "$module_name" ]]; then
+        # Directory with several example modules, select one with MODULE
+        if cached_make SIM="$SIMULATOR" MODULE="$module_name" 2>&1 | tee "/tmp/pyuvm_${module_name}.log"; then
+            print_status $GREEN "✓ $example_name completed successfully"
+            cd "$PROJECT_ROOT"
+            return 0
+        else
+            print_status $RED "✗ $example_name failed"
+            cd "$PROJECT_ROOT"
+            return 1
+        fi
     else
-        print_status $RED "✗ $example_name failed"
-        cd "$PROJECT_ROOT"
-        return 1
+        if cached_make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
+            print_status $GREEN "✓ $example_name completed successfully"
+            cd "$PROJECT_ROOT"
+            return 0
+        else
+            print_status $RED "✗ $example_name failed"
+            cd "$PROJECT_ROOT"
+            return 1
+        fi
     fi
 }
 
@@ -197,7 +234,7 @@ run_pyuvm_tests() {
     make clean > /dev/null 2>&1 || true
 
     print_status $BLUE "Running complex testbench test..."
-    if make SIM="$SIMULATOR" TEST=test_complex_testbench 2>&1 | tee /tmp/pyuvm_test.log; then
+    if cached_make SIM="$SIMULATOR" TEST=test_complex_testbench 2>&1 | tee /tmp/pyuvm_test.log; then
         print_status $GREEN "✓ pyuvm test passed"
         cd "$PROJECT_ROOT"
         return 0
@@ -240,12 +277,30 @@ parse_args() {
                 has_specific_option=true
                 shift
                 ;;
+            --axi4-lite-master)
+                RUN_AXI4_LITE_MASTER=true
+                has_specific_option=true
+                shift
+                ;;
+            --axi4-lite-monitor)
+                RUN_AXI4_LITE_MONITOR=true
+                has_specific_option=true
+                shift
+                ;;
+            --axi4-lite-assertions)
+                RUN_AXI4_LITE_ASSERTIONS=true
+                has_specific_option=true
+                shift
+                ;;
             --all-examples)
                 RUN_MULTI_AGENT=true
                 RUN_PROTOCOL=true
                 RUN_PROTOCOL_CHECKERS=true
                 RUN_SCOREBOARDS=true
                 RUN_ARCHITECTURE=true
+                RUN_AXI4_LITE_MASTER=true
+                RUN_AXI4_LITE_MONITOR=true
+                RUN_AXI4_LITE_ASSERTIONS=true
                 has_specific_option=true
                 shift
                 ;;
@@ -255,6 +310,9 @@ parse_args() {
                 RUN_PROTOCOL_CHECKERS=false
                 RUN_SCOREBOARDS=false
                 RUN_ARCHITECTURE=false
+                RUN_AXI4_LITE_MASTER=false
+                RUN_AXI4_LITE_MONITOR=false
+                RUN_AXI4_LITE_ASSERTIONS=false
                 shift
                 ;;
             --pyuvm-tests)
@@ -274,6 +332,10 @@ parse_args() {
                 SIMULATOR="$2"
                 shift 2
                 ;;
+            --force)
+                FORCE=true
+                shift
+                ;;
             --help|-h)
                 show_usage
                 exit 0
@@ -293,6 +355,9 @@ parse_args() {
         RUN_PROTOCOL_CHECKERS=true
         RUN_SCOREBOARDS=true
         RUN_ARCHITECTURE=true
+        RUN_AXI4_LITE_MASTER=true
+        RUN_AXI4_LITE_MONITOR=true
+        RUN_AXI4_LITE_ASSERTIONS=true
     fi
 }
 
@@ -302,6 +367,7 @@ main() {
     
     # Parse arguments
     parse_args "$@"
+    CACHE_SESSION="$(mktemp)"
     
     # Check prerequisites
     check_prerequisites
@@ -311,7 +377,10 @@ main() {
     # Run examples
     if [[ "$RUN_MULTI_AGENT" == true ]] || [[ "$RUN_PROTOCOL" == true ]] || \
        [[ "$RUN_PROTOCOL_CHECKERS" == true ]] || [[ "$RUN_SCOREBOARDS" == true ]] || \
-       [[ "$RUN_ARCHITECTURE" == true ]]; then
+       [[ "$RUN_ARCHITECTURE" == true ]] || \
+       [[ "$RUN_AXI4_LITE_MASTER" == true ]] || \
+       [[ "$RUN_AXI4_LITE_MONITOR" == true ]] || \
+       [[ "$RUN_AXI4_LITE_ASSERTIONS" == true ]]; then
         
         print_header "Running Complex Testbench Examples"
         
@@ -344,6 +413,24 @@ main() {
                 errors=$((errors + 1))
             fi
         fi
+        
+        if [[ "$RUN_AXI4_LITE_MASTER" == true ]]; then
+            if ! run_python_example "axi4_lite" "Pipelined AXI4-Lite Master" "axi4_lite_master_example"; then
+                errors=$((errors + 1))
+            fi
+        fi
+        
+        if [[ "$RUN_AXI4_LITE_MONITOR" == true ]]; then
+            if ! run_python_example "axi4_lite" "AXI4-Lite Bus Monitor" "axi4_lite_monitor_example"; then
+                errors=$((errors + 1))
+            fi
+        fi
+        
+        if [[ "$RUN_AXI4_LITE_ASSERTIONS" == true ]]; then
+            if ! run_python_example "axi4_lite" "Temporal Assertions" "axi4_lite_assertions_example"; then
+                errors=$((errors + 1))
+            fi
+        fi
     fi
     
     # Run tests
@@ -355,6 +442,8 @@ main() {
     
     # Summary
     print_header "Summary"
+    python3 "$SCRIPT_DIR/result_cache.py" report --session "$CACHE_SESSION"
+    rm -f "$CACHE_SESSION"
     
     if [[ $errors -eq 0 ]]; then
         print_status $GREEN "✓ All examples and tests completed successfully!"
@@ -22,6 +22,7 @@ VENV_DIR="$PROJECT_ROOT/.venv"
 
 # Options
 RUN_DMA=true
+RUN_DMA_STRESS=true
 RUN_UART=true
 RUN_SPI=true
 RUN_I2C=true
@@ -30,6 +31,8 @@ RUN_BEST_PRACTICES=true
 RUN_PYUVM_TESTS=true
 USE_VENV=true
 SIMULATOR="verilator"
+FORCE=false
+CACHE_SESSION=""
 
 # Function to print colored output
 print_status() {
@@ -58,6 +61,7 @@ This script runs examples and tests for Module 7.
 OPTIONS:
     Examples:
         --dma              Run DMA verification examples
+        --dma-stress       Run multi-channel DMA stress example
         --uart             Run UART protocol examples
         --spi              Run SPI protocol examples
         --i2c              Run I2C protocol examples
@@ -75,6 +79,7 @@ OPTIONS:
         --sim SIMULATOR    Simulator to use (default: verilator)
     
     Other:
+        --force            Rerun tests whose passing results are cached
         --help, -h         Show this help message
 
 EXAMPLES:
@@ -83,6 +88,7 @@ EXAMPLES:
     
     # Run specific examples
     $0 --dma
+    $0 --dma-stress
     $0 --uart
     $0 --spi
     $0 --i2c
@@ -145,6 +151,17 @@ check_prerequisites() {
     print_status $GREEN "Prerequisites check passed"
 }
 
+# Function to run make through scripts/result_cache.py: the run is skipped
+# when the same test module, imports, DUT sources, simulator and plusargs
+# already passed (--force runs it anyway)
+cached_make() {
+    local cache_args=(run --session "$CACHE_SESSION")
+    if [[ "$FORCE" == true ]]; then
+        cache_args+=(--force)
+    fi
+    python3 "$SCRIPT_DIR/result_cache.py" "${cache_args[@]}" -- make "$@"
+}
+
 # Function to run Python example (run with cocotb)
 run_python_example() {
     local example_dir=$1
@@ -181,7 +198,7 @@ run_python_example() {
     print_status $BLUE "Running pyuvm test for $example_name..."
     if [[ -n "$module_name" ]]; then
         # For protocols directory, specify MODULE
-        if make SIM="$SIMULATOR" MODULE="$module_name" 2>&1 | tee "/tmp/pyuvm_${module_name}.log"; then
+        if cached_make SIM="$SIMULATOR" MODULE="$module_name" 2>&1 | tee "/tmp/pyuvm_${module_name}.log"; then
             print_status $GREEN "✓ $example_name completed successfully"
             cd "$PROJECT_ROOT"
             return 0
@@ -192,7 +209,7 @@ run_python_example() {
         fi
     else
         # Regular example
-        if make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
+        if cached_make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
             print_status $GREEN "✓ $example_name completed successfully"
             cd "$PROJECT_ROOT"
             return 0
@@ -221,7 +238,7 @@ run_pyuvm_tests() {
     make clean > /dev/null 2>&1 || true
 
     print_status $BLUE "Running real-world application test..."
-    if make SIM="$SIMULATOR" TEST=test_real_world 2>&1 | tee /tmp/pyuvm_test.log; then
+    if cached_make SIM="$SIMULATOR" TEST=test_real_world 2>&1 | tee /tmp/pyuvm_test.log; then
         print_status $GREEN "✓ pyuvm test passed"
         cd "$PROJECT_ROOT"
         return 0
@@ -244,6 +261,11 @@ parse_args() {
                 has_specific_option=true
                 shift
                 ;;
+            --dma-stress)
+                RUN_DMA_STRESS=true
+                has_specific_option=true
+                shift
+                ;;
             --uart)
                 RUN_UART=true
                 has_specific_option=true
@@ -271,6 +293,7 @@ parse_args() {
                 ;;
             --all-examples)
                 RUN_DMA=true
+                RUN_DMA_STRESS=true
                 RUN_UART=true
                 RUN_SPI=true
                 RUN_I2C=true
@@ -281,6 +304,7 @@ parse_args() {
                 ;;
             --skip-examples)
                 RUN_DMA=false
+                RUN_DMA_STRESS=false
                 RUN_UART=false
                 RUN_SPI=false
                 RUN_I2C=false
@@ -305,6 +329,10 @@ parse_args() {
                 SIMULATOR="$2"
                 shift 2
                 ;;
+            --force)
+                FORCE=true
+                shift
+                ;;
             --help|-h)
                 show_usage
                 exit 0
@@ -320,6 +348,7 @@ parse_args() {
     # If no specific option, run all examples
     if [[ "$has_specific_option" == false ]]; then
         RUN_DMA=true
+        RUN_DMA_STRESS=true
         RUN_UART=true
         RUN_SPI=true
         RUN_I2C=true
@@ -334,6 +363,7 @@ main() {
     
     # Parse arguments
     parse_args "$@"
+    CACHE_SESSION="$(mktemp)"
     
     # Check prerequisites
     check_prerequisites
@@ -341,7 +371,8 @@ main() {
     local errors=0
     
     # Run examples
-    if [[ "$RUN_DMA" == true ]] || [[ "$RUN_UART" == true ]] || \
+    if [[ "$RUN_DMA" == true ]] || [[ "$RUN_DMA_STRESS" == true ]] || \
+       [[ "$RUN_UART" == true ]] || \
        [[ "$RUN_SPI" == true ]] || [[ "$RUN_I2C" == true ]] || \
        [[ "$RUN_VIP" == true ]] || [[ "$RUN_BEST_PRACTICES" == true ]]; then
         
@@ -353,6 +384,12 @@ main() {
             fi
         fi
         
+        if [[ "$RUN_DMA_STRESS" == true ]]; then
+            if ! run_python_example "dma" "DMA Stress" "dma_stress_example"; then
+                errors=$((errors + 1))
+            fi
+        fi
+        
         if [[ "$RUN_UART" == true ]]; then
             if ! run_python_example "protocols" "UART Protocol" "uart_example"; then
                 errors=$((errors + 1))
@@ -393,6 +430,8 @@ main() {
     
     # Summary
     print_header "Summary"
+    python3 "$SCRIPT_DIR/result_cache.py" report --session "$CACHE_SESSION"
+    rm -f "$CACHE_SESSION"
     
     if [[ $errors -eq 0 ]]; then
         print_status $GREEN "✓ All examples and tests completed successfully!"
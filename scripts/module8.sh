@@ -30,9 +30,12 @@ RUN_STRING_UTILS=true
 RUN_MATH_UTILS=true
 RUN_RANDOM_UTILS=true
 RUN_INTEGRATION=true
+RUN_PROFILING=true
 RUN_PYUVM_TESTS=true
 USE_VENV=true
 SIMULATOR="verilator"
+FORCE=false
+CACHE_SESSION=""
 
 # Function to print colored output
 print_status() {
@@ -69,6 +72,7 @@ OPTIONS:
         --math-utils       Run Math utility examples
         --random-utils     Run Random utility examples
         --integration      Run Utility integration examples
+        --profiling        Run hot-path profiling examples
         --all-examples     Run all examples (default)
         --skip-examples    Skip all examples
     
@@ -81,6 +85,7 @@ OPTIONS:
         --sim SIMULATOR    Simulator to use (default: verilator)
     
     Other:
+        --force            Rerun tests whose passing results are cached
         --help, -h         Show this help message
 
 EXAMPLES:
@@ -97,6 +102,7 @@ EXAMPLES:
     $0 --math-utils
     $0 --random-utils
     $0 --integration
+    $0 --profiling
     
     # Run tests
     $0 --pyuvm-tests
@@ -154,6 +160,17 @@ check_prerequisites() {
     print_status $GREEN "Prerequisites check passed"
 }
 
+# Function to run make through scripts/result_cache.py: the run is skipped
+# when the same test module, imports, DUT sources, simulator and plusargs
+# already passed (--force runs it anyway)
+cached_make() {
+    local cache_args=(run --session "$CACHE_SESSION")
+    if [[ "$FORCE" == true ]]; then
+        cache_args+=(--force)
+    fi
+    python3 "$SCRIPT_DIR/result_cache.py" "${cache_args[@]}" -- make "$@"
+}
+
 # Function to run Python example (run with cocotb)
 run_python_example() {
     local example_dir=$1
@@ -181,7 +198,7 @@ run_python_example() {
     make clean > /dev/null 2>&1 || true
 
     print_status $BLUE "Running pyuvm test for $example_name..."
-    if make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
+    if cached_make SIM="$SIMULATOR" 2>&1 | tee "/tmp/pyuvm_${example_dir}.log"; then
         print_status $GREEN "✓ $example_name completed successfully"
         cd "$PROJECT_ROOT"
         return 0
@@ -209,7 +226,7 @@ run_pyuvm_tests() {
     make clean > /dev/null 2>&1 || true
 
     print_status $BLUE "Running utilities test..."
-    if make SIM="$SIMULATOR" TEST=test_utilities 2>&1 | tee /tmp/pyuvm_test.log; then
+    if cached_make SIM="$SIMULATOR" TEST=test_utilities 2>&1 | tee /tmp/pyuvm_test.log; then
         print_status $GREEN "✓ pyuvm test passed"
         cd "$PROJECT_ROOT"
         return 0
@@ -272,6 +289,11 @@ parse_args() {
                 has_specific_option=true
                 shift
                 ;;
+            --profiling)
+                RUN_PROFILING=true
+                has_specific_option=true
+                shift
+                ;;
             --all-examples)
                 RUN_CLP=true
                 RUN_COMPARATORS=true
@@ -282,6 +304,7 @@ parse_args() {
                 RUN_MATH_UTILS=true
                 RUN_RANDOM_UTILS=true
                 RUN_INTEGRATION=true
+                RUN_PROFILING=true
                 has_specific_option=true
                 shift
                 ;;
@@ -295,6 +318,7 @@ parse_args() {
                 RUN_MATH_UTILS=false
                 RUN_RANDOM_UTILS=false
                 RUN_INTEGRATION=false
+                RUN_PROFILING=false
                 shift
                 ;;
             --pyuvm-tests)
@@ -314,6 +338,10 @@ parse_args() {
                 SIMULATOR="$2"
                 shift 2
                 ;;
+            --force)
+                FORCE=true
+                shift
+                ;;
             --help|-h)
                 show_usage
                 exit 0
@@ -337,6 +365,7 @@ parse_args() {
         RUN_MATH_UTILS=true
         RUN_RANDOM_UTILS=true
         RUN_INTEGRATION=true
+        RUN_PROFILING=true
     fi
 }
 
@@ -346,6 +375,7 @@ main() {
     
     # Parse arguments
     parse_args "$@"
+    CACHE_SESSION="$(mktemp)"
     
     # Check prerequisites
     check_prerequisites
@@ -357,7 +387,8 @@ main() {
        [[ "$RUN_RECORDERS" == true ]] || [[ "$RUN_POOLS" == true ]] || \
        [[ "$RUN_QUEUES" == true ]] || [[ "$RUN_STRING_UTILS" == true ]] || \
        [[ "$RUN_MATH_UTILS" == true ]] || [[ "$RUN_RANDOM_UTILS" == true ]] || \
-       [[ "$RUN_INTEGRATION" == true ]]; then
+       [[ "$RUN_INTEGRATION" == true ]] || \
+       [[ "$RUN_PROFILING" == true ]]; then
         
         print_header "Running UVM Utilities Examples"
         
@@ -414,6 +445,12 @@ main() {
                 errors=$((errors + 1))
             fi
         fi
+        
+        if [[ "$RUN_PROFILING" == true ]]; then
+            if ! run_python_example "profiling" "Hot-Path Profiling"; then
+                errors=$((errors + 1))
+            fi
+        fi
     fi
     
     # Run tests
@@ -425,6 +462,8 @@ main() {
     
     # Summary
     print_header "Summary"
+    python3 "$SCRIPT_DIR/result_cache.py" report --session "$CACHE_SESSION"
+    rm -f "$CACHE_SESSION"
     
     if [[ $errors -eq 0 ]]; then
         print_status $GREEN "✓ All examples and tests completed successfully!"
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Result cache for the moduleN.sh regression scripts.
+
+The scripts run every example and test as `make SIM=... [VAR=value ...]`
+in its directory, whether or not anything it depends on changed. Through
+`result_cache.py run -- make ...` a run is skipped when an earlier run
+with the same key passed. The key is a SHA-256 over:
+
+- the directory's Makefile, the test modules it resolves to and the make
+  arguments (SIM, CLOCK_SOURCE, ...) whose value differs from the
+  Makefile's own, so `make TEST=test_and_gate` and a plain `make` of a
+  Makefile with `TEST ?= test_and_gate` share a key
+- the test module and every local Python file it imports, transitively
+- the VERILOG_SOURCES / VHDL_SOURCES files
+- the simulator version and the installed cocotb and pyuvm versions
+- PLUSARGS, the random seed and the other cocotb/simulator environment
+  variables, and the environment values of variables the Makefile exports
+
+A run passes when make exits 0 and, if it wrote one, results.xml holds no
+failure or error. Failed runs are never cached. Entries live in
+.result_cache/ at the project root (RESULT_CACHE_DIR overrides).
+
+Usage:
+    result_cache.py run [--force] [--session FILE] [--label NAME] -- make SIM=verilator ...
+    result_cache.py key [VAR=value ...]     # show the key and inputs for this directory
+    result_cache.py report --session FILE   # executed vs skipped time of a session
+    result_cache.py clear
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from importlib import metadata
+
+from example_deps import MakefileVars, PROJECT_ROOT, example_inputs, parse_make_args
+
+# Environment variables that change what a run does (seed, plusargs, test selection, tool args)
+ENV_INPUTS = (
+    "PLUSARGS", "RANDOM_SEED", "COCOTB_RANDOM_SEED", "TESTCASE", "COCOTB_TESTCASE",
+    "COCOTB_TEST_FILTER", "TOPLEVEL_LANG", "EXTRA_ARGS", "COMPILE_ARGS", "SIM_ARGS",
+    "WAVES", "GPI_EXTRA",
+)
+
+# Version command per cocotb SIM value; anything else is asked for --version
+SIMULATOR_VERSION = {
+    "verilator": ["verilator", "--version"],
+    "icarus": ["iverilog", "-V"],
+    "questa": ["vsim", "-version"],
+    "xcelium": ["xrun", "-version"],
+    "vcs": ["vcs", "-ID"],
+}
+
+_versions = {}
+
+
+def cache_dir():
+    return os.environ.get("RESULT_CACHE_DIR") or os.path.join(PROJECT_ROOT, ".result_cache")
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except OSError:
+        return "missing"
+    return digest.hexdigest()
+
+
+def simulator_version(sim):
+    """First line the simulator prints for its version, or why there is none."""
+    if sim not in _versions:
+        command = SIMULATOR_VERSION.get(sim, [sim, "--version"])
+        if shutil.which(command[0]) is None:
+            _versions[sim] = f"{command[0]} not found"
+        else:
+            try:
+                out = subprocess.run(command, capture_output=True, text=True, timeout=30)
+                lines = (out.stdout or out.stderr).strip().splitlines()
+                _versions[sim] = lines[0] if lines else f"{command[0]} printed no version"
+            except (OSError, subprocess.SubprocessError) as exc:
+                _versions[sim] = f"{command[0]}: {exc}"
+    return _versions[sim]
+
+
+def _package_version(name):
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "not installed"
+
+
+def effective_overrides(directory, make_args):
+    """{name: value} of the VAR=value make arguments that change a variable of the Makefile."""
+    defaults = MakefileVars(os.path.join(directory, "Makefile"))
+    return {name: value for name, value in parse_make_args(make_args).items()
+            if defaults.get(name) != value}
+
+
+def key_inputs(directory, make_args):
+    """Everything the key is computed over, as a JSON-serializable dict."""
+    overrides = parse_make_args(make_args)
+    deps = example_inputs(directory, overrides)
+    sim = MakefileVars(deps["makefile"], overrides).get("SIM") or "verilator"
+    files = [deps["makefile"]] + deps["python"] + deps["hdl"]
+    env_names = sorted(set(ENV_INPUTS) | set(deps["exported"]))
+    return {
+        "directory": os.path.relpath(directory, PROJECT_ROOT),
+        "modules": deps["modules"],
+        "make_args": effective_overrides(directory, make_args),
+        "files": {os.path.relpath(path, PROJECT_ROOT): _file_digest(path) for path in files},
+        "simulator": simulator_version(sim),
+        "cocotb": _package_version("cocotb"),
+        "pyuvm": _package_version("pyuvm"),
+        "env": {name: os.environ[name] for name in env_names if name in os.environ},
+    }
+
+
+def compute_key(inputs):
+    text = json.dumps(inputs, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def load_entry(key):
+    try:
+        with open(os.path.join(cache_dir(), key + ".json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def store_entry(key, entry):
+    os.makedirs(cache_dir(), exist_ok=True)
+    path = os.path.join(cache_dir(), key + ".json")
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def results_failures(directory, since):
+    """Failures + errors in a results.xml written after since, or None if there is none."""
+    path = os.path.join(directory, os.environ.get("COCOTB_RESULTS_FILE", "results.xml"))
+    try:
+        if os.path.getmtime(path) < since:
+            return None
+        root = ET.parse(path).getroot()
+    except (OSError, ET.ParseError):
+        return None
+    return len(root.findall(".//failure")) + len(root.findall(".//error"))
+
+
+def record(session, label, status, seconds, cached_seconds=0.0):
+    if not session:
+        return
+    with open(session, "a") as f:
+        f.write(json.dumps({"label": label, "status": status, "seconds": seconds,
+                            "cached_seconds": cached_seconds}) + "\n")
+
+
+def _default_label(directory, make_args):
+    selectors = [arg for arg in make_args if arg.split("=", 1)[0] in ("MODULE", "TEST", "TESTCASE")]
+    return " ".join([os.path.relpath(directory, PROJECT_ROOT)] + selectors)
+
+
+def cmd_run(args):
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        print("result_cache.py run: no command given", file=sys.stderr)
+        return 2
+    directory = os.getcwd()
+    make_args = command[1:]
+    label = args.label or _default_label(directory, make_args)
+    inputs = key_inputs(directory, make_args)
+    key = compute_key(inputs)
+
+    entry = load_entry(key)
+    if entry is not None and not args.force:
+        print(f"[result_cache] {label}: inputs unchanged since the passing run of "
+              f"{entry['passed']} ({entry['seconds']:.1f} s), skipped (--force reruns it)")
+        record(args.session, label, "skipped", 0.0, entry["seconds"])
+        return 0
+
+    start = time.time()
+    code = subprocess.call(command)
+    seconds = time.time() - start
+    failures = results_failures(directory, start)
+    if code == 0 and not failures:
+        store_entry(key, {"label": label, "seconds": seconds,
+                          "passed": datetime.now().isoformat(timespec="seconds"), "inputs": inputs})
+        record(args.session, label, "executed", seconds)
+    else:
+        if code == 0:
+            print(f"[result_cache] {label}: results.xml reports {failures} failures, not cached")
+        record(args.session, label, "failed", seconds)
+    return code
+
+
+def cmd_key(args):
+    inputs = key_inputs(os.getcwd(), args.make_args)
+    key = compute_key(inputs)
+    entry = load_entry(key)
+    print(json.dumps(inputs, indent=1, sort_keys=True))
+    state = f"passed {entry['passed']}" if entry else "not cached"
+    print(f"key {key}: {state}")
+    return 0
+
+
+def cmd_report(args):
+    try:
+        with open(args.session) as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        runs = []
+    if not runs:
+        return 0
+    executed = [r for r in runs if r["status"] != "skipped"]
+    skipped = [r for r in runs if r["status"] == "skipped"]
+    failed = [r for r in runs if r["status"] == "failed"]
+    run_time = sum(r["seconds"] for r in executed)
+    saved = sum(r["cached_seconds"] for r in skipped)
+    print(f"Result cache: {len(executed)} executed in {run_time:.1f} s "
+          f"({len(failed)} failed), {len(skipped)} skipped (their last passing runs took {saved:.1f} s)")
+    for r in runs:
+        seconds = r["cached_seconds"] if r["status"] == "skipped" else r["seconds"]
+        print(f"  {r['status']:<9}{seconds:8.1f} s  {r['label']}")
+    return 0
+
+
+def cmd_clear(args):
+    shutil.rmtree(cache_dir(), ignore_errors=True)
+    print(f"Cleared {cache_dir()}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skip example/test runs whose inputs already passed.")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    run = sub.add_parser("run", help="run a make command unless a passing result is cached")
+    run.add_argument("--force", action="store_true", help="run even if a passing result is cached")
+    run.add_argument("--session", help="append the outcome to this file, for report")
+    run.add_argument("--label", help="name shown in messages and reports")
+    run.add_argument("command", nargs=argparse.REMAINDER, help="-- make SIM=... [VAR=value ...]")
+    run.set_defaults(func=cmd_run)
+
+    key = sub.add_parser("key", help="show the key inputs of the current directory")
+    key.add_argument("make_args", nargs="*", help="VAR=value make arguments")
+    key.set_defaults(func=cmd_key)
+
+    report = sub.add_parser("report", help="summarize a session")
+    report.add_argument("--session", required=True)
+    report.set_defaults(func=cmd_report)
+
+    clear = sub.add_parser("clear", help="delete every cached result")
+    clear.set_defaults(func=cmd_clear)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())